@@ -1,6 +1,7 @@
 """
 Gunicorn configuration for blacklist application
 """
+import os
 
 # Server socket
 bind = "0.0.0.0:2542"
@@ -8,12 +9,20 @@ backlog = 2048
 
 # Worker processes
 workers = 4
-worker_class = "sync"
+# Sync workers by default. GUNICORN_WORKER_CLASS=gthread opts into threaded
+# workers, whose concurrent requests share the process-wide async DB loop
+# (src/core/database/async_pool.py); DB pools are sized from the same settings
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+# gunicorn switches sync workers to gthread when threads > 1
+threads = (
+    int(os.getenv("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+)
 worker_connections = 1000
 timeout = 30
 keepalive = 2
 
 # Restart workers after this many requests, to prevent memory leaks
+# (postponed while the worker runs a collection job, see pre_request)
 max_requests = 1000
 max_requests_jitter = 50
 
@@ -44,3 +53,58 @@ chdir = "/app"
 
 # Performance
 worker_tmp_dir = "/dev/shm"
+
+
+def on_starting(server):
+    """Apply schema migrations once, then check the DB connection budget"""
+    from src.core.database.migrations import run_startup_migrations
+
+    # Runs in the master before any worker is forked, so workers never wait
+    # on index builds or contend for the migration lock (failure stops startup)
+    result = run_startup_migrations()
+    if result and result.get("applied"):
+        server.log.info("Applied schema migrations: %s", result["applied"])
+    _check_connection_budget(server)
+
+
+def _check_connection_budget(server):
+    """Warn when every worker's DB pools together can exceed max_connections"""
+    from src.core.database.async_pool import connections_per_worker
+
+    # PostgreSQL max_connections minus superuser / admin / backup headroom
+    limit = int(os.getenv("DB_MAX_CONNECTIONS", "100")) - int(
+        os.getenv("DB_RESERVED_CONNECTIONS", "10")
+    )
+    # recycled workers briefly overlap with their replacement
+    needed = (workers + 1) * connections_per_worker()
+    if needed > limit:
+        server.log.warning(
+            "DB pools may open %d connections (%d workers + 1 restarting x %d), "
+            "above the %d available: lower DB_POOL_MAX / DB_ASYNC_POOL_MAX / "
+            "GUNICORN_THREADS or raise PostgreSQL max_connections",
+            needed,
+            workers,
+            connections_per_worker(),
+            limit,
+        )
+
+
+# Collection jobs run on a thread executor inside the worker process
+# (src/core/services/collection_jobs.py), so worker lifecycle must respect them
+
+
+def pre_request(worker, req):
+    """Postpone the max_requests restart while this worker has collection jobs"""
+    from src.core.services.collection_jobs import collection_jobs
+
+    if worker.nr + 1 >= worker.max_requests and collection_jobs.local_jobs():
+        worker.max_requests = worker.nr + 2
+
+
+def worker_exit(server, worker):
+    """Cancel this worker's jobs and record them as cancelled instead of lost"""
+    from src.core.services.collection_jobs import collection_jobs
+
+    cancelled = collection_jobs.shutdown()
+    if cancelled:
+        worker.log.info("Cancelled collection jobs on worker exit: %s", cancelled)
@@ -3,16 +3,31 @@
 Flask 애플리케이션 - PostgreSQL 연결 및 수집 관리
 """
 import os
-import psycopg2
+import logging
 from flask import Flask, jsonify, redirect, send_file
 from datetime import datetime
 from pathlib import Path
 
+from src.core.database.connection_pool import db_pool
+from src.core.services.metrics import metrics
+from src.core.services.profiler import request_profiler
+from src.core.services.stats_rollup import stats_rollup
+
+logger = logging.getLogger(__name__)
+
 
 def create_app():
     """Flask 애플리케이션 생성"""
     app = Flask(__name__)
 
+    # 스키마 마이그레이션은 워커 부팅과 분리 (gunicorn on_starting 또는 flask migrate)
+    @app.cli.command("migrate")
+    def migrate_command():
+        """미적용 스키마 마이그레이션 적용"""
+        from src.core.database.migrations import run_startup_migrations
+
+        print(run_startup_migrations())
+
     # Register collection panel blueprint
     try:
         from src.core.routes.collection_panel import collection_bp
@@ -39,37 +54,37 @@ def create_app():
     except ImportError:
         pass  # Unified API not available
 
+    # 요청/캐시/풀/수집 메트릭 및 /metrics 엔드포인트 (METRICS_ENABLED=false로 비활성화)
+    metrics.init_app(app)
+
+    # 온디맨드 요청 프로파일링 (PROFILE_TOKEN / PROFILE_SAMPLE_RATE 미설정 시 비활성)
+    request_profiler.init_app(app)
+
     @app.route("/health")
     def health_check():
         """헬스체크 엔드포인트"""
         try:
-            # PostgreSQL 연결 테스트
-            conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", "postgres"),
-                port=os.getenv("POSTGRES_PORT", "5432"),
-                database=os.getenv("POSTGRES_DB", "blacklist"),
-                user=os.getenv("POSTGRES_USER", "postgres"),
-                password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-            )
-
-            cursor = conn.cursor()
-
-            # 테이블 존재 확인
-            cursor.execute(
+            # PostgreSQL 연결 테스트 (공유 커넥션 풀)
+            conn = db_pool.getconn()
+            try:
+                cursor = conn.cursor()
+
+                # 테이블 존재 확인
+                cursor.execute(
+                    """
+                    SELECT table_name 
+                    FROM information_schema.tables 
+                    WHERE table_schema = 'public'
                 """
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-            """
-            )
-            tables = [row[0] for row in cursor.fetchall()]
+                )
+                tables = [row[0] for row in cursor.fetchall()]
 
-            # 블랙리스트 IP 개수 확인
-            cursor.execute("SELECT COUNT(*) FROM blacklist_ips")
-            ip_count = cursor.fetchone()[0]
+                cursor.close()
 
-            cursor.close()
-            conn.close()
+                # 블랙리스트 IP 개수 확인 (집계 테이블)
+                ip_count = stats_rollup.read(conn).total_ips
+            finally:
+                conn.close()
 
             return (
                 jsonify(
@@ -80,6 +95,7 @@ def create_app():
                             "connection": "successful",
                             "tables": tables,
                             "blacklist_ips_count": ip_count,
+                            "pool": db_pool.get_pool_stats(),
                         },
                         "message": "✅ PostgreSQL 커스텀 이미지 연결 성공!",
                     }
@@ -109,6 +125,9 @@ def create_app():
 
 
 if __name__ == "__main__":
+    from src.core.database.migrations import run_startup_migrations
+
+    run_startup_migrations()
     app = create_app()
     port = int(os.getenv("PORT", 2542))
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -20,17 +20,11 @@ class AuthManager:
         """서비스별 인증정보 반환"""
         try:
             # PostgreSQL에서 인증정보 조회
-            import psycopg2
             from psycopg2.extras import RealDictCursor
 
-            conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", "blacklist-postgres"),
-                port=os.getenv("POSTGRES_PORT", "5432"),
-                database=os.getenv("POSTGRES_DB", "blacklist"),
-                user=os.getenv("POSTGRES_USER", "postgres"),
-                password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-                cursor_factory=RealDictCursor,
-            )
+            from src.core.database.connection_pool import db_pool
+
+            conn = db_pool.getconn(cursor_factory=RealDictCursor)
             cursor = conn.cursor()
 
             cursor.execute(
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+엔드포인트 탐색 이력 모듈
+후보 URL별 성공/실패 이력을 파일에 저장하여 다음 수집 때 성공했던 엔드포인트부터 시도한다.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 응답 종류별 우선순위 (Excel / JSON 다운로드가 가장 유용)
+KIND_PRIORITY = {"excel": 2, "json": 2, "html": 1}
+
+
+class EndpointHistory:
+    """후보 경로별 탐색 이력 (시도/성공 횟수, 마지막 응답 종류, 평균 응답 시간)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("endpoints", {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"엔드포인트 이력 로드 실패 ({self.path}): {e}")
+            return {}
+
+    def _score(self, path: str) -> tuple:
+        entry = self._entries.get(path)
+        if not entry or not entry.get("attempts"):
+            return (0, 0.0)
+        priority = KIND_PRIORITY.get(entry.get("last_kind"), 0)
+        if not entry.get("last_ok"):
+            priority = -1
+        return (priority, entry["successes"] / entry["attempts"])
+
+    def order(self, paths: List[str]) -> List[str]:
+        """최근 성공한 고가치 엔드포인트 → 성공률 순 (같으면 원래 순서)"""
+        with self._lock:
+            ranked = sorted(
+                enumerate(paths), key=lambda item: (self._score(item[1]), -item[0])
+            )
+        return [path for _, path in reversed(ranked)]
+
+    def record(
+        self,
+        path: str,
+        status: Optional[int],
+        kind: Optional[str],
+        ips: int,
+        elapsed_ms: float,
+        error: Optional[str] = None,
+    ):
+        """탐색 결과 1건 기록 (ips > 0 이면 성공)"""
+        ok = ips > 0
+        with self._lock:
+            entry = self._entries.setdefault(
+                path, {"attempts": 0, "successes": 0, "avg_ms": 0.0}
+            )
+            entry["attempts"] += 1
+            entry["avg_ms"] = round(
+                entry["avg_ms"] + (elapsed_ms - entry["avg_ms"]) / entry["attempts"], 1
+            )
+            entry.update(
+                last_ok=ok,
+                last_status=status,
+                last_kind=kind,
+                last_ips=ips,
+                last_error=error,
+                last_attempt_at=datetime.now().isoformat(),
+            )
+            if ok:
+                entry["successes"] += 1
+                entry["last_success_at"] = entry["last_attempt_at"]
+
+    def save(self):
+        """이력 파일 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            data = {
+                "updated_at": datetime.now().isoformat(),
+                "endpoints": self._entries,
+            }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"엔드포인트 이력 저장 실패 ({self.path}): {e}")
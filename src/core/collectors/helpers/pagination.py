@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+파이프라인 페이지 수집 모듈
+여러 페이지 요청을 동시에 진행하고, 응답 지연 / 오류 / 429 비율에 따라
+동시 요청 수와 요청 간 지연을 AIMD로 조정한다.
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ...utils.cancellation import cancellable_async_sleep, raise_if_cancelled
+
+logger = logging.getLogger(__name__)
+
+
+class PageCollectionIncomplete(Exception):
+    """연속 에러 한계로 중단되어 수집하지 못한 페이지가 남은 경우"""
+
+    def __init__(self, failed_pages: List[int]):
+        self.failed_pages = failed_pages
+        super().__init__(
+            f"페이지 수집 불완전 - 실패한 페이지: "
+            f"{', '.join(str(page + 1) for page in failed_pages)}"
+        )
+
+
+def _is_throttled(error: Exception) -> bool:
+    """429 Too Many Requests 응답으로 인한 오류 여부"""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """429 응답의 Retry-After (초) - 없거나 형식이 다르면 None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AIMDController:
+    """
+    동시 요청 수 / 요청 간 지연 AIMD 조정
+    - 성공 (지연이 latency_target 이하): 요청 간 지연 delay_step 감소,
+      동시 요청 수만큼 성공하면 동시 요청 수 +1 (첫 혼잡 전까지는 2배씩 증가)
+    - 오류 / 429 / 지연 초과: 동시 요청 수 절반, 요청 간 지연 2배
+    - 429 응답의 Retry-After는 그 시간 동안 새 요청 시작 중지
+    감소는 마지막 감소 이후 시작된 요청의 결과에만 적용 (동시 요청들의 연쇄 감소 방지)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        max_concurrency: int = 8,
+        delay: float = 0.1,
+        max_delay: float = 10.0,
+        delay_step: float = 0.02,
+        latency_target: float = 5.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = min(max(1, concurrency), self.max_concurrency)
+        self.delay = max(0.0, delay)
+        self.max_delay = max_delay
+        self.delay_step = delay_step
+        self.latency_target = latency_target
+        self.slow_start = True
+        self.decreases = 0
+        # 새 요청 시작 가능 시각 (time.monotonic, Retry-After)
+        self.resume_at = 0.0
+        self._decreased_at = 0.0
+        self._successes = 0
+
+    def on_success(self, started: float, latency: float):
+        if latency > self.latency_target:
+            self._decrease(started, f"응답 지연 {latency:.1f}초")
+            return
+        self.delay = max(0.0, self.delay - self.delay_step)
+        self._successes += 1
+        if self._successes < self.concurrency:
+            return
+        self._successes = 0
+        if self.slow_start:
+            self.concurrency = min(self.concurrency * 2, self.max_concurrency)
+        else:
+            self.concurrency = min(self.concurrency + 1, self.max_concurrency)
+
+    def on_error(self, started: float, error: Exception):
+        reason = "429 응답" if _is_throttled(error) else f"오류 ({error})"
+        self._decrease(started, reason)
+        retry_after = _retry_after(error) if _is_throttled(error) else None
+        if retry_after is not None:
+            self.resume_at = max(
+                self.resume_at, time.monotonic() + min(retry_after, self.max_delay)
+            )
+
+    def _decrease(self, started: float, reason: str):
+        self.slow_start = False
+        self._successes = 0
+        if started < self._decreased_at:
+            return
+        self._decreased_at = time.monotonic()
+        self.decreases += 1
+        self.concurrency = max(1, self.concurrency // 2)
+        self.delay = min(max(self.delay * 2, self.delay_step), self.max_delay)
+        logger.info(
+            f"페이지 수집 속도 감소 - {reason}: "
+            f"동시 요청 {self.concurrency}, 지연 {self.delay:.2f}초"
+        )
+
+
+class PagePipeline:
+    """
+    페이지 파이프라인 수집
+    - fetch(page): 페이지 1개 조회 → 파싱된 항목 목록 (빈 목록이면 마지막 페이지)
+    - 완료된 페이지는 도착 순서대로 queue에 (page, items)로 전달, 종료 시 None
+    - 실패한 페이지는 재시도 대기열에 넣고, 연속 실패가 max_errors에 도달하면 중단
+      (끝내 받지 못한 페이지는 stats["failed_pages"]에 기록, 이후 페이지는 이미 전달됨)
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Awaitable[List[Any]]],
+        controller: AIMDController,
+        max_pages: int = 100,
+        max_errors: int = 5,
+        cancel_token=None,
+    ):
+        self.fetch = fetch
+        self.controller = controller
+        self.max_pages = max_pages
+        self.max_errors = max_errors
+        self.cancel_token = cancel_token
+        self.stats: Dict[str, Any] = {
+            "pages": 0,
+            "errors": 0,
+            "throttled": 0,
+            "peak_concurrency": 0,
+            "exhausted": False,
+            "failed_pages": [],
+        }
+
+    async def _fetch(self, page: int):
+        """→ (항목 또는 None, 오류 또는 None, 시작 시각, 소요 시간)"""
+        started = time.monotonic()
+        try:
+            items = await self.fetch(page)
+            return items, None, started, time.monotonic() - started
+        except Exception as e:
+            return None, e, started, time.monotonic() - started
+
+    async def run(self, queue: asyncio.Queue):
+        """페이지 수집 실행 (queue 소비자와 함께 실행)"""
+        next_page = 0
+        # 빈 응답을 받은 첫 페이지 (이후 페이지는 요청/전달하지 않음)
+        end_page: Optional[int] = None
+        retry: deque = deque()
+        inflight: Dict[asyncio.Future, int] = {}
+        consecutive_errors = 0
+        last_start = 0.0
+
+        def next_to_fetch() -> Optional[int]:
+            nonlocal next_page
+            limit = self.max_pages if end_page is None else end_page
+            while retry:
+                page = retry.popleft()
+                if page < limit:
+                    return page
+            if next_page < limit:
+                next_page += 1
+                return next_page - 1
+            return None
+
+        try:
+            while True:
+                raise_if_cancelled(self.cancel_token)
+
+                # 동시 요청 수까지 요청 시작 (요청 간 지연 유지)
+                while len(inflight) < self.controller.concurrency:
+                    page = next_to_fetch()
+                    if page is None:
+                        break
+                    start_at = last_start + self.controller.delay
+                    wait = max(start_at, self.controller.resume_at) - time.monotonic()
+                    if wait > 0:
+                        await cancellable_async_sleep(self.cancel_token, wait)
+                    last_start = time.monotonic()
+                    inflight[asyncio.ensure_future(self._fetch(page))] = page
+                self.stats["peak_concurrency"] = max(
+                    self.stats["peak_concurrency"], len(inflight)
+                )
+                if not inflight:
+                    break
+
+                done, _ = await asyncio.wait(
+                    inflight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    page = inflight.pop(future)
+                    items, error, started, latency = future.result()
+
+                    if error is not None:
+                        consecutive_errors += 1
+                        self.stats["errors"] += 1
+                        if _is_throttled(error):
+                            self.stats["throttled"] += 1
+                        self.controller.on_error(started, error)
+                        logger.warning(
+                            f"페이지 {page + 1} 수집 실패 "
+                            f"(연속 에러: {consecutive_errors}/{self.max_errors}): {error}"
+                        )
+                        retry.append(page)
+                        continue
+
+                    consecutive_errors = 0
+                    self.controller.on_success(started, latency)
+                    if not items:
+                        if end_page is None or page < end_page:
+                            logger.info(f"페이지 {page + 1}에서 더 이상 데이터 없음")
+                            end_page = page
+                        continue
+                    if end_page is not None and page > end_page:
+                        continue
+                    self.stats["pages"] += 1
+                    await queue.put((page, items))
+
+                if consecutive_errors >= self.max_errors:
+                    logger.error(f"연속 페이지 에러 한계 도달 ({self.max_errors})")
+                    break
+        finally:
+            for future in inflight:
+                future.cancel()
+            # 재시도 대기 / 진행 중에 중단된 페이지 (마지막 페이지 이후는 제외)
+            limit = self.max_pages if end_page is None else end_page
+            self.stats["failed_pages"] = sorted(
+                page for page in set(retry) | set(inflight.values()) if page < limit
+            )
+            self.stats["exhausted"] = end_page is not None
+            self.stats["concurrency"] = self.controller.concurrency
+            self.stats["delay"] = round(self.controller.delay, 3)
+            await queue.put(None)
+        return self.stats
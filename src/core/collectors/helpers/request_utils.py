@@ -4,6 +4,7 @@ HTTP 요청 유틸리티 모듈
 """
 
 import logging
+import threading
 from typing import Dict, List, Any
 import requests
 
@@ -27,10 +28,16 @@ class RegtechRequestUtils:
         )
         return session
 
-    async def collect_single_page(
+    def collect_single_page(
         self, session: requests.Session, page: int, start_date: str, end_date: str
     ) -> List[Dict[str, Any]]:
-        """단일 페이지 데이터 수집"""
+        """
+        단일 페이지 데이터 수집 (블로킹 호출, 페이지 스레드에서 실행)
+        빈 목록은 마지막 페이지를 뜻하므로, 요청 실패 / 오류 응답은 빈 목록이 아닌
+        예외로 전달한다 (PagePipeline이 재시도하고 AIMD 감소 / 429 대기에 반영).
+        아직 REGTECH 페이지 API가 연결되지 않아 항상 빈 목록을 반환하므로,
+        robust_collect_ips는 현재 첫 페이지 요청 후 종료된다.
+        """
         try:
             # 실제 REGTECH API 엔드포인트에 맞춰 구현
             # 현재는 기본 구조만 제공
@@ -43,10 +50,47 @@ class RegtechRequestUtils:
             # }
             # response = session.get(f"{self.base_url}/api/threat/data",
             #                       params=params, timeout=self.timeout)
+            # response.raise_for_status()
 
             # 임시로 빈 결과 반환 (실제 구현 필요)
             return []
 
-        except Exception as e:
+        except requests.exceptions.RequestException as e:
             logger.error(f"Page {page} collection failed: {e}")
-            return []
+            raise
+
+
+class ThreadLocalSessions:
+    """
+    스레드별 requests 세션
+    requests.Session은 스레드 안전하지 않으므로, 동시 요청 스레드마다 기준 세션의
+    헤더 / 쿠키 / 인증 설정을 복사한 세션을 만들어 사용한다.
+    """
+
+    def __init__(self, base: requests.Session):
+        self.base = base
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: List[requests.Session] = []
+
+    def get(self) -> requests.Session:
+        """현재 스레드의 세션 (처음 호출 시 기준 세션에서 복사)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.base.headers)
+            session.cookies = self.base.cookies.copy()
+            session.auth = self.base.auth
+            session.proxies.update(self.base.proxies)
+            session.verify = self.base.verify
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self):
+        """복사한 세션 모두 닫기 (연결 풀 소켓 반환)"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
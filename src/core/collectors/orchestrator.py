@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+다중 소스 수집 오케스트레이터
+등록된 모든 BaseCollector를 소스별 스레드에서 동시에 실행하고 (소스별 동시 요청 수 / 시간 예산),
+먼저 끝난 소스의 결과부터 공유 적재 단계로 흘려보내 전체 소요 시간이 가장 느린 소스에 수렴하도록 한다.
+적재 단위는 소스별 전체 목록이다 - collect_from_web()이 완성된 목록을 반환하고,
+REGTECH 동기화(reconcile)는 빠진 IP를 비활성화하려면 전체 목록이 필요하다.
+"""
+
+import os
+import time
+import asyncio
+import importlib
+import importlib.util
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.cancellation import CancelToken, CollectionCancelled
+from .unified_collector import BaseCollector, CollectionConfig
+
+logger = logging.getLogger(__name__)
+
+# 소스별 실행 결과 상태
+SOURCE_SUCCEEDED = "succeeded"
+SOURCE_FAILED = "failed"
+SOURCE_TIMEOUT = "timeout"
+SOURCE_CANCELLED = "cancelled"
+SOURCE_UNAVAILABLE = "unavailable"
+
+
+@dataclass
+class CollectorSpec:
+    """등록된 수집 소스 (collector: "모듈:클래스" - 실행 시점에 import)"""
+
+    source: str
+    collector: str
+
+    def load(self) -> type:
+        module_name, class_name = self.collector.split(":")
+        module = importlib.import_module(module_name, package=__package__)
+        return getattr(module, class_name)
+
+    def config(self) -> CollectionConfig:
+        """소스별 설정 (COLLECTION_<SOURCE>_CONCURRENCY / _TIME_BUDGET, 없으면 공통값)"""
+        config = CollectionConfig()
+        prefix = f"COLLECTION_{self.source.upper()}_"
+        config.concurrency = int(
+            os.getenv(
+                f"{prefix}CONCURRENCY",
+                os.getenv("COLLECTION_CONCURRENCY", str(config.concurrency)),
+            )
+        )
+        config.time_budget = float(
+            os.getenv(
+                f"{prefix}TIME_BUDGET",
+                os.getenv("COLLECTION_TIME_BUDGET", str(config.time_budget)),
+            )
+        )
+        return config
+
+
+class CollectionOrchestrator:
+    """
+    등록된 수집기 동시 실행
+    - 소스마다 전용 스레드에서 collect_from_web() 실행 (요청이 블로킹 I/O라 스레드로 겹침)
+    - 시간 예산 초과 시 해당 소스의 취소 토큰만 취소 (부분 결과는 적재하지 않음)
+    - 적재(ingest)는 단일 스레드에서 소스 완료 순서대로 실행 → DB 쓰기는 직렬, 수집과는 겹침
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, CollectorSpec] = {}
+
+    def register(self, source: str, collector: str):
+        """수집 소스 등록 (collector: BaseCollector 하위 클래스 "모듈:클래스")"""
+        self._specs[source] = CollectorSpec(source, collector)
+
+    def register_if_available(self, source: str, collector: str) -> bool:
+        """수집기 모듈이 있을 때만 등록 (선택 수집기)"""
+        module_name = collector.split(":")[0]
+        if importlib.util.find_spec(module_name, package=__package__) is None:
+            logger.info(f"{source} collector 모듈 없음 - 다중 소스 수집에서 제외")
+            return False
+        self.register(source, collector)
+        return True
+
+    def sources(self) -> List[str]:
+        return list(self._specs)
+
+    def run(
+        self,
+        sources: Optional[List[str]] = None,
+        progress=None,
+        prepare: Optional[Callable[[str, BaseCollector], None]] = None,
+        ingest: Optional[Callable[[str, List[Dict[str, Any]]], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        동기 진입점 (수집 작업 스레드에서 호출)
+        - progress: collection_jobs.JobProgress (취소 토큰 포함, 선택)
+        - prepare(source, collector): 실행 전 수집기 설정 (인증정보 등)
+        - ingest(source, data): 수집 결과 적재, 결과 dict 반환
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(
+                self.run_async(sources, progress, prepare, ingest)
+            )
+        finally:
+            loop.close()
+
+    async def run_async(self, sources=None, progress=None, prepare=None, ingest=None):
+        specs = [self._specs[s] for s in (sources or self._specs) if s in self._specs]
+        parent = getattr(progress, "cancel_token", None)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        results: Dict[str, Dict[str, Any]] = {}
+        running = set(spec.source for spec in specs)
+
+        def update_stage():
+            if progress is not None:
+                progress.stage(
+                    "collecting:" + ",".join(sorted(running)) if running else "loading"
+                )
+
+        collect_pool = ThreadPoolExecutor(
+            max_workers=max(1, len(specs)), thread_name_prefix="collect"
+        )
+        ingest_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest")
+
+        async def collect(spec: CollectorSpec):
+            token = CancelToken()
+            # 작업 토큰 취소를 소스 토큰으로 전파 (소스 종료 시 콜백 해제)
+            unregister = (
+                parent.on_cancel(lambda: token.cancel(parent.reason))
+                if parent is not None
+                else lambda: None
+            )
+            config = spec.config()
+            future = loop.run_in_executor(
+                collect_pool, self._collect, spec, config, token, progress, prepare
+            )
+            try:
+                outcome = await asyncio.wait_for(
+                    asyncio.shield(future), config.time_budget
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"{spec.source} 수집 시간 예산 초과 ({config.time_budget:g}초) - 취소"
+                )
+                token.cancel(f"시간 예산 초과 ({config.time_budget:g}초)")
+                # 취소 토큰 확인 지점 / HTTP 타임아웃 안에서 스레드 종료 대기
+                outcome = await future
+                if outcome["status"] == SOURCE_CANCELLED:
+                    outcome["status"] = SOURCE_TIMEOUT
+            finally:
+                unregister()
+                running.discard(spec.source)
+                update_stage()
+            results[spec.source] = outcome
+            if outcome["status"] == SOURCE_SUCCEEDED and ingest is not None:
+                await queue.put((spec.source, outcome.pop("data")))
+            else:
+                outcome.pop("data", None)
+
+        async def ingest_worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                source, data = item
+                outcome = results[source]
+                try:
+                    if parent is not None:
+                        parent.raise_if_cancelled()
+                    outcome["ingest"] = await loop.run_in_executor(
+                        ingest_pool, ingest, source, data
+                    )
+                except CollectionCancelled as e:
+                    outcome["status"] = SOURCE_CANCELLED
+                    outcome["error"] = str(e)
+                except Exception as e:
+                    logger.error(f"{source} 적재 실패: {e}")
+                    outcome["status"] = SOURCE_FAILED
+                    outcome["error"] = f"적재 실패: {e}"
+
+        update_stage()
+        consumer = asyncio.ensure_future(ingest_worker())
+        try:
+            await asyncio.gather(*(collect(spec) for spec in specs))
+        finally:
+            await queue.put(None)
+            await consumer
+            collect_pool.shutdown(wait=False)
+            ingest_pool.shutdown(wait=False)
+
+        wall = time.perf_counter() - started
+        total = sum(r.get("collected", 0) for r in results.values())
+        logger.info(
+            f"다중 소스 수집 완료: {total}개, {wall:.1f}초 "
+            f"(소스별 합계 {sum(r['duration_sec'] for r in results.values()):.1f}초) - "
+            + ", ".join(f"{s}={r['status']}" for s, r in results.items())
+        )
+
+        if parent is not None:
+            parent.raise_if_cancelled()
+        return {
+            "success": any(r["status"] == SOURCE_SUCCEEDED for r in results.values()),
+            "results": results,
+            "total_collected": total,
+            "wall_sec": round(wall, 3),
+        }
+
+    @staticmethod
+    def _collect(spec, config, token, progress, prepare) -> Dict[str, Any]:
+        """소스 1개 수집 (수집 스레드에서 실행)"""
+        from ..services.metrics import metrics
+
+        started = time.perf_counter()
+        outcome: Dict[str, Any] = {"status": SOURCE_FAILED, "collected": 0}
+        try:
+            try:
+                collector_class = spec.load()
+            except ImportError as e:
+                logger.warning(f"{spec.source} collector 모듈 import 실패: {e}")
+                outcome.update(status=SOURCE_UNAVAILABLE, error=str(e))
+                return outcome
+
+            collector = collector_class(config)
+            if progress is not None:
+                collector.set_progress(progress)
+            collector.set_cancel_token(token)
+            if prepare is not None:
+                prepare(spec.source, collector)
+
+            with metrics.time_collection(spec.source) as timing:
+                result = collector.collect_from_web()
+                if not result.get("success", False):
+                    timing["status"] = "failed"
+
+            if result.get("success", False):
+                data = result.get("data", [])
+                outcome.update(status=SOURCE_SUCCEEDED, collected=len(data), data=data)
+                logger.info(f"✅ {spec.source}: {len(data)}개 수집 완료")
+            else:
+                outcome["error"] = result.get("error", "Unknown error")
+                logger.error(f"❌ {spec.source} collection failed: {outcome['error']}")
+        except CollectionCancelled as e:
+            outcome.update(status=SOURCE_CANCELLED, error=str(e))
+        except Exception as e:
+            logger.error(f"{spec.source} collection error: {e}")
+            outcome["error"] = str(e)
+        finally:
+            outcome["duration_sec"] = round(time.perf_counter() - started, 3)
+        return outcome
+
+
+# 전역 수집 오케스트레이터 인스턴스
+collection_orchestrator = CollectionOrchestrator()
+collection_orchestrator.register("REGTECH", ".regtech_collector_core:RegtechCollector")
+# SECUDIUM 수집기 모듈은 아직 없음 (/secudium/trigger와 같이 있을 때만 사용)
+collection_orchestrator.register_if_available(
+    "SECUDIUM", ".secudium_collector:SecudiumCollector"
+)
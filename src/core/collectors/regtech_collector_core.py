@@ -4,7 +4,6 @@ REGTECH 컬렉터 메인 모듈
 전체 수집 프로세스 조정 및 메인 로직을 담당
 """
 
-import asyncio
 import logging
 import os
 from datetime import datetime, timedelta
@@ -12,6 +11,12 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+from ..utils.cancellation import (
+    CollectionCancelled,
+    cancel_on,
+    cancellable_async_sleep,
+    raise_if_cancelled,
+)
 from .regtech_collector_auth import RegtechCollectorAuth
 from .regtech_collector_data import RegtechCollectorData
 from .unified_collector import BaseCollector, CollectionConfig
@@ -63,6 +68,8 @@ class RegtechCollector(BaseCollector):
         self.data_module = RegtechCollectorData(
             self.base_url, self.auth_module, self.auth_module.validation_utils
         )
+        # 페이지 수집 시작 동시 요청 수 (COLLECTION_REGTECH_CONCURRENCY)
+        self.data_module.page_concurrency = config.concurrency
 
         logger.info("REGTECH collector initialized with modular components")
 
@@ -101,6 +108,16 @@ class RegtechCollector(BaseCollector):
         self.auth_module.set_cookie_string(cookie_string)
         logger.info("Cookie string updated through auth module")
 
+    def set_progress(self, progress):
+        """수집 진행 상황 보고 대상 설정 (데이터 모듈에 전달)"""
+        super().set_progress(progress)
+        self.data_module.progress = progress
+
+    def set_cancel_token(self, token):
+        """취소 토큰 설정 (데이터 모듈의 페이지 루프에 전달)"""
+        super().set_cancel_token(token)
+        self.data_module._cancel_event = token
+
     @property
     def source_type(self) -> str:
         return "REGTECH"
@@ -109,6 +126,8 @@ class RegtechCollector(BaseCollector):
         """
         메인 데이터 수집 메서드 - 자동 쿠키 관리 포함
         """
+        raise_if_cancelled(self.cancel_token)
+
         # 1. 쿠키가 없으면 자동 추출 시도
         if not self.auth_module.cookie_auth_mode:
             logger.info("🔄 No cookies available - attempting automatic extraction...")
@@ -125,6 +144,7 @@ class RegtechCollector(BaseCollector):
         # 2. 쿠키 기반 수집 시도
         if self.auth_module.cookie_auth_mode:
             collected_data = await self.data_module.collect_with_cookies()
+            raise_if_cancelled(self.cancel_token)
 
             # 3. 수집 결과가 없거나 쿠키 만료 의심 시 재추출 시도
             if not collected_data:
@@ -159,37 +179,44 @@ class RegtechCollector(BaseCollector):
                 session = self.auth_module.create_session()
                 self.current_session = session
 
-                # 로그인 시도
-                if not self.auth_module.robust_login(session):
-                    raise Exception("로그인 실패 후 재시도 한계 도달")
+                # 취소 시 세션의 연결 풀을 닫아 소켓 반환 (진행 중 요청은 request_timeout 내 종료)
+                with cancel_on(self.cancel_token, session.close):
+                    # 로그인 시도
+                    if not self.auth_module.robust_login(session):
+                        raise Exception("로그인 실패 후 재시도 한계 도달")
 
-                # 데이터 수집
-                start_date, end_date = self.data_module.data_transform.get_date_range(
-                    self.config
-                )
-                collected_ips = await self.data_module.robust_collect_ips(
-                    session, start_date, end_date
-                )
+                    # 데이터 수집
+                    start_date, end_date = (
+                        self.data_module.data_transform.get_date_range(self.config)
+                    )
+                    collected_ips = await self.data_module.robust_collect_ips(
+                        session, start_date, end_date
+                    )
+
+                # 취소된 수집의 부분 결과는 저장하지 않음
+                raise_if_cancelled(self.cancel_token)
 
                 # 성공적으로 수집 완료
                 logger.info(f"REGTECH 수집 완료: {len(collected_ips)}개 IP")
 
-                # 데이터베이스에 저장
-                if collected_ips:
-                    saved_count = self.save_to_database(collected_ips)
-                    logger.info(f"✅ PostgreSQL에 {saved_count}개 IP 저장 완료")
-                else:
+                # 데이터베이스 적재는 수집 작업(collection_api)에서 한 번만 수행
+                if not collected_ips:
                     logger.warning("⚠️ 저장할 IP 데이터가 없습니다")
 
                 break
 
+            except CollectionCancelled:
+                raise
+
             except requests.exceptions.ConnectionError as e:
                 session_retry_count += 1
                 logger.warning(
                     f"연결 오류 (재시도 {session_retry_count}/{self.session_retry_limit}): {e}"
                 )
                 if session_retry_count < self.session_retry_limit:
-                    await asyncio.sleep(5 * session_retry_count)  # 지수적 백오프
+                    await cancellable_async_sleep(
+                        self.cancel_token, 5 * session_retry_count
+                    )  # 지수적 백오프
 
             except requests.exceptions.Timeout as e:
                 session_retry_count += 1
@@ -197,13 +224,17 @@ class RegtechCollector(BaseCollector):
                     f"타임아웃 오류 (재시도 {session_retry_count}/{self.session_retry_limit}): {e}"
                 )
                 if session_retry_count < self.session_retry_limit:
-                    await asyncio.sleep(3 * session_retry_count)
+                    await cancellable_async_sleep(
+                        self.cancel_token, 3 * session_retry_count
+                    )
 
             except Exception as e:
                 logger.error(f"예상치 못한 오류: {e}")
                 session_retry_count += 1
                 if session_retry_count < self.session_retry_limit:
-                    await asyncio.sleep(2 * session_retry_count)
+                    await cancellable_async_sleep(
+                        self.cancel_token, 2 * session_retry_count
+                    )
 
             finally:
                 if hasattr(self, "current_session") and self.current_session:
@@ -215,101 +246,63 @@ class RegtechCollector(BaseCollector):
 
         return collected_ips
 
+    @staticmethod
+    def to_records(collected_ips: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """수집된 IP 데이터 → blacklist_ips 레코드 (REGTECH 단일 매핑)"""
+        # 위협 등급별 신뢰도 (blacklist_ips.confidence_level)
+        threat_confidence = {"HIGH": 9, "MEDIUM": 7, "LOW": 5}
+
+        records = []
+        for ip_data in collected_ips:
+            ip = ip_data.get("ip")
+            if not ip:
+                continue
+
+            # 데이터 준비
+            country = ip_data.get("country", "Unknown")
+            attack_type = ip_data.get("attack_type", "blacklist")
+            detection_date = ip_data.get("detection_date")
+            threat_level = str(ip_data.get("threat_level", "MEDIUM")).upper()
+
+            # 날짜 형식 변환
+            if isinstance(detection_date, str):
+                try:
+                    if len(detection_date) == 8:  # YYYYMMDD
+                        detection_date = datetime.strptime(detection_date, "%Y%m%d")
+                    else:  # YYYY-MM-DD
+                        detection_date = datetime.strptime(detection_date, "%Y-%m-%d")
+                except:
+                    detection_date = datetime.now()
+            elif not detection_date:
+                detection_date = datetime.now()
+
+            records.append(
+                {
+                    "ip_address": ip,
+                    "reason": f"REGTECH {attack_type} ({country})",
+                    "category": attack_type,
+                    "confidence_level": threat_confidence.get(threat_level, 6),
+                    "last_seen": detection_date,
+                }
+            )
+        return records
+
     def save_to_database(self, collected_ips: List[Dict[str, Any]]) -> int:
-        """수집된 IP 데이터를 PostgreSQL에 저장"""
+        """
+        수집된 IP 데이터를 blacklist_ips에 동기화 (수집 작업과 같은 COPY + 단일 병합 경로)
+        collect_from_web()은 적재하지 않으므로 직접 호출한 경우에만 사용한다.
+        수집 작업(collection_api)은 자체적으로 한 번 적재한다.
+        """
         if not collected_ips:
             logger.warning("저장할 IP 데이터가 없습니다")
             return 0
 
-        try:
-            import psycopg2
-            from datetime import datetime
-
-            # PostgreSQL 연결
-            conn = psycopg2.connect(
-                host="blacklist-postgres",
-                database="blacklist",
-                user="postgres",
-                password="postgres",
-            )
-            cur = conn.cursor()
-
-            # 기존 REGTECH 데이터 정리 (선택사항 - 중복 방지)
-            cur.execute("DELETE FROM blacklist_ips WHERE source = 'REGTECH'")
-            logger.info(f"기존 REGTECH 데이터 {cur.rowcount}개 정리")
-
-            # 새 데이터 일괄 삽입
-            saved_count = 0
-            batch_data = []
-
-            for ip_data in collected_ips:
-                ip = ip_data.get("ip")
-                if not ip:
-                    continue
-
-                # 데이터 준비
-                country = ip_data.get("country", "Unknown")
-                attack_type = ip_data.get("attack_type", "blacklist")
-                detection_date = ip_data.get("detection_date")
-                threat_level = ip_data.get("threat_level", "MEDIUM")
-
-                # 날짜 형식 변환
-                if isinstance(detection_date, str):
-                    try:
-                        if len(detection_date) == 8:  # YYYYMMDD
-                            detection_date = datetime.strptime(
-                                detection_date, "%Y%m%d"
-                            ).date()
-                        else:  # YYYY-MM-DD
-                            detection_date = datetime.strptime(
-                                detection_date, "%Y-%m-%d"
-                            ).date()
-                    except:
-                        detection_date = datetime.now().date()
-                elif not detection_date:
-                    detection_date = datetime.now().date()
-
-                batch_data.append(
-                    (
-                        ip,  # ip_address
-                        "REGTECH",  # source
-                        detection_date,  # detection_date
-                        threat_level,  # threat_level
-                        country,  # country
-                        attack_type,  # attack_type or reason
-                        datetime.now(),  # created_at
-                        datetime.now(),  # updated_at
-                    )
-                )
-
-            # 일괄 삽입
-            if batch_data:
-                cur.executemany(
-                    """
-                    INSERT INTO blacklist_ips 
-                    (ip_address, source, detection_date, threat_level, country, notes, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                    batch_data,
-                )
-
-                saved_count = cur.rowcount
-                conn.commit()
-
-                logger.info(f"✅ PostgreSQL에 {saved_count}개 IP 저장 완료")
+        from ..services.ingest import load_collected_records
 
-            conn.close()
-            return saved_count
-
-        except Exception as e:
-            logger.error(f"❌ 데이터베이스 저장 실패: {e}")
-            if "conn" in locals():
-                try:
-                    conn.rollback()
-                    conn.close()
-                except:
-                    pass
-            return 0
+        load = load_collected_records(
+            self.to_records(collected_ips), "REGTECH", reconcile=True
+        )
+        return load.staged
 
     def collect_from_web(
         self, start_date: str = None, end_date: str = None
@@ -341,6 +334,9 @@ class RegtechCollector(BaseCollector):
             finally:
                 loop.close()
 
+        except CollectionCancelled:
+            logger.info("REGTECH 웹 수집 취소됨")
+            raise
         except Exception as e:
             logger.error(f"REGTECH 웹 수집 실패: {e}")
             return {
@@ -4,17 +4,47 @@ REGTECH 데이터 수집 및 처리 모듈
 실제 데이터 수집, 페이지 처리, 검증 등의 기능을 담당
 """
 
+import os
+import time
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
 import requests
 
+from ..utils.cancellation import (
+    CollectionCancelled,
+    cancel_on,
+    raise_if_cancelled,
+)
 from .helpers.data_transform import RegtechDataTransform
+from .helpers.endpoint_history import EndpointHistory
+from .helpers.pagination import (
+    AIMDController,
+    PageCollectionIncomplete,
+    PagePipeline,
+)
+from .helpers.request_utils import ThreadLocalSessions
 from .regtech_data_processor import RegtechDataProcessor
 
 logger = logging.getLogger(__name__)
 
+# 실제 REGTECH 사이트 구조에 맞는 블랙리스트 페이지들 (탐색 기본 순서)
+BLACKLIST_URLS = [
+    "/board/11/boardList",  # 공지사항 게시판 (위협 정보 포함 가능)
+    "/fcti/securityAdvisory/advisoryList",  # 보안 권고 목록
+    "/fcti/securityAdvisory/blacklistDownload",  # 블랙리스트 다운로드
+    "/fcti/threat/threatList",  # 위협 정보 목록
+    "/fcti/threat/ipBlacklist",  # IP 블랙리스트
+    "/fcti/report/threatReport",  # 위협 리포트
+    "/board/boardList?menuCode=FCTI",  # FCTI 관련 게시판
+    "/threat/intelligence/ipList",  # 위협 인텔리전스 IP 목록
+]
+
+# 엔드포인트 탐색 이력 기본 경로 (작업 디렉토리 기준)
+DEFAULT_ENDPOINT_HISTORY = os.path.join("data", "regtech_endpoint_history.json")
+
 
 class RegtechCollectorData:
     """
@@ -26,8 +56,27 @@ class RegtechCollectorData:
         self.auth_module = auth_module
         self.validation_utils = validation_utils
         self.request_timeout = 30
-        self.page_delay = 1
+        # 페이지 수집 설정 (동시 요청 수 / 요청 간 지연은 AIMD로 조정되는 시작값)
+        self.page_concurrency = 1
+        self.max_page_concurrency = int(os.getenv("REGTECH_PAGE_MAX_CONCURRENCY", "8"))
+        self.page_delay = float(os.getenv("REGTECH_PAGE_DELAY", "0.1"))
+        self.page_latency_target = float(
+            os.getenv("REGTECH_PAGE_LATENCY_TARGET", "5")
+        )
         self.max_page_errors = 5
+        # 쿠키 수집 시 동시에 요청할 후보 경로 수
+        self.probe_concurrency = max(
+            1, int(os.getenv("REGTECH_PROBE_CONCURRENCY", "3"))
+        )
+        # 후보 경로별 탐색 이력 (성공한 경로 우선) - 재시작 후에도 유지되도록
+        # 영속 데이터 디렉토리에 저장 (컨테이너의 /app/data 볼륨, git 추적 제외)
+        self.endpoint_history = EndpointHistory(
+            os.getenv("REGTECH_ENDPOINT_HISTORY", DEFAULT_ENDPOINT_HISTORY)
+        )
+        # 수집 진행 상황 보고 대상 (collection_jobs.JobProgress)
+        self.progress = None
+        # 취소 토큰 (RegtechCollector.set_cancel_token에서 설정)
+        self._cancel_event = None
 
         # 데이터 처리 컴포넌트 초기화
         self.data_processor = RegtechDataProcessor()
@@ -39,7 +88,12 @@ class RegtechCollectorData:
         logger.info("REGTECH data collection module initialized")
 
     async def collect_with_cookies(self) -> List[Any]:
-        """쿠키 기반 데이터 수집"""
+        """
+        쿠키 기반 데이터 수집
+        후보 경로를 probe_concurrency 개씩 동시에 요청하고, 처음 도착한 고가치 응답
+        (Excel / JSON, IP 10개 초과 HTML)을 사용한 뒤 나머지 요청은 취소한다.
+        경로별 결과는 endpoint_history에 저장되어 다음 수집 때 성공한 경로부터 시도한다.
+        """
         collected_ips = []
 
         try:
@@ -51,78 +105,51 @@ class RegtechCollectorData:
 
             logger.info("Starting cookie-based data collection")
 
-            # 실제 REGTECH 사이트 구조에 맞는 블랙리스트 페이지들
-            blacklist_urls = [
-                "/board/11/boardList",  # 공지사항 게시판 (위협 정보 포함 가능)
-                "/fcti/securityAdvisory/advisoryList",  # 보안 권고 목록
-                "/fcti/securityAdvisory/blacklistDownload",  # 블랙리스트 다운로드
-                "/fcti/threat/threatList",  # 위협 정보 목록
-                "/fcti/threat/ipBlacklist",  # IP 블랙리스트
-                "/fcti/report/threatReport",  # 위협 리포트
-                "/board/boardList?menuCode=FCTI",  # FCTI 관련 게시판
-                "/threat/intelligence/ipList",  # 위협 인텔리전스 IP 목록
-            ]
-
-            for path in blacklist_urls:
-                try:
-                    url = f"{self.base_url}{path}"
-                    logger.info(f"Trying URL: {url}")
-
-                    response = session.get(
-                        url, verify=False, timeout=self.request_timeout
-                    )
-
-                    # 쿠키 만료 확인
-                    if self.auth_module.is_cookie_expired(response):
-                        logger.warning(
-                            f"Cookies expired at {url} - will trigger re-extraction"
+            # 이전 수집에서 성공한 경로부터 시도
+            paths = self.endpoint_history.order(BLACKLIST_URLS)
+            logger.info(
+                f"Probing {len(paths)} endpoints "
+                f"(concurrency={self.probe_concurrency}, first={paths[0]})"
+            )
+
+            loop = asyncio.get_running_loop()
+            executor = ThreadPoolExecutor(
+                max_workers=self.probe_concurrency, thread_name_prefix="regtech-probe"
+            )
+            # 탐색 스레드마다 인증 세션을 복사해 사용
+            sessions = ThreadLocalSessions(session)
+            pending = {
+                loop.run_in_executor(executor, self._probe, sessions, path): path
+                for path in paths
+            }
+            try:
+                # 취소 시 세션의 연결 풀을 닫아 소켓 반환
+                with cancel_on(self._cancel_event, sessions.close):
+                    while pending:
+                        done, _ = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
                         )
-                        return []  # 빈 결과 반환하여 상위에서 재추출 트리거
-
-                    if response.status_code == 200:
-                        content_type = response.headers.get("content-type", "").lower()
-
-                        # 데이터 프로세서로 위임
-                        if "excel" in content_type or "spreadsheet" in content_type:
-                            ips = await self.data_processor.process_excel_response(
-                                response
-                            )
-                            if ips:
-                                collected_ips.extend(ips)
-                                logger.info(
-                                    f"Collected {len(ips)} IPs from Excel download"
-                                )
-                                break
-
-                        elif "text/html" in content_type:
-                            ips = await self.data_processor.process_html_response(
-                                response
+                        stop = False
+                        for future in done:
+                            path = pending.pop(future)
+                            raise_if_cancelled(self._cancel_event)
+                            result, elapsed_ms = future.result()
+                            outcome = await self._handle_probe(
+                                path, result, elapsed_ms, collected_ips
                             )
-                            if ips:
-                                collected_ips.extend(ips)
-                                logger.info(f"Collected {len(ips)} IPs from HTML page")
-                                if len(ips) > 10:  # 충분한 데이터가 있으면 중단
-                                    break
-
-                        elif "application/json" in content_type:
-                            ips = await self.data_processor.process_json_response(
-                                response
-                            )
-                            if ips:
-                                collected_ips.extend(ips)
-                                logger.info(f"Collected {len(ips)} IPs from JSON API")
-                                break
-
-                    elif (
-                        response.status_code == 302
-                        and "login" in response.headers.get("Location", "")
-                    ):
-                        logger.warning("Redirected to login - cookies may be expired")
-                        break
-
-                except Exception as e:
-                    logger.error(f"Error accessing {path}: {e}")
-                    continue
+                            if outcome == "expired":
+                                # 빈 결과 반환하여 상위에서 재추출 트리거
+                                return []
+                            stop = stop or outcome == "stop"
+                        if stop:
+                            break
+            finally:
+                # 남은 요청 취소 (대기 중인 요청은 실행하지 않음)
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=False, cancel_futures=True)
+                sessions.close()
+                self.endpoint_history.save()
 
             # 수집된 데이터 검증 및 변환
             if collected_ips:
@@ -132,79 +159,182 @@ class RegtechCollectorData:
                 logger.info(
                     f"Validated {len(validated_ips)} out of {len(collected_ips)} collected IPs"
                 )
+                if self.progress is not None:
+                    self.progress.add_rows(len(validated_ips))
                 return validated_ips
             else:
                 logger.warning("No IPs collected - check cookies or access permissions")
                 return []
 
+        except CollectionCancelled:
+            raise
         except Exception as e:
             logger.error(f"Cookie-based collection failed: {e}")
             return []
 
+    def _probe(self, sessions: ThreadLocalSessions, path: str):
+        """후보 경로 1개 요청 (탐색 스레드에서 실행) → (응답 또는 예외, 소요 ms)"""
+        url = f"{self.base_url}{path}"
+        logger.info(f"Trying URL: {url}")
+        started = time.perf_counter()
+        try:
+            result = sessions.get().get(
+                url, verify=False, timeout=self.request_timeout
+            )
+        except Exception as e:
+            result = e
+        return result, (time.perf_counter() - started) * 1000
+
+    async def _handle_probe(
+        self, path: str, result, elapsed_ms: float, collected_ips: List[Any]
+    ) -> str:
+        """
+        탐색 응답 처리 → "expired" (쿠키 만료), "stop" (충분한 데이터 / 로그인 리다이렉트),
+        "continue" (다음 응답 대기)
+        """
+        if isinstance(result, Exception):
+            logger.error(f"Error accessing {path}: {result}")
+            self.endpoint_history.record(path, None, None, 0, elapsed_ms, str(result))
+            return "continue"
+
+        response = result
+        url = f"{self.base_url}{path}"
+        # 쿠키 만료 확인
+        if self.auth_module.is_cookie_expired(response):
+            logger.warning(f"Cookies expired at {url} - will trigger re-extraction")
+            self.endpoint_history.record(
+                path, response.status_code, None, 0, elapsed_ms, "cookie expired"
+            )
+            return "expired"
+
+        if self.progress is not None:
+            self.progress.page(nbytes=len(response.content))
+
+        if response.status_code == 302 and "login" in response.headers.get(
+            "Location", ""
+        ):
+            logger.warning("Redirected to login - cookies may be expired")
+            self.endpoint_history.record(
+                path, response.status_code, None, 0, elapsed_ms, "login redirect"
+            )
+            return "stop"
+
+        kind, ips = None, []
+        try:
+            if response.status_code == 200:
+                content_type = response.headers.get("content-type", "").lower()
+
+                # 데이터 프로세서로 위임
+                if "excel" in content_type or "spreadsheet" in content_type:
+                    kind = "excel"
+                    ips = await self.data_processor.process_excel_response(response)
+                elif "text/html" in content_type:
+                    kind = "html"
+                    ips = await self.data_processor.process_html_response(response)
+                elif "application/json" in content_type:
+                    kind = "json"
+                    ips = await self.data_processor.process_json_response(response)
+        except Exception as e:
+            logger.error(f"Error processing {path}: {e}")
+            self.endpoint_history.record(
+                path, response.status_code, kind, 0, elapsed_ms, str(e)
+            )
+            return "continue"
+
+        ips = ips or []
+        self.endpoint_history.record(
+            path, response.status_code, kind, len(ips), elapsed_ms
+        )
+        if not ips:
+            return "continue"
+
+        collected_ips.extend(ips)
+        logger.info(f"Collected {len(ips)} IPs from {kind.upper()} ({path})")
+        # Excel / JSON 또는 충분한 HTML 데이터가 있으면 나머지 탐색 중단
+        if kind in ("excel", "json") or len(ips) > 10:
+            return "stop"
+        return "continue"
+
     async def robust_collect_ips(
         self, session: requests.Session, start_date: str, end_date: str
     ) -> List[Dict[str, Any]]:
-        """강화된 IP 수집 로직"""
+        """
+        강화된 IP 수집 로직
+        페이지 요청을 여러 개 동시에 진행하고 (AIMD로 동시 요청 수 / 지연 조정),
+        파싱된 페이지는 도착 순서대로 큐를 통해 누적한다.
+        """
         all_ips = []
-        page = 0
-        consecutive_errors = 0
         max_pages = 100  # 안전장치
+        controller = AIMDController(
+            concurrency=self.page_concurrency,
+            max_concurrency=self.max_page_concurrency,
+            delay=self.page_delay,
+            latency_target=self.page_latency_target,
+        )
+
+        logger.info(
+            f"IP 수집 시작: {start_date} ~ {end_date} "
+            f"(동시 요청 {controller.concurrency}~{controller.max_concurrency})"
+        )
+
+        # 페이지 요청은 블로킹 HTTP 호출이므로 전용 스레드에서 실행
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=controller.max_concurrency, thread_name_prefix="regtech-page"
+        )
+        # requests.Session은 스레드 간 공유하지 않음 (페이지 스레드마다 복사)
+        sessions = ThreadLocalSessions(session)
+
+        def collect_page(page: int) -> List[Dict[str, Any]]:
+            return self._collect_page(sessions.get(), page, start_date, end_date)
+
+        async def fetch(page: int) -> List[Dict[str, Any]]:
+            page_ips = await loop.run_in_executor(executor, collect_page, page)
+            # IP 유효성 검사 적용
+            return [
+                ip_data
+                for ip_data in page_ips
+                if self.validation_utils.is_valid_ip(ip_data.get("ip", ""))
+            ]
 
-        logger.info(f"IP 수집 시작: {start_date} ~ {end_date}")
-
-        while page < max_pages and consecutive_errors < self.max_page_errors:
-            try:
-                # 취소 요청 확인
-                if self.validation_utils.should_cancel(
-                    getattr(self, "_cancel_event", None)
-                ):
-                    logger.info("사용자 취소 요청으로 수집 중단")
-                    break
-
-                # 페이지 지연
-                if page > 0:
-                    await asyncio.sleep(self.page_delay)
-
-                # 페이지 데이터 수집
-                page_ips = await self.auth_module.request_utils.collect_single_page(
-                    session, page, start_date, end_date
-                )
-
-                # IP 유효성 검사 적용
-                valid_page_ips = []
-                for ip_data in page_ips:
-                    if self.validation_utils.is_valid_ip(ip_data.get("ip", "")):
-                        valid_page_ips.append(ip_data)
-                page_ips = valid_page_ips
-
-                if not page_ips:
-                    logger.info(f"페이지 {page + 1}에서 더 이상 데이터 없음, 수집 종료")
-                    break
-
+        pipeline = PagePipeline(
+            fetch,
+            controller,
+            max_pages=max_pages,
+            max_errors=self.max_page_errors,
+            cancel_token=self._cancel_event,
+        )
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                page, page_ips = item
                 all_ips.extend(page_ips)
-                consecutive_errors = 0  # 성공 시 에러 카운트 리셋
-
-                logger.info(f"페이지 {page + 1}: {len(page_ips)}개 수집 (총 {len(all_ips)}개)")
-                page += 1
-
-            except requests.exceptions.RequestException as e:
-                consecutive_errors += 1
-                logger.warning(
-                    f"페이지 {page + 1} 수집 실패 (연속 에러: {consecutive_errors}/{self.max_page_errors}): {e}"
+                if self.progress is not None:
+                    self.progress.page(rows=len(page_ips))
+                logger.info(
+                    f"페이지 {page + 1}: {len(page_ips)}개 수집 (총 {len(all_ips)}개)"
                 )
 
-                if consecutive_errors < self.max_page_errors:
-                    await asyncio.sleep(2 * consecutive_errors)  # 점진적 지연
-
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"페이지 {page + 1} 처리 중 예상치 못한 오류: {e}")
-
-                if consecutive_errors < self.max_page_errors:
-                    await asyncio.sleep(1)
-
-        if consecutive_errors >= self.max_page_errors:
-            logger.error(f"연속 페이지 에러 한계 도달 ({self.max_page_errors})")
+        started = time.perf_counter()
+        try:
+            with cancel_on(self._cancel_event, sessions.close):
+                stats, _ = await asyncio.gather(pipeline.run(queue), consume())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            sessions.close()
+        logger.info(
+            f"페이지 수집 완료: {stats['pages']}페이지, "
+            f"{time.perf_counter() - started:.1f}초 (최대 동시 요청 "
+            f"{stats['peak_concurrency']}, 에러 {stats['errors']}, "
+            f"429 {stats['throttled']})"
+        )
+        # 중간 페이지가 빠진 결과는 적재하지 않음 (REGTECH 적재는 누락 IP를 비활성화)
+        if stats["failed_pages"]:
+            raise PageCollectionIncomplete(stats["failed_pages"])
 
         # 중복 제거
         unique_ips = self.data_processor.remove_duplicates(all_ips)
@@ -212,6 +342,14 @@ class RegtechCollectorData:
 
         return unique_ips
 
+    def _collect_page(
+        self, session: requests.Session, page: int, start_date: str, end_date: str
+    ) -> List[Dict[str, Any]]:
+        """페이지 1개 조회 (페이지 스레드에서 실행)"""
+        return self.auth_module.request_utils.collect_single_page(
+            session, page, start_date, end_date
+        )
+
     def transform_data(self, raw_data: dict) -> dict:
         """데이터 변환 - 헬퍼 모듈 위임"""
         return self.data_transform.transform_data(raw_data)
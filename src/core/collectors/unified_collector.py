@@ -20,6 +20,8 @@ class CollectionConfig:
         self.max_retries = 3
         self.timeout = 30
         self.batch_size = 100
+        self.concurrency = 1  # 소스별 동시 요청 수
+        self.time_budget = 600  # 소스별 전체 수집 시간 예산 (초)
 
     def get_date_range(self, days: int = None) -> tuple:
         """날짜 범위 반환"""
@@ -39,6 +41,10 @@ class BaseCollector(ABC):
         self.source_name = source_name
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{source_name}")
+        # 수집 진행 상황 보고 대상 (collection_jobs.JobProgress, 없으면 None)
+        self.progress = None
+        # 취소 토큰 (utils.cancellation.CancelToken, 없으면 취소 불가)
+        self.cancel_token = None
 
     @abstractmethod
     async def _collect_data(self) -> List[Any]:
@@ -51,6 +57,14 @@ class BaseCollector(ABC):
         """소스 타입 반환"""
         pass
 
+    def set_progress(self, progress):
+        """수집 진행 상황 보고 대상 설정 (페이지/행/바이트)"""
+        self.progress = progress
+
+    def set_cancel_token(self, token):
+        """취소 토큰 설정 (페이지 루프 / HTTP 세션 / DB 적재에서 확인)"""
+        self.cancel_token = token
+
     def validate_config(self) -> bool:
         """설정 검증"""
         return self.config.enabled
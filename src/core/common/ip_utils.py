@@ -5,6 +5,8 @@ IP 유틸리티 모듈
 
 import ipaddress
 import logging
+from collections import defaultdict
+from typing import Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -48,3 +50,69 @@ class IPUtils:
                 return "public"
         except ValueError:
             return "invalid"
+
+    @staticmethod
+    def aggregate_cidrs(
+        ips: Iterable[str],
+        min_density: Optional[float] = None,
+        min_prefixlen_v4: int = 16,
+        min_prefixlen_v6: int = 48,
+    ) -> List[str]:
+        """
+        IP 목록을 최소 CIDR 목록으로 집약
+        - min_density 미지정: 무손실 집약 (정확히 같은 주소 집합)
+        - min_density 지정: 상위 네트워크 내 실제 등록 주소 비율이 min_density 이상이면
+          상위 네트워크로 확장 (손실 집약, min_prefixlen 보다 넓게는 확장하지 않음)
+        단일 호스트는 프리픽스 없이 IP 문자열로 반환
+        """
+        v4, v6 = [], []
+        for ip in ips:
+            try:
+                network = ipaddress.ip_network(str(ip).strip(), strict=False)
+            except ValueError:
+                continue
+            (v4 if network.version == 4 else v6).append(network)
+
+        result = []
+        for networks, min_prefixlen in ((v4, min_prefixlen_v4), (v6, min_prefixlen_v6)):
+            if not networks:
+                continue
+            collapsed = list(ipaddress.collapse_addresses(networks))
+            if min_density is not None and min_density < 1:
+                collapsed = IPUtils._supernet_by_density(
+                    collapsed, min_density, min_prefixlen
+                )
+            for network in collapsed:
+                if network.prefixlen == network.max_prefixlen:
+                    result.append(str(network.network_address))
+                else:
+                    result.append(str(network))
+        return result
+
+    @staticmethod
+    def _supernet_by_density(networks, min_density: float, min_prefixlen: int):
+        """밀도 기준 손실 상위 네트워크 확장 (서로 겹치지 않는 네트워크 입력)"""
+        # (네트워크, 실제 등록 주소 수) - 확장으로 늘어난 주소는 밀도 계산에서 제외
+        entries = [(network, network.num_addresses) for network in networks]
+        max_prefixlen = networks[0].max_prefixlen
+
+        for prefixlen in range(max_prefixlen - 1, min_prefixlen - 1, -1):
+            groups = defaultdict(list)
+            merged = []
+            for network, real_count in entries:
+                if network.prefixlen > prefixlen:
+                    groups[network.supernet(new_prefix=prefixlen)].append(
+                        (network, real_count)
+                    )
+                else:
+                    merged.append((network, real_count))
+
+            for supernet, members in groups.items():
+                real_count = sum(count for _, count in members)
+                if len(members) > 1 and real_count / supernet.num_addresses >= min_density:
+                    merged.append((supernet, real_count))
+                else:
+                    merged.extend(members)
+            entries = merged
+
+        return list(ipaddress.collapse_addresses(network for network, _ in entries))
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+비동기 DB 접근 경로 - 프로세스당 하나의 장기 실행 이벤트 루프 + 비동기 커넥션 풀
+- 기본: 동기 커넥션 풀(psycopg2)을 스레드 실행기로 감싸 비동기 인터페이스 제공
+- 선택: DB_ASYNC_BACKEND=psycopg + psycopg 3 설치 시 네이티브 비동기 I/O
+  (psycopg[binary,pool]은 requirements에 포함하지 않는 선택 의존성)
+동기 라우트는 run_async()로 공유 루프에 코루틴을 제출하므로 요청마다 루프를 만들지 않는다.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from psycopg2 import errors as psycopg2_errors
+from psycopg2.extras import RealDictCursor
+
+from src.core.database.connection_pool import db_pool, request_threads
+from src.core.database.query_stats import query_stats
+
+try:
+    from psycopg import errors as psycopg_errors
+    from psycopg.conninfo import make_conninfo
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    PSYCOPG3_AVAILABLE = True
+except ImportError:
+    PSYCOPG3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncLoopRunner:
+    """
+    데몬 스레드에서 실행되는 프로세스 공용 이벤트 루프
+    - fork 후 첫 사용 시 자식 프로세스에서 새 루프 시작 (gunicorn preload)
+    - 여러 요청 스레드가 제출한 코루틴이 같은 루프에서 I/O를 겹쳐 실행
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = (
+            timeout
+            if timeout is not None
+            else float(os.getenv("DB_ASYNC_TIMEOUT", "30"))
+        )
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def _alive(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, name="async-db-loop", daemon=True)
+        thread.start()
+        ready.wait()
+        self._loop, self._thread, self._pid = loop, thread, os.getpid()
+        logger.info(f"프로세스 {self._pid} 비동기 이벤트 루프 시작")
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """공유 이벤트 루프 (필요 시 시작)"""
+        if not self._alive():
+            with self._lock:
+                if not self._alive():
+                    self._start()
+        return self._loop
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """코루틴을 공유 루프에서 실행하고 결과 대기 (동기 호출부용)"""
+        loop = self.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("이벤트 루프 스레드에서는 run() 대신 await 사용")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout if timeout is not None else self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+
+class AsyncDatabase:
+    """
+    비동기 쿼리 인터페이스 (행은 dict로 반환)
+    - backend "thread" (기본): 동기 커넥션 풀 + 스레드 실행기
+    - backend "psycopg": AsyncConnectionPool (DB_ASYNC_BACKEND=psycopg, psycopg 3 설치 시,
+      DB_ASYNC_POOL_MIN / DB_ASYNC_POOL_MAX, 기본 max는 요청 스레드 수)
+    """
+
+    def __init__(self):
+        self.min_size = int(os.getenv("DB_ASYNC_POOL_MIN", "1"))
+        # 요청 스레드마다 동시에 대기하는 비동기 쿼리는 1개
+        self.max_size = int(os.getenv("DB_ASYNC_POOL_MAX") or request_threads())
+        requested = os.getenv("DB_ASYNC_BACKEND", "thread").lower()
+        if requested == "psycopg" and not PSYCOPG3_AVAILABLE:
+            logger.warning("DB_ASYNC_BACKEND=psycopg 이지만 psycopg 3 미설치 - thread 사용")
+        self.backend = (
+            "psycopg" if PSYCOPG3_AVAILABLE and requested == "psycopg" else "thread"
+        )
+        # 집계 테이블 미존재 등 호출부에서 구분할 예외 (백엔드별 클래스)
+        self.UndefinedTable = (
+            psycopg_errors.UndefinedTable
+            if self.backend == "psycopg"
+            else psycopg2_errors.UndefinedTable
+        )
+        self._pid: Optional[int] = None
+        self._pool = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _check_pid(self):
+        """fork 후 첫 사용 시 부모의 풀/실행기를 버리고 새로 생성"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._pool = None
+            self._pool_lock = None
+            self._executor = None
+
+    def _conninfo(self) -> str:
+        """동기 풀과 같은 연결 파라미터, 마지막 성공 호스트를 우선하는 다중 호스트"""
+        params = db_pool.connection_params
+        hosts = []
+        for host in (
+            db_pool._discovery.winner,
+            params["host"],
+            "blacklist-postgres",
+            "postgres",
+            "localhost",
+        ):
+            if host and host not in hosts:
+                hosts.append(host)
+
+        return make_conninfo(
+            host=",".join(hosts),
+            port=str(params["port"]),
+            dbname=params["database"],
+            user=params["user"],
+            password=params["password"],
+            connect_timeout=3,
+        )
+
+    async def _get_pool(self):
+        self._check_pid()
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    pool = AsyncConnectionPool(
+                        self._conninfo(),
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        kwargs={"row_factory": dict_row},
+                        timeout=db_pool.checkout_timeout,
+                        max_lifetime=db_pool.max_lifetime,
+                        max_idle=db_pool.idle_timeout,
+                        open=False,
+                    )
+                    await pool.open()
+                    self._pool = pool
+        return self._pool
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        self._check_pid()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=db_pool.maxconn, thread_name_prefix="async-db"
+            )
+        return self._executor
+
+    @staticmethod
+    def _fetchall_sync(sql: str, params: Any) -> List[Dict[str, Any]]:
+        conn = db_pool.getconn(cursor_factory=RealDictCursor)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = [dict(row) for row in cursor.fetchall()]
+            cursor.close()
+            return rows
+        finally:
+            conn.close()
+
+    async def run_blocking(self, func: Callable[..., T], *args: Any) -> T:
+        """블로킹 함수를 실행기 스레드에서 실행 (루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def fetchall(self, sql: str, params: Any = None) -> List[Dict[str, Any]]:
+        """쿼리 실행 후 전체 행 반환"""
+        if self.backend == "thread":
+            return await self.run_blocking(self._fetchall_sync, sql, params)
+
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
+            started = time.perf_counter()
+            rows: List[Dict[str, Any]] = []
+            error = None
+            try:
+                cursor = await conn.execute(sql, params)
+                rows = await cursor.fetchall()
+                return rows
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                # 동기 경로(계측 커서)와 같은 쿼리 통계에 기록
+                if query_stats.enabled:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    key = query_stats.record(sql, elapsed_ms, len(rows), error)
+                    if error is None and query_stats.is_slow(elapsed_ms):
+                        logger.warning(
+                            f"느린 쿼리 {elapsed_ms:.1f}ms (rows={len(rows)}): "
+                            f"{key[:500]}"
+                        )
+
+    async def fetchone(self, sql: str, params: Any = None) -> Optional[Dict[str, Any]]:
+        """쿼리 실행 후 첫 행 반환 (없으면 None)"""
+        rows = await self.fetchall(sql, params)
+        return rows[0] if rows else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """비동기 경로 상태 정보"""
+        stats: Dict[str, Any] = {"backend": self.backend, "pid": self._pid}
+        if self._pool is not None:
+            stats["pool"] = self._pool.get_stats()
+        return stats
+
+
+# 전역 비동기 루프 / DB 인스턴스
+async_runner = AsyncLoopRunner()
+async_db = AsyncDatabase()
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """동기 라우트에서 코루틴 실행 (asyncio.run 대체, 공유 루프 사용)"""
+    return async_runner.run(coro, timeout)
+
+
+def connections_per_worker() -> int:
+    """워커 프로세스 1개가 열 수 있는 최대 PostgreSQL 연결 수 (동기 풀 + 비동기 풀)"""
+    async_max = async_db.max_size if async_db.backend == "psycopg" else 0
+    return db_pool.maxconn + async_max
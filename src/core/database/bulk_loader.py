@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+블랙리스트 대량 적재 - COPY FROM STDIN + 단일 set 기반 upsert
+수집기 출력을 검증하여 UNLOGGED 스테이징 테이블로 스트리밍한 뒤 blacklist_ips에 병합
+- load(): 수집 목록 upsert (누적, 바뀐 행만 갱신)
+- reconcile(): 소스 단위 차집합 반영 (신규/변경 upsert + 빠진 IP 비활성화)
+"""
+import io
+import csv
+import time
+import logging
+import ipaddress
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 스테이징 컬럼 (COPY 순서)
+STAGING_COLUMNS = (
+    "ip_address",
+    "reason",
+    "source",
+    "category",
+    "confidence_level",
+    "last_seen",
+)
+
+# 적재 방식 로그 표기
+_MODE_NAMES = {"load": "대량 적재", "reconcile": "동기화"}
+
+
+@dataclass
+class BulkLoadResult:
+    """대량 적재 결과"""
+
+    source: str
+    received: int = 0
+    staged: int = 0
+    rejected: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    elapsed: float = 0.0
+    # 적재된 IP 중 적재 전 비활성/미존재였던 IP (변경 이력용)
+    newly_active: Set[str] = field(default_factory=set)
+    # reconcile()에서 수집 목록에 없어 비활성화된 IP
+    deactivated: Set[str] = field(default_factory=set)
+    # 적재된 전체 IP (정규화된 문자열)
+    ips: Set[str] = field(default_factory=set)
+
+    @property
+    def merged(self) -> int:
+        return self.inserted + self.updated
+
+    @property
+    def changed(self) -> int:
+        """실제로 쓰기가 발생한 행 수"""
+        return self.inserted + self.updated + len(self.deactivated)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.staged / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "received": self.received,
+            "staged": self.staged,
+            "rejected": self.rejected,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "deactivated": len(self.deactivated),
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
+
+
+class _CopyStream(io.TextIOBase):
+    """레코드 이터레이터를 COPY용 CSV 텍스트로 지연 변환하는 파일 객체"""
+
+    def __init__(self, rows: Iterator[List[Any]]):
+        self._rows = rows
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            batch = 0
+            for row in self._rows:
+                self._writer.writerow(row)
+                batch += 1
+                if batch >= 1000:
+                    break
+            if not batch:
+                break
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+        if size < 0:
+            data, self._pending = self._pending, ""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+class BlacklistBulkLoader:
+    """
+    수집기 공용 대량 적재기
+    - load(): 호출자 트랜잭션 안에서 스테이징 COPY → 병합 (커밋은 호출자)
+    - 스테이징 테이블은 TRUNCATE 잠금으로 적재 간 직렬화
+    """
+
+    SCHEMA_SQL = """
+        CREATE UNLOGGED TABLE IF NOT EXISTS blacklist_ips_staging (
+            ip_address INET NOT NULL,
+            reason TEXT,
+            source VARCHAR(100),
+            category VARCHAR(50),
+            confidence_level INTEGER,
+            last_seen TIMESTAMP
+        )
+    """
+
+    # RECONCILE_SQL과 같이 내용이 같은 행은 건드리지 않음 → 변경 없는 적재는 데이터 버전 유지
+    # detection_count는 새 탐지(재활성화 또는 더 최근 last_seen)일 때만 목록 내 건수만큼 증가
+    MERGE_SQL = """
+        INSERT INTO blacklist_ips
+            (ip_address, reason, source, category, confidence_level,
+             is_active, last_seen, detection_count)
+        SELECT ip_address, reason, source, category, confidence_level,
+               true, last_seen, hits
+        FROM (
+            SELECT DISTINCT ON (ip_address) *,
+                   COUNT(*) OVER (PARTITION BY ip_address) AS hits
+            FROM blacklist_ips_staging
+            ORDER BY ip_address, last_seen DESC NULLS LAST
+        ) staged
+        ON CONFLICT (ip_address) DO UPDATE
+        SET source = EXCLUDED.source,
+            last_seen = GREATEST(blacklist_ips.last_seen, EXCLUDED.last_seen),
+            confidence_level = EXCLUDED.confidence_level,
+            is_active = true,
+            detection_count = blacklist_ips.detection_count + CASE
+                WHEN NOT blacklist_ips.is_active
+                  OR EXCLUDED.last_seen > blacklist_ips.last_seen
+                THEN EXCLUDED.detection_count
+                ELSE 0 END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE NOT blacklist_ips.is_active
+           OR blacklist_ips.source IS DISTINCT FROM EXCLUDED.source
+           OR blacklist_ips.confidence_level IS DISTINCT FROM EXCLUDED.confidence_level
+           OR EXCLUDED.last_seen > COALESCE(blacklist_ips.last_seen, '-infinity')
+        RETURNING (xmax = 0) AS inserted
+    """
+
+    # 내용이 같은 행은 건드리지 않음 (WHERE 절) - 쓰기량이 목록 크기가 아닌 변경량에 비례
+    # source도 갱신 → 마지막으로 목록에 포함한 소스가 행을 소유 (DEACTIVATE_SQL 대상)
+    RECONCILE_SQL = """
+        INSERT INTO blacklist_ips
+            (ip_address, reason, source, category, confidence_level,
+             is_active, last_seen, detection_count)
+        SELECT ip_address, reason, source, category, confidence_level,
+               true, last_seen, 1
+        FROM (
+            SELECT DISTINCT ON (ip_address) *
+            FROM blacklist_ips_staging
+            ORDER BY ip_address, last_seen DESC NULLS LAST
+        ) staged
+        ON CONFLICT (ip_address) DO UPDATE
+        SET source = EXCLUDED.source,
+            reason = EXCLUDED.reason,
+            category = EXCLUDED.category,
+            confidence_level = EXCLUDED.confidence_level,
+            is_active = true,
+            last_seen = GREATEST(blacklist_ips.last_seen, EXCLUDED.last_seen),
+            detection_count = blacklist_ips.detection_count + CASE
+                WHEN NOT blacklist_ips.is_active
+                  OR EXCLUDED.last_seen > blacklist_ips.last_seen THEN 1
+                ELSE 0 END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE NOT blacklist_ips.is_active
+           OR blacklist_ips.source IS DISTINCT FROM EXCLUDED.source
+           OR blacklist_ips.reason IS DISTINCT FROM EXCLUDED.reason
+           OR blacklist_ips.category IS DISTINCT FROM EXCLUDED.category
+           OR blacklist_ips.confidence_level IS DISTINCT FROM EXCLUDED.confidence_level
+           OR EXCLUDED.last_seen > COALESCE(blacklist_ips.last_seen, '-infinity')
+        RETURNING (xmax = 0) AS inserted
+    """
+
+    DEACTIVATE_SQL = """
+        UPDATE blacklist_ips b
+        SET is_active = false, updated_at = CURRENT_TIMESTAMP
+        WHERE b.source = %s
+          AND b.is_active
+          AND NOT EXISTS (
+              SELECT 1 FROM blacklist_ips_staging s
+              WHERE s.ip_address = b.ip_address
+          )
+        RETURNING abbrev(b.ip_address) AS ip
+    """
+
+    def __init__(self):
+        self._schema_ready = False
+
+    def ensure_schema(self, cursor):
+        """스테이징 테이블 생성 (프로세스당 1회)"""
+        if not self._schema_ready:
+            cursor.execute(self.SCHEMA_SQL)
+            self._schema_ready = True
+
+    @staticmethod
+    def normalize_ip(value: Any) -> Optional[str]:
+        """IP/CIDR 정규화 (단일 호스트는 접두사 없이), 잘못된 값은 None"""
+        try:
+            network = ipaddress.ip_network(str(value).strip(), strict=False)
+        except ValueError:
+            return None
+        if network.num_addresses == 1:
+            return str(network.network_address)
+        return str(network)
+
+    def _rows(
+        self, records: Iterable[Dict[str, Any]], source: str, result: BulkLoadResult
+    ) -> Iterator[List[Any]]:
+        now = datetime.now()
+        for record in records:
+            result.received += 1
+            ip = self.normalize_ip(record.get("ip_address") or record.get("ip") or "")
+            if ip is None:
+                result.rejected += 1
+                continue
+
+            confidence = record.get("confidence_level")
+            try:
+                confidence = int(confidence) if confidence is not None else None
+            except (TypeError, ValueError):
+                confidence = None
+
+            result.staged += 1
+            result.ips.add(ip)
+            yield [
+                ip,
+                record.get("reason"),
+                (record.get("source") or source)[:100],
+                (record.get("category") or "unknown")[:50],
+                confidence,
+                record.get("last_seen") or now,
+            ]
+
+    @staticmethod
+    def _column(row, name: str, index: int = 0) -> Any:
+        return row[name] if isinstance(row, dict) else row[index]
+
+    def _stage(
+        self, cursor, records: Iterable[Dict[str, Any]], source: str
+    ) -> BulkLoadResult:
+        """검증된 레코드를 스테이징 테이블로 COPY 하고 적재 전 활성 상태 확인"""
+        self.ensure_schema(cursor)
+        result = BulkLoadResult(source=source)
+
+        # TRUNCATE의 배타 잠금이 커밋까지 유지되어 동시 적재를 직렬화
+        cursor.execute("TRUNCATE blacklist_ips_staging")
+        cursor.copy_expert(
+            f"COPY blacklist_ips_staging ({', '.join(STAGING_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            _CopyStream(self._rows(records, source, result)),
+        )
+
+        cursor.execute(
+            """
+            SELECT DISTINCT abbrev(b.ip_address) AS ip
+            FROM blacklist_ips b
+            JOIN blacklist_ips_staging s ON s.ip_address = b.ip_address
+            WHERE b.is_active
+        """
+        )
+        previously_active = {self._column(row, "ip") for row in cursor.fetchall()}
+        result.newly_active = {ip for ip in result.ips if ip not in previously_active}
+        return result
+
+    def _merge(self, cursor, sql: str, result: BulkLoadResult):
+        cursor.execute(sql)
+        for row in cursor.fetchall():
+            if self._column(row, "inserted"):
+                result.inserted += 1
+            else:
+                result.updated += 1
+        result.unchanged = len(result.ips) - result.merged
+
+    def _finish(self, cursor, result: BulkLoadResult, started: float, mode: str):
+        cursor.execute("TRUNCATE blacklist_ips_staging")
+        result.elapsed = time.perf_counter() - started
+
+        from src.core.services.metrics import metrics
+
+        labels = {"source": result.source, "mode": mode}
+        metrics.observe("blacklist_ingest_duration_seconds", labels, result.elapsed)
+        for outcome, count in (
+            ("inserted", result.inserted),
+            ("updated", result.updated),
+            ("unchanged", result.unchanged),
+            ("deactivated", len(result.deactivated)),
+            ("rejected", result.rejected),
+        ):
+            if count:
+                metrics.inc(
+                    "blacklist_ingest_rows_total",
+                    {"source": result.source, "result": outcome},
+                    count,
+                )
+
+        logger.info(
+            f"{result.source} {_MODE_NAMES[mode]}: {result.staged}/{result.received}개 "
+            f"(신규 {result.inserted}, 갱신 {result.updated}, 유지 {result.unchanged}, "
+            f"비활성화 {len(result.deactivated)}, 거부 {result.rejected}) "
+            f"{result.elapsed:.2f}초, {result.rows_per_sec:,.0f} rows/s"
+        )
+
+    def load(
+        self, cursor, records: Iterable[Dict[str, Any]], source: str
+    ) -> BulkLoadResult:
+        """
+        레코드 대량 적재 (호출자 트랜잭션 안에서 실행)
+        records: ip_address(또는 ip), reason, category, confidence_level, last_seen
+        """
+        started = time.perf_counter()
+        result = self._stage(cursor, records, source)
+        self._merge(cursor, self.MERGE_SQL, result)
+        self._finish(cursor, result, started, "load")
+        return result
+
+    def reconcile(
+        self,
+        cursor,
+        records: Iterable[Dict[str, Any]],
+        source: str,
+        allow_empty: bool = False,
+    ) -> BulkLoadResult:
+        """
+        소스 목록 동기화 (호출자 트랜잭션 안에서 실행, 커밋 시 한 번에 반영)
+        - 신규 IP 삽입, 내용이 바뀐 IP만 갱신, 목록에서 빠진 소스 IP는 비활성화
+        - detection_count는 재활성화 또는 last_seen이 앞설 때만 증가
+        - 빈 목록은 수집 실패로 보고 비활성화하지 않음 (allow_empty=True로 허용)
+        """
+        started = time.perf_counter()
+        result = self._stage(cursor, records, source)
+        self._merge(cursor, self.RECONCILE_SQL, result)
+
+        if result.staged or allow_empty:
+            cursor.execute(self.DEACTIVATE_SQL, (source,))
+            result.deactivated = {
+                self._column(row, "ip") for row in cursor.fetchall()
+            }
+        else:
+            logger.warning(f"{source} 수집 목록이 비어 있어 비활성화를 건너뜀")
+
+        self._finish(cursor, result, started, "reconcile")
+        return result
+
+
+# 전역 대량 적재기 인스턴스
+bulk_loader = BlacklistBulkLoader()
@@ -8,6 +8,8 @@ from typing import Optional, Dict, Any
 import logging
 from urllib.parse import urlparse
 
+from src.core.database.smart_connection_manager import HostDiscovery
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +18,7 @@ class PostgreSQLConnectionManager:
 
     def __init__(self):
         self.connection_params = self._get_connection_params()
+        self._discovery = HostDiscovery()
 
     def _get_connection_params(self) -> Dict[str, Any]:
         """환경변수에서 PostgreSQL 연결 파라미터 추출"""
@@ -44,8 +47,19 @@ class PostgreSQLConnectionManager:
             "password": os.getenv("POSTGRES_PASSWORD", ""),
         }
 
+    def _connect_host(self, host: str) -> psycopg2.extensions.connection:
+        logger.info(f"PostgreSQL 연결 시도: {host}:{self.connection_params['port']}")
+        return psycopg2.connect(
+            host=host,
+            port=self.connection_params["port"],
+            database=self.connection_params["database"],
+            user=self.connection_params["user"],
+            password=self.connection_params["password"],
+            connect_timeout=5,  # 5초 타임아웃
+        )
+
     def get_connection(self) -> Optional[psycopg2.extensions.connection]:
-        """PostgreSQL 연결 시도 (fallback 포함)"""
+        """PostgreSQL 연결 시도 (후보 호스트 병렬 탐색)"""
         hosts_to_try = [
             self.connection_params["host"],
             "blacklist-postgres",  # Docker 컨테이너명
@@ -53,31 +67,18 @@ class PostgreSQLConnectionManager:
             "localhost",  # 로컬 fallback
         ]
 
-        for host in hosts_to_try:
-            try:
-                params = self.connection_params.copy()
-                params["host"] = host
-
-                logger.info(f"PostgreSQL 연결 시도: {host}:{params['port']}")
-
-                conn = psycopg2.connect(
-                    host=params["host"],
-                    port=params["port"],
-                    database=params["database"],
-                    user=params["user"],
-                    password=params["password"],
-                    connect_timeout=5,  # 5초 타임아웃
-                )
-
-                logger.info(f"PostgreSQL 연결 성공: {host}")
-                return conn
-
-            except Exception as e:
-                logger.warning(f"PostgreSQL 연결 실패 ({host}): {e}")
-                continue
-
-        logger.error("모든 PostgreSQL 호스트 연결 실패")
-        return None
+        result = self._discovery.connect(
+            hosts_to_try,
+            self._connect_host,
+            lambda e, host: logger.warning(f"PostgreSQL 연결 실패 ({host}): {e}"),
+        )
+        if result is None:
+            logger.error("모든 PostgreSQL 호스트 연결 실패")
+            return None
+
+        conn, host = result
+        logger.info(f"PostgreSQL 연결 성공: {host}")
+        return conn
 
     def get_stats_with_fallback(self) -> Dict[str, Any]:
         """PostgreSQL 통계 조회 (fallback 포함)"""
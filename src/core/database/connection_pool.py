@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL 커넥션 풀 - 프로세스별 스레드 안전 풀
+요청 경로에서 TCP 연결/인증 핸드셰이크를 제거하기 위해 모든 DB 접근이 공유
+"""
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+from src.core.database.query_stats import instrumented_cursor_factory
+from src.core.database.smart_connection_manager import SmartConnectionManager
+
+logger = logging.getLogger(__name__)
+
+
+def request_threads() -> int:
+    """
+    워커 프로세스당 동시 요청 스레드 수 (gunicorn.conf.py와 같은 설정)
+    sync 워커는 1, GUNICORN_WORKER_CLASS=gthread일 때만 GUNICORN_THREADS
+    """
+    if os.getenv("GUNICORN_WORKER_CLASS", "sync") != "gthread":
+        return 1
+    return max(1, int(os.getenv("GUNICORN_THREADS", "4")))
+
+
+def default_pool_max() -> int:
+    """
+    동기 풀 기본 최대 크기 (DB_POOL_MAX 미설정 시)
+    요청 스레드 + 수집 작업 스레드 (COLLECTION_JOB_WORKERS) + 백그라운드 갱신 1
+    """
+    job_workers = max(1, int(os.getenv("COLLECTION_JOB_WORKERS", "1")))
+    return request_threads() + job_workers + 1
+
+
+class PooledConnection:
+    """
+    풀에서 대여한 연결 프록시
+    - close()는 연결을 닫지 않고 풀에 반환 (기존 호출부 코드 그대로 사용 가능)
+    - cursor()는 쿼리 계측 커서 반환
+    - 그 외 속성/메서드는 psycopg2 연결로 위임
+    """
+
+    def __init__(self, pool: "PooledConnectionManager", raw, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._pid = os.getpid()
+        self._returned = False
+
+    @property
+    def raw(self):
+        """원본 psycopg2 연결"""
+        return self._raw
+
+    def close(self):
+        """풀에 반환 (중복 호출 무시)"""
+        if not self._returned:
+            self._returned = True
+            self._pool.putconn(self)
+
+    def discard(self):
+        """연결을 풀에 반환하지 않고 닫기 (오류 상태 연결 등)"""
+        if not self._returned:
+            self._returned = True
+            self._pool.putconn(self, discard=True)
+
+    def cursor(self, *args: Any, cursor_factory=None, **kwargs: Any):
+        """계측 커서 생성 (쿼리 지문별 지연시간 기록, query_stats)"""
+        factory = instrumented_cursor_factory(
+            cursor_factory or self._raw.cursor_factory
+        )
+        return self._raw.cursor(*args, cursor_factory=factory, **kwargs)
+
+    @property
+    def autocommit(self) -> bool:
+        return self._raw.autocommit
+
+    @autocommit.setter
+    def autocommit(self, value: bool):
+        # __getattr__ 위임은 읽기 전용 - 설정은 원본 연결에 반영해야 함
+        self._raw.autocommit = value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        # psycopg2와 동일한 트랜잭션 컨텍스트 (종료 시 commit/rollback, 반환하지 않음)
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    def __del__(self):
+        # close() 없이 버려진 연결도 풀로 회수
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class PooledConnectionManager(SmartConnectionManager):
+    """
+    프로세스별 스레드 안전 PostgreSQL 커넥션 풀
+    - min/max 크기 (DB_POOL_MIN / DB_POOL_MAX, 기본 max는 default_pool_max()),
+      최대 대기 시간 (DB_POOL_TIMEOUT)
+    - 대여 시 상태 확인: 닫힌 연결 폐기, 오래 유휴한 연결은 SELECT 1 확인
+    - 최대 수명 (DB_POOL_MAX_LIFETIME) 초과 연결 재생성
+    - fork 감지 시 부모 프로세스의 연결을 건드리지 않고 새 풀 시작 (gunicorn preload)
+    """
+
+    def __init__(
+        self,
+        minconn: Optional[int] = None,
+        maxconn: Optional[int] = None,
+        max_lifetime: Optional[float] = None,
+    ):
+        super().__init__()
+        self.minconn = (
+            minconn if minconn is not None else int(os.getenv("DB_POOL_MIN", "1"))
+        )
+        self.maxconn = (
+            maxconn
+            if maxconn is not None
+            else int(os.getenv("DB_POOL_MAX") or default_pool_max())
+        )
+        self.max_lifetime = (
+            max_lifetime
+            if max_lifetime is not None
+            else float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+        )
+        self.checkout_timeout = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+        self.idle_timeout = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "600"))
+        # 이 시간 이상 유휴한 연결은 대여 전 SELECT 1로 확인
+        self.health_check_after = float(
+            os.getenv("DB_POOL_HEALTH_CHECK_AFTER", "30")
+        )
+
+        self._reset_state()
+        # fork 이전 프로세스에서 만든 연결 (자식에서 닫으면 부모 세션이 끊기므로 보관만)
+        self._inherited: List[Any] = []
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        # (연결, 생성 시각, 반환 시각)
+        self._idle: Deque[Tuple[Any, float, float]] = deque()
+        self._checked_out = 0
+        self.created = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.checkouts = 0
+        self.waits = 0
+
+    def _get_connection_params(self) -> Dict[str, Any]:
+        """연결 파라미터 (기존 호출부와 같은 기본값 사용)"""
+        if os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL"):
+            return super()._get_connection_params()
+
+        return {
+            "host": os.getenv("POSTGRES_HOST", "postgres"),
+            "port": int(os.getenv("POSTGRES_PORT", "5432")),
+            "database": os.getenv("POSTGRES_DB", "blacklist"),
+            "user": os.getenv("POSTGRES_USER", "postgres"),
+            "password": os.getenv("POSTGRES_PASSWORD", "postgres"),
+        }
+
+    def _check_pid(self):
+        """fork 후 첫 사용 시 풀 상태 초기화"""
+        if self._pid != os.getpid():
+            self._inherited.extend(conn for conn, _, _ in self._idle)
+            self._reset_state()
+            logger.info(f"프로세스 {self._pid} 커넥션 풀 초기화")
+
+    def _open(self):
+        """새 연결 생성 (호스트 탐색 및 오류 로깅 억제는 SmartConnectionManager)"""
+        conn = super().get_connection()
+        if conn is None:
+            raise psycopg2.OperationalError("PostgreSQL 연결 불가 (모든 호스트 실패)")
+        self.created += 1
+        return conn
+
+    def _is_usable(self, conn, created_at: float, returned_at: float) -> bool:
+        now = time.monotonic()
+        if conn.closed:
+            return False
+        if now - created_at >= self.max_lifetime:
+            self.recycled += 1
+            return False
+        if now - returned_at >= self.health_check_after:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error as e:
+                logger.info(f"유휴 연결 상태 확인 실패 - 재연결: {e}")
+                return False
+        return True
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _reap_idle(self):
+        """minconn 초과분 중 idle_timeout 이상 유휴한 연결 정리 (잠금 보유 상태)"""
+        now = time.monotonic()
+        while (
+            len(self._idle) > self.minconn
+            and now - self._idle[0][2] >= self.idle_timeout
+        ):
+            conn, _, _ = self._idle.popleft()
+            self._close_quietly(conn)
+
+    def getconn(self, cursor_factory=None) -> PooledConnection:
+        """
+        풀에서 연결 대여 (close()로 반환)
+        - cursor_factory: 대여 기간 동안 conn.cursor()의 기본 커서 클래스
+        - 풀이 가득 차면 DB_POOL_TIMEOUT 동안 대기 후 PoolError
+        """
+        self._check_pid()
+        with self._cond:
+            self.checkouts += 1
+            self._reap_idle()
+            deadline = None
+            while not self._idle and self._checked_out >= self.maxconn:
+                if deadline is None:
+                    self.waits += 1
+                    deadline = time.monotonic() + self.checkout_timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError(
+                        f"커넥션 풀 고갈 ({self.maxconn}개 사용 중, "
+                        f"{self.checkout_timeout:g}초 대기 초과)"
+                    )
+                self._cond.wait(remaining)
+
+            entry = self._idle.pop() if self._idle else None
+            self._checked_out += 1
+
+        # 네트워크 I/O (상태 확인 / 연결 생성)는 잠금 밖에서 수행
+        try:
+            while entry is not None and not self._is_usable(*entry):
+                self._close_quietly(entry[0])
+                with self._cond:
+                    entry = self._idle.pop() if self._idle else None
+
+            if entry is None:
+                conn, created_at = self._open(), time.monotonic()
+            else:
+                conn, created_at, _ = entry
+        except Exception:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+        conn.cursor_factory = cursor_factory
+        return PooledConnection(self, conn, created_at)
+
+    def get_connection(self) -> Optional[PooledConnection]:
+        """SmartConnectionManager 호환 - 실패 시 None"""
+        try:
+            return self.getconn()
+        except Exception as e:
+            logger.debug(f"커넥션 풀 대여 실패: {e}")
+            return None
+
+    def putconn(self, pooled: PooledConnection, discard: bool = False):
+        """연결 반환 - 진행 중인 트랜잭션은 롤백, 비정상/수명 초과 연결은 폐기"""
+        conn = pooled.raw
+        if pooled._pid != os.getpid():
+            # fork 이전에 대여된 연결 - 자식 프로세스에서는 반환하지 않음
+            return
+
+        if not discard and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    discard = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if not discard:
+                    if conn.autocommit:
+                        conn.autocommit = False
+                    conn.cursor_factory = None
+            except psycopg2.Error:
+                discard = True
+
+        now = time.monotonic()
+        if discard or conn.closed or now - pooled._created_at >= self.max_lifetime:
+            self._close_quietly(conn)
+            conn = None
+
+        with self._cond:
+            self._checked_out = max(0, self._checked_out - 1)
+            if conn is None:
+                self.discarded += 1
+            else:
+                self._idle.append((conn, pooled._created_at, now))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, cursor_factory=None) -> Iterator[PooledConnection]:
+        """with 블록 동안 연결 대여 (종료 시 반환)"""
+        conn = self.getconn(cursor_factory=cursor_factory)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def warm_up(self):
+        """minconn개 연결 미리 생성"""
+        conns = []
+        try:
+            for _ in range(max(0, self.minconn - len(self._idle))):
+                conns.append(self.getconn())
+        except Exception as e:
+            logger.warning(f"커넥션 풀 예열 실패: {e}")
+        finally:
+            for conn in conns:
+                conn.close()
+
+    def close_all(self):
+        """유휴 연결 모두 닫기 (대여 중인 연결은 반환 시 유지)"""
+        self._check_pid()
+        with self._cond:
+            while self._idle:
+                conn, _, _ = self._idle.popleft()
+                self._close_quietly(conn)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """풀 상태 정보"""
+        return {
+            "pid": self._pid,
+            "min": self.minconn,
+            "max": self.maxconn,
+            "idle": len(self._idle),
+            "in_use": self._checked_out,
+            "created": self.created,
+            "recycled": self.recycled,
+            "discarded": self.discarded,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+        }
+
+
+# 전역 커넥션 풀 인스턴스
+db_pool = PooledConnectionManager()
+
+
+def get_db_connection(cursor_factory=None) -> PooledConnection:
+    """풀에서 연결 대여 (close()로 반환)"""
+    return db_pool.getconn(cursor_factory=cursor_factory)
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+스키마 마이그레이션 관리자 - 미적용 버전을 순서대로 적용
+워커 부팅과 분리된 배포 단계에서 한 번 실행한다:
+gunicorn on_starting (마스터 프로세스, 워커 fork 전), flask migrate,
+python -m src.core.database.migrations
+적용 이력은 schema_migrations 테이블에 기록하고 세션 advisory lock으로 동시 실행 방지
+"""
+import os
+import re
+import time
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.core.database.bulk_loader import BlacklistBulkLoader
+from src.core.database.connection_pool import db_pool
+from src.core.services.change_log import BlacklistChangeLog
+from src.core.services.data_version import BlacklistDataVersion
+from src.core.services.stats_rollup import BlacklistStatsRollup
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_lock 키 (마이그레이션 전용)
+MIGRATION_LOCK_KEY = 7_215_001
+
+_CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+
+class Migration(NamedTuple):
+    """
+    버전별 마이그레이션
+    concurrent=True: 트랜잭션 밖(autocommit)에서 문장을 하나씩 실행
+    (CREATE INDEX CONCURRENTLY - 인덱스 생성 중에도 테이블 쓰기를 막지 않음)
+    requires_valid: 적용 전에 존재하고 VALID 상태여야 하는 인덱스 (대체 인덱스 확인)
+    """
+
+    version: int
+    name: str
+    sql: str
+    concurrent: bool = False
+    requires_valid: Tuple[str, ...] = ()
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "blacklist_ips_baseline",
+        """
+        CREATE TABLE IF NOT EXISTS blacklist_ips (
+            id SERIAL PRIMARY KEY,
+            ip_address INET NOT NULL UNIQUE,
+            reason TEXT,
+            is_active BOOLEAN DEFAULT true,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source VARCHAR(100) DEFAULT 'manual',
+            confidence_level INTEGER DEFAULT 5,
+            category VARCHAR(50) DEFAULT 'unknown',
+            last_seen TIMESTAMP,
+            detection_count INTEGER DEFAULT 1
+        );
+        """,
+    ),
+    Migration(
+        2,
+        "ingest_bookkeeping_tables",
+        BlacklistDataVersion.SCHEMA_SQL
+        + ";"
+        + BlacklistChangeLog.SCHEMA_SQL
+        + BlacklistBulkLoader.SCHEMA_SQL,
+    ),
+    Migration(
+        3,
+        "ip_address_inet",
+        # 문자열 컬럼으로 만들어진 구 스키마의 ip_address를 네이티브 inet으로 변환
+        # 변환할 수 없는 값과 inet으로 같아지는 중복 행은 먼저 격리 테이블로 옮긴다
+        # (한 행 때문에 ALTER 전체가 실패하거나 UNIQUE 제약이 깨지지 않도록)
+        """
+        CREATE OR REPLACE FUNCTION pg_temp.try_inet(value TEXT) RETURNS inet AS $f$
+        BEGIN
+            RETURN NULLIF(trim(value), '')::inet;
+        EXCEPTION WHEN data_exception THEN
+            RETURN NULL;
+        END;
+        $f$ LANGUAGE plpgsql IMMUTABLE;
+
+        DO $$
+        BEGIN
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = 'blacklist_ips'
+                  AND column_name = 'ip_address') <> 'inet' THEN
+                CREATE TABLE IF NOT EXISTS blacklist_ips_quarantine (
+                    id SERIAL PRIMARY KEY,
+                    ip_address TEXT,
+                    reason VARCHAR(50) NOT NULL,
+                    row_data JSONB NOT NULL,
+                    quarantined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- 변환할 수 없는 값 (빈 문자열, NULL 포함)
+                WITH invalid AS (
+                    DELETE FROM blacklist_ips b
+                    WHERE pg_temp.try_inet(b.ip_address::text) IS NULL
+                    RETURNING b.*
+                )
+                INSERT INTO blacklist_ips_quarantine (ip_address, reason, row_data)
+                SELECT invalid.ip_address::text, 'invalid_ip_address', to_jsonb(invalid)
+                FROM invalid;
+
+                -- 표기만 다른 같은 주소 (' 1.1.1.1', '1.1.1.1/32')는 먼저 저장된 행만 유지
+                WITH ranked AS (
+                    SELECT ctid AS row_id, row_number() OVER (
+                        PARTITION BY pg_temp.try_inet(ip_address::text) ORDER BY ctid
+                    ) AS rank
+                    FROM blacklist_ips
+                ), duplicate AS (
+                    DELETE FROM blacklist_ips b USING ranked r
+                    WHERE b.ctid = r.row_id AND r.rank > 1
+                    RETURNING b.*
+                )
+                INSERT INTO blacklist_ips_quarantine (ip_address, reason, row_data)
+                SELECT duplicate.ip_address::text, 'duplicate_ip_address',
+                       to_jsonb(duplicate)
+                FROM duplicate;
+
+                ALTER TABLE blacklist_ips
+                    ALTER COLUMN ip_address TYPE inet
+                    USING pg_temp.try_inet(ip_address::text);
+            END IF;
+        END $$;
+        """,
+    ),
+    Migration(
+        4,
+        "blacklist_ips_hot_path_indexes",
+        """
+        -- 활성 스냅샷 / JSON 피드: WHERE is_active ORDER BY last_seen DESC
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blacklist_ips_active_last_seen
+            ON blacklist_ips (last_seen DESC) WHERE is_active;
+        -- 소스/카테고리 집계 및 소스 단위 동기화 (WHERE source = %s AND is_active)
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blacklist_ips_active_source_category
+            ON blacklist_ips (source, category) WHERE is_active;
+        -- 일별 수집 차트: WHERE DATE(last_seen) = %s GROUP BY source
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blacklist_ips_last_seen_date_source
+            ON blacklist_ips ((DATE(last_seen)), source);
+        """,
+        concurrent=True,
+    ),
+    Migration(
+        5,
+        "blacklist_ips_inet_gist",
+        """
+        -- CIDR 포함 관계 (>>=, <<=) 및 범위 조회용
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blacklist_ips_ip_gist
+            ON blacklist_ips USING gist (ip_address inet_ops);
+        """,
+        concurrent=True,
+    ),
+    Migration(
+        6,
+        "blacklist_stats_rollup",
+        BlacklistStatsRollup.SCHEMA_SQL + BlacklistStatsRollup.BACKFILL_SQL,
+    ),
+    Migration(
+        7,
+        "blacklist_daily_stats_rollup",
+        BlacklistStatsRollup.DAILY_SCHEMA_SQL
+        + BlacklistStatsRollup.DAILY_BACKFILL_SQL,
+    ),
+    Migration(
+        8,
+        "drop_superseded_active_index",
+        """
+        -- 부분 인덱스(버전 4)로 대체된 저선택도 boolean 인덱스
+        DROP INDEX CONCURRENTLY IF EXISTS idx_blacklist_ips_active;
+        """,
+        concurrent=True,
+        # 대체 인덱스가 VALID로 확인된 뒤에만 삭제 (아니면 실패로 중단하고 기존 인덱스 유지)
+        requires_valid=(
+            "idx_blacklist_ips_active_last_seen",
+            "idx_blacklist_ips_active_source_category",
+        ),
+    ),
+]
+
+
+class MigrationRunner:
+    """
+    버전 기반 마이그레이션 실행기
+    - 실행 전체를 세션 advisory lock 하나로 보호 (여러 프로세스가 동시에 시작해도 한 번만 적용)
+    - 잠금은 autocommit 연결에서 pg_try_advisory_lock으로 폴링해 획득한다.
+      대기 중인 실행기가 트랜잭션을 열어 두면 잠금 보유자의 CREATE INDEX CONCURRENTLY가
+      그 트랜잭션이 끝나기를 기다리며 교착되기 때문 (MIGRATION_LOCK_TIMEOUT 초 후 실패)
+    - 각 마이그레이션은 개별 트랜잭션으로 적용 (실패 시 해당 버전부터 중단)
+    - concurrent 마이그레이션은 autocommit으로 문장별 실행
+    """
+
+    def __init__(self, migrations: List[Migration] = MIGRATIONS):
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.enabled = os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true"
+        self.lock_timeout = float(os.getenv("MIGRATION_LOCK_TIMEOUT", "600"))
+        self.lock_poll_interval = 1.0
+
+    def _acquire_lock(self, cursor) -> bool:
+        """세션 advisory lock 폴링 (autocommit 커서, 대기 중 트랜잭션을 열지 않음)"""
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+            if cursor.fetchone()[0]:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.lock_poll_interval)
+
+    def _applied_versions(self, cursor) -> set:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(200) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        cursor.execute("SELECT version FROM schema_migrations")
+        return {row[0] for row in cursor.fetchall()}
+
+    @staticmethod
+    def _record(cursor, migration: Migration):
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+            (migration.version, migration.name),
+        )
+
+    def _apply(self, conn, migration: Migration) -> Optional[str]:
+        """트랜잭션 마이그레이션 적용 (실패 시 오류 메시지 반환)"""
+        conn.autocommit = False
+        cursor = conn.cursor()
+        try:
+            cursor.execute(migration.sql)
+            self._record(cursor, migration)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            return str(e)
+        finally:
+            cursor.close()
+            conn.autocommit = True
+        return None
+
+    def _apply_concurrent(self, cursor, migration: Migration) -> Optional[str]:
+        """
+        autocommit 마이그레이션 적용 (실패 시 오류 메시지 반환)
+        실패한 CONCURRENTLY 생성이 남긴 INVALID 인덱스는 IF NOT EXISTS로 건너뛰지
+        않도록 먼저 삭제한다.
+        """
+        statements = [stmt.strip() for stmt in migration.sql.split(";")]
+        statements = [stmt for stmt in statements if stmt]
+        try:
+            cursor.execute(
+                """
+                SELECT c.relname FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE NOT i.indisvalid AND c.relname = ANY(%s)
+            """,
+                (_CONCURRENT_INDEX.findall(migration.sql),),
+            )
+            for (name,) in cursor.fetchall():
+                logger.warning(f"INVALID 인덱스 재생성: {name}")
+                cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+            if migration.requires_valid:
+                cursor.execute(
+                    """
+                    SELECT c.relname FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE i.indisvalid AND i.indisready AND c.relname = ANY(%s)
+                """,
+                    (list(migration.requires_valid),),
+                )
+                valid = {name for (name,) in cursor.fetchall()}
+                missing = [n for n in migration.requires_valid if n not in valid]
+                if missing:
+                    return f"대체 인덱스 미확인 (없음 또는 INVALID): {missing}"
+
+            for statement in statements:
+                cursor.execute(statement)
+            self._record(cursor, migration)
+        except Exception as e:
+            return str(e)
+        return None
+
+    def run(self) -> Dict[str, Any]:
+        """미적용 마이그레이션 적용"""
+        if not self.enabled:
+            return {"success": True, "skipped": True, "applied": []}
+
+        applied: List[int] = []
+        conn = db_pool.getconn()
+        try:
+            conn.autocommit = True
+            cursor = conn.cursor()
+            try:
+                if not self._acquire_lock(cursor):
+                    error = f"마이그레이션 잠금 대기 시간 초과 ({self.lock_timeout:.0f}초)"
+                    logger.error(error)
+                    return {"success": False, "applied": applied, "error": error}
+                try:
+                    # 잠금 획득 후 조회 - 먼저 끝난 실행기가 적용한 버전은 건너뜀
+                    done = self._applied_versions(cursor)
+                    for migration in self.migrations:
+                        if migration.version in done:
+                            continue
+
+                        if migration.concurrent:
+                            # CONCURRENTLY는 트랜잭션 블록 안에서 실행할 수 없음
+                            error = self._apply_concurrent(cursor, migration)
+                        else:
+                            error = self._apply(conn, migration)
+                        if error is not None:
+                            logger.error(
+                                f"마이그레이션 {migration.version} ({migration.name}) "
+                                f"실패: {error}"
+                            )
+                            return {"success": False, "applied": applied, "error": error}
+
+                        applied.append(migration.version)
+                        logger.info(
+                            f"마이그레이션 {migration.version} ({migration.name}) 적용"
+                        )
+                finally:
+                    cursor.execute(
+                        "SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,)
+                    )
+            finally:
+                cursor.close()
+        finally:
+            conn.autocommit = False
+            conn.close()
+
+        return {
+            "success": True,
+            "applied": applied,
+            "version": self.migrations[-1].version if self.migrations else 0,
+        }
+
+
+# 전역 마이그레이션 실행기 인스턴스
+migration_runner = MigrationRunner()
+
+
+def run_startup_migrations() -> Optional[Dict[str, Any]]:
+    """
+    배포 단계 마이그레이션 (DB_AUTO_MIGRATE=false로 비활성화)
+    DB에 연결할 수 없으면 경고 후 None, 마이그레이션이 실패하면 RuntimeError
+    (실패한 버전 이후 - inet 변환 / GiST 인덱스 등 - 가 빠진 스키마로 서비스하지 않음)
+    """
+    try:
+        result = migration_runner.run()
+    except Exception as e:
+        logger.warning(f"스키마 마이그레이션 건너뜀 (DB 연결 불가): {e}")
+        return None
+    finally:
+        # gunicorn 마스터 프로세스의 연결을 워커로 물려주지 않음
+        db_pool.close_all()
+    if not result.get("success"):
+        raise RuntimeError(f"스키마 마이그레이션 실패: {result.get('error')}")
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(run_startup_migrations())
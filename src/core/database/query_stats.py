@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+쿼리 계측 - 문장 지문(fingerprint)별 지연시간 히스토그램 / 행 수 / 오류 수 집계
+커넥션 풀이 대여하는 모든 커서에 적용되며, 임계값을 넘는 쿼리는 느린 쿼리 로그로 남긴다.
+(선택) 읽기 전용 SELECT 문은 EXPLAIN 실행 계획을 함께 수집한다 (문장을 다시 실행하지 않음).
+각 워커는 통계를 주기적으로 공유 디렉토리의 워커별 파일에 기록하고, collect()가 합산한다.
+"""
+import os
+import re
+import glob
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2 import extensions, sql
+
+from src.core.utils.process_state import pid_alive, state_dir
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (ms), 마지막 버킷은 +Inf
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+)
+
+_STRING_LITERAL = re.compile(r"'(?:''|[^'])*'")
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s|%s")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUE_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_ARRAY_LIST = re.compile(r"\[\s*\?(?:\s*,\s*\?)+\s*\]")
+_WHITESPACE = re.compile(r"\s+")
+_COMMENT = re.compile(r"--[^\n]*")
+
+# 실행 계획은 읽기 전용 문장에만 수집 (데이터 변경 CTE, 부수 효과 함수 호출 제외)
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_DATA_MODIFYING = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+_FROM = re.compile(r"\bFROM\b", re.IGNORECASE)
+_SIDE_EFFECT_CALL = re.compile(
+    r"\b(pg_\w+|nextval|setval|set_config|lo_\w+|dblink\w*)\s*\(", re.IGNORECASE
+)
+
+
+def fingerprint(query: str) -> str:
+    """리터럴/파라미터/공백을 정규화한 문장 지문"""
+    text = _COMMENT.sub(" ", query)
+    text = _STRING_LITERAL.sub("?", text)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _VALUE_LIST.sub("(?)", text)
+    text = _VALUE_ROWS.sub("(?)", text)
+    text = _ARRAY_LIST.sub("[?]", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class QueryStatsRecorder:
+    """
+    워커별 쿼리 통계 수집기 (스레드 안전) + 워커 간 파일 집계
+    - DB_QUERY_STATS: 계측 활성화 (기본 true)
+    - DB_SLOW_QUERY_MS: 느린 쿼리 임계값 (기본 500ms)
+    - DB_SLOW_QUERY_EXPLAIN: 느린 읽기 전용 SELECT의 EXPLAIN 실행 계획 수집 (기본 false)
+    - DB_SLOW_QUERY_EXPLAIN_INTERVAL: 지문별 실행 계획 수집 최소 간격 (기본 300초)
+    - DB_QUERY_STATS_DIR: 워커별 통계 파일 디렉토리 (기본 /dev/shm/blacklist_query_stats)
+    - DB_QUERY_STATS_FLUSH_INTERVAL: 워커 파일 기록 최소 간격 (기본 5초)
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.enabled = os.getenv("DB_QUERY_STATS", "true").lower() == "true"
+        self.slow_ms = float(os.getenv("DB_SLOW_QUERY_MS", "500"))
+        self.explain = os.getenv("DB_SLOW_QUERY_EXPLAIN", "false").lower() == "true"
+        self.explain_interval = float(
+            os.getenv("DB_SLOW_QUERY_EXPLAIN_INTERVAL", "300")
+        )
+        # 지문 수 상한 (동적 SQL로 인한 무한 증가 방지)
+        self.max_fingerprints = int(os.getenv("DB_QUERY_STATS_MAX", "500"))
+        self.directory = directory or os.getenv(
+            "DB_QUERY_STATS_DIR", os.path.join(state_dir(), "blacklist_query_stats")
+        )
+        self.flush_interval = float(os.getenv("DB_QUERY_STATS_FLUSH_INTERVAL", "5"))
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._last_explain: Dict[str, float] = {}
+        self._started = time.time()
+        self._pid = os.getpid()
+        self._last_flush = 0.0
+
+    def _check_pid(self):
+        """fork 후 부모 프로세스에서 누적된 통계 초기화"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._stats = {}
+            self._last_explain = {}
+            self._started = time.time()
+            self._last_flush = 0.0
+
+    def _entry(self, key: str) -> Dict[str, Any]:
+        entry = self._stats.get(key)
+        if entry is None:
+            if len(self._stats) >= self.max_fingerprints:
+                key = "<other>"
+                entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "rows": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "slow": 0,
+                    "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    "last_error": None,
+                    "last_plan": None,
+                }
+        return entry
+
+    def record(
+        self,
+        query: str,
+        elapsed_ms: float,
+        rows: int = 0,
+        error: Optional[BaseException] = None,
+    ) -> str:
+        """쿼리 1회 실행 결과 기록, 지문 반환"""
+        key = fingerprint(query)
+        with self._lock:
+            self._check_pid()
+            entry = self._entry(key)
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["buckets"][bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            if rows > 0:
+                entry["rows"] += rows
+            if error is not None:
+                entry["errors"] += 1
+                entry["last_error"] = f"{type(error).__name__}: {error}"[:500]
+            if elapsed_ms >= self.slow_ms:
+                entry["slow"] += 1
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return key
+
+    def is_slow(self, elapsed_ms: float) -> bool:
+        return self.enabled and elapsed_ms >= self.slow_ms
+
+    def should_explain(self, key: str, query: str) -> bool:
+        """실행 계획 수집 여부 (읽기 전용 문장, 지문별 최소 간격)"""
+        if not self.explain or not _READ_ONLY.match(query):
+            return False
+        # FROM 없는 SELECT는 함수 호출 (예: SELECT pg_advisory_lock(...))
+        if (
+            _DATA_MODIFYING.search(query)
+            or _SIDE_EFFECT_CALL.search(query)
+            or not _FROM.search(query)
+        ):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_explain.get(key)
+            if last is not None and now - last < self.explain_interval:
+                return False
+            self._last_explain[key] = now
+        return True
+
+    def record_plan(self, key: str, plan: str):
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is not None:
+                entry["last_plan"] = plan
+
+    def snapshot(
+        self, limit: Optional[int] = None, sort: str = "total_ms"
+    ) -> Dict[str, Any]:
+        """현재 워커 프로세스의 지문별 통계 (sort 기준 내림차순)"""
+        with self._lock:
+            self._check_pid()
+            items = [
+                (key, {**entry, "buckets": list(entry["buckets"])})
+                for key, entry in self._stats.items()
+            ]
+        return {
+            "pid": self._pid,
+            "since": self._started,
+            **self._format(items, limit, sort),
+        }
+
+    def _format(
+        self, items: List[Tuple[str, Dict[str, Any]]], limit: Optional[int], sort: str
+    ) -> Dict[str, Any]:
+        queries: List[Dict[str, Any]] = []
+        for key, entry in items:
+            calls = entry["calls"]
+            entry["fingerprint"] = key
+            entry["avg_ms"] = round(entry["total_ms"] / calls, 3) if calls else 0.0
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+            # 버킷별 건수 (le_ms: 상한, None은 +Inf)
+            entry["histogram"] = [
+                {"le_ms": bound, "count": count}
+                for bound, count in zip(
+                    LATENCY_BUCKETS_MS + (None,), entry.pop("buckets")
+                )
+            ]
+            queries.append(entry)
+
+        if queries and sort not in queries[0]:
+            sort = "total_ms"
+        queries.sort(key=lambda q: q[sort], reverse=True)
+        return {
+            "slow_query_ms": self.slow_ms,
+            "fingerprints": len(queries),
+            "queries": queries[:limit] if limit else queries,
+        }
+
+    # === 워커 파일 ===
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"worker_{pid}.json")
+
+    def _reset_at(self) -> float:
+        """마지막 전체 초기화 시각 (DELETE 요청, 없으면 0)"""
+        try:
+            return os.stat(os.path.join(self.directory, "reset")).st_mtime
+        except OSError:
+            return 0.0
+
+    def flush(self):
+        """현재 워커 통계를 워커 파일에 기록 (다른 워커의 전체 초기화 요청 먼저 반영)"""
+        self._last_flush = time.monotonic()
+        if self._reset_at() > self._started:
+            self.reset(local=True)
+        with self._lock:
+            self._check_pid()
+            data = {
+                "pid": self._pid,
+                "since": self._started,
+                "stats": {
+                    key: {**entry, "buckets": list(entry["buckets"])}
+                    for key, entry in self._stats.items()
+                },
+            }
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(data["pid"])
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"쿼리 통계 파일 기록 실패: {e}")
+
+    def collect(
+        self, limit: Optional[int] = None, sort: str = "total_ms"
+    ) -> Dict[str, Any]:
+        """모든 워커의 지문별 통계 합산 (종료된 워커 파일은 삭제)"""
+        self.flush()
+        reset_at = self._reset_at()
+        merged: Dict[str, Dict[str, Any]] = {}
+        workers = []
+        since = None
+
+        for path in glob.glob(os.path.join(self.directory, "worker_*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pid = data.get("pid")
+            if pid != self._pid and not pid_alive(pid):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                continue
+            # 초기화 이전 통계를 아직 다시 기록하지 않은 워커
+            if data["since"] < reset_at:
+                continue
+
+            workers.append(pid)
+            since = data["since"] if since is None else min(since, data["since"])
+            for key, entry in data["stats"].items():
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = dict(entry)
+                    continue
+                for field in ("calls", "errors", "rows", "total_ms", "slow"):
+                    total[field] += entry[field]
+                total["max_ms"] = max(total["max_ms"], entry["max_ms"])
+                total["buckets"] = [
+                    a + b for a, b in zip(total["buckets"], entry["buckets"])
+                ]
+                total["last_error"] = entry["last_error"] or total["last_error"]
+                total["last_plan"] = entry["last_plan"] or total["last_plan"]
+
+        return {
+            "workers": sorted(workers),
+            "since": since,
+            **self._format(list(merged.items()), limit, sort),
+        }
+
+    def reset(self, local: bool = False):
+        """통계 초기화 (local=False면 모든 워커: 각 워커는 다음 파일 기록 때 초기화)"""
+        with self._lock:
+            self._stats = {}
+            self._last_explain = {}
+            self._started = time.time()
+        if local:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            marker = os.path.join(self.directory, "reset")
+            with open(marker, "w"):
+                pass
+            os.utime(marker, (self._started, self._started))
+        except OSError as e:
+            logger.warning(f"쿼리 통계 초기화 표시 실패: {e}")
+        self.flush()
+
+
+# 전역 쿼리 통계 인스턴스
+query_stats = QueryStatsRecorder()
+
+
+def _query_text(cursor, query: Any) -> str:
+    if isinstance(query, sql.Composable):
+        return query.as_string(cursor)
+    if isinstance(query, bytes):
+        return query.decode("utf-8", "replace")
+    return str(query)
+
+
+class InstrumentedCursorMixin:
+    """execute / executemany / copy_expert 지연시간 계측 (psycopg2 커서 클래스와 조합)"""
+
+    def _timed(self, method, query: Any, *args: Any, explain_vars: Any = None):
+        if not query_stats.enabled:
+            return method(query, *args)
+
+        started = time.perf_counter()
+        error = None
+        try:
+            return method(query, *args)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            text = _query_text(self, query)
+            rows = self.rowcount if error is None else 0
+            key = query_stats.record(text, elapsed_ms, rows, error)
+            if error is None and query_stats.is_slow(elapsed_ms):
+                self._log_slow(key, text, elapsed_ms, rows, explain_vars)
+
+    def _log_slow(self, key: str, text: str, elapsed_ms: float, rows: int, vars):
+        plan = None
+        if query_stats.should_explain(key, text):
+            plan = self._explain(text, vars)
+            if plan:
+                query_stats.record_plan(key, plan)
+
+        logger.warning(
+            f"느린 쿼리 {elapsed_ms:.1f}ms (rows={rows}): {key[:500]}"
+            + (f"\n{plan}" if plan else "")
+        )
+
+    def _explain(self, text: str, vars: Any) -> Optional[str]:
+        """
+        같은 연결에서 EXPLAIN 실행 (계측 없는 기본 커서 사용)
+        ANALYZE 없이 계획만 조회하므로 문장을 다시 실행하지 않으며,
+        호출자 트랜잭션 안에서는 SAVEPOINT로 감싸 실패해도 트랜잭션을 중단시키지 않는다.
+        """
+        conn = self.connection
+        status = conn.get_transaction_status()
+        if status != extensions.TRANSACTION_STATUS_INTRANS and not (
+            conn.autocommit and status == extensions.TRANSACTION_STATUS_IDLE
+        ):
+            return None
+        savepoint = not conn.autocommit
+        try:
+            statement = self.mogrify(text, vars).decode("utf-8", "replace")
+            with conn.cursor(cursor_factory=extensions.cursor) as cursor:
+                if savepoint:
+                    cursor.execute("SAVEPOINT query_stats_explain")
+                try:
+                    cursor.execute("EXPLAIN " + statement)
+                    plan = "\n".join(row[0] for row in cursor.fetchall())
+                except Exception:
+                    if savepoint:
+                        cursor.execute("ROLLBACK TO SAVEPOINT query_stats_explain")
+                    raise
+                finally:
+                    if savepoint:
+                        cursor.execute("RELEASE SAVEPOINT query_stats_explain")
+                return plan
+        except Exception as e:
+            logger.warning(f"실행 계획 수집 실패: {e}")
+            return None
+
+    def execute(self, query, vars=None):
+        return self._timed(super().execute, query, vars, explain_vars=vars)
+
+    def executemany(self, query, vars_list):
+        return self._timed(super().executemany, query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._timed(super().copy_expert, sql, file, size)
+
+
+_factory_cache: Dict[type, type] = {}
+_factory_lock = threading.Lock()
+
+
+def instrumented_cursor_factory(factory: Optional[type] = None) -> type:
+    """커서 클래스에 계측 믹스인을 조합한 클래스 반환 (클래스별 캐시)"""
+    base = factory or extensions.cursor
+    if issubclass(base, InstrumentedCursorMixin):
+        return base
+
+    cls = _factory_cache.get(base)
+    if cls is None:
+        with _factory_lock:
+            cls = _factory_cache.get(base)
+            if cls is None:
+                cls = type(
+                    f"Instrumented{base.__name__}",
+                    (InstrumentedCursorMixin, base),
+                    {},
+                )
+                _factory_cache[base] = cls
+    return cls
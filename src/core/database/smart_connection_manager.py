@@ -4,8 +4,10 @@
 """
 import os
 import time
+import queue
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import Callable, Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import psycopg2
 from urllib.parse import urlparse
@@ -13,6 +15,203 @@ from urllib.parse import urlparse
 logger = logging.getLogger(__name__)
 
 
+class HostDiscovery:
+    """
+    PostgreSQL 후보 호스트 병렬 탐색 (happy eyeballs 방식)
+    - 후보를 stagger 간격으로 차례로 시작해 동시에 시도
+    - 설정 호스트(첫 후보)가 실패하거나 prefer_wait 안에 응답하지 않을 때만 대체 호스트 사용
+    - 성공 호스트는 winner_ttl 동안 기억하여 실패할 때까지 바로 사용
+    - 실패 호스트는 negative_ttl 동안 후보에서 제외
+    """
+
+    def __init__(
+        self,
+        winner_ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        stagger: Optional[float] = None,
+        prefer_wait: Optional[float] = None,
+    ):
+        self.winner_ttl = (
+            winner_ttl
+            if winner_ttl is not None
+            else float(os.getenv("DB_HOST_WINNER_TTL", "300"))
+        )
+        self.negative_ttl = (
+            negative_ttl
+            if negative_ttl is not None
+            else float(os.getenv("DB_HOST_NEGATIVE_TTL", "30"))
+        )
+        self.stagger = (
+            stagger
+            if stagger is not None
+            else float(os.getenv("DB_HOST_STAGGER", "0.25"))
+        )
+        # 대체 후보가 먼저 연결된 뒤 설정 호스트 응답을 기다리는 최대 시간
+        self.prefer_wait = (
+            prefer_wait
+            if prefer_wait is not None
+            else float(os.getenv("DB_HOST_PREFER_WAIT", "3"))
+        )
+        self._winner: Optional[str] = None
+        self._winner_until = 0.0
+        self._failed_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def winner(self) -> Optional[str]:
+        """기억 중인 성공 호스트 (만료 시 None)"""
+        if self._winner and time.monotonic() < self._winner_until:
+            return self._winner
+        return None
+
+    def _mark_success(self, host: str):
+        with self._lock:
+            self._winner = host
+            self._winner_until = time.monotonic() + self.winner_ttl
+            self._failed_until.pop(host, None)
+
+    def _mark_failure(self, host: str):
+        with self._lock:
+            self._failed_until[host] = time.monotonic() + self.negative_ttl
+            if self._winner == host:
+                self._winner = None
+
+    def candidates(self, hosts: List[str]) -> List[str]:
+        """중복 및 실패 캐시된 호스트를 제외한 후보 목록"""
+        now = time.monotonic()
+        result = []
+        for host in hosts:
+            if host and host not in result and self._failed_until.get(host, 0) <= now:
+                result.append(host)
+        return result
+
+    def connect(
+        self,
+        hosts: List[str],
+        connect: Callable[[str], Any],
+        on_error: Optional[Callable[[Exception, str], None]] = None,
+    ) -> Optional[Tuple[Any, str]]:
+        """(연결, 호스트) 반환 - 모든 후보가 실패하거나 실패 캐시 중이면 None
+
+        hosts의 첫 호스트(설정된 호스트)를 우선 사용: 다른 후보가 먼저 연결되어도
+        설정 호스트가 prefer_wait 안에 응답하면 설정 호스트를 쓰고,
+        실패하거나 시간을 넘기면 먼저 연결된 후보로 대체
+        """
+        configured = next((host for host in hosts if host), None)
+        winner = self.winner
+        # 대체 호스트는 설정 호스트가 실패 캐시 중일 때만 바로 재사용
+        if winner and (winner == configured or self._is_failed(configured)):
+            try:
+                conn = connect(winner)
+            except Exception as e:
+                self._mark_failure(winner)
+                if on_error:
+                    on_error(e, winner)
+            else:
+                self._mark_success(winner)
+                return conn, winner
+
+        candidates = self.candidates(hosts)
+        if not candidates:
+            return None
+
+        results: "queue.Queue[Tuple[str, Any, Optional[Exception]]]" = queue.Queue()
+
+        def attempt(host: str):
+            try:
+                results.put((host, connect(host), None))
+            except Exception as e:
+                results.put((host, None, e))
+
+        def start(host: str):
+            threading.Thread(
+                target=attempt, args=(host,), name=f"db-probe-{host}", daemon=True
+            ).start()
+
+        preferred = candidates[0] if candidates[0] == configured else None
+        start(candidates[0])
+        started, pending = 1, 1
+        found = None
+        fallback = None
+        deadline = 0.0
+        while pending:
+            if fallback:
+                timeout = max(0.0, deadline - time.monotonic())
+            elif started < len(candidates):
+                timeout = self.stagger
+            else:
+                timeout = None
+            try:
+                host, conn, error = results.get(timeout=timeout)
+            except queue.Empty:
+                if fallback:
+                    # 설정 호스트 대기 시간 초과 - 먼저 연결된 후보 사용
+                    break
+                # 앞선 시도가 지연되면 다음 후보를 동시에 시작
+                start(candidates[started])
+                started += 1
+                pending += 1
+                continue
+
+            pending -= 1
+            if conn is not None:
+                if preferred is None or host == preferred:
+                    found = (conn, host)
+                    break
+                if fallback is None:
+                    # 설정 호스트가 아직 시도 중이면 응답을 기다림
+                    fallback = (conn, host)
+                    deadline = time.monotonic() + self.prefer_wait
+                else:
+                    self._close(conn)
+                continue
+
+            self._mark_failure(host)
+            if on_error:
+                on_error(error, host)
+            if host == preferred:
+                preferred = None
+                if fallback:
+                    break
+            if not fallback and started < len(candidates):
+                start(candidates[started])
+                started += 1
+                pending += 1
+
+        if fallback:
+            if found:
+                self._close(fallback[0])
+            else:
+                found = fallback
+        if found:
+            self._mark_success(found[1])
+
+        if pending:
+            # 늦게 끝난 시도 정리 (성공한 여분 연결은 닫고 실패는 캐시)
+            threading.Thread(
+                target=self._drain, args=(results, pending), daemon=True
+            ).start()
+        return found
+
+    @staticmethod
+    def _close(conn: Any):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_failed(self, host: Optional[str]) -> bool:
+        return bool(host) and self._failed_until.get(host, 0) > time.monotonic()
+
+    def _drain(self, results: "queue.Queue", pending: int):
+        for _ in range(pending):
+            host, conn, error = results.get()
+            if conn is not None:
+                self._close(conn)
+            else:
+                self._mark_failure(host)
+
+
 class SmartConnectionManager:
     """
     스마트 PostgreSQL 연결 관리자
@@ -29,6 +228,7 @@ class SmartConnectionManager:
         self._cache_timeout = 300  # 5분 캐시
         self._backoff_duration = 60  # 1분 백오프
         self._max_error_logs = 5  # 최대 5번까지만 오류 로깅
+        self._discovery = HostDiscovery()
 
     def _get_connection_params(self) -> Dict[str, Any]:
         """환경변수에서 PostgreSQL 연결 파라미터 추출"""
@@ -93,8 +293,18 @@ class SmartConnectionManager:
         else:
             logger.warning(f"PostgreSQL 연결 실패 ({host}): {error}")
 
+    def _connect_host(self, host: str) -> psycopg2.extensions.connection:
+        return psycopg2.connect(
+            host=host,
+            port=self.connection_params["port"],
+            database=self.connection_params["database"],
+            user=self.connection_params["user"],
+            password=self.connection_params["password"],
+            connect_timeout=3,  # 빠른 타임아웃
+        )
+
     def get_connection(self) -> Optional[psycopg2.extensions.connection]:
-        """PostgreSQL 연결 시도 (스마트 백오프 포함)"""
+        """PostgreSQL 연결 시도 (후보 호스트 병렬 탐색 + 스마트 백오프)"""
         hosts_to_try = [
             self.connection_params["host"],
             "blacklist-postgres",
@@ -102,31 +312,20 @@ class SmartConnectionManager:
             "localhost",
         ]
 
-        for host in hosts_to_try:
-            try:
-                params = self.connection_params.copy()
-                params["host"] = host
-
-                conn = psycopg2.connect(
-                    host=params["host"],
-                    port=params["port"],
-                    database=params["database"],
-                    user=params["user"],
-                    password=params["password"],
-                    connect_timeout=3,  # 빠른 타임아웃
-                )
-
-                # 연결 성공 시 오류 카운터 리셋
-                self._error_count = 0
-                self._last_error_time = None
-                logger.info(f"PostgreSQL 연결 성공: {host}")
-                return conn
-
-            except Exception as e:
-                self._log_connection_error(e, host)
-                continue
+        previous = self._discovery.winner
+        result = self._discovery.connect(
+            hosts_to_try, self._connect_host, self._log_connection_error
+        )
+        if result is None:
+            return None
 
-        return None
+        conn, host = result
+        # 연결 성공 시 오류 카운터 리셋
+        self._error_count = 0
+        self._last_error_time = None
+        if host != previous:
+            logger.info(f"PostgreSQL 연결 성공: {host}")
+        return conn
 
     def get_stats_with_graceful_degradation(self) -> Dict[str, Any]:
         """PostgreSQL 통계 조회 (우아한 성능 저하 포함)"""
@@ -4,88 +4,59 @@ Collection API endpoints for blacklist management
 
 from flask import Blueprint, jsonify, request
 import logging
-import os
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import random
-import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from src.core.database.connection_pool import db_pool
+from src.core.services.collection_jobs import JOB_KIND_ALL, collection_jobs
+from src.core.services.ingest import load_collected_records
+from src.core.services.metrics import metrics
+from src.core.services.stats_rollup import stats_rollup
+from src.core.utils.cancellation import CollectionCancelled
+from src.core.utils.validators import ValidationError, parse_day_range
+
 logger = logging.getLogger(__name__)
 collection_api_bp = Blueprint("collection_api", __name__, url_prefix="/api/collection")
 
 
 # Database connection helper
 def get_db_connection():
-    """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv("POSTGRES_HOST", "postgres"),
-        port=os.getenv("POSTGRES_PORT", "5432"),
-        database=os.getenv("POSTGRES_DB", "blacklist"),
-        user=os.getenv("POSTGRES_USER", "postgres"),
-        password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-        cursor_factory=RealDictCursor,
-    )
+    """Get database connection (공유 커넥션 풀에서 대여, close() 시 반환)"""
+    return db_pool.getconn(cursor_factory=RealDictCursor)
 
 
 @collection_api_bp.route("/status")
 def collection_status():
-    """Get collection status and statistics"""
+    """Get collection status and statistics (chart range: ?days=<N>, default 7)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Get total IPs
-        cursor.execute("SELECT COUNT(*) as count FROM blacklist_ips")
-        total_ips = cursor.fetchone()["count"]
-
-        # Get recent collections
-        cursor.execute(
-            """
-            SELECT source, COUNT(*) as count, MAX(last_seen) as last_detected
-            FROM blacklist_ips
-            GROUP BY source
-        """
-        )
-        source_stats = cursor.fetchall()
-
-        # Generate chart data from actual database
-        now = datetime.now()
-        labels = []
-        regtech_data = []
-        secudium_data = []
-
-        for i in range(7):
-            date = (now - timedelta(days=6 - i)).strftime("%m/%d")
-            date_str = (now - timedelta(days=6 - i)).strftime("%Y-%m-%d")
-            labels.append(date)
-
-            # Get actual counts from database for each date
-            cursor.execute(
-                """
-                SELECT source, COUNT(*) as count
-                FROM blacklist_ips 
-                WHERE DATE(last_seen) = %s
-                GROUP BY source
-            """,
-                (date_str,),
-            )
+        start, end = parse_day_range(request.args)
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
-            daily_stats = cursor.fetchall()
-            regtech_count = 0
-            secudium_count = 0
-
-            for stat in daily_stats:
-                if stat["source"] == "REGTECH":
-                    regtech_count = stat["count"]
-                elif stat["source"] == "SECUDIUM":
-                    secudium_count = stat["count"]
-
-            regtech_data.append(regtech_count)
-            secudium_data.append(secudium_count)
+    try:
+        conn = get_db_connection()
+        try:
+            # Get totals and per-source counts from the stats rollup
+            stats = stats_rollup.read(conn)
+            # Generate chart data from the daily rollup (one range query)
+            daily = stats_rollup.daily(conn, start, end)
+        finally:
+            conn.close()
 
-        cursor.close()
-        conn.close()
+        total_ips = stats.total_ips
+        source_stats = [
+            {
+                "source": source,
+                "count": entry["count"],
+                "last_detected": entry["last_seen"],
+            }
+            for source, entry in stats.by_source().items()
+        ]
+        labels = daily.labels()
+        regtech_data = daily.get("REGTECH")
+        secudium_data = daily.get("SECUDIUM")
 
         return jsonify(
             {
@@ -107,421 +78,418 @@ def collection_status():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@collection_api_bp.route("/regtech/trigger", methods=["POST"])
-def trigger_regtech_collection():
-    """Trigger REGTECH collection with credentials"""
+@collection_api_bp.route("/daily-stats")
+def daily_collection_stats():
+    """Daily per-source IP counts (?days=<N> or ?start=&end=, up to 366 days)"""
     try:
-        # Get stored credentials from database
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        start, end = parse_day_range(request.args)
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
+    try:
+        conn = get_db_connection()
         try:
-            cursor.execute(
-                """
-                SELECT username, password 
-                FROM collection_credentials 
-                WHERE service_name = 'REGTECH'
+            daily = stats_rollup.daily(conn, start, end)
+        finally:
+            conn.close()
+
+        return jsonify({"success": True, **daily.to_dict()})
+
+    except Exception as e:
+        logger.error(f"Failed to get daily collection stats: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+def _get_regtech_credentials():
+    """Get stored REGTECH credentials from database ("" when missing)"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(
             """
+            SELECT username, password 
+            FROM collection_credentials 
+            WHERE service_name = 'REGTECH'
+        """
+        )
+        result = cursor.fetchone()
+        if result:
+            username = result["username"] or ""
+            password = result["password"] or ""
+            logger.info(
+                f"✅ Retrieved REGTECH credentials from database for user: {username}"
             )
-            result = cursor.fetchone()
-            if result:
-                username = result["username"] or ""
-                password = result["password"] or ""
-                logger.info(
-                    f"✅ Retrieved REGTECH credentials from database for user: {username}"
-                )
-            else:
-                username = ""
-                password = ""
-                logger.warning("⚠️ No REGTECH credentials found in database")
-        except Exception as e:
-            logger.error(f"Failed to retrieve credentials: {e}")
+        else:
             username = ""
             password = ""
-        finally:
-            cursor.close()
-            conn.close()
+            logger.warning("⚠️ No REGTECH credentials found in database")
+    except Exception as e:
+        logger.error(f"Failed to retrieve credentials: {e}")
+        username = ""
+        password = ""
+    finally:
+        cursor.close()
+        conn.close()
 
-        logger.info(
-            f"Starting REGTECH collection with stored credentials for user: {username}"
-        )
+    return username, password
 
-        # 실제 REGTECH API 호출 로직
-        if not (username and password):
-            return jsonify({"success": False, "error": "인증정보가 필요합니다"}), 400
 
-        # 실제 REGTECH collector 사용
-        try:
-            from ..collectors.regtech_collector_core import RegtechCollector
-            from ..collectors.unified_collector import CollectionConfig
+def _regtech_records(regtech_data):
+    """Map REGTECH items to blacklist_ips records (collector's single mapping)"""
+    from ..collectors.regtech_collector_core import RegtechCollector
 
-            # Collector 인스턴스 생성
-            config = CollectionConfig()
-            collector = RegtechCollector(config)
+    return RegtechCollector.to_records(regtech_data)
 
-            # 인증정보 설정
-            collector.username = username
-            collector.password = password
 
-            logger.info(f"✅ REGTECH collector 초기화 완료 - 사용자: {username}")
+def _secudium_records(secudium_data):
+    """Map SECUDIUM items to blacklist_ips records"""
+    # Process real SECUDIUM data
+    # Map threat level to confidence and category
+    threat_mapping = {
+        "high": {"confidence": 9, "category": "phishing"},
+        "medium": {"confidence": 7, "category": "suspicious"},
+        "low": {"confidence": 5, "category": "scanning"},
+    }
 
-            # 실제 데이터 수집 실행
-            result = collector.collect_from_web()
+    records = []
+    for record in secudium_data:
+        ip = record.get("ip")
+        if not ip:
+            logger.warning("IP 정보가 없는 레코드 스킵")
+            continue
+
+        threat_level = record.get("threat_level", "medium")
+        description = record.get("description", "SECUDIUM detected threat")
+
+        mapping = threat_mapping.get(
+            threat_level, {"confidence": 6, "category": "unknown"}
+        )
 
-            if result.get("success", False):
-                regtech_data = result.get("data", [])
-                logger.info(f"📡 REGTECH API에서 {len(regtech_data)}개 실제 위협 정보 수집완료")
-            else:
-                logger.error(f"❌ REGTECH 수집 실패: {result.get('error', 'Unknown error')}")
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error": f"REGTECH 수집 실패: {result.get('error', 'Unknown error')}",
-                        }
-                    ),
-                    500,
-                )
-
-        except ImportError as e:
-            logger.error(f"REGTECH collector 모듈 import 실패: {e}")
-            # Fallback to static data for now
-            regtech_data = [
+        records.append(
+            {
+                "ip_address": ip,
+                "reason": f"SECUDIUM Real Data: {description}",
+                "category": mapping["category"],
+                "confidence_level": mapping["confidence"],
+                "last_seen": datetime.now(),
+            }
+        )
+    return records
+
+
+def _job_response(record, created):
+    """Job accepted (202) or already running (409) response"""
+    body = {
+        "job_id": record["id"],
+        "status_url": f"/api/collection/jobs/{record['id']}",
+        "job": record,
+        "timestamp": datetime.now().isoformat(),
+    }
+    if not created:
+        return (
+            jsonify(
                 {
-                    "ip": "203.248.252.2",
-                    "threat_level": "high",
-                    "description": "Known malicious server",
-                    "detection_date": "2025-08-30",
-                    "source_country": "KR",
+                    "success": False,
+                    "error": f"이미 실행 중인 수집 작업이 있습니다 ({record['kind']})",
+                    **body,
                 }
-            ]
-            logger.info(f"📡 Fallback - 정적 데이터 {len(regtech_data)}개 사용")
-        except Exception as e:
-            logger.error(f"REGTECH collector 실행 실패: {e}")
-            return (
-                jsonify(
-                    {"success": False, "error": f"REGTECH collector 실행 실패: {str(e)}"}
-                ),
-                500,
-            )
+            ),
+            409,
+        )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": f"{record['kind']} collection job queued",
+                **body,
+            }
+        ),
+        202,
+    )
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Process real REGTECH data
-        processed_count = 0
-        for record in regtech_data:
-            ip = record.get("ip")
-            if not ip:  # IP가 없으면 스킵
-                logger.warning("IP 정보가 없는 레코드 스킵")
-                continue
-            threat_level = record.get("threat_level", "medium")
-            description = record.get("description", "REGTECH detected threat")
-            detection_date = record.get(
-                "detection_date", datetime.now().strftime("%Y-%m-%d")
-            )
 
-            # Map threat level to confidence and category
-            threat_mapping = {
-                "high": {"confidence": 9, "category": "malware"},
-                "medium": {"confidence": 7, "category": "suspicious"},
-                "low": {"confidence": 5, "category": "scanning"},
+def _run_regtech_collection(progress, username, password):
+    """REGTECH collection job body (runs on the collection job executor)"""
+    progress.stage("collecting")
+
+    # 실제 REGTECH collector 사용
+    try:
+        from ..collectors.regtech_collector_core import RegtechCollector
+        from ..collectors.unified_collector import CollectionConfig
+
+        # Collector 인스턴스 생성
+        config = CollectionConfig()
+        collector = RegtechCollector(config)
+
+        # 인증정보 설정
+        collector.username = username
+        collector.password = password
+        collector.set_progress(progress)
+        collector.set_cancel_token(progress.cancel_token)
+
+        logger.info(f"✅ REGTECH collector 초기화 완료 - 사용자: {username}")
+
+        # 실제 데이터 수집 실행
+        with metrics.time_collection("REGTECH") as outcome:
+            result = collector.collect_from_web()
+            if not result.get("success", False):
+                outcome["status"] = "failed"
+
+        if result.get("success", False):
+            regtech_data = result.get("data", [])
+            logger.info(f"📡 REGTECH API에서 {len(regtech_data)}개 실제 위협 정보 수집완료")
+        else:
+            logger.error(f"❌ REGTECH 수집 실패: {result.get('error', 'Unknown error')}")
+            return {
+                "success": False,
+                "error": f"REGTECH 수집 실패: {result.get('error', 'Unknown error')}",
             }
 
-            mapping = threat_mapping.get(
-                threat_level, {"confidence": 6, "category": "unknown"}
-            )
+    except ImportError as e:
+        logger.error(f"REGTECH collector 모듈 import 실패: {e}")
+        return {"success": False, "error": "REGTECH collector를 불러올 수 없습니다"}
+    except CollectionCancelled:
+        raise
+    except Exception as e:
+        logger.error(f"REGTECH collector 실행 실패: {e}")
+        return {"success": False, "error": f"REGTECH collector 실행 실패: {str(e)}"}
 
-            # Enhance confidence based on authentication
-            is_authenticated = bool(
-                username and password
-            )  # 유저명과 패스워드가 모두 있으면 인증된 것으로 처리
-            if is_authenticated:
-                mapping["confidence"] = min(10, mapping["confidence"] + 1)
-                logger.info(f"🔐 Enhanced confidence for authenticated user: {username}")
-
-            cursor.execute(
-                """
-                INSERT INTO blacklist_ips (ip_address, reason, source, category, confidence_level, is_active, last_seen)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (ip_address) DO UPDATE
-                SET last_seen = EXCLUDED.last_seen,
-                    confidence_level = EXCLUDED.confidence_level,
-                    is_active = EXCLUDED.is_active,
-                    detection_count = blacklist_ips.detection_count + 1
-            """,
-                (
-                    ip,
-                    f"REGTECH Real Data: {description}",
-                    "REGTECH",
-                    mapping["category"],
-                    mapping["confidence"],
-                    True,
-                    datetime.now(),
-                ),
-            )
-            processed_count += 1
+    # 유저명과 패스워드가 모두 있으면 인증된 것으로 처리
+    is_authenticated = bool(username and password)
+
+    # 수집 목록 동기화 - 바뀐 IP만 기록, 목록에서 빠진 REGTECH IP 비활성화
+    records = _regtech_records(regtech_data)
+    load = load_collected_records(
+        records, "REGTECH", reconcile=True, progress=progress
+    )
+    processed_count = load.staged
+
+    auth_status = "authenticated" if is_authenticated else "demo"
+    logger.info(
+        f"REGTECH collection completed ({auth_status}). Processed {processed_count} real records"
+    )
+
+    return {
+        "success": True,
+        "message": f"REGTECH collection completed with real data ({auth_status} mode)",
+        "collected": processed_count,
+        "authenticated": is_authenticated,
+        "data_source": "real_regtech_data",
+        "username": username if is_authenticated else None,
+        "load": load.to_dict(),
+        "timestamp": datetime.now().isoformat(),
+    }
 
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-        is_authenticated = bool(username and password)  # 유저명과 패스워드가 모두 있으면 인증된 것으로 처리
-        auth_status = "authenticated" if is_authenticated else "demo"
+@collection_api_bp.route("/regtech/trigger", methods=["POST"])
+def trigger_regtech_collection():
+    """Trigger REGTECH collection with credentials (background job, 202 + job ID)"""
+    try:
+        username, password = _get_regtech_credentials()
+
+        # 실제 REGTECH API 호출 로직
+        if not (username and password):
+            return jsonify({"success": False, "error": "인증정보가 필요합니다"}), 400
+
         logger.info(
-            f"REGTECH collection completed ({auth_status}). Processed {processed_count} real records"
+            f"Queueing REGTECH collection with stored credentials for user: {username}"
         )
-
-        return jsonify(
-            {
-                "success": True,
-                "message": f"REGTECH collection completed with real data ({auth_status} mode)",
-                "collected": processed_count,
-                "authenticated": is_authenticated,
-                "data_source": "real_regtech_data",
-                "enhanced_confidence": is_authenticated,
-                "username": username if is_authenticated else None,
-                "timestamp": datetime.now().isoformat(),
-            }
+        record, created = collection_jobs.submit(
+            "REGTECH",
+            lambda progress: _run_regtech_collection(progress, username, password),
         )
+        return _job_response(record, created)
 
     except Exception as e:
         logger.error(f"Failed to trigger REGTECH collection: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@collection_api_bp.route("/secudium/trigger", methods=["POST"])
-def trigger_secudium_collection():
-    """Trigger SECUDIUM collection with real data"""
-    try:
-        logger.info("Starting SECUDIUM collection...")
+def _run_secudium_collection(progress):
+    """SECUDIUM collection job body (runs on the collection job executor)"""
+    progress.stage("collecting")
 
-        # Use actual SECUDIUM collector
-        try:
-            from ..collectors.secudium_collector import SecudiumCollector
-            from ..collectors.unified_collector import CollectionConfig
+    # Use actual SECUDIUM collector
+    try:
+        from ..collectors.secudium_collector import SecudiumCollector
+        from ..collectors.unified_collector import CollectionConfig
 
-            config = CollectionConfig()
-            collector = SecudiumCollector(config)
+        config = CollectionConfig()
+        collector = SecudiumCollector(config)
+        collector.set_progress(progress)
+        collector.set_cancel_token(progress.cancel_token)
 
-            logger.info("✅ SECUDIUM collector 초기화 완료")
+        logger.info("✅ SECUDIUM collector 초기화 완료")
 
-            # 실제 데이터 수집 실행
+        # 실제 데이터 수집 실행
+        with metrics.time_collection("SECUDIUM") as outcome:
             result = collector.collect_from_web()
+            if not result.get("success", False):
+                outcome["status"] = "failed"
+
+        if result.get("success", False):
+            secudium_data = result.get("data", [])
+            logger.info(f"📡 SECUDIUM API에서 {len(secudium_data)}개 실제 위협 정보 수집완료")
+        else:
+            logger.error(f"❌ SECUDIUM 수집 실패: {result.get('error', 'Unknown error')}")
+            return {
+                "success": False,
+                "error": f"SECUDIUM 수집 실패: {result.get('error', 'Unknown error')}",
+            }
 
-            if result.get("success", False):
-                secudium_data = result.get("data", [])
-                logger.info(f"📡 SECUDIUM API에서 {len(secudium_data)}개 실제 위협 정보 수집완료")
-            else:
-                logger.error(
-                    f"❌ SECUDIUM 수집 실패: {result.get('error', 'Unknown error')}"
-                )
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error": f"SECUDIUM 수집 실패: {result.get('error', 'Unknown error')}",
-                        }
-                    ),
-                    500,
-                )
-
-        except ImportError as e:
-            logger.warning(f"SECUDIUM collector 모듈 import 실패: {e}")
-            # 실제 서비스에서는 에러를 반환
-            return (
-                jsonify({"success": False, "error": "SECUDIUM collector가 구현되지 않았습니다"}),
-                501,
-            )
-        except Exception as e:
-            logger.error(f"SECUDIUM collector 실행 실패: {e}")
-            return (
-                jsonify(
-                    {"success": False, "error": f"SECUDIUM collector 실행 실패: {str(e)}"}
-                ),
-                500,
-            )
-
-        # Process real SECUDIUM data
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        processed_count = 0
-        for record in secudium_data:
-            ip = record.get("ip")
-            if not ip:
-                logger.warning("IP 정보가 없는 레코드 스킵")
-                continue
-
-            threat_level = record.get("threat_level", "medium")
-            description = record.get("description", "SECUDIUM detected threat")
-            detection_date = record.get(
-                "detection_date", datetime.now().strftime("%Y-%m-%d")
-            )
+    except ImportError as e:
+        logger.warning(f"SECUDIUM collector 모듈 import 실패: {e}")
+        # 실제 서비스에서는 에러를 반환
+        return {"success": False, "error": "SECUDIUM collector가 구현되지 않았습니다"}
+    except CollectionCancelled:
+        raise
+    except Exception as e:
+        logger.error(f"SECUDIUM collector 실행 실패: {e}")
+        return {"success": False, "error": f"SECUDIUM collector 실행 실패: {str(e)}"}
 
-            # Map threat level to confidence and category
-            threat_mapping = {
-                "high": {"confidence": 9, "category": "phishing"},
-                "medium": {"confidence": 7, "category": "suspicious"},
-                "low": {"confidence": 5, "category": "scanning"},
-            }
+    records = _secudium_records(secudium_data)
 
-            mapping = threat_mapping.get(
-                threat_level, {"confidence": 6, "category": "unknown"}
-            )
+    load = load_collected_records(records, "SECUDIUM", progress=progress)
+    processed_count = load.staged
 
-            cursor.execute(
-                """
-                INSERT INTO blacklist_ips (ip_address, reason, source, category, confidence_level, is_active, last_seen)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (ip_address) DO UPDATE
-                SET last_seen = EXCLUDED.last_seen,
-                    confidence_level = EXCLUDED.confidence_level,
-                    is_active = EXCLUDED.is_active,
-                    detection_count = blacklist_ips.detection_count + 1
-            """,
-                (
-                    ip,
-                    f"SECUDIUM Real Data: {description}",
-                    "SECUDIUM",
-                    mapping["category"],
-                    mapping["confidence"],
-                    True,
-                    datetime.now(),
-                ),
-            )
-            processed_count += 1
+    logger.info(f"SECUDIUM collection completed. Processed {processed_count} real records")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+    return {
+        "success": True,
+        "message": "SECUDIUM collection completed with real data",
+        "collected": processed_count,
+        "data_source": "real_secudium_data",
+        "load": load.to_dict(),
+        "timestamp": datetime.now().isoformat(),
+    }
 
-        logger.info(
-            f"SECUDIUM collection completed. Processed {processed_count} real records"
-        )
 
-        return jsonify(
-            {
-                "success": True,
-                "message": "SECUDIUM collection completed with real data",
-                "collected": processed_count,
-                "data_source": "real_secudium_data",
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+@collection_api_bp.route("/secudium/trigger", methods=["POST"])
+def trigger_secudium_collection():
+    """Trigger SECUDIUM collection with real data (background job, 202 + job ID)"""
+    try:
+        logger.info("Queueing SECUDIUM collection...")
+        record, created = collection_jobs.submit("SECUDIUM", _run_secudium_collection)
+        return _job_response(record, created)
 
     except Exception as e:
         logger.error(f"Failed to trigger SECUDIUM collection: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@collection_api_bp.route("/trigger-all", methods=["POST"])
-def trigger_all_collections():
-    """Trigger all collections with real collectors"""
-    try:
-        logger.info("Starting all collections...")
+def _run_all_collections(progress):
+    """All-sources collection job body - sources run concurrently (orchestrator)"""
+    from ..collectors.orchestrator import collection_orchestrator
+
+    def prepare(source, collector):
+        # Get credentials from database
+        if source == "REGTECH":
+            username, password = _get_regtech_credentials()
+            if username or password:
+                collector.username = username
+                collector.password = password
+
+    def ingest(source, data):
+        # 완료된 소스부터 공유 적재 단계에서 순서대로 병합 (다른 소스 수집과 겹침)
+        if source == "REGTECH":
+            records = _regtech_records(data)
+            load = load_collected_records(
+                records, source, reconcile=True, progress=progress
+            )
+        else:
+            records = _secudium_records(data)
+            load = load_collected_records(records, source, progress=progress)
+        return load.to_dict()
 
-        results = {"regtech": False, "secudium": False, "total_collected": 0}
+    logger.info(
+        f"Starting all collections: {', '.join(collection_orchestrator.sources())}"
+    )
+    outcome = collection_orchestrator.run(
+        progress=progress, prepare=prepare, ingest=ingest
+    )
 
-        # Trigger REGTECH Collection
-        try:
-            from ..collectors.regtech_collector_core import RegtechCollector
-            from ..collectors.unified_collector import CollectionConfig
-
-            config = CollectionConfig()
-            regtech_collector = RegtechCollector(config)
-
-            # Get credentials from database
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            try:
-                cursor.execute(
-                    """
-                    SELECT username, password 
-                    FROM collection_credentials 
-                    WHERE service_name = 'REGTECH'
-                """
-                )
-                result = cursor.fetchone()
-                if result:
-                    regtech_collector.username = result["username"] or ""
-                    regtech_collector.password = result["password"] or ""
-            except Exception as e:
-                logger.warning(f"Failed to get REGTECH credentials: {e}")
-            finally:
-                cursor.close()
-                conn.close()
-
-            # Collect from REGTECH
-            regtech_result = regtech_collector.collect_from_web()
-            if regtech_result.get("success", False):
-                regtech_count = len(regtech_result.get("data", []))
-                results["regtech"] = True
-                results["total_collected"] += regtech_count
-                logger.info(f"✅ REGTECH: {regtech_count}개 수집 완료")
-            else:
-                logger.error(
-                    f"❌ REGTECH collection failed: {regtech_result.get('error')}"
-                )
-
-        except Exception as e:
-            logger.error(f"REGTECH collection error: {e}")
-
-        # Trigger SECUDIUM Collection
-        try:
-            from ..collectors.secudium_collector import SecudiumCollector
-
-            secudium_collector = SecudiumCollector(config)
-            secudium_result = secudium_collector.collect_from_web()
-
-            if secudium_result.get("success", False):
-                secudium_count = len(secudium_result.get("data", []))
-                results["secudium"] = True
-                results["total_collected"] += secudium_count
-                logger.info(f"✅ SECUDIUM: {secudium_count}개 수집 완료")
-            else:
-                logger.error(
-                    f"❌ SECUDIUM collection failed: {secudium_result.get('error')}"
-                )
-
-        except ImportError:
-            logger.warning("SECUDIUM collector not implemented")
-        except Exception as e:
-            logger.error(f"SECUDIUM collection error: {e}")
+    logger.info(
+        f"All collections completed. Total: {outcome['total_collected']} IPs "
+        f"in {outcome['wall_sec']:.1f}s"
+    )
 
-        logger.info(
-            f"All collections completed. Total: {results['total_collected']} IPs"
-        )
+    result = {
+        "success": outcome["success"],
+        "message": "All collections completed with real data",
+        "results": outcome["results"],
+        "total_collected": outcome["total_collected"],
+        "wall_sec": outcome["wall_sec"],
+        "data_source": "real_collectors",
+        "timestamp": datetime.now().isoformat(),
+    }
+    if not outcome["success"]:
+        result["error"] = "모든 소스 수집 실패"
+    return result
 
-        return jsonify(
-            {
-                "success": True,
-                "message": "All collections completed with real data",
-                "results": results,
-                "data_source": "real_collectors",
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+
+@collection_api_bp.route("/trigger-all", methods=["POST"])
+def trigger_all_collections():
+    """Trigger all collections with real collectors (background job, 202 + job ID)"""
+    try:
+        logger.info("Queueing all collections...")
+        record, created = collection_jobs.submit(JOB_KIND_ALL, _run_all_collections)
+        return _job_response(record, created)
 
     except Exception as e:
         logger.error(f"Failed to trigger all collections: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@collection_api_bp.route("/jobs")
+def list_collection_jobs():
+    """Recent collection jobs (?limit=<N>, default 20)"""
+    try:
+        limit = int(request.args.get("limit", "20"))
+    except ValueError:
+        return jsonify({"success": False, "error": "limit는 정수여야 합니다"}), 400
+
+    return jsonify(
+        {"success": True, "jobs": collection_jobs.list(limit if limit > 0 else None)}
+    )
+
+
+@collection_api_bp.route("/jobs/<job_id>")
+def get_collection_job(job_id):
+    """Collection job status and progress (pages, rows, bytes, rate)"""
+    record = collection_jobs.get(job_id)
+    if record is None:
+        return jsonify({"success": False, "error": "작업을 찾을 수 없습니다"}), 404
+    return jsonify({"success": True, "job": record})
+
+
 @collection_api_bp.route("/stop", methods=["POST"])
 def stop_collection():
-    """Stop ongoing collection"""
+    """Cancel queued/running collection jobs (job_id in JSON body or query, else all)"""
     try:
-        logger.info("Stopping collection...")
-
-        # In a real implementation, this would stop background tasks
-        # For now, just return success
+        data = request.get_json(silent=True)
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "요청 본문은 JSON 객체여야 합니다"}), 400
+        job_id = data.get("job_id")
+        if job_id is not None and not isinstance(job_id, str):
+            return jsonify({"success": False, "error": "job_id는 문자열이어야 합니다"}), 400
+        job_id = job_id or request.args.get("job_id")
+        logger.info(f"Stopping collection... ({job_id or 'all jobs'})")
+
+        if job_id and collection_jobs.get(job_id) is None:
+            return jsonify({"success": False, "error": "작업을 찾을 수 없습니다"}), 404
+
+        cancelled = collection_jobs.cancel(job_id)
 
         return jsonify(
             {
                 "success": True,
-                "message": "Collection stopped",
+                "message": "Collection stop requested"
+                if cancelled
+                else "No running collection",
+                "cancelled": cancelled,
                 "timestamp": datetime.now().isoformat(),
             }
         )
@@ -358,6 +358,35 @@ SIMPLE_PANEL_HTML = """
             }, 2000);
         }
 
+        function pollCollectionJob(jobId, label) {
+            fetch(`/api/collection/jobs/${jobId}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.success) return;
+                    const job = data.job;
+                    const progress = job.progress || {};
+                    const statusEl = document.getElementById('collection-status');
+                    if (job.status === 'queued' || job.status === 'running') {
+                        statusEl.textContent = `${label} 수집 중... ${progress.pages || 0}페이지, ` +
+                            `${progress.rows || 0}건 (${progress.rows_per_sec || 0}건/초)`;
+                        setTimeout(() => pollCollectionJob(jobId, label), 2000);
+                    } else if (job.status === 'cancelled') {
+                        statusEl.textContent = `${label} 수집 중지됨 (${progress.rows || 0}건 폐기)`;
+                        showStatus(`${label} 수집이 중지되었습니다`, 'success');
+                    } else if (job.status === 'succeeded') {
+                        statusEl.textContent = `${label} 수집 완료 (${progress.rows || 0}건, ${progress.elapsed_sec || 0}초)`;
+                        showStatus(`${label} 수집이 완료되었습니다`, 'success');
+                        refreshData();
+                    } else {
+                        statusEl.textContent = `${label} 수집 실패`;
+                        showStatus(`${label} 수집 실패: ${job.error || job.status}`, 'error');
+                    }
+                })
+                .catch(error => {
+                    console.error('수집 작업 상태 조회 실패:', error);
+                });
+        }
+
         function collectAll() {
             showStatus('전체 수집을 시작합니다...', 'info');
             document.getElementById('collection-status').textContent = '수집 진행 중... (예상 시간: 2-5분)';
@@ -368,6 +397,7 @@ SIMPLE_PANEL_HTML = """
                 .then(data => {
                     if (data.success) {
                         showStatus('전체 수집이 시작되었습니다', 'success');
+                        pollCollectionJob(data.job_id, '전체');
                     } else {
                         showStatus('수집 시작 실패: ' + data.error, 'error');
                     }
@@ -396,6 +426,7 @@ SIMPLE_PANEL_HTML = """
                 .then(data => {
                     if (data.success) {
                         showStatus('REGTECH 수집이 시작되었습니다', 'success');
+                        pollCollectionJob(data.job_id, 'REGTECH');
                     } else {
                         showStatus('REGTECH 수집 실패: ' + data.error, 'error');
                     }
@@ -414,6 +445,7 @@ SIMPLE_PANEL_HTML = """
                 .then(data => {
                     if (data.success) {
                         showStatus('SECUDIUM 수집이 시작되었습니다', 'success');
+                        pollCollectionJob(data.job_id, 'SECUDIUM');
                     } else {
                         showStatus('SECUDIUM 수집 실패: ' + data.error, 'error');
                     }
@@ -425,11 +457,21 @@ SIMPLE_PANEL_HTML = """
 
         function stopCollection() {
             showStatus('수집을 중지합니다...', 'info');
-            document.getElementById('collection-status').textContent = '수집 중지됨';
-            
-            setTimeout(() => {
-                showStatus('수집이 중지되었습니다', 'success');
-            }, 1000);
+
+            fetch('/api/collection/stop', { method: 'POST' })
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.success) {
+                        showStatus('수집 중지 실패: ' + data.error, 'error');
+                    } else if (data.cancelled.length) {
+                        showStatus('수집 중지를 요청했습니다', 'success');
+                    } else {
+                        showStatus('실행 중인 수집이 없습니다', 'info');
+                    }
+                })
+                .catch(error => {
+                    showStatus('수집 중지 요청 실패: ' + error, 'error');
+                });
         }
 
         function updateSchedule() {
@@ -502,14 +544,9 @@ def simple_collection_panel():
 def get_credentials():
     """저장된 인증정보 조회"""
     try:
-        import psycopg2
+        from src.core.database.connection_pool import db_pool
 
-        conn = psycopg2.connect(
-            host="blacklist-postgres",
-            database="blacklist",
-            user="postgres",
-            password="postgres",
-        )
+        conn = db_pool.getconn()
         cur = conn.cursor()
 
         # 저장된 인증정보 조회
@@ -561,14 +598,9 @@ def save_credentials():
         data = request.get_json()
 
         # PostgreSQL에 인증정보 저장
-        import psycopg2
+        from src.core.database.connection_pool import db_pool
 
-        conn = psycopg2.connect(
-            host="blacklist-postgres",
-            database="blacklist",
-            user="postgres",
-            password="postgres",
-        )
+        conn = db_pool.getconn()
         cur = conn.cursor()
 
         # REGTECH 인증정보 업데이트
@@ -618,14 +650,9 @@ def save_credentials():
 def get_collection_logs():
     """수집 로그 조회"""
     try:
-        import psycopg2
+        from src.core.database.connection_pool import db_pool
 
-        conn = psycopg2.connect(
-            host="blacklist-postgres",
-            database="blacklist",
-            user="postgres",
-            password="postgres",
-        )
+        conn = db_pool.getconn()
         cur = conn.cursor()
 
         cur.execute(
@@ -694,27 +721,21 @@ def get_collection_logs():
 def get_real_stats():
     """실시간 통계 데이터"""
     try:
-        import psycopg2
+        from src.core.database.connection_pool import db_pool
 
-        conn = psycopg2.connect(
-            host="blacklist-postgres",
-            database="blacklist",
-            user="postgres",
-            password="postgres",
-        )
-        cur = conn.cursor()
+        from src.core.services.stats_rollup import stats_rollup
 
-        # 총 IP 수
-        cur.execute("SELECT COUNT(*) FROM blacklist_ips")
-        total_ips = cur.fetchone()[0]
+        conn = db_pool.getconn()
 
-        # 활성 IP 수
-        cur.execute("SELECT COUNT(*) FROM blacklist_ips WHERE is_active = true")
-        active_ips = cur.fetchone()[0]
+        # 총/활성/소스별 IP 수 (집계 테이블)
+        stats = stats_rollup.read(conn)
+        total_ips = stats.total_ips
+        active_ips = stats.active_ips
+        source_stats = {
+            source: entry["count"] for source, entry in stats.by_source().items()
+        }
 
-        # 소스별 IP 수
-        cur.execute("SELECT source, COUNT(*) FROM blacklist_ips GROUP BY source")
-        source_stats = dict(cur.fetchall())
+        cur = conn.cursor()
 
         # 활성 서비스 수 (인증정보가 있는 서비스)
         cur.execute(
@@ -723,11 +744,9 @@ def get_real_stats():
         active_services = cur.fetchone()[0]
 
         # 마지막 수집 시간
-        cur.execute("SELECT MAX(last_seen) FROM blacklist_ips")
-        last_collection_result = cur.fetchone()
         last_collection = "Never"
-        if last_collection_result and last_collection_result[0]:
-            last_collection = last_collection_result[0].strftime("%Y-%m-%d %H:%M")
+        if stats.last_seen:
+            last_collection = stats.last_seen.strftime("%Y-%m-%d %H:%M")
 
         conn.close()
 
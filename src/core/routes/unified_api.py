@@ -1,28 +1,39 @@
 """
 새로운 통합 API - collection_api 방식 사용
 """
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+import json
 import logging
 import os
 from datetime import datetime
-import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from src.core.database.async_pool import async_db
+from src.core.database.connection_pool import db_pool
+from src.core.database.query_stats import query_stats
+from src.core.services.blacklist_service import service
+from src.core.services.data_version import DataVersion
+from src.core.services.feed_cache import aggregated_variant, feed_cache
+from src.core.services.profiler import request_profiler
+from src.core.services.stats_rollup import stats_rollup
+from src.core.utils.http_cache import feed_response, not_modified, set_validators
+from src.core.utils.validators import (
+    ValidationError,
+    parse_cidr_aggregation,
+    validate_ip,
+)
+
 logger = logging.getLogger(__name__)
 unified_api_bp = Blueprint("unified_api", __name__, url_prefix="/api")
 
+# 배치 IP 검색 최대 개수
+MAX_BATCH_SEARCH_IPS = int(os.getenv("MAX_BATCH_SEARCH_IPS", "100000"))
+
 
 # Database connection helper (collection_api와 동일)
 def get_db_connection():
-    """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv("POSTGRES_HOST", "postgres"),
-        port=os.getenv("POSTGRES_PORT", "5432"),
-        database=os.getenv("POSTGRES_DB", "blacklist"),
-        user=os.getenv("POSTGRES_USER", "postgres"),
-        password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-        cursor_factory=RealDictCursor,
-    )
+    """Get database connection (공유 커넥션 풀에서 대여, close() 시 반환)"""
+    return db_pool.getconn(cursor_factory=RealDictCursor)
 
 
 @unified_api_bp.route("/stats")
@@ -30,56 +41,27 @@ def get_statistics():
     """시스템 통계"""
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # 전체 통계
-        cursor.execute("SELECT COUNT(*) as count FROM blacklist_ips")
-        total_ips = cursor.fetchone()["count"]
-
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM blacklist_ips WHERE is_active = true"
-        )
-        active_ips = cursor.fetchone()["count"]
+        try:
+            stats = stats_rollup.read(conn)
+        finally:
+            conn.close()
 
         # 소스별 통계
-        cursor.execute(
-            """
-            SELECT source, COUNT(*) as count, AVG(confidence_level) as avg_confidence
-            FROM blacklist_ips 
-            GROUP BY source
-        """
-        )
-        sources = {}
-        for row in cursor.fetchall():
-            sources[row["source"]] = {
-                "count": row["count"],
-                "avg_confidence": float(row["avg_confidence"])
-                if row["avg_confidence"]
-                else 0,
+        sources = {
+            source: {
+                "count": entry["count"],
+                "avg_confidence": entry["avg_confidence"],
             }
-
-        # 카테고리별 통계
-        cursor.execute(
-            """
-            SELECT category, COUNT(*) as count 
-            FROM blacklist_ips 
-            GROUP BY category
-        """
-        )
-        categories = {}
-        for row in cursor.fetchall():
-            categories[row["category"]] = row["count"]
-
-        cursor.close()
-        conn.close()
+            for source, entry in stats.by_source().items()
+        }
 
         return jsonify(
             {
                 "success": True,
-                "total_ips": total_ips,
-                "active_ips": active_ips,
+                "total_ips": stats.total_ips,
+                "active_ips": stats.active_ips,
                 "sources": sources,
-                "categories": categories,
+                "categories": stats.by_category(),
                 "last_updated": datetime.now().isoformat(),
             }
         )
@@ -91,29 +73,32 @@ def get_statistics():
 
 @unified_api_bp.route("/blacklist/active")
 def get_active_blacklist():
-    """활성 블랙리스트 조회 (텍스트)"""
+    """활성 블랙리스트 조회 (텍스트, ?aggregate=cidr&density=<0~1> 시 CIDR 집약)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        aggregate, density = parse_cidr_aggregation(request.args)
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
-        cursor.execute(
-            "SELECT ip_address FROM blacklist_ips WHERE is_active = true ORDER BY last_seen DESC"
-        )
-        ips = [row["ip_address"] for row in cursor.fetchall()]
-
-        cursor.close()
-        conn.close()
-
-        # 텍스트 형식으로 반환
-        response = Response(
-            "\n".join(ips) + "\n",
-            mimetype="text/plain",
-            headers={
-                "Cache-Control": "public, max-age=300",
-                "Content-Disposition": 'inline; filename="blacklist.txt"',
-            },
+    try:
+
+        def build(snapshot) -> bytes:
+            ips = (
+                snapshot.render_aggregated("text", density)
+                if aggregate
+                else snapshot.render("text")
+            )
+            return ("\n".join(ips) + "\n").encode("utf-8")
+
+        # 텍스트 형식으로 반환 (데이터 버전별 사전 압축본)
+        return feed_response(
+            feed_cache,
+            service.get_data_version(),
+            service.get_active_snapshot,
+            aggregated_variant("text", density) if aggregate else "text",
+            "text/plain",
+            build,
+            headers={"Content-Disposition": 'inline; filename="blacklist.txt"'},
         )
-        return response
 
     except Exception as e:
         logger.error(f"Active blacklist retrieval failed: {e}")
@@ -122,66 +107,109 @@ def get_active_blacklist():
 
 @unified_api_bp.route("/blacklist/json")
 def get_blacklist_json():
-    """활성 블랙리스트 JSON 형식"""
+    """활성 블랙리스트 JSON 형식 (?stream=true 시 서버 사이드 커서 스트리밍)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT ip_address, reason, source, category, confidence_level, 
-                   is_active, last_seen, detection_count
-            FROM blacklist_ips 
-            WHERE is_active = true 
-            ORDER BY last_seen DESC
-        """
+        if request.args.get("stream", "").lower() in ("1", "true", "yes"):
+            # DB에서 직접 스트리밍 - 본문은 항상 이 버전 이상
+            version = service.get_data_version()
+            cached = not_modified(version.etag("json-stream"), version.updated_at)
+            if cached is not None:
+                return cached
+
+            stream = service.stream_active_blacklist_json()
+            response = Response(
+                stream_with_context(stream), mimetype="application/json"
+            )
+            response.call_on_close(stream.close)
+            return set_validators(
+                response, version.etag("json-stream"), version.updated_at
+            )
+
+        def build(snapshot) -> bytes:
+            data = snapshot.render("json")
+            return jsonify(
+                {
+                    "success": True,
+                    "data": data,
+                    "count": len(data),
+                    "timestamp": snapshot.updated_at.isoformat(),
+                }
+            ).get_data()
+
+        return feed_response(
+            feed_cache,
+            service.get_data_version(),
+            service.get_active_snapshot,
+            "json",
+            "application/json",
+            build,
         )
 
-        data = []
-        for row in cursor.fetchall():
-            item = dict(row)
-            if item["last_seen"]:
-                item["last_seen"] = item["last_seen"].isoformat()
-            data.append(item)
+    except Exception as e:
+        logger.error(f"JSON blacklist retrieval failed: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
 
-        cursor.close()
-        conn.close()
 
-        return jsonify(
-            {
-                "success": True,
-                "data": data,
-                "count": len(data),
-                "timestamp": datetime.now().isoformat(),
-            }
+@unified_api_bp.route("/blacklist/delta")
+def get_blacklist_delta():
+    """since 버전 이후 변경분 (보존 범위 초과 시 전체 목록)"""
+    try:
+        since = int(request.args.get("since", ""))
+    except ValueError:
+        return (
+            jsonify({"success": False, "error": "since 파라미터(정수 버전)가 필요합니다"}),
+            400,
+        )
+
+    try:
+        version = service.get_data_version()
+        etag = version.etag(f"delta-{since}")
+        cached = not_modified(etag, version.updated_at)
+        if cached is not None:
+            return cached
+
+        result = service.get_blacklist_delta(since)
+        served = DataVersion(
+            result["version"], datetime.fromisoformat(result["timestamp"])
+        )
+        return set_validators(
+            jsonify(result), served.etag(f"delta-{since}"), served.updated_at
         )
 
     except Exception as e:
-        logger.error(f"JSON blacklist retrieval failed: {e}")
+        logger.error(f"Blacklist delta retrieval failed: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
 @unified_api_bp.route("/fortigate")
 def get_fortigate_format():
-    """FortiGate External Connector 형식"""
+    """FortiGate External Connector 형식 (?aggregate=cidr 시 CIDR 집약)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT ip_address FROM blacklist_ips WHERE is_active = true")
-        ips = [row["ip_address"] for row in cursor.fetchall()]
+        aggregate, density = parse_cidr_aggregation(request.args)
+    except ValidationError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
-        cursor.close()
-        conn.close()
-
-        data = {
-            "entries": [{"ip": ip, "action": "block"} for ip in ips],
-            "total": len(ips),
-            "format": "fortigate_external_connector",
-            "timestamp": datetime.now().isoformat(),
-        }
+    try:
 
-        return jsonify(data)
+        def build(snapshot) -> bytes:
+            data = {
+                **(
+                    snapshot.render_aggregated("fortigate", density)
+                    if aggregate
+                    else snapshot.render("fortigate")
+                ),
+                "timestamp": snapshot.updated_at.isoformat(),
+            }
+            return jsonify(data).get_data()
+
+        return feed_response(
+            feed_cache,
+            service.get_data_version(),
+            service.get_active_snapshot,
+            aggregated_variant("fortigate", density) if aggregate else "fortigate",
+            "application/json",
+            build,
+        )
 
     except Exception as e:
         logger.error(f"FortiGate format retrieval failed: {e}")
@@ -190,51 +218,53 @@ def get_fortigate_format():
 
 @unified_api_bp.route("/search/<ip>")
 def search_single_ip(ip: str):
-    """단일 IP 검색"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT ip_address, reason, source, category, confidence_level, 
-                   is_active, last_seen, detection_count
-            FROM blacklist_ips 
-            WHERE ip_address = %s
-        """,
-            (ip,),
-        )
+    """단일 IP 검색 (활성 스냅샷 인덱스 기반)"""
+    if not validate_ip(ip):
+        return jsonify({"success": False, "error": f"유효하지 않은 IP 주소: {ip}"}), 400
 
-        result = cursor.fetchone()
-        cursor.close()
-        conn.close()
+    result = service.lookup_ip(ip)
+    if result["success"]:
+        return jsonify(result)
 
-        if result:
-            data = dict(result)
-            if data["last_seen"]:
-                data["last_seen"] = data["last_seen"].isoformat()
+    return jsonify(result), 500
 
-            return jsonify(
-                {
-                    "success": True,
-                    "found": True,
-                    "data": data,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
-        else:
-            return jsonify(
+
+@unified_api_bp.route("/search", methods=["POST"])
+def search_batch_ips():
+    """배치 IP 검색 (?format=ndjson 또는 Accept: application/x-ndjson 시 스트리밍)"""
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get("ips"), list):
+        return jsonify({"success": False, "error": "IP 목록(ips 배열)이 필요합니다"}), 400
+
+    ips = data["ips"]
+    if not all(isinstance(ip, str) for ip in ips):
+        return jsonify({"success": False, "error": "IP 목록은 문자열 배열이어야 합니다"}), 400
+    if len(ips) > MAX_BATCH_SEARCH_IPS:
+        return (
+            jsonify(
                 {
-                    "success": True,
-                    "found": False,
-                    "data": None,
-                    "timestamp": datetime.now().isoformat(),
+                    "success": False,
+                    "error": f"IP 목록은 {MAX_BATCH_SEARCH_IPS}개 이하여야 합니다",
                 }
-            )
+            ),
+            400,
+        )
 
-    except Exception as e:
-        logger.error(f"IP search failed for {ip}: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    wants_ndjson = (
+        request.args.get("format") == "ndjson"
+        or request.accept_mimetypes.best == "application/x-ndjson"
+    )
+    if wants_ndjson:
+        return Response(
+            stream_with_context(
+                json.dumps(result, ensure_ascii=False) + "\n"
+                for result in service.iter_lookup_ips(ips)
+            ),
+            mimetype="application/x-ndjson",
+        )
+
+    result = service.lookup_ips(ips)
+    return jsonify(result), (200 if result["success"] else 500)
 
 
 @unified_api_bp.route("/status")
@@ -242,37 +272,24 @@ def service_status():
     """서비스 상태 조회"""
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # 기본 헬스 체크
-        cursor.execute("SELECT COUNT(*) as count FROM blacklist_ips")
-        ip_count = cursor.fetchone()["count"]
-
-        # 소스별 통계
-        cursor.execute(
-            """
-            SELECT source, COUNT(*) as count, MAX(last_seen) as last_seen
-            FROM blacklist_ips 
-            GROUP BY source
-        """
-        )
-        sources = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
+        try:
+            stats = stats_rollup.read(conn)
+        finally:
+            conn.close()
 
         components = {
-            "database": {"status": "healthy", "ip_count": ip_count},
+            "database": {"status": "healthy", "ip_count": stats.total_ips},
             "regtech": {"status": "healthy", "enabled": True},
             "secudium": {"status": "healthy", "enabled": True},
         }
 
+        # 소스별 통계
         source_stats = {}
-        for source in sources:
-            source_stats[source["source"].lower()] = {
-                "total_ips": source["count"],
-                "last_seen": source["last_seen"].isoformat()
-                if source["last_seen"]
+        for source, entry in stats.by_source().items():
+            source_stats[source.lower()] = {
+                "total_ips": entry["count"],
+                "last_seen": entry["last_seen"].isoformat()
+                if entry["last_seen"]
                 else None,
                 "enabled": True,
             }
@@ -287,7 +304,7 @@ def service_status():
                 },
                 "components": components,
                 "sources": source_stats,
-                "collection": {"collection_enabled": True, "total_ips": ip_count},
+                "collection": {"collection_enabled": True, "total_ips": stats.total_ips},
                 "healthy": True,
             }
         )
@@ -309,3 +326,36 @@ def service_status():
             ),
             500,
         )
+
+
+@unified_api_bp.route("/internal/query-stats", methods=["GET", "DELETE"])
+def internal_query_stats():
+    """
+    쿼리 지문별 지연시간/행 수/오류 통계 (모든 워커 합산, DELETE 시 전체 초기화)
+    - 프로파일러와 같은 관리자 토큰 필요 (X-Profile-Token == PROFILE_TOKEN)
+    - pool / async 항목은 응답한 워커 프로세스(pid) 기준
+    """
+    if not request_profiler.authorized(request.headers.get("X-Profile-Token")):
+        return jsonify({"success": False, "error": "관리자 토큰이 필요합니다"}), 403
+
+    if request.method == "DELETE":
+        query_stats.reset()
+        return jsonify({"success": True, "reset": True})
+
+    try:
+        limit = int(request.args.get("limit", "50"))
+    except ValueError:
+        return jsonify({"success": False, "error": "limit는 정수여야 합니다"}), 400
+
+    return jsonify(
+        {
+            "success": True,
+            **query_stats.collect(
+                limit=limit if limit > 0 else None,
+                sort=request.args.get("sort", "total_ms"),
+            ),
+            "pid": os.getpid(),
+            "pool": db_pool.get_pool_stats(),
+            "async": async_db.get_stats(),
+        }
+    )
@@ -3,14 +3,26 @@
 모든 블랙리스트 관련 비즈니스 로직을 처리하는 서비스 클래스
 """
 import os
-import psycopg2
+import asyncio
+import ipaddress
 from psycopg2.extras import RealDictCursor
 import logging
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from dataclasses import dataclass
 
+from src.core.database.async_pool import async_db
+from src.core.database.connection_pool import db_pool
+from src.core.services.blacklist_snapshot import (
+    ActiveBlacklistSnapshot,
+    BlacklistSnapshotCache,
+)
+from src.core.services.change_log import change_log
+from src.core.services.data_version import DataVersion, data_version
+from src.core.services.shared_snapshot import SharedSnapshotStore
+from src.core.services.stats_rollup import stats_rollup
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +36,59 @@ class HealthStatus:
     components: Dict[str, Any]
 
 
+class JsonExportStream:
+    """
+    서버 사이드 커서 JSON 스트림 (쿼리 실행 완료 상태로 생성)
+    close() 시 연결을 풀에 반환 - 반복을 시작하지 않은 채 응답이 닫혀도 호출됨
+    """
+
+    def __init__(self, conn, cursor, fetch_size: int):
+        self._conn = conn
+        self._cursor = cursor
+        self._fetch_size = fetch_size
+
+    def __iter__(self) -> Iterator[str]:
+        count = 0
+        try:
+            yield '{"data": ['
+            while True:
+                rows = self._cursor.fetchmany(self._fetch_size)
+                if not rows:
+                    break
+
+                items = []
+                for row in rows:
+                    item = dict(row)
+                    item["ip_address"] = str(item["ip_address"])
+                    item["last_seen"] = (
+                        item["last_seen"].isoformat() if item["last_seen"] else None
+                    )
+                    item["detection_count"] = item.get("detection_count") or 0
+                    items.append(json.dumps(item, ensure_ascii=False))
+
+                yield ("," if count else "") + ",".join(items)
+                count += len(items)
+
+            self._cursor.close()
+            trailer = {
+                "count": count,
+                "success": True,
+                "timestamp": datetime.now().isoformat(),
+            }
+            yield "], " + json.dumps(trailer)[1:]
+
+        except Exception as e:
+            # 응답 헤더와 여는 괄호가 이미 전송되었으므로 JSON을 닫으며 오류를 기록
+            logger.error(f"JSON blacklist streaming failed after {count} rows: {e}")
+            trailer = {"count": count, "success": False, "error": str(e)}
+            yield "], " + json.dumps(trailer)[1:]
+        finally:
+            self.close()
+
+    def close(self):
+        self._conn.close()
+
+
 class BlacklistService:
     """통합 블랙리스트 서비스"""
 
@@ -36,32 +101,31 @@ class BlacklistService:
             "password": os.getenv("POSTGRES_PASSWORD", "postgres"),
         }
         self._components = {"regtech": True, "secudium": True, "database": True}
+        self._snapshot_cache = BlacklistSnapshotCache(
+            self._load_active_rows,
+            version_provider=data_version.current,
+            store=(
+                SharedSnapshotStore()
+                if os.getenv("BLACKLIST_SHARED_SNAPSHOT", "true").lower() == "true"
+                else None
+            ),
+        )
 
     def get_db_connection(self):
-        """데이터베이스 연결 획득"""
-        return psycopg2.connect(
-            host=os.getenv("POSTGRES_HOST", "postgres"),
-            port=os.getenv("POSTGRES_PORT", "5432"),
-            database=os.getenv("POSTGRES_DB", "blacklist"),
-            user=os.getenv("POSTGRES_USER", "postgres"),
-            password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-            cursor_factory=RealDictCursor,
-        )
+        """데이터베이스 연결 획득 (공유 커넥션 풀, close() 시 반환)"""
+        return db_pool.getconn(cursor_factory=RealDictCursor)
 
     def get_health(self) -> HealthStatus:
         """시스템 헬스 상태 반환"""
         try:
             conn = self.get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT COUNT(*) as count FROM blacklist_ips")
-            ip_count = cursor.fetchone()["count"]
-
-            cursor.close()
-            conn.close()
+            try:
+                stats = stats_rollup.read(conn)
+            finally:
+                conn.close()
 
             components = {
-                "database": {"status": "healthy", "ip_count": ip_count},
+                "database": {"status": "healthy", "ip_count": stats.total_ips},
                 "regtech": {"status": "healthy", "enabled": True},
                 "secudium": {"status": "healthy", "enabled": True},
             }
@@ -85,33 +149,24 @@ class BlacklistService:
         """수집 상태 반환"""
         try:
             conn = self.get_db_connection()
-            cursor = conn.cursor()
-
-            # 소스별 통계
-            cursor.execute(
-                """
-                SELECT source, COUNT(*) as count, MAX(last_seen) as last_seen
-                FROM blacklist_ips 
-                GROUP BY source
-            """
-            )
-            sources = cursor.fetchall()
-
-            cursor.close()
-            conn.close()
+            try:
+                stats = stats_rollup.read(conn)
+            finally:
+                conn.close()
 
             status = {
                 "collection_enabled": True,
                 "sources": {},
-                "total_ips": sum(s["count"] for s in sources),
+                "total_ips": stats.total_ips,
                 "last_updated": datetime.now().isoformat(),
             }
 
-            for source in sources:
-                status["sources"][source["source"].lower()] = {
-                    "total_ips": source["count"],
-                    "last_seen": source["last_seen"].isoformat()
-                    if source["last_seen"]
+            # 소스별 통계
+            for source, entry in stats.by_source().items():
+                status["sources"][source.lower()] = {
+                    "total_ips": entry["count"],
+                    "last_seen": entry["last_seen"].isoformat()
+                    if entry["last_seen"]
                     else None,
                     "enabled": True,
                 }
@@ -121,59 +176,125 @@ class BlacklistService:
             logger.error(f"Collection status check failed: {e}")
             return {"error": str(e), "collection_enabled": False}
 
-    async def get_active_blacklist(self, format_type: str = "text") -> Dict[str, Any]:
-        """활성 블랙리스트 조회"""
+    def _load_active_rows(self) -> List[Dict[str, Any]]:
+        """활성 블랙리스트 전체 조회 (스냅샷 생성용)"""
+        conn = self.get_db_connection()
         try:
-            conn = self.get_db_connection()
             cursor = conn.cursor()
-
-            if format_type == "enhanced":
-                cursor.execute(
-                    """
-                    SELECT ip_address, reason, source, category, confidence_level, 
-                           is_active, last_seen, detection_count
-                    FROM blacklist_ips 
-                    WHERE is_active = true 
-                    ORDER BY last_seen DESC
+            cursor.execute(
                 """
+                SELECT ip_address, reason, source, category, confidence_level, 
+                       is_active, last_seen, detection_count
+                FROM blacklist_ips 
+                WHERE is_active = true 
+                ORDER BY last_seen DESC
+            """
+            )
+            rows = []
+            for row in cursor.fetchall():
+                item = dict(row)
+                item["ip_address"] = str(item["ip_address"])
+                item["last_seen"] = (
+                    item["last_seen"].isoformat() if item["last_seen"] else None
                 )
-                rows = cursor.fetchall()
-                data = []
-                for row in rows:
-                    item = {
-                        "ip_address": row[0],
-                        "reason": row[1],
-                        "source": row[2],
-                        "category": row[3],
-                        "confidence_level": row[4],
-                        "is_active": row[5],
-                        "last_seen": row[6].isoformat() if row[6] else None,
-                        "detection_count": row[7] if len(row) > 7 else 0,
-                    }
-                    data.append(item)
-
-            elif format_type == "fortigate":
-                cursor.execute(
-                    "SELECT ip_address FROM blacklist_ips WHERE is_active = true"
-                )
-                ips = [row[0] for row in cursor.fetchall()]
-                data = {
-                    "entries": [{"ip": ip, "action": "block"} for ip in ips],
-                    "total": len(ips),
-                    "format": "fortigate_external_connector",
-                }
-            else:  # text format
-                cursor.execute(
-                    "SELECT ip_address FROM blacklist_ips WHERE is_active = true"
-                )
-                data = [row[0] for row in cursor.fetchall()]
-
+                item["detection_count"] = item.get("detection_count") or 0
+                rows.append(item)
             cursor.close()
+            return rows
+        finally:
+            conn.close()
+
+    def get_active_snapshot(self) -> ActiveBlacklistSnapshot:
+        """활성 블랙리스트 스냅샷 반환 (TTL 만료 또는 무효화 시에만 DB 조회)"""
+        return self._snapshot_cache.get()
+
+    def invalidate_active_snapshot(self):
+        """수집 커밋 후 스냅샷 무효화"""
+        self._snapshot_cache.invalidate()
+
+    def get_data_version(self) -> DataVersion:
+        """현재 블랙리스트 데이터 버전 (테이블 조회 없음)"""
+        return data_version.current()
+
+    def publish_ingest(self, version: int):
+        """수집 커밋 완료 - 새 데이터 버전 게시 및 스냅샷 무효화"""
+        data_version.publish(version)
+        self.invalidate_active_snapshot()
+
+    def stream_active_blacklist_json(self, fetch_size: int = 2000) -> JsonExportStream:
+        """
+        활성 블랙리스트 JSON 스트리밍 (서버 사이드 커서)
+        fetch_size 행 단위로 읽어 JSON 배열을 조각으로 생성하므로
+        테이블 크기와 무관하게 메모리 사용량이 일정함
+        연결 대여와 쿼리 실행은 응답 헤더 전송 전인 호출 시점에 수행하므로
+        여기서 실패하면 예외가 호출부로 전파되어 일반 오류 응답이 된다.
+        """
+        conn = self.get_db_connection()
+        try:
+            cursor = conn.cursor(name="blacklist_json_export")
+            cursor.itersize = fetch_size
+            cursor.execute(
+                """
+                SELECT ip_address, reason, source, category, confidence_level, 
+                       is_active, last_seen, detection_count
+                FROM blacklist_ips 
+                WHERE is_active = true 
+                ORDER BY last_seen DESC
+            """
+            )
+        except Exception:
             conn.close()
+            raise
+        return JsonExportStream(conn, cursor, fetch_size)
+
+    def get_blacklist_delta(self, since: int) -> Dict[str, Any]:
+        """
+        since 버전 이후 변경된 IP (added / removed)
+        변경 이력이 보존 범위를 벗어나면 전체 스냅샷으로 대체
+        """
+        current = self.get_data_version()
+
+        delta = None
+        if 0 <= since <= current.version:
+            conn = self.get_db_connection()
+            try:
+                cursor = conn.cursor()
+                delta = change_log.get_delta(cursor, since, current.version)
+                conn.commit()
+                cursor.close()
+            finally:
+                conn.close()
+
+        if delta is not None:
+            return {
+                "success": True,
+                "mode": "delta",
+                "since": since,
+                "version": current.version,
+                "added": delta["added"],
+                "removed": delta["removed"],
+                "timestamp": current.updated_at.isoformat(),
+            }
+
+        snapshot = self.get_active_snapshot()
+        return {
+            "success": True,
+            "mode": "full",
+            "since": since,
+            "version": snapshot.version,
+            "data": snapshot.render("text"),
+            "timestamp": snapshot.updated_at.isoformat(),
+        }
+
+    async def get_active_blacklist(self, format_type: str = "text") -> Dict[str, Any]:
+        """활성 블랙리스트 조회 (스냅샷 갱신은 실행기 스레드에서 수행)"""
+        try:
+            snapshot = await async_db.run_blocking(self.get_active_snapshot)
 
             return {
                 "success": True,
-                "data": data,
+                "data": snapshot.render(format_type),
+                "version": snapshot.version,
                 "timestamp": datetime.now().isoformat(),
             }
 
@@ -181,104 +302,197 @@ class BlacklistService:
             logger.error(f"Active blacklist retrieval failed: {e}")
             return {"success": False, "error": str(e)}
 
-    async def search_ip(self, ip: str) -> Dict[str, Any]:
-        """IP 검색"""
+    # 단건 조회 - 가장 구체적인(접두사가 긴) 포함 항목 우선
+    SEARCH_IP_SQL = """
+        SELECT ip_address, reason, source, category, confidence_level, 
+               is_active, last_seen, detection_count
+        FROM blacklist_ips 
+        WHERE ip_address >>= %s::inet AND is_active = true
+        ORDER BY masklen(ip_address) DESC
+        LIMIT 1
+    """
+
+    @staticmethod
+    def _format_ip_row(row) -> Dict[str, Any]:
+        data = dict(row)
+        data["ip_address"] = str(data["ip_address"])
+        data["last_seen"] = data["last_seen"].isoformat() if data["last_seen"] else None
+        data["detection_count"] = data.get("detection_count") or 0
+        return data
+
+    def _search_ip_in_db(self, ip: str) -> Optional[Dict[str, Any]]:
+        """DB 단건 조회 (스냅샷 인덱스를 사용할 수 없을 때의 fallback)"""
+        conn = self.get_db_connection()
         try:
-            conn = self.get_db_connection()
             cursor = conn.cursor()
+            cursor.execute(self.SEARCH_IP_SQL, (ip,))
+            result = cursor.fetchone()
+            cursor.close()
+        finally:
+            conn.close()
+
+        return self._format_ip_row(result) if result else None
+
+    async def _search_ip_in_db_async(self, ip: str) -> Optional[Dict[str, Any]]:
+        """DB 단건 조회 (비동기 경로)"""
+        result = await async_db.fetchone(self.SEARCH_IP_SQL, (ip,))
+        return self._format_ip_row(result) if result else None
+
+    def lookup_ip(self, ip: str) -> Dict[str, Any]:
+        """
+        IP 검색 (동기)
+        활성 스냅샷 인덱스에서 메모리 조회하고, 스냅샷을 갱신할 수 없을 때만 DB 조회
+        """
+        try:
+            try:
+                snapshot = self.get_active_snapshot()
+            except Exception as e:
+                logger.warning(f"IP 인덱스 사용 불가 - DB 조회로 대체: {e}")
+                data = self._search_ip_in_db(ip)
+            else:
+                data = snapshot.index.lookup(ip)
+
+            return {
+                "success": True,
+                "found": data is not None,
+                "data": data,
+                "timestamp": datetime.now().isoformat(),
+            }
 
+        except Exception as e:
+            logger.error(f"IP search failed for {ip}: {e}")
+            return {"success": False, "error": str(e)}
+
+    def _search_ips_in_db(self, ips: List[str]) -> Dict[str, Dict[str, Any]]:
+        """DB 일괄 조회 - 단일 쿼리 (CIDR 항목 포함 관계는 inet GiST 인덱스 사용)"""
+        conn = self.get_db_connection()
+        try:
+            cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT ip_address, reason, source, category, confidence_level, 
-                       is_active, last_seen, detection_count
-                FROM blacklist_ips 
-                WHERE ip_address = %s
+                SELECT DISTINCT ON (q.ip) host(q.ip) AS query_ip,
+                       b.ip_address, b.reason, b.source, b.category,
+                       b.confidence_level, b.is_active, b.last_seen,
+                       b.detection_count
+                FROM unnest(%s::inet[]) AS q(ip)
+                JOIN blacklist_ips b
+                  ON b.ip_address >>= q.ip AND b.is_active = true
+                ORDER BY q.ip, masklen(b.ip_address) DESC
             """,
-                (ip,),
+                (ips,),
             )
-
-            result = cursor.fetchone()
+            rows = cursor.fetchall()
             cursor.close()
+        finally:
             conn.close()
 
-            if result:
-                data = {
-                    "ip_address": result[0],
-                    "reason": result[1],
-                    "source": result[2],
-                    "category": result[3],
-                    "confidence_level": result[4],
-                    "is_active": result[5],
-                    "last_seen": result[6].isoformat() if result[6] else None,
-                    "detection_count": result[7] if len(result) > 7 else 0,
-                }
-
-                return {
+        found = {}
+        for row in rows:
+            data = self._format_ip_row(row)
+            found[data.pop("query_ip")] = data
+        return found
+
+    def iter_lookup_ips(
+        self, ips: List[str], chunk_size: int = 10000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        IP 일괄 검색 (제너레이터)
+        스냅샷 인덱스로 메모리 조회하고, 인덱스를 사용할 수 없으면
+        chunk_size 단위로 한 번의 포함 관계(>>=) 쿼리로 조회
+        """
+        try:
+            index = self.get_active_snapshot().index
+        except Exception as e:
+            logger.warning(f"IP 인덱스 사용 불가 - DB 일괄 조회로 대체: {e}")
+            index = None
+
+        for start in range(0, len(ips), chunk_size):
+            chunk = []
+            for ip in ips[start : start + chunk_size]:
+                try:
+                    # 문자열이 아닌 항목은 잘못된 IP로 처리 (str(dict) 등으로 변환하지 않음)
+                    chunk.append((ip, str(ipaddress.ip_address(ip.strip()))))
+                except (AttributeError, ValueError):
+                    chunk.append((ip, None))
+
+            if index is None:
+                found = self._search_ips_in_db([n for _, n in chunk if n])
+
+            for ip, normalized in chunk:
+                if normalized is None:
+                    yield {"ip": ip, "success": False, "error": "Invalid IP address"}
+                    continue
+
+                if index is not None:
+                    data = index.lookup(normalized)
+                else:
+                    data = found.get(normalized)
+                yield {
+                    "ip": ip,
                     "success": True,
-                    "found": True,
+                    "found": data is not None,
                     "data": data,
-                    "timestamp": datetime.now().isoformat(),
                 }
+
+    def lookup_ips(self, ips: List[str]) -> Dict[str, Any]:
+        """IP 일괄 검색 (동기)"""
+        try:
+            results = {}
+            for result in self.iter_lookup_ips(ips):
+                results[result.pop("ip")] = result
+
+            return {
+                "success": True,
+                "results": results,
+                "total_searched": len(ips),
+                "found": sum(1 for r in results.values() if r.get("found")),
+                "timestamp": datetime.now().isoformat(),
+            }
+
+        except Exception as e:
+            logger.error(f"Batch IP search failed: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def search_ip(self, ip: str) -> Dict[str, Any]:
+        """IP 검색 (비동기) - 스냅샷 인덱스 우선, 사용 불가 시 비동기 DB 조회"""
+        try:
+            try:
+                snapshot = await async_db.run_blocking(self.get_active_snapshot)
+            except Exception as e:
+                logger.warning(f"IP 인덱스 사용 불가 - DB 조회로 대체: {e}")
+                data = await self._search_ip_in_db_async(ip)
             else:
-                return {
-                    "success": True,
-                    "found": False,
-                    "data": None,
-                    "timestamp": datetime.now().isoformat(),
-                }
+                data = snapshot.index.lookup(ip)
+
+            return {
+                "success": True,
+                "found": data is not None,
+                "data": data,
+                "timestamp": datetime.now().isoformat(),
+            }
 
         except Exception as e:
             logger.error(f"IP search failed for {ip}: {e}")
             return {"success": False, "error": str(e)}
 
     async def get_statistics(self) -> Dict[str, Any]:
-        """시스템 통계"""
+        """시스템 통계 (blacklist_stats 집계 테이블 비동기 조회)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-
-            # 전체 통계
-            cursor.execute("SELECT COUNT(*) FROM blacklist_ips")
-            total_ips = cursor.fetchone()[0]
+            stats = await stats_rollup.read_async(async_db)
 
-            cursor.execute("SELECT COUNT(*) FROM blacklist_ips WHERE is_active = true")
-            active_ips = cursor.fetchone()[0]
-
-            # 소스별 통계
-            cursor.execute(
-                """
-                SELECT source, COUNT(*) as count, AVG(confidence_level) as avg_confidence
-                FROM blacklist_ips 
-                GROUP BY source
-            """
-            )
-            sources = {}
-            for row in cursor.fetchall():
-                sources[row[0]] = {  # source
-                    "count": row[1],  # count
-                    "avg_confidence": float(row[2]) if row[2] else 0,  # avg_confidence
+            sources = {
+                source: {
+                    "count": entry["count"],
+                    "avg_confidence": entry["avg_confidence"],
                 }
-
-            # 카테고리별 통계
-            cursor.execute(
-                """
-                SELECT category, COUNT(*) as count 
-                FROM blacklist_ips 
-                GROUP BY category
-            """
-            )
-            categories = {
-                row[0]: row[1] for row in cursor.fetchall()
-            }  # category: count
-
-            cursor.close()
-            conn.close()
+                for source, entry in stats.by_source().items()
+            }
 
             statistics = {
-                "total_ips": total_ips,
-                "active_ips": active_ips,
+                "total_ips": stats.total_ips,
+                "active_ips": stats.active_ips,
                 "sources": sources,
-                "categories": categories,
+                "categories": stats.by_category(),
                 "last_updated": datetime.now().isoformat(),
             }
 
@@ -320,13 +534,10 @@ class BlacklistService:
         """모든 소스에서 데이터 수집"""
         results = {}
 
-        # REGTECH 수집
-        regtech_result = await self._collect_regtech_data(force)
-        results["regtech"] = regtech_result
-
-        # SECUDIUM 수집
-        secudium_result = await self._collect_secudium_data(force)
-        results["secudium"] = secudium_result
+        # REGTECH / SECUDIUM 동시 수집
+        results["regtech"], results["secudium"] = await asyncio.gather(
+            self._collect_regtech_data(force), self._collect_secudium_data(force)
+        )
 
         success_count = sum(1 for r in results.values() if r.get("success", False))
 
@@ -0,0 +1,289 @@
+"""
+활성 블랙리스트 스냅샷 캐시
+모든 피드 엔드포인트(text / fortigate / json / enhanced)가 공유하는 버전 관리형 인메모리 스냅샷
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.common.ip_utils import IPUtils
+from src.core.services.data_version import DataVersion
+from src.core.services.ip_index import IPLookupIndex
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷이 보관하는 컬럼 (ORDER BY last_seen DESC 순서 유지)
+SNAPSHOT_COLUMNS = (
+    "ip_address",
+    "reason",
+    "source",
+    "category",
+    "confidence_level",
+    "is_active",
+    "last_seen",
+    "detection_count",
+)
+
+
+class ActiveBlacklistSnapshot:
+    """
+    활성 블랙리스트 스냅샷 (생성 후 불변)
+    - 포맷별 결과는 최초 요청 시 한 번만 생성하여 재사용
+    """
+
+    def __init__(
+        self,
+        version: int,
+        rows: List[Dict[str, Any]],
+        updated_at: Optional[datetime] = None,
+    ):
+        self.version = version
+        self.rows = rows
+        self.built_at = time.monotonic()
+        self.created_at = datetime.now()
+        # 데이터 버전이 게시된 시각 (Last-Modified 기준)
+        self.updated_at = updated_at or self.created_at.replace(microsecond=0)
+        self._rendered: Dict[str, Any] = {}
+        self._index: Optional[IPLookupIndex] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def data_version(self) -> DataVersion:
+        """스냅샷 데이터 버전 (ETag / Last-Modified 기준)"""
+        return DataVersion(self.version, self.updated_at)
+
+    @property
+    def ips(self) -> List[str]:
+        """IP 주소 목록"""
+        return self.render("text")
+
+    @property
+    def index(self) -> IPLookupIndex:
+        """IP 조회 인덱스 (최초 접근 시 생성)"""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._build_index()
+        return self._index
+
+    def _build_index(self) -> IPLookupIndex:
+        return IPLookupIndex(self.rows)
+
+    def _ip_strings(self) -> List[str]:
+        return [row["ip_address"] for row in self.rows]
+
+    def render(self, format_type: str = "text") -> Any:
+        """포맷별 데이터 반환 (스냅샷 단위 메모이제이션)"""
+        if format_type in ("json", "enhanced"):
+            format_type = "enhanced"
+        elif format_type != "fortigate":
+            format_type = "text"
+
+        rendered = self._rendered.get(format_type)
+        if rendered is not None:
+            return rendered
+
+        with self._lock:
+            rendered = self._rendered.get(format_type)
+            if rendered is None:
+                rendered = self._build(format_type)
+                self._rendered[format_type] = rendered
+            return rendered
+
+    def aggregate(self, min_density: Optional[float] = None) -> List[str]:
+        """
+        CIDR 집약 목록 (스냅샷 단위 메모이제이션)
+        min_density는 parse_cidr_aggregation이 허용한 값만 전달 (메모 키 수 제한)
+        """
+        key = "cidr" if min_density is None else f"cidr:{min_density:g}"
+        aggregated = self._rendered.get(key)
+        if aggregated is None:
+            ips = self.ips
+            with self._lock:
+                aggregated = self._rendered.get(key)
+                if aggregated is None:
+                    aggregated = IPUtils.aggregate_cidrs(ips, min_density)
+                    self._rendered[key] = aggregated
+                    logger.info(
+                        f"스냅샷 v{self.version} CIDR 집약 (density={min_density}): "
+                        f"{len(self.rows)} → {len(aggregated)}개"
+                    )
+        return aggregated
+
+    def render_aggregated(
+        self, format_type: str, min_density: Optional[float] = None
+    ) -> Any:
+        """CIDR 집약 피드 (text / fortigate)"""
+        cidrs = self.aggregate(min_density)
+        if format_type == "fortigate":
+            return {
+                "entries": [{"ip": cidr, "action": "block"} for cidr in cidrs],
+                "total": len(cidrs),
+                "source_total": len(self.rows),
+                "aggregated": True,
+                "format": "fortigate_external_connector",
+            }
+        if format_type == "text":
+            return cidrs
+        raise ValueError(f"CIDR 집약을 지원하지 않는 형식: {format_type}")
+
+    def _build(self, format_type: str) -> Any:
+        if format_type == "enhanced":
+            return self.rows
+
+        ips = self._rendered.get("text")
+        if ips is None:
+            ips = self._ip_strings()
+            self._rendered["text"] = ips
+
+        if format_type == "fortigate":
+            return {
+                "entries": [{"ip": ip, "action": "block"} for ip in ips],
+                "total": len(ips),
+                "format": "fortigate_external_connector",
+            }
+        return ips
+
+
+class BlacklistSnapshotCache:
+    """
+    활성 블랙리스트 스냅샷 캐시
+    - 데이터 버전 변경(다른 워커의 수집 커밋 포함), invalidate() 또는 TTL 만료 시에만 재생성
+    - 재생성 실패 시 이전 스냅샷으로 우아한 성능 저하
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], List[Dict[str, Any]]],
+        ttl: Optional[int] = None,
+        version_provider: Optional[Callable[[], DataVersion]] = None,
+        store=None,
+    ):
+        self._loader = loader
+        self._version_provider = version_provider
+        # 공유 메모리 스냅샷 저장소 (SharedSnapshotStore, 버전 제공자와 함께 사용)
+        self._store = store
+        self.ttl = (
+            ttl
+            if ttl is not None
+            else int(os.getenv("BLACKLIST_SNAPSHOT_TTL", "300"))
+        )
+        self._snapshot: Optional[ActiveBlacklistSnapshot] = None
+        self._invalidated = False
+        self._version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _is_fresh(self, snapshot: Optional[ActiveBlacklistSnapshot]) -> bool:
+        if snapshot is None or self._invalidated:
+            return False
+        if (time.monotonic() - snapshot.built_at) >= self.ttl:
+            return False
+        if self._version_provider is not None:
+            return self._version_provider().version == snapshot.version
+        return True
+
+    def peek(self) -> Optional[ActiveBlacklistSnapshot]:
+        """DB 접근 없이 유효한 스냅샷만 반환 (없으면 None)"""
+        snapshot = self._snapshot
+        return snapshot if self._is_fresh(snapshot) else None
+
+    def get(self) -> ActiveBlacklistSnapshot:
+        """스냅샷 반환 (필요 시 재생성)"""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            self.hits += 1
+            return snapshot
+
+        with self._lock:
+            # 대기 중 다른 스레드가 이미 재생성했으면 그대로 사용
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                self.hits += 1
+                return snapshot
+
+            self.misses += 1
+
+            force = self._invalidated
+            self._invalidated = False
+            # 행을 읽기 전에 버전을 확정 (스냅샷 내용은 항상 해당 버전 이상)
+            data_version = (
+                self._version_provider() if self._version_provider else None
+            )
+
+            if self._store is not None and data_version is not None:
+                try:
+                    shared = self._store.acquire(
+                        data_version,
+                        self._loader,
+                        self.ttl,
+                        force=force
+                        and snapshot is not None
+                        and snapshot.version == data_version.version,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"공유 스냅샷 사용 불가 - 프로세스 내 스냅샷으로 대체: {e}"
+                    )
+                else:
+                    if snapshot is None or snapshot.version != shared.version:
+                        logger.info(
+                            f"공유 스냅샷 v{shared.version} 전환: {len(shared)}개 활성 IP"
+                        )
+                    self._snapshot = shared
+                    return shared
+
+            try:
+                rows = self._loader()
+            except Exception as e:
+                if snapshot is None:
+                    raise
+                logger.warning(
+                    f"블랙리스트 스냅샷 재생성 실패 - 이전 스냅샷(v{snapshot.version}) 사용: {e}"
+                )
+                return snapshot
+
+            if data_version is not None:
+                snapshot = ActiveBlacklistSnapshot(
+                    data_version.version, rows, data_version.updated_at
+                )
+            else:
+                self._version += 1
+                snapshot = ActiveBlacklistSnapshot(self._version, rows)
+            self._snapshot = snapshot
+            logger.info(
+                f"블랙리스트 스냅샷 v{snapshot.version} 생성: {len(snapshot)}개 활성 IP"
+            )
+            return snapshot
+
+    def invalidate(self):
+        """다음 조회 시 스냅샷 재생성"""
+        self._invalidated = True
+
+    def get_stats(self) -> Dict[str, int]:
+        """캐시 적중 통계 (miss = 재생성 또는 공유 스냅샷 전환)"""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """캐시 상태 정보"""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "size": len(snapshot) if snapshot else 0,
+            "created_at": snapshot.created_at.isoformat() if snapshot else None,
+            "fresh": self._is_fresh(snapshot),
+            "ttl": self.ttl,
+            "shared_file": getattr(snapshot, "path", None),
+        }
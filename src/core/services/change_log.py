@@ -0,0 +1,163 @@
+"""
+블랙리스트 변경 이력 (데이터 버전별 변경 집합)
+수집 트랜잭션마다 추가/비활성화/삭제된 IP를 기록하여 델타 피드를 제공
+"""
+import os
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+CHANGE_ADDED = "added"
+CHANGE_DEACTIVATED = "deactivated"
+CHANGE_REMOVED = "removed"
+
+
+class BlacklistChangeLog:
+    """
+    버전별 변경 집합 기록 및 델타 계산
+    - record(): 수집 트랜잭션 안에서 변경 집합 기록 (data_version.bump() 직후)
+    - get_delta(): since 이후의 순 변경(added / removed) 계산, 보존 범위를 벗어나면 None
+    """
+
+    SCHEMA_SQL = """
+        CREATE TABLE IF NOT EXISTS blacklist_changes (
+            version BIGINT NOT NULL,
+            ip_address INET NOT NULL,
+            change VARCHAR(16) NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_blacklist_changes_version
+            ON blacklist_changes(version);
+        ALTER TABLE blacklist_data_versions
+            ADD COLUMN IF NOT EXISTS changes_recorded BOOLEAN DEFAULT false;
+    """
+
+    def __init__(self, retention: Optional[int] = None):
+        # 변경 이력을 보관할 최근 버전 수
+        self.retention = (
+            retention
+            if retention is not None
+            else int(os.getenv("BLACKLIST_CHANGELOG_RETENTION", "500"))
+        )
+        self._schema_ready = False
+
+    def ensure_schema(self, cursor):
+        """변경 이력 테이블 생성 (프로세스당 1회, 버전 테이블 이후)"""
+        if not self._schema_ready:
+            cursor.execute(self.SCHEMA_SQL)
+            self._schema_ready = True
+
+    def record(
+        self,
+        cursor,
+        version: int,
+        added: Iterable[str] = (),
+        deactivated: Iterable[str] = (),
+        removed: Iterable[str] = (),
+    ) -> Dict[str, int]:
+        """버전의 변경 집합 기록 및 보존 범위 밖 이력 정리"""
+        self.ensure_schema(cursor)
+
+        rows = [(version, ip, CHANGE_ADDED) for ip in added]
+        rows += [(version, ip, CHANGE_DEACTIVATED) for ip in deactivated]
+        rows += [(version, ip, CHANGE_REMOVED) for ip in removed]
+
+        if rows:
+            execute_values(
+                cursor,
+                "INSERT INTO blacklist_changes (version, ip_address, change) VALUES %s",
+                rows,
+                page_size=1000,
+            )
+
+        cursor.execute(
+            "UPDATE blacklist_data_versions SET changes_recorded = true WHERE version = %s",
+            (version,),
+        )
+
+        # 보존 범위 밖의 이력 정리 - 해당 버전은 델타 계산 불가로 표시
+        floor = version - self.retention
+        if floor > 0:
+            cursor.execute("DELETE FROM blacklist_changes WHERE version <= %s", (floor,))
+            cursor.execute(
+                """
+                UPDATE blacklist_data_versions SET changes_recorded = false
+                WHERE version <= %s AND changes_recorded
+            """,
+                (floor,),
+            )
+
+        summary = {
+            CHANGE_ADDED: sum(1 for r in rows if r[2] == CHANGE_ADDED),
+            CHANGE_DEACTIVATED: sum(1 for r in rows if r[2] == CHANGE_DEACTIVATED),
+            CHANGE_REMOVED: sum(1 for r in rows if r[2] == CHANGE_REMOVED),
+        }
+        logger.info(f"데이터 버전 v{version} 변경 집합 기록: {summary}")
+        return summary
+
+    def get_delta(self, cursor, since: int, until: int) -> Optional[Dict[str, Any]]:
+        """
+        since 이후 until까지의 순 변경 계산
+        중간 버전의 변경 이력이 없으면 (보존 범위 초과 등) None 반환
+        """
+        if since < 0 or since > until:
+            return None
+        if since == until:
+            return {"added": [], "removed": []}
+        if until - since > self.retention:
+            return None
+
+        self.ensure_schema(cursor)
+        cursor.execute(
+            """
+            SELECT COUNT(*) AS missing
+            FROM generate_series(%s::bigint + 1, %s::bigint) AS v(version)
+            LEFT JOIN blacklist_data_versions d ON d.version = v.version
+            WHERE d.changes_recorded IS NOT TRUE
+        """,
+            (since, until),
+        )
+        row = cursor.fetchone()
+        missing = row["missing"] if isinstance(row, dict) else row[0]
+        if missing:
+            return None
+
+        # 스냅샷 / bulk_loader와 같은 텍스트 형식 (CIDR은 접두사 유지, /32는 생략)
+        cursor.execute(
+            """
+            SELECT abbrev(ip_address) AS ip, change
+            FROM blacklist_changes
+            WHERE version > %s AND version <= %s
+            ORDER BY version
+        """,
+            (since, until),
+        )
+
+        # IP별 첫 변경으로 since 시점 상태를, 마지막 변경으로 현재 상태를 판단
+        first_change: Dict[str, str] = {}
+        last_change: Dict[str, str] = {}
+        for row in cursor.fetchall():
+            ip, change = (
+                (row["ip"], row["change"]) if isinstance(row, dict) else row
+            )
+            first_change.setdefault(ip, change)
+            last_change[ip] = change
+
+        added: List[str] = []
+        removed: List[str] = []
+        for ip, change in last_change.items():
+            was_active = first_change[ip] != CHANGE_ADDED
+            is_active = change == CHANGE_ADDED
+            if is_active and not was_active:
+                added.append(ip)
+            elif was_active and not is_active:
+                removed.append(ip)
+
+        return {"added": added, "removed": removed}
+
+
+# 전역 변경 이력 인스턴스
+change_log = BlacklistChangeLog()
@@ -0,0 +1,431 @@
+"""
+백그라운드 수집 작업 실행기
+- 트리거 요청은 작업을 등록하고 작업 ID를 즉시 반환
+- 워커 프로세스의 전용 스레드 실행기가 수집기를 실행하며 진행 상황(페이지/행/바이트/속도)을 기록
+- 작업 상태는 공유 메모리의 작업별 JSON 파일에 저장되어 어느 워커에서든 조회 가능
+- 취소 요청은 같은 디렉토리의 표시 파일로 전달되어 작업을 실행 중인 워커가 취소 토큰을 설정
+"""
+import os
+import json
+import time
+import uuid
+import fcntl
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.core.utils.cancellation import CancelToken, CollectionCancelled
+from src.core.utils.process_state import pid_alive, state_dir
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+# 실행 중이던 워커 프로세스가 종료되어 결과를 알 수 없는 작업
+JOB_LOST = "lost"
+ACTIVE_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+# 모든 소스를 수집하는 작업 종류 (다른 모든 작업과 겹침)
+JOB_KIND_ALL = "ALL"
+
+
+class JobStore:
+    """작업 레코드 저장소 (작업당 JSON 파일 1개, 원자적 교체)"""
+
+    def __init__(self, directory: Optional[str] = None, history: Optional[int] = None):
+        self.directory = directory or os.getenv(
+            "COLLECTION_JOB_DIR", os.path.join(state_dir(), "blacklist_jobs")
+        )
+        # 보관할 종료 작업 수
+        self.history = (
+            history
+            if history is not None
+            else int(os.getenv("COLLECTION_JOB_HISTORY", "50"))
+        )
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _cancel_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.cancel")
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """작업 등록 직렬화 (워커 간 flock)"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self, record: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(record["id"])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _resolve(record: Dict[str, Any]) -> Dict[str, Any]:
+        """실행 프로세스가 사라진 미완료 작업은 lost로 표시"""
+        if record.get("status") in ACTIVE_STATES and not pid_alive(record["pid"]):
+            record["status"] = JOB_LOST
+            record["error"] = record.get("error") or "작업을 실행하던 워커 프로세스가 종료되었습니다"
+        return record
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # 파일 경로로 쓰이므로 영숫자 문자열 ID만 허용
+        if not isinstance(job_id, str) or not job_id.isalnum():
+            return None
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as f:
+                return self._resolve(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """작업 목록 (최근 등록순)"""
+        if not os.path.isdir(self.directory):
+            return []
+        records = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                record = self.get(name[: -len(".json")])
+                if record is not None:
+                    records.append(record)
+        records.sort(key=lambda r: r["created_at"], reverse=True)
+        return records[:limit] if limit else records
+
+    def request_cancel(self, job_id: str, reason: str):
+        """다른 워커가 실행 중인 작업에 취소 요청 표시"""
+        with open(self._cancel_path(job_id), "w", encoding="utf-8") as f:
+            f.write(reason)
+
+    def cancel_requested(self, job_id: str) -> Optional[str]:
+        """취소 요청 사유 (요청 없으면 None)"""
+        try:
+            with open(self._cancel_path(job_id), "r", encoding="utf-8") as f:
+                return f.read() or "사용자 취소 요청"
+        except FileNotFoundError:
+            return None
+
+    def clear_cancel(self, job_id: str):
+        try:
+            os.unlink(self._cancel_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def prune(self):
+        """보관 개수를 넘는 오래된 종료 작업 삭제"""
+        finished = [r for r in self.list() if r["status"] not in ACTIVE_STATES]
+        for record in finished[self.history :]:
+            try:
+                os.unlink(self._path(record["id"]))
+            except FileNotFoundError:
+                pass
+            self.clear_cancel(record["id"])
+
+
+class JobProgress:
+    """
+    작업 진행 상황 보고 (수집기에 전달)
+    - page(rows, nbytes): 페이지 1개 처리
+    - stage(name): 진행 단계 (login / collecting / loading 등)
+    - cancel_token: 수집기/DB 적재에 전달할 취소 토큰
+    저장은 flush_interval 간격으로 제한하여 페이지마다 파일을 쓰지 않는다.
+    """
+
+    def __init__(self, job: "CollectionJob", flush_interval: float):
+        self.job = job
+        self.flush_interval = flush_interval
+        self.pages = 0
+        self.rows = 0
+        self.bytes = 0
+        self.current_stage: Optional[str] = None
+        self.cancel_token = CancelToken()
+        self._started = time.monotonic()
+        self._flushed = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """실행 시작 시각 기록 (대기 시간은 속도 계산에서 제외)"""
+        self._started = time.monotonic()
+
+    def page(self, rows: int = 0, nbytes: int = 0):
+        with self._lock:
+            self.pages += 1
+            self.rows += rows
+            self.bytes += nbytes
+        self.flush()
+
+    def add_rows(self, rows: int):
+        with self._lock:
+            self.rows += rows
+        self.flush()
+
+    def stage(self, name: str):
+        self.current_stage = name
+        self.flush(force=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started
+        with self._lock:
+            pages, rows, nbytes = self.pages, self.rows, self.bytes
+        return {
+            "stage": self.current_stage,
+            "pages": pages,
+            "rows": rows,
+            "bytes": nbytes,
+            "elapsed_sec": round(elapsed, 3),
+            "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+            "bytes_per_sec": round(nbytes / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+    def flush(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._flushed < self.flush_interval:
+            return
+        self._flushed = now
+        self.job.save()
+
+
+class CollectionJob:
+    """실행 중인 작업 1개 (레코드 + 진행 상황)"""
+
+    def __init__(self, store: JobStore, kind: str, flush_interval: float):
+        self.store = store
+        self.record: Dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": JOB_QUEUED,
+            "pid": os.getpid(),
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "cancel_requested_at": None,
+            "progress": None,
+            "result": None,
+            "error": None,
+        }
+        self.progress = JobProgress(self, flush_interval)
+        self._save_lock = threading.Lock()
+
+    @property
+    def id(self) -> str:
+        return self.record["id"]
+
+    def save(self):
+        with self._save_lock:
+            self.record["progress"] = self.progress.snapshot()
+            try:
+                self.store.save(self.record)
+            except OSError as e:
+                logger.warning(f"수집 작업 {self.id} 상태 저장 실패: {e}")
+
+    def _on_cancel(self):
+        self.record["cancel_requested_at"] = datetime.now().isoformat()
+        logger.info(f"수집 작업 취소 요청: {self.record['kind']} ({self.id})")
+        self.save()
+
+    def run(self, func: Callable[[JobProgress], Dict[str, Any]]):
+        token = self.progress.cancel_token
+        token.on_cancel(self._on_cancel)
+        self.record["status"] = JOB_RUNNING
+        self.record["started_at"] = datetime.now().isoformat()
+        self.progress.start()
+        self.save()
+        logger.info(f"수집 작업 시작: {self.record['kind']} ({self.id})")
+
+        try:
+            # 대기 중에 취소된 작업은 실행하지 않음
+            token.raise_if_cancelled()
+            result = func(self.progress) or {}
+            self.record["result"] = result
+            if result.get("success", True):
+                self.record["status"] = JOB_SUCCEEDED
+            else:
+                self.record["status"] = JOB_FAILED
+                self.record["error"] = result.get("error")
+        except CollectionCancelled as e:
+            self.record["status"] = JOB_CANCELLED
+            self.record["error"] = str(e) or token.reason
+        except Exception as e:
+            logger.exception(f"수집 작업 실패: {self.record['kind']} ({self.id})")
+            self.record["status"] = JOB_FAILED
+            self.record["error"] = str(e)
+        finally:
+            self.record["finished_at"] = datetime.now().isoformat()
+            self.save()
+            self.store.clear_cancel(self.id)
+            self.store.prune()
+            logger.info(
+                f"수집 작업 종료: {self.record['kind']} ({self.id}) "
+                f"{self.record['status']} - {self.record['progress']}"
+            )
+
+
+class CollectionJobRunner:
+    """
+    수집 작업 실행기 (워커 프로세스별 스레드 실행기)
+    - COLLECTION_JOB_WORKERS: 동시 실행 작업 수 (기본 1)
+    - COLLECTION_JOB_FLUSH_INTERVAL: 진행 상황 저장 간격 (기본 1초)
+    - COLLECTION_JOB_CANCEL_POLL: 다른 워커의 취소 요청 확인 간격 (기본 0.5초)
+    수집 소스가 겹치는 작업이 어느 워커에서든 대기/실행 중이면 새 작업을 등록하지 않는다.
+    작업이 있는 워커는 max_requests 재시작을 미루고 (gunicorn.conf.py pre_request),
+    종료되는 워커는 작업을 취소 상태로 기록한 뒤 끝낸다 (worker_exit → shutdown).
+    """
+
+    def __init__(self, store: Optional[JobStore] = None):
+        self.store = store or JobStore()
+        self.max_workers = int(os.getenv("COLLECTION_JOB_WORKERS", "1"))
+        self.flush_interval = float(os.getenv("COLLECTION_JOB_FLUSH_INTERVAL", "1"))
+        self.cancel_poll = float(os.getenv("COLLECTION_JOB_CANCEL_POLL", "0.5"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        # 이 프로세스가 실행하는 작업 (대기/실행 중)
+        self._local: Dict[str, CollectionJob] = {}
+        self._watcher: Optional[threading.Thread] = None
+
+    def _check_pid(self):
+        """fork 후 첫 사용 시 부모의 실행기/작업 목록을 버림 (호출자가 _lock 보유)"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._executor = None
+            self._local = {}
+            self._watcher = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """fork 후 첫 사용 시 자식 프로세스에서 새 실행기 생성"""
+        with self._lock:
+            self._check_pid()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="collection-job"
+                )
+            return self._executor
+
+    def _watch(self):
+        """다른 워커에서 들어온 취소 요청을 로컬 작업의 취소 토큰에 반영"""
+        while True:
+            time.sleep(self.cancel_poll)
+            with self._lock:
+                if not self._local:
+                    self._watcher = None
+                    return
+                jobs = list(self._local.values())
+            for job in jobs:
+                reason = self.store.cancel_requested(job.id)
+                if reason is not None:
+                    job.progress.cancel_token.cancel(reason)
+
+    def _run(self, job: CollectionJob, func: Callable[[JobProgress], Dict[str, Any]]):
+        try:
+            job.run(func)
+        finally:
+            with self._lock:
+                self._local.pop(job.id, None)
+
+    def active(self, kind: str) -> Optional[Dict[str, Any]]:
+        """수집 소스가 겹치는 대기/실행 중 작업"""
+        for record in self.store.list():
+            if record["status"] not in ACTIVE_STATES:
+                continue
+            if record["kind"] == kind or JOB_KIND_ALL in (kind, record["kind"]):
+                return record
+        return None
+
+    def submit(
+        self, kind: str, func: Callable[[JobProgress], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """작업 등록 → (작업 레코드, 새로 등록 여부)"""
+        with self.store.locked():
+            existing = self.active(kind)
+            if existing is not None:
+                return existing, False
+            job = CollectionJob(self.store, kind, self.flush_interval)
+            job.save()
+
+        executor = self._get_executor()
+        with self._lock:
+            self._local[job.id] = job
+            if self._watcher is None:
+                self._watcher = threading.Thread(
+                    target=self._watch, name="collection-job-cancel", daemon=True
+                )
+                self._watcher.start()
+        executor.submit(self._run, job, func)
+        return dict(job.record), True
+
+    def cancel(
+        self, job_id: Optional[str] = None, reason: str = "사용자 취소 요청"
+    ) -> List[str]:
+        """작업 취소 요청 (job_id 없으면 대기/실행 중인 모든 작업) → 취소 요청한 작업 ID"""
+        if job_id is not None:
+            record = self.store.get(job_id)
+            records = [record] if record is not None else []
+        else:
+            records = self.store.list()
+
+        cancelled = []
+        for record in records:
+            if record["status"] not in ACTIVE_STATES:
+                continue
+            with self._lock:
+                self._check_pid()
+                job = self._local.get(record["id"])
+            if job is not None:
+                job.progress.cancel_token.cancel(reason)
+            else:
+                self.store.request_cancel(record["id"], reason)
+            cancelled.append(record["id"])
+        return cancelled
+
+    def local_jobs(self) -> int:
+        """이 워커 프로세스가 대기/실행 중인 작업 수"""
+        with self._lock:
+            self._check_pid()
+            return len(self._local)
+
+    def shutdown(
+        self, timeout: Optional[float] = None, reason: str = "워커 프로세스 종료로 중단"
+    ) -> List[str]:
+        """
+        워커 종료 전 로컬 작업 취소 후 종료 상태 기록까지 대기 → 취소한 작업 ID
+        (프로세스와 함께 사라져 lost로 남는 대신 cancelled + 사유로 기록)
+        - COLLECTION_JOB_SHUTDOWN_TIMEOUT: 대기 시간 (기본 10초)
+        """
+        if timeout is None:
+            timeout = float(os.getenv("COLLECTION_JOB_SHUTDOWN_TIMEOUT", "10"))
+        with self._lock:
+            self._check_pid()
+            jobs = list(self._local.values())
+        for job in jobs:
+            job.progress.cancel_token.cancel(reason)
+
+        deadline = time.monotonic() + timeout
+        while self.local_jobs() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if self.local_jobs():
+            logger.warning(f"종료 대기 시간 내 끝나지 않은 수집 작업: {self.local_jobs()}개")
+        return [job.id for job in jobs]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.store.list(limit)
+
+
+# 전역 수집 작업 실행기 인스턴스
+collection_jobs = CollectionJobRunner()
@@ -0,0 +1,179 @@
+"""
+블랙리스트 데이터 버전 관리
+- 버전 원본: PostgreSQL blacklist_data_versions 테이블 (수집 트랜잭션 안에서 발급)
+- 공유 캐시: 공유 메모리(/dev/shm)의 작은 JSON 파일 - 모든 gunicorn 워커가 테이블 조회 없이 읽음
+"""
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from src.core.database.connection_pool import db_pool
+from src.core.utils.process_state import state_dir
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """블랙리스트 데이터 버전"""
+
+    version: int
+    updated_at: datetime
+
+    def etag(self, variant: str) -> str:
+        """피드 변형별 ETag 값"""
+        return f"bl-{self.version}-{variant}"
+
+
+class BlacklistDataVersion:
+    """
+    단조 증가하는 블랙리스트 데이터 버전
+    - bump(): 수집 트랜잭션 안에서 새 버전 발급 (커밋과 함께 확정)
+    - publish(): 커밋 후 공유 파일에 반영 → 모든 워커의 피드 캐시 무효화
+    - current(): 공유 파일 stat 한 번으로 현재 버전 조회
+    """
+
+    SCHEMA_SQL = """
+        CREATE TABLE IF NOT EXISTS blacklist_data_versions (
+            version BIGSERIAL PRIMARY KEY,
+            source VARCHAR(100),
+            row_count INTEGER DEFAULT 0,
+            committed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv(
+            "BLACKLIST_DATA_VERSION_FILE",
+            os.path.join(state_dir(), "blacklist_data_version.json"),
+        )
+        self._cached: Optional[DataVersion] = None
+        self._cached_mtime = None
+        self._bootstrap_retry_at = 0.0
+        self._bootstrap_interval = 60  # DB 부트스트랩 재시도 간격
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._started_at = datetime.now().replace(microsecond=0)
+
+    def _connect(self):
+        """버전 테이블 조회용 연결 (공유 커넥션 풀)"""
+        return db_pool.getconn()
+
+    def ensure_schema(self, cursor):
+        """버전 테이블 생성 (프로세스당 1회)"""
+        if not self._schema_ready:
+            cursor.execute(self.SCHEMA_SQL)
+            self._schema_ready = True
+
+    def current(self) -> DataVersion:
+        """현재 데이터 버전 (공유 파일 기반, 변경 시에만 다시 읽음)"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return self._bootstrap()
+
+        if self._cached is not None and mtime == self._cached_mtime:
+            return self._cached
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            version = DataVersion(
+                int(data["version"]), datetime.fromisoformat(data["updated_at"])
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"데이터 버전 파일 읽기 실패 ({self.path}): {e}")
+            return self._cached or DataVersion(0, self._started_at)
+
+        self._cached = version
+        self._cached_mtime = mtime
+        return version
+
+    def _bootstrap(self) -> DataVersion:
+        """공유 파일이 없을 때 DB의 마지막 버전으로 초기화"""
+        fallback = self._cached or DataVersion(0, self._started_at)
+        now = time.monotonic()
+        if now < self._bootstrap_retry_at:
+            return fallback
+
+        with self._lock:
+            if now < self._bootstrap_retry_at:
+                return fallback
+            self._bootstrap_retry_at = now + self._bootstrap_interval
+
+            try:
+                conn = self._connect()
+                try:
+                    cursor = conn.cursor()
+                    self.ensure_schema(cursor)
+                    cursor.execute(
+                        "SELECT version, committed_at FROM blacklist_data_versions "
+                        "ORDER BY version DESC LIMIT 1"
+                    )
+                    row = cursor.fetchone()
+                    conn.commit()
+                    cursor.close()
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.warning(f"데이터 버전 초기화 실패 - v{fallback.version} 사용: {e}")
+                return fallback
+
+            if row:
+                self.publish(row[0], row[1])
+            else:
+                self.publish(0, self._started_at)
+            return self._cached or fallback
+
+    def bump(self, cursor, source: str, row_count: int = 0) -> int:
+        """수집 트랜잭션 안에서 새 버전 발급 (커밋 후 publish 필요)"""
+        self.ensure_schema(cursor)
+        cursor.execute(
+            """
+            INSERT INTO blacklist_data_versions (source, row_count)
+            VALUES (%s, %s)
+            RETURNING version
+        """,
+            (source, row_count),
+        )
+        row = cursor.fetchone()
+        return int(row["version"] if isinstance(row, dict) else row[0])
+
+    def publish(self, version: int, updated_at: Optional[datetime] = None):
+        """커밋된 버전을 공유 파일에 반영 (버전은 감소하지 않음)"""
+        updated_at = (updated_at or datetime.now()).replace(microsecond=0)
+        lock_path = f"{self.path}.lock"
+
+        try:
+            with open(lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        if int(json.load(f)["version"]) >= version:
+                            return
+                except (OSError, ValueError, KeyError):
+                    pass
+
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": version, "updated_at": updated_at.isoformat()}, f
+                    )
+                os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"데이터 버전 파일 갱신 실패 ({self.path}): {e}")
+            return
+
+        self._cached = DataVersion(version, updated_at)
+        self._cached_mtime = None
+        logger.info(f"블랙리스트 데이터 버전 v{version} 게시")
+
+
+# 전역 데이터 버전 인스턴스
+data_version = BlacklistDataVersion()
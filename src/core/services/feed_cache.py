@@ -0,0 +1,126 @@
+"""
+피드 응답 바이트 캐시
+데이터 버전별로 각 피드 포맷의 원본/gzip/brotli 인코딩을 한 번만 생성하여 재사용
+"""
+import os
+import gzip
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # brotli 미설치 시 gzip만 제공
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+
+
+def aggregated_variant(variant: str, min_density: Optional[float] = None) -> str:
+    """CIDR 집약 피드의 캐시/ETag 변형 이름"""
+    if min_density is None:
+        return f"{variant}.cidr"
+    return f"{variant}.cidr-{min_density:g}"
+
+
+class FeedCache:
+    """
+    데이터 버전별 사전 압축 피드 캐시
+    - (스냅샷 버전, variant) 단위로 인코딩별 바이트 보관
+    - 바이트는 항상 키가 된 스냅샷에서 생성 (builder에 스냅샷 전달)
+    - 최근 max_versions 개 버전만 유지
+    """
+
+    def __init__(self, max_versions: int = 2):
+        self.max_versions = max_versions
+        self.gzip_level = int(os.getenv("FEED_GZIP_LEVEL", "9"))
+        self.brotli_quality = int(os.getenv("FEED_BROTLI_QUALITY", "9"))
+        self._entries: "OrderedDict[int, Dict[Tuple[str, str], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def encodings(self) -> List[str]:
+        """지원 인코딩 (선호 순서)"""
+        return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    def negotiate(self, accept_encodings) -> str:
+        """Accept-Encoding 헤더에 맞는 인코딩 선택"""
+        best = accept_encodings.best_match(self.encodings) if accept_encodings else None
+        return best or IDENTITY
+
+    def _encode(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        if encoding == "gzip":
+            return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        return body
+
+    def get(
+        self,
+        snapshot,
+        variant: str,
+        encoding: str,
+        builder: Callable[[Any], bytes],
+    ) -> bytes:
+        """피드 바이트 반환 (캐시에 없으면 builder(snapshot)으로 생성 후 저장)"""
+        version = snapshot.version
+        entry = self._entries.get(version)
+        if entry is not None:
+            body = entry.get((variant, encoding))
+            if body is not None:
+                self.hits += 1
+                return body
+
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None:
+                entry = {}
+                self._entries[version] = entry
+                # 가장 낮은 버전부터 제거 (이전 스냅샷 응답이 최신 버전을 밀어내지 않음)
+                while len(self._entries) > self.max_versions:
+                    del self._entries[min(self._entries)]
+
+            body = entry.get((variant, encoding))
+            if body is not None:
+                self.hits += 1
+                return body
+
+            self.misses += 1
+            raw = entry.get((variant, IDENTITY))
+            if raw is None:
+                raw = builder(snapshot)
+                entry[(variant, IDENTITY)] = raw
+
+            body = self._encode(raw, encoding)
+            entry[(variant, encoding)] = body
+            if encoding != IDENTITY:
+                logger.info(
+                    f"피드 v{version} {variant} {encoding} 인코딩: "
+                    f"{len(raw)} → {len(body)} bytes"
+                )
+            return body
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """캐시 적중 통계"""
+        return {
+            "versions": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": sum(
+                len(body) for entry in list(self._entries.values()) for body in entry.values()
+            ),
+        }
+
+
+# 전역 피드 캐시 인스턴스
+feed_cache = FeedCache()
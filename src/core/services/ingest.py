@@ -0,0 +1,78 @@
+"""
+수집 데이터 적재 (COPY 스테이징 → 병합 → 데이터 버전 발급 → 게시)
+수집 작업(collection_api)과 수집기(RegtechCollector.save_to_database)가 공유하는 단일 경로
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor
+
+from src.core.database.bulk_loader import BulkLoadResult, bulk_loader
+from src.core.database.connection_pool import db_pool
+from src.core.services.blacklist_service import service
+from src.core.services.change_log import change_log
+from src.core.services.data_version import data_version
+from src.core.utils.cancellation import CancelToken, CollectionCancelled, cancel_on
+
+logger = logging.getLogger(__name__)
+
+
+def get_db_connection():
+    """공유 커넥션 풀에서 대여 (close() 시 반환)"""
+    return db_pool.getconn(cursor_factory=RealDictCursor)
+
+
+def load_collected_records(
+    records: List[Dict[str, Any]],
+    source: str,
+    reconcile: bool = False,
+    progress: Optional[Any] = None,
+) -> BulkLoadResult:
+    """
+    COPY 스테이징 → 단일 병합 후 새 데이터 버전 게시 (취소 시 전체 롤백)
+    reconcile=True: 소스 목록 동기화 (바뀐 행만 갱신, 빠진 IP 비활성화)
+    실제로 바뀐 행이 없으면 데이터 버전을 올리지 않는다.
+    progress: 수집 작업의 JobProgress (None이면 취소 불가한 단독 호출)
+    """
+    if progress is not None:
+        progress.stage("loading")
+        token = progress.cancel_token
+    else:
+        token = CancelToken()
+    token.raise_if_cancelled()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    version = None
+    try:
+        # 취소 시 실행 중인 쿼리를 서버에서 중단
+        with cancel_on(token, conn.cancel):
+            if reconcile:
+                load = bulk_loader.reconcile(cursor, records, source)
+            else:
+                load = bulk_loader.load(cursor, records, source)
+
+            # 데이터 버전 발급 (수집 데이터와 함께 커밋)
+            if load.changed:
+                version = data_version.bump(cursor, source, load.changed)
+                change_log.record(
+                    cursor,
+                    version,
+                    added=load.newly_active,
+                    deactivated=load.deactivated,
+                )
+            token.raise_if_cancelled()
+            conn.commit()
+    except Exception as e:
+        conn.rollback()
+        if token.is_set() and not isinstance(e, CollectionCancelled):
+            raise CollectionCancelled(token.reason) from e
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    # 새 버전 게시 - 모든 워커의 피드 스냅샷/ETag 갱신
+    if version is not None:
+        service.publish_ingest(version)
+    return load
@@ -0,0 +1,184 @@
+"""
+활성 블랙리스트 IP 조회 인덱스
+IPv4는 32비트 정수, IPv6는 128비트(상위/하위 64비트) 키로 정렬된 array에 보관하고
+bisect로 조회한다. CIDR 항목은 prefix 길이별 마스킹 키 배열로 나누어
+가장 긴 prefix부터 bisect한다. 메타데이터는 병렬 row-offset 배열로 스냅샷 행을 가리킨다.
+키 배열은 array 또는 mmap 위의 memoryview 모두 사용 가능하다.
+"""
+import ipaddress
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_U64_MASK = (1 << 64) - 1
+
+# (v4 키, v4 행, v6 상위, v6 하위, v6 행, CIDR 목록)
+IndexKeys = Tuple[
+    Sequence[int],
+    Sequence[int],
+    Sequence[int],
+    Sequence[int],
+    Sequence[int],
+    List[Tuple[Any, int]],
+]
+
+
+class IPLookupIndex:
+    """정렬 배열 기반 IP 조회 인덱스 (생성 후 불변)"""
+
+    def __init__(
+        self, rows: Sequence[Dict[str, Any]], keys: Optional[IndexKeys] = None
+    ):
+        self._rows = rows
+        (
+            self._v4_keys,
+            self._v4_rows,
+            self._v6_hi,
+            self._v6_lo,
+            self._v6_rows,
+            networks,
+        ) = keys if keys is not None else self.build_keys(rows)
+        self._network_count = len(networks)
+        self._v4_networks, self._v6_networks = self._group_networks(networks)
+
+    @staticmethod
+    def build_keys(rows: Sequence[Dict[str, Any]]) -> IndexKeys:
+        """행 목록에서 정렬 키 배열 생성 (공유 메모리 스냅샷 파일에도 그대로 기록)"""
+        v4_entries = []
+        v6_entries = []
+        # 단일 호스트가 아닌 CIDR 항목은 포함 관계로 별도 확인
+        networks = []
+
+        for offset, row in enumerate(rows):
+            try:
+                network = ipaddress.ip_network(str(row["ip_address"]), strict=False)
+            except (KeyError, ValueError):
+                logger.debug(f"인덱스에서 제외된 항목: {row.get('ip_address')}")
+                continue
+
+            if network.num_addresses > 1:
+                networks.append((network, offset))
+            elif network.version == 4:
+                v4_entries.append((int(network.network_address), offset))
+            else:
+                v6_entries.append((int(network.network_address), offset))
+
+        v4_entries.sort()
+        v6_entries.sort()
+
+        return (
+            array("I", (key for key, _ in v4_entries)),
+            array("I", (offset for _, offset in v4_entries)),
+            array("Q", (key >> 64 for key, _ in v6_entries)),
+            array("Q", (key & _U64_MASK for key, _ in v6_entries)),
+            array("I", (offset for _, offset in v6_entries)),
+            networks,
+        )
+
+    @staticmethod
+    def _group_networks(networks: List[Tuple[Any, int]]):
+        """
+        CIDR 항목을 prefix 길이별로 묶어 마스킹된 네트워크 키의 정렬 배열로 변환
+        가장 긴 prefix부터 정렬 (DB의 ORDER BY masklen DESC와 같은 결과)
+        """
+        grouped: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for network, offset in networks:
+            grouped.setdefault((network.version, network.prefixlen), []).append(
+                (int(network.network_address), offset)
+            )
+
+        v4_groups = []
+        v6_groups = []
+        for (version, prefixlen), entries in sorted(
+            grouped.items(), key=lambda item: item[0][1], reverse=True
+        ):
+            # 같은 네트워크가 여러 행이면 먼저 나온 행 (기존 선형 탐색과 동일)
+            entries.sort()
+            rows = array("I", (offset for _, offset in entries))
+            if version == 4:
+                mask = (0xFFFFFFFF << (32 - prefixlen)) & 0xFFFFFFFF
+                v4_groups.append(
+                    (mask, array("I", (key for key, _ in entries)), rows)
+                )
+            else:
+                mask = ((1 << 128) - 1) ^ ((1 << (128 - prefixlen)) - 1)
+                v6_groups.append(
+                    (
+                        mask >> 64,
+                        mask & _U64_MASK,
+                        array("Q", (key >> 64 for key, _ in entries)),
+                        array("Q", (key & _U64_MASK for key, _ in entries)),
+                        rows,
+                    )
+                )
+        return v4_groups, v6_groups
+
+    def __len__(self) -> int:
+        return len(self._v4_keys) + len(self._v6_hi) + self._network_count
+
+    @staticmethod
+    def _find_v4(keys: Sequence[int], key: int) -> int:
+        pos = bisect_left(keys, key)
+        return pos if pos < len(keys) and keys[pos] == key else -1
+
+    @staticmethod
+    def _find_v6(
+        hi_keys: Sequence[int], lo_keys: Sequence[int], hi: int, lo: int
+    ) -> int:
+        start = bisect_left(hi_keys, hi)
+        end = bisect_right(hi_keys, hi, start)
+        pos = bisect_left(lo_keys, lo, start, end)
+        return pos if pos < end and lo_keys[pos] == lo else -1
+
+    def _find_offset(self, address) -> Optional[int]:
+        key = int(address)
+
+        if address.version == 4:
+            pos = self._find_v4(self._v4_keys, key)
+            if pos >= 0:
+                return self._v4_rows[pos]
+
+            # 단일 호스트 항목이 없으면 가장 긴 prefix의 CIDR 항목 (prefix 길이별 bisect)
+            for mask, keys, rows in self._v4_networks:
+                pos = self._find_v4(keys, key & mask)
+                if pos >= 0:
+                    return rows[pos]
+            return None
+
+        hi, lo = key >> 64, key & _U64_MASK
+        pos = self._find_v6(self._v6_hi, self._v6_lo, hi, lo)
+        if pos >= 0:
+            return self._v6_rows[pos]
+
+        for mask_hi, mask_lo, hi_keys, lo_keys, rows in self._v6_networks:
+            pos = self._find_v6(hi_keys, lo_keys, hi & mask_hi, lo & mask_lo)
+            if pos >= 0:
+                return rows[pos]
+        return None
+
+    def lookup(self, ip: str) -> Optional[Dict[str, Any]]:
+        """IP에 해당하는 스냅샷 행 반환 (없으면 None, 잘못된 IP는 ValueError)"""
+        offset = self._find_offset(ipaddress.ip_address(ip))
+        return self._rows[offset] if offset is not None else None
+
+    def __contains__(self, ip: str) -> bool:
+        try:
+            return self.lookup(ip) is not None
+        except ValueError:
+            return False
+
+    def get_stats(self) -> Dict[str, int]:
+        """인덱스 크기 정보"""
+        return {
+            "ipv4": len(self._v4_keys),
+            "ipv6": len(self._v6_hi),
+            "networks": self._network_count,
+            "bytes": (
+                self._v4_keys.itemsize * len(self._v4_keys) * 2
+                + self._v6_hi.itemsize * len(self._v6_hi) * 2
+                + self._v6_rows.itemsize * len(self._v6_rows)
+            ),
+        }
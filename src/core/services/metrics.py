@@ -0,0 +1,480 @@
+"""
+Prometheus 텍스트 형식 메트릭 (gunicorn 멀티 프로세스 집계)
+각 워커는 메모리에 누적한 값을 주기적으로 공유 디렉토리의 워커별 JSON 파일로 기록하고,
+/metrics 요청을 받은 워커가 모든 파일을 합산해 응답한다.
+종료된 워커의 카운터/히스토그램은 아카이브 파일로 합쳐 값이 줄어들지 않게 한다.
+"""
+import os
+import json
+import time
+import fcntl
+import glob
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from flask import Flask, Response, g, request
+
+from src.core.utils.process_state import pid_alive, state_dir
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# 메트릭 정의: 이름 → (타입, 설명, 히스토그램 버킷)
+METRICS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "blacklist_http_requests_total": (
+        "counter",
+        "HTTP requests by blueprint route, method and status",
+        (),
+    ),
+    "blacklist_http_request_duration_seconds": (
+        "histogram",
+        "HTTP request latency by blueprint route",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    "blacklist_http_response_size_bytes": (
+        "histogram",
+        "HTTP response body size by blueprint route",
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+    ),
+    "blacklist_cache_requests_total": (
+        "counter",
+        "Cache lookups by cache and result (hit/miss)",
+        (),
+    ),
+    "blacklist_cache_hit_ratio": (
+        "gauge",
+        "Cache hit ratio across workers",
+        (),
+    ),
+    "blacklist_db_pool_connections": (
+        "gauge",
+        "Database pool connections by state across live workers",
+        (),
+    ),
+    "blacklist_db_pool_max_connections": (
+        "gauge",
+        "Database pool capacity across live workers",
+        (),
+    ),
+    "blacklist_db_pool_utilization": (
+        "gauge",
+        "Database pool connections in use / capacity across live workers",
+        (),
+    ),
+    "blacklist_db_pool_checkouts_total": (
+        "counter",
+        "Database pool checkouts",
+        (),
+    ),
+    "blacklist_db_pool_waits_total": (
+        "counter",
+        "Database pool checkouts that had to wait for a free connection",
+        (),
+    ),
+    "blacklist_collection_duration_seconds": (
+        "histogram",
+        "Collector run duration by source and status",
+        (1, 5, 10, 30, 60, 120, 300, 600, 1800),
+    ),
+    "blacklist_ingest_duration_seconds": (
+        "histogram",
+        "Bulk load / reconcile duration by source and mode",
+        (0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+    ),
+    "blacklist_ingest_rows_total": (
+        "counter",
+        "Ingested rows by source and result",
+        (),
+    ),
+}
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    워커별 메트릭 저장소 + 워커 간 파일 집계
+    - METRICS_DIR: 워커별 파일 디렉토리 (기본 /dev/shm/blacklist_metrics)
+    - METRICS_FLUSH_INTERVAL: 요청 처리 후 파일 기록 최소 간격 (기본 5초)
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, flush_interval: Optional[float] = None
+    ):
+        self.directory = directory or os.getenv(
+            "METRICS_DIR", os.path.join(state_dir(), "blacklist_metrics")
+        )
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+        )
+        self.enabled = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+        self._lock = threading.Lock()
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+        self._reset_state()
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        # (버킷별 건수, 합계, 건수)
+        self._histograms: Dict[Tuple[str, LabelKey], List[Any]] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._last_flush = 0.0
+
+    def _check_pid(self):
+        """fork 후 부모 프로세스의 누적값 버리기"""
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    # === 기록 ===
+
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, value: float = 1):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_pid()
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_counter(self, name: str, labels: Optional[Dict[str, Any]], value: float):
+        """프로세스 누적값을 그대로 반영 (다른 모듈이 이미 세고 있는 카운터)"""
+        with self._lock:
+            self._check_pid()
+            self._counters[(name, _label_key(labels))] = value
+
+    def set_gauge(self, name: str, labels: Optional[Dict[str, Any]], value: float):
+        with self._lock:
+            self._check_pid()
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, labels: Optional[Dict[str, Any]], value: float):
+        buckets = METRICS[name][2]
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_pid()
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            entry[0][bisect_left(buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time_collection(self, source: str) -> Iterator[Dict[str, str]]:
+        """수집기 실행 시간 기록 (yield된 dict의 status를 바꿔 결과 지정)"""
+        outcome = {"status": "success"}
+        started = time.perf_counter()
+        try:
+            yield outcome
+        except Exception:
+            outcome["status"] = "error"
+            raise
+        finally:
+            self.observe(
+                "blacklist_collection_duration_seconds",
+                {"source": source, "status": outcome["status"]},
+                time.perf_counter() - started,
+            )
+
+    def register_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        """파일 기록 직전에 호출되는 값 수집 함수 등록 (캐시/풀 상태 등)"""
+        self._collectors.append(collector)
+
+    # === 워커 파일 ===
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"worker_{pid}.json")
+
+    def _local(self) -> Dict[str, Any]:
+        """이 워커의 누적값 (파일 형식)"""
+        with self._lock:
+            self._check_pid()
+            return {
+                "pid": self._pid,
+                **self._dump(
+                    {
+                        "counters": self._counters,
+                        "histograms": self._histograms,
+                        "gauges": self._gauges,
+                    }
+                ),
+            }
+
+    def flush(self, force: bool = False):
+        """워커 파일 기록 (flush_interval 이내 재호출은 무시)"""
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                logger.debug(f"메트릭 수집 함수 실패: {e}")
+
+        data = self._local()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(data["pid"])
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"메트릭 파일 기록 실패: {e}")
+
+    @staticmethod
+    def _dump(state: Dict[str, Dict]) -> Dict[str, List]:
+        """메모리 형식 → 파일 형식"""
+        return {
+            "counters": [[n, k, v] for (n, k), v in state["counters"].items()],
+            "histograms": [
+                [n, k, list(e[0]), e[1], e[2]]
+                for (n, k), e in state["histograms"].items()
+            ],
+            "gauges": [[n, k, v] for (n, k), v in state.get("gauges", {}).items()],
+        }
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _merge(total: Dict[str, Dict], data: Dict[str, Any], gauges: bool = True):
+        for name, key, value in data.get("counters", []):
+            k = (name, tuple(map(tuple, key)))
+            total["counters"][k] = total["counters"].get(k, 0) + value
+        for name, key, buckets, sum_, count in data.get("histograms", []):
+            k = (name, tuple(map(tuple, key)))
+            entry = total["histograms"].get(k)
+            if entry is None or len(entry[0]) != len(buckets):
+                total["histograms"][k] = [list(buckets), sum_, count]
+            else:
+                entry[0] = [a + b for a, b in zip(entry[0], buckets)]
+                entry[1] += sum_
+                entry[2] += count
+        if gauges:
+            for name, key, value in data.get("gauges", []):
+                k = (name, tuple(map(tuple, key)))
+                total["gauges"][k] = total["gauges"].get(k, 0) + value
+
+    def collect(self) -> Dict[str, Dict]:
+        """
+        모든 워커 파일 합산 (종료된 워커는 아카이브로 합친 뒤 삭제)
+        공유 디렉토리를 쓸 수 없으면 이 워커의 값만 합산한다.
+        """
+        self.flush(force=True)
+        try:
+            total = self._collect_files()
+        except OSError as e:
+            logger.warning(f"메트릭 파일 집계 실패 ({self.directory}): {e}")
+            total = {"counters": {}, "histograms": {}, "gauges": {}}
+            self._merge(total, self._local())
+        self._derive(total)
+        return total
+
+    def _collect_files(self) -> Dict[str, Dict]:
+        os.makedirs(self.directory, exist_ok=True)
+        archive_path = os.path.join(self.directory, "archive.json")
+        total: Dict[str, Dict] = {"counters": {}, "histograms": {}, "gauges": {}}
+
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive = self._read(archive_path) or {}
+            folded: Dict[str, Dict] = {"counters": {}, "histograms": {}, "gauges": {}}
+            self._merge(folded, archive, gauges=False)
+            dead = []
+
+            for path in glob.glob(os.path.join(self.directory, "worker_*.json")):
+                data = self._read(path)
+                if data is None:
+                    continue
+                if data.get("pid") != self._pid and not pid_alive(data["pid"]):
+                    self._merge(folded, data, gauges=False)
+                    dead.append(path)
+                else:
+                    self._merge(total, data)
+
+            if dead:
+                tmp = f"{archive_path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self._dump(folded), f)
+                os.replace(tmp, archive_path)
+                for path in dead:
+                    os.unlink(path)
+
+        self._merge(total, self._dump(folded), gauges=False)
+        return total
+
+    @staticmethod
+    def _derive(total: Dict[str, Dict]):
+        """워커 합산 값에서 계산되는 비율 게이지"""
+        counters, gauges = total["counters"], total["gauges"]
+        caches: Dict[str, Dict[str, float]] = {}
+        for (name, key), value in counters.items():
+            if name == "blacklist_cache_requests_total":
+                labels = dict(key)
+                caches.setdefault(labels.get("cache", ""), {})[
+                    labels.get("result", "")
+                ] = value
+        for cache, results in caches.items():
+            lookups = results.get("hit", 0) + results.get("miss", 0)
+            if lookups:
+                gauges[("blacklist_cache_hit_ratio", (("cache", cache),))] = (
+                    results.get("hit", 0) / lookups
+                )
+
+        capacity = gauges.get(("blacklist_db_pool_max_connections", ()), 0)
+        in_use = gauges.get(("blacklist_db_pool_connections", (("state", "in_use"),)), 0)
+        if capacity:
+            gauges[("blacklist_db_pool_utilization", ())] = in_use / capacity
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식 (0.0.4)"""
+        total = self.collect()
+        series: Dict[str, List[str]] = {}
+
+        for (name, key), value in sorted(total["counters"].items()):
+            series.setdefault(name, []).append(
+                f"{name}{_format_labels(key)} {_format_value(value)}"
+            )
+        for (name, key), value in sorted(total["gauges"].items()):
+            series.setdefault(name, []).append(
+                f"{name}{_format_labels(key)} {_format_value(value)}"
+            )
+        for (name, key), (buckets, sum_, count) in sorted(total["histograms"].items()):
+            bounds = METRICS.get(name, ("", "", ()))[2] + (float("inf"),)
+            lines = series.setdefault(name, [])
+            cumulative = 0
+            for bound, bucket in zip(bounds, buckets):
+                cumulative += bucket
+                le = (("le", _format_value(bound)),)
+                lines.append(
+                    f"{name}_bucket{_format_labels(key, le)} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(sum_)}")
+            lines.append(f"{name}_count{_format_labels(key)} {count}")
+
+        output = []
+        for name in sorted(series):
+            kind, help_text, _ = METRICS.get(name, ("untyped", name, ()))
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(series[name])
+        return "\n".join(output) + "\n"
+
+    # === Flask 연동 ===
+
+    def init_app(self, app: Flask):
+        """요청 계측 훅과 /metrics 엔드포인트 등록"""
+        if not self.enabled:
+            return
+        if _collect_runtime not in self._collectors:
+            self.register_collector(_collect_runtime)
+
+        @app.before_request
+        def _metrics_start():
+            g._metrics_started = time.perf_counter()
+
+        @app.after_request
+        def _metrics_record(response):
+            started = g.pop("_metrics_started", None)
+            if started is None or request.path == "/metrics":
+                return response
+            try:
+                rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+                labels = {
+                    "blueprint": request.blueprint or "app",
+                    "route": rule,
+                    "method": request.method,
+                }
+                self.observe(
+                    "blacklist_http_request_duration_seconds",
+                    labels,
+                    time.perf_counter() - started,
+                )
+                if not response.is_streamed and response.content_length is not None:
+                    self.observe(
+                        "blacklist_http_response_size_bytes",
+                        labels,
+                        response.content_length,
+                    )
+                self.inc(
+                    "blacklist_http_requests_total",
+                    {**labels, "status": response.status_code},
+                )
+                self.flush()
+            except Exception as e:
+                logger.debug(f"요청 메트릭 기록 실패: {e}")
+            return response
+
+        @app.route("/metrics")
+        def prometheus_metrics():
+            """Prometheus 메트릭 (모든 워커 합산)"""
+            return Response(
+                self.render(), mimetype="text/plain; version=0.0.4; charset=utf-8"
+            )
+
+
+def _collect_runtime(registry: MetricsRegistry):
+    """캐시 적중 / 커넥션 풀 상태 수집 (각 모듈의 프로세스 누적값)"""
+    from src.core.database.connection_pool import db_pool
+    from src.core.services.blacklist_service import service
+    from src.core.services.feed_cache import feed_cache
+
+    caches = {
+        "feed": feed_cache.get_stats(),
+        "snapshot": service._snapshot_cache.get_stats(),
+    }
+    for cache, stats in caches.items():
+        registry.set_counter(
+            "blacklist_cache_requests_total",
+            {"cache": cache, "result": "hit"},
+            stats["hits"],
+        )
+        registry.set_counter(
+            "blacklist_cache_requests_total",
+            {"cache": cache, "result": "miss"},
+            stats["misses"],
+        )
+
+    pool = db_pool.get_pool_stats()
+    if pool["pid"] == os.getpid():
+        registry.set_gauge(
+            "blacklist_db_pool_connections", {"state": "in_use"}, pool["in_use"]
+        )
+        registry.set_gauge("blacklist_db_pool_connections", {"state": "idle"}, pool["idle"])
+        registry.set_gauge("blacklist_db_pool_max_connections", None, pool["max"])
+        registry.set_counter("blacklist_db_pool_checkouts_total", None, pool["checkouts"])
+        registry.set_counter("blacklist_db_pool_waits_total", None, pool["waits"])
+
+
+# 전역 메트릭 인스턴스
+metrics = MetricsRegistry()
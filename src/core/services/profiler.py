@@ -0,0 +1,299 @@
+"""
+요청 단위 온디맨드 프로파일링 (WSGI 미들웨어)
+- 관리자 토큰 헤더(X-Profile-Token) 또는 샘플링 비율로 선택된 요청만 프로파일링
+- cprofile: 결정적 프로파일 → .prof (pstats / snakeviz / flameprof)
+- sample: 통계적 스택 샘플링 → .folded (flamegraph.pl / speedscope collapsed stack)
+PROFILE_TOKEN과 PROFILE_SAMPLE_RATE가 모두 비어 있으면 미들웨어를 설치하지 않는다.
+"""
+import os
+import re
+import sys
+import time
+import hmac
+import random
+import cProfile
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import Flask, abort, jsonify, request, send_file
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+_EXTENSIONS = {"cprofile": ".prof", "sample": ".folded"}
+_SAFE_NAME = re.compile(r"^[\w.-]+\.(prof|folded)$")
+_SLUG = re.compile(r"[^\w]+")
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 주기적으로 수집 (collapsed stack 카운트)"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                    f":{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RequestProfiler:
+    """
+    선택된 요청의 프로파일을 파일로 저장
+    - PROFILE_TOKEN: 요청 헤더 X-Profile-Token과 일치하면 프로파일링 (X-Profile-Mode로 방식 지정)
+    - PROFILE_SAMPLE_RATE: 무작위 샘플링 비율 0~1 (기본 0)
+    - PROFILE_PATHS: 샘플링 대상 경로 접두사, 쉼표 구분 (기본 /api/)
+    - PROFILE_MODE: 기본 방식 cprofile / sample (기본 cprofile)
+    - PROFILE_SAMPLE_INTERVAL_MS: 스택 샘플링 간격 (기본 5ms)
+    - PROFILE_DIR: 저장 디렉토리 (기본 logs/profiles), PROFILE_MAX_FILES: 보관 개수 (기본 200)
+    """
+
+    def __init__(self):
+        self.token = os.getenv("PROFILE_TOKEN", "")
+        self.sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.paths = tuple(
+            prefix.strip()
+            for prefix in os.getenv("PROFILE_PATHS", "/api/").split(",")
+            if prefix.strip()
+        )
+        mode = os.getenv("PROFILE_MODE", "cprofile").lower()
+        self.mode = mode if mode in PROFILE_MODES else "cprofile"
+        self.sample_interval = (
+            float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")) / 1000
+        )
+        self.directory = Path(os.getenv("PROFILE_DIR", "logs/profiles"))
+        self.max_files = int(os.getenv("PROFILE_MAX_FILES", "200"))
+        # cProfile은 프로세스 내 동시 1개만 활성화 가능
+        self._cprofile_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token) or self.sample_rate > 0
+
+    def _token_ok(self, supplied: Optional[str]) -> bool:
+        return bool(self.token and supplied) and hmac.compare_digest(
+            supplied.encode(), self.token.encode()
+        )
+
+    def authorized(self, supplied: Optional[str]) -> bool:
+        """X-Profile-Token 관리자 토큰 확인 (PROFILE_TOKEN 미설정 시 항상 거부)"""
+        return self._token_ok(supplied)
+
+    def _select(self, environ: Dict[str, Any]) -> Optional[str]:
+        """프로파일링 방식 반환 (대상이 아니면 None)"""
+        if self._token_ok(environ.get("HTTP_X_PROFILE_TOKEN")):
+            mode = environ.get("HTTP_X_PROFILE_MODE", self.mode).lower()
+            return mode if mode in PROFILE_MODES else self.mode
+        if (
+            self.sample_rate > 0
+            and environ.get("PATH_INFO", "").startswith(self.paths)
+            and random.random() < self.sample_rate
+        ):
+            return self.mode
+        return None
+
+    def _filename(self, environ: Dict[str, Any], mode: str, elapsed: float) -> str:
+        slug = _SLUG.sub("_", environ.get("PATH_INFO", "")).strip("_")[:60] or "root"
+        return (
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}_"
+            f"{environ.get('REQUEST_METHOD', 'GET')}_{slug}_"
+            f"{elapsed * 1000:.0f}ms{_EXTENSIONS[mode]}"
+        )
+
+    def _prune(self):
+        """보관 개수를 넘는 오래된 프로파일 삭제"""
+        files = sorted(self.list_profiles(), key=lambda p: p["modified"])
+        for entry in files[: max(0, len(files) - self.max_files)]:
+            try:
+                (self.directory / entry["name"]).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _save(self, environ, mode: str, elapsed: float, writer: Callable[[Path], Any]):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            name = self._filename(environ, mode, elapsed)
+            writer(self.directory / name)
+            self._prune()
+            logger.info(
+                f"요청 프로파일 저장: {name} ({environ.get('PATH_INFO')}, "
+                f"{elapsed * 1000:.1f}ms)"
+            )
+            return name
+        except Exception as e:
+            logger.warning(f"요청 프로파일 저장 실패: {e}")
+            return None
+
+    @staticmethod
+    def _is_streamed(environ, headers, iterable) -> bool:
+        """스트리밍 응답 여부 (Content-Length 없는 제너레이터 응답 또는 파일 전달)"""
+        file_wrapper = environ.get("wsgi.file_wrapper")
+        if isinstance(file_wrapper, type) and isinstance(iterable, file_wrapper):
+            return True
+        return not any(key.lower() == "content-length" for key, _ in headers)
+
+    def _profiled_call(self, wsgi_app, environ, start_response, mode: str):
+        captured: Dict[str, Any] = {}
+
+        # 본문 생성까지 프로파일에 포함하도록 응답을 버퍼링하고 start_response 호출을 지연
+        # 스트리밍 응답은 버퍼링하지 않음 → start_response 시점까지만 프로파일
+        def capture_start_response(status, headers, exc_info=None):
+            captured["status"], captured["headers"] = status, list(headers)
+            captured["exc_info"] = exc_info
+            return lambda data: None
+
+        def run():
+            iterable = wsgi_app(environ, capture_start_response)
+            if self._is_streamed(environ, captured["headers"], iterable):
+                return iterable, None
+            try:
+                return None, b"".join(iterable)
+            finally:
+                if hasattr(iterable, "close"):
+                    iterable.close()
+
+        started = time.perf_counter()
+        if mode == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                iterable, body = run()
+            finally:
+                profile.disable()
+            elapsed = time.perf_counter() - started
+            name = self._save(
+                environ, mode, elapsed, lambda path: profile.dump_stats(str(path))
+            )
+        else:
+            sampler = StackSampler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+            try:
+                iterable, body = run()
+            finally:
+                sampler.stop()
+            elapsed = time.perf_counter() - started
+            name = self._save(environ, mode, elapsed, sampler.dump)
+
+        headers = captured["headers"]
+        if body is not None:
+            headers = [
+                (key, value) for key, value in headers if key.lower() != "content-length"
+            ]
+            headers.append(("Content-Length", str(len(body))))
+        if name:
+            headers.append(("X-Profile-Id", name))
+        start_response(captured["status"], headers, captured["exc_info"])
+        return [body] if body is not None else iterable
+
+    def wrap(self, wsgi_app):
+        """프로파일링 WSGI 미들웨어"""
+
+        def middleware(environ, start_response):
+            mode = self._select(environ)
+            if mode is None:
+                return wsgi_app(environ, start_response)
+            if mode == "cprofile":
+                if self._cprofile_lock.acquire(blocking=False):
+                    try:
+                        return self._profiled_call(
+                            wsgi_app, environ, start_response, mode
+                        )
+                    finally:
+                        self._cprofile_lock.release()
+                # 다른 요청이 cProfile 사용 중이면 스택 샘플링으로 대체
+                mode = "sample"
+            return self._profiled_call(wsgi_app, environ, start_response, mode)
+
+        return middleware
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """저장된 프로파일 목록 (최신순)"""
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for path in self.directory.iterdir():
+            if not _SAFE_NAME.match(path.name):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append(
+                {"name": path.name, "size": stat.st_size, "modified": stat.st_mtime}
+            )
+        return sorted(entries, key=lambda e: e["modified"], reverse=True)
+
+    def init_app(self, app: Flask):
+        """미들웨어와 프로파일 조회/다운로드 엔드포인트 등록 (비활성 시 아무것도 하지 않음)"""
+        if not self.enabled:
+            return
+        app.wsgi_app = self.wrap(app.wsgi_app)
+
+        def require_token():
+            # PROFILE_SAMPLE_RATE만 설정된 경우에도 토큰 없이는 조회/다운로드 불가
+            if not self.authorized(request.headers.get("X-Profile-Token")):
+                abort(403)
+
+        @app.route("/api/internal/profiles")
+        def list_request_profiles():
+            """저장된 요청 프로파일 목록"""
+            require_token()
+            return jsonify(
+                {
+                    "success": True,
+                    "directory": str(self.directory),
+                    "profiles": self.list_profiles(),
+                }
+            )
+
+        @app.route("/api/internal/profiles/<name>")
+        def download_request_profile(name):
+            """요청 프로파일 다운로드 (.prof: pstats, .folded: flamegraph collapsed stack)"""
+            require_token()
+            path = self.directory / name
+            if not _SAFE_NAME.match(name) or not path.is_file():
+                abort(404)
+            return send_file(path.resolve(), as_attachment=True, download_name=name)
+
+        logger.info(
+            f"요청 프로파일링 활성화 (token={'set' if self.token else 'unset'}, "
+            f"sample_rate={self.sample_rate}, mode={self.mode}, dir={self.directory})"
+        )
+
+
+# 전역 요청 프로파일러 인스턴스
+request_profiler = RequestProfiler()
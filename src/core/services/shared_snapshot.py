@@ -0,0 +1,387 @@
+"""
+공유 메모리 블랙리스트 스냅샷
+활성 블랙리스트를 버전별 바이너리 파일(/dev/shm)로 기록하고 모든 gunicorn 워커가
+읽기 전용 mmap으로 공유한다 (물리 메모리 한 벌, 역직렬화 없음).
+
+파일 구조 (네이티브 바이트 순서, 섹션은 8바이트 정렬)
+- 헤더: magic, 바이트 순서, 버전, 행/키/CIDR/문자열 개수, updated_at 문자열 id
+- 정렬 키: v4 키(u32) / v4 행(u32) / v6 상위(u64) / v6 하위(u64) / v6 행(u32) / CIDR 행(u32)
+- 고정폭 메타데이터 컬럼 (행 순서 = last_seen DESC)
+  ip / reason / source / category 문자열 id(u32), confidence_level(i32),
+  detection_count(i32), last_seen(i64, epoch 마이크로초), is_active(u8)
+- 문자열 테이블: 오프셋(u32 × n+1) + UTF-8 blob (중복 제거)
+"""
+import os
+import sys
+import glob
+import mmap
+import time
+import fcntl
+import struct
+import logging
+import ipaddress
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.services.blacklist_snapshot import ActiveBlacklistSnapshot
+from src.core.services.data_version import DataVersion
+from src.core.services.ip_index import IPLookupIndex
+from src.core.utils.process_state import state_dir
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BLSNAP01"
+# magic, 바이트 순서, 버전, 행, v4 키, v6 키, CIDR, 문자열 수, updated_at 문자열 id
+HEADER = struct.Struct("=8sB7xQIIIIII")
+
+NULL_STRING = 0xFFFFFFFF
+NULL_INT32 = -(1 << 31)
+NULL_INT64 = -(1 << 63)
+
+_EPOCH = datetime(1970, 1, 1)
+_BYTEORDER = 0 if sys.byteorder == "little" else 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _encode_timestamp(value: Any) -> int:
+    if not value:
+        return NULL_INT64
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _decode_timestamp(value: int) -> Optional[str]:
+    if value == NULL_INT64:
+        return None
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+class _StringTable:
+    """중복 제거 문자열 테이블 (쓰기용)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._blob = bytearray()
+        self.offsets = array("I", [0])
+
+    def add(self, value: Any) -> int:
+        if value is None:
+            return NULL_STRING
+        value = str(value)
+        sid = self._ids.get(value)
+        if sid is None:
+            sid = len(self._ids)
+            self._ids[value] = sid
+            self._blob += value.encode("utf-8")
+            self.offsets.append(len(self._blob))
+        return sid
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def blob(self) -> bytes:
+        return bytes(self._blob)
+
+
+def _layout(
+    row_count: int, v4_count: int, v6_count: int, net_count: int, string_count: int
+):
+    """섹션별 (이름, 타입 코드, 개수) 목록 - 쓰기/읽기 공용"""
+    return [
+        ("v4_keys", "I", v4_count),
+        ("v4_rows", "I", v4_count),
+        ("v6_hi", "Q", v6_count),
+        ("v6_lo", "Q", v6_count),
+        ("v6_rows", "I", v6_count),
+        ("net_rows", "I", net_count),
+        ("ip", "I", row_count),
+        ("reason", "I", row_count),
+        ("source", "I", row_count),
+        ("category", "I", row_count),
+        ("confidence_level", "i", row_count),
+        ("detection_count", "i", row_count),
+        ("last_seen", "q", row_count),
+        ("is_active", "B", row_count),
+        ("string_offsets", "I", string_count + 1),
+    ]
+
+
+def write_snapshot_file(
+    path: str, version: DataVersion, rows: List[Dict[str, Any]]
+) -> int:
+    """스냅샷 파일 기록 (임시 파일 후 os.replace로 원자적 교체), 기록한 바이트 수 반환"""
+    v4_keys, v4_rows, v6_hi, v6_lo, v6_rows, networks = IPLookupIndex.build_keys(
+        rows
+    )
+    strings = _StringTable()
+    updated_at_sid = strings.add(version.updated_at.isoformat())
+
+    columns = {
+        "v4_keys": v4_keys,
+        "v4_rows": v4_rows,
+        "v6_hi": v6_hi,
+        "v6_lo": v6_lo,
+        "v6_rows": v6_rows,
+        "net_rows": array("I", (offset for _, offset in networks)),
+        "ip": array("I"),
+        "reason": array("I"),
+        "source": array("I"),
+        "category": array("I"),
+        "confidence_level": array("i"),
+        "detection_count": array("i"),
+        "last_seen": array("q"),
+        "is_active": array("B"),
+    }
+    for row in rows:
+        columns["ip"].append(strings.add(row["ip_address"]))
+        columns["reason"].append(strings.add(row.get("reason")))
+        columns["source"].append(strings.add(row.get("source")))
+        columns["category"].append(strings.add(row.get("category")))
+        confidence = row.get("confidence_level")
+        columns["confidence_level"].append(
+            NULL_INT32 if confidence is None else int(confidence)
+        )
+        columns["detection_count"].append(int(row.get("detection_count") or 0))
+        columns["last_seen"].append(_encode_timestamp(row.get("last_seen")))
+        columns["is_active"].append(1 if row.get("is_active", True) else 0)
+    columns["string_offsets"] = strings.offsets
+
+    header = HEADER.pack(
+        MAGIC,
+        _BYTEORDER,
+        version.version,
+        len(rows),
+        len(v4_keys),
+        len(v6_hi),
+        len(networks),
+        len(strings),
+        updated_at_sid,
+    )
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    size = 0
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        size = len(header)
+        for name, _, _ in _layout(
+            len(rows), len(v4_keys), len(v6_hi), len(networks), len(strings)
+        ):
+            padding = _align(size) - size
+            f.write(b"\0" * padding)
+            data = columns[name].tobytes()
+            f.write(data)
+            size += padding + len(data)
+        f.write(strings.blob)
+        size += len(strings.blob)
+    os.replace(tmp_path, path)
+    return size
+
+
+class _MappedRows(Sequence):
+    """mmap 컬럼 위의 읽기 전용 행 시퀀스 (접근 시에만 dict 생성)"""
+
+    def __init__(self, snapshot: "MappedBlacklistSnapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.row_count
+
+    def __getitem__(self, offset):
+        if isinstance(offset, slice):
+            return [self._snapshot.row(i) for i in range(*offset.indices(len(self)))]
+        if offset < 0:
+            offset += len(self)
+        if not 0 <= offset < len(self):
+            raise IndexError(offset)
+        return self._snapshot.row(offset)
+
+
+class MappedBlacklistSnapshot(ActiveBlacklistSnapshot):
+    """
+    공유 메모리 파일을 mmap한 활성 블랙리스트 스냅샷
+    - 조회 인덱스는 파일의 정렬 키 배열을 memoryview로 직접 사용
+    - 행 dict는 조회 결과 / JSON 피드 생성 시에만 만든다
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.size = stat.st_size
+        view = memoryview(self._mmap)
+
+        (
+            magic,
+            byteorder,
+            version,
+            self.row_count,
+            v4_count,
+            v6_count,
+            net_count,
+            string_count,
+            updated_at_sid,
+        ) = HEADER.unpack_from(view)
+        if magic != MAGIC or byteorder != _BYTEORDER:
+            raise ValueError(f"스냅샷 파일 형식 불일치: {path}")
+
+        offset = HEADER.size
+        self._columns: Dict[str, memoryview] = {}
+        for name, typecode, count in _layout(
+            self.row_count, v4_count, v6_count, net_count, string_count
+        ):
+            offset = _align(offset)
+            nbytes = count * array(typecode).itemsize
+            self._columns[name] = view[offset : offset + nbytes].cast(typecode)
+            offset += nbytes
+        self._blob = view[offset:]
+        self._strings = self._columns["string_offsets"]
+
+        super().__init__(
+            version,
+            _MappedRows(self),
+            datetime.fromisoformat(self._string(updated_at_sid)),
+        )
+        # 스냅샷 나이는 파일 기록 시각 기준 (모든 워커가 같은 TTL 만료 시점 공유)
+        self.built_at = time.monotonic() - max(0.0, time.time() - stat.st_mtime)
+
+    def _string(self, sid: int) -> Optional[str]:
+        if sid == NULL_STRING:
+            return None
+        return str(self._blob[self._strings[sid] : self._strings[sid + 1]], "utf-8")
+
+    def row(self, offset: int) -> Dict[str, Any]:
+        """행 offset의 메타데이터 dict"""
+        columns = self._columns
+        confidence = columns["confidence_level"][offset]
+        return {
+            "ip_address": self._string(columns["ip"][offset]),
+            "reason": self._string(columns["reason"][offset]),
+            "source": self._string(columns["source"][offset]),
+            "category": self._string(columns["category"][offset]),
+            "confidence_level": None if confidence == NULL_INT32 else confidence,
+            "is_active": bool(columns["is_active"][offset]),
+            "last_seen": _decode_timestamp(columns["last_seen"][offset]),
+            "detection_count": columns["detection_count"][offset],
+        }
+
+    def _build_index(self) -> IPLookupIndex:
+        columns = self._columns
+        networks = []
+        for offset in columns["net_rows"]:
+            ip = self._string(columns["ip"][offset])
+            networks.append((ipaddress.ip_network(ip, strict=False), offset))
+        return IPLookupIndex(
+            self.rows,
+            keys=(
+                columns["v4_keys"],
+                columns["v4_rows"],
+                columns["v6_hi"],
+                columns["v6_lo"],
+                columns["v6_rows"],
+                networks,
+            ),
+        )
+
+    def _ip_strings(self) -> List[str]:
+        return [self._string(sid) for sid in self._columns["ip"]]
+
+    def _build(self, format_type: str) -> Any:
+        if format_type == "enhanced":
+            return [self.row(offset) for offset in range(self.row_count)]
+        return super()._build(format_type)
+
+
+class SharedSnapshotStore:
+    """
+    버전별 공유 메모리 스냅샷 파일 관리
+    - 파일이 없거나 TTL이 지났을 때 파일 잠금을 잡은 워커 하나만 DB에서 재생성
+    - 나머지 워커는 잠금 해제 후 새 파일을 mmap (버전별 파일명으로 원자적 전환)
+    """
+
+    def __init__(self, directory: Optional[str] = None, keep: int = 2):
+        self.directory = directory or os.getenv(
+            "BLACKLIST_SNAPSHOT_DIR", state_dir()
+        )
+        self.keep = keep
+        self.prefix = "blacklist_snapshot"
+
+    def path_for(self, version: int) -> str:
+        return os.path.join(self.directory, f"{self.prefix}.v{version}.bin")
+
+    def _open_fresh(
+        self, path: str, version: int, max_age: float, newer_than: float = 0.0
+    ) -> Optional[MappedBlacklistSnapshot]:
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        if time.time() - mtime >= max_age or mtime <= newer_than:
+            return None
+
+        try:
+            snapshot = MappedBlacklistSnapshot(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"공유 스냅샷 파일 열기 실패 - 재생성: {path}: {e}")
+            return None
+        return snapshot if snapshot.version == version else None
+
+    def acquire(
+        self,
+        version: DataVersion,
+        loader: Callable[[], List[Dict[str, Any]]],
+        max_age: float,
+        force: bool = False,
+    ) -> MappedBlacklistSnapshot:
+        """버전의 공유 스냅샷 반환 (없거나 만료됐거나 force면 재생성)"""
+        path = self.path_for(version.version)
+        requested_at = time.time()
+        if not force:
+            snapshot = self._open_fresh(path, version.version, max_age)
+            if snapshot is not None:
+                return snapshot
+
+        with open(os.path.join(self.directory, f".{self.prefix}.lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # 대기 중 다른 워커가 이미 기록했으면 그대로 사용
+            snapshot = self._open_fresh(
+                path,
+                version.version,
+                max_age,
+                newer_than=requested_at if force else 0.0,
+            )
+            if snapshot is not None:
+                return snapshot
+
+            rows = loader()
+            size = write_snapshot_file(path, version, rows)
+            logger.info(
+                f"공유 스냅샷 v{version.version} 기록: "
+                f"{len(rows)}개 행, {size} bytes ({path})"
+            )
+            self._cleanup()
+
+        return MappedBlacklistSnapshot(path)
+
+    def _cleanup(self):
+        """최근 keep개 버전 외 파일 삭제 (이미 mmap한 워커는 영향 없음)"""
+        files = []
+        for path in glob.glob(os.path.join(self.directory, f"{self.prefix}.v*.bin")):
+            try:
+                files.append((int(path.rsplit(".v", 1)[1][:-4]), path))
+            except ValueError:
+                continue
+        for _, path in sorted(files)[: -self.keep]:
+            try:
+                os.unlink(path)
+            except OSError as e:
+                logger.debug(f"이전 스냅샷 파일 삭제 실패: {path}: {e}")
@@ -0,0 +1,387 @@
+"""
+블랙리스트 통계 집계 테이블
+- blacklist_stats: source, category, is_active 단위 카운터
+- blacklist_daily_stats: DATE(last_seen), source 단위 일별 카운터
+blacklist_ips 변경 시 문장 단위 트리거가 같은 트랜잭션 안에서 증감을 반영하여
+대시보드 통계 조회가 테이블 크기와 무관하게 집계 행 수에만 비례하도록 한다.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from psycopg2 import errors
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BlacklistStats:
+    """집계 행 목록 (source, category, is_active별 ip_count / confidence 합계)"""
+
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    # False면 집계 테이블이 없어 blacklist_ips를 직접 집계한 결과
+    from_rollup: bool = True
+
+    @property
+    def total_ips(self) -> int:
+        return sum(row["ip_count"] for row in self.rows)
+
+    @property
+    def active_ips(self) -> int:
+        return sum(row["ip_count"] for row in self.rows if row["is_active"])
+
+    @property
+    def last_seen(self) -> Optional[datetime]:
+        seen = [row["last_seen"] for row in self.rows if row["last_seen"]]
+        return max(seen) if seen else None
+
+    def by_source(self) -> Dict[str, Dict[str, Any]]:
+        """소스별 IP 수 / 활성 IP 수 / 평균 신뢰도 / 최근 탐지 시각"""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for row in self.rows:
+            entry = totals.setdefault(
+                row["source"],
+                {"count": 0, "active": 0, "_sum": 0, "_n": 0, "last_seen": None},
+            )
+            entry["count"] += row["ip_count"]
+            if row["is_active"]:
+                entry["active"] += row["ip_count"]
+            entry["_sum"] += row["confidence_sum"]
+            entry["_n"] += row["confidence_count"]
+            if row["last_seen"] and (
+                entry["last_seen"] is None or row["last_seen"] > entry["last_seen"]
+            ):
+                entry["last_seen"] = row["last_seen"]
+
+        for entry in totals.values():
+            confidence_sum, confidence_n = entry.pop("_sum"), entry.pop("_n")
+            entry["avg_confidence"] = (
+                float(confidence_sum) / confidence_n if confidence_n else 0
+            )
+        return totals
+
+    def by_category(self) -> Dict[str, int]:
+        """카테고리별 IP 수"""
+        counts: Dict[str, int] = {}
+        for row in self.rows:
+            counts[row["category"]] = counts.get(row["category"], 0) + row["ip_count"]
+        return counts
+
+
+@dataclass
+class DailyStats:
+    """일별 소스별 IP 수 (days × sources, 값이 없는 날은 0)"""
+
+    days: List[date]
+    series: Dict[str, List[int]] = field(default_factory=dict)
+
+    def get(self, source: str) -> List[int]:
+        return self.series.get(source, [0] * len(self.days))
+
+    def labels(self, fmt: str = "%m/%d") -> List[str]:
+        return [day.strftime(fmt) for day in self.days]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.days[0].isoformat() if self.days else None,
+            "end": self.days[-1].isoformat() if self.days else None,
+            "days": [day.isoformat() for day in self.days],
+            "sources": self.series,
+            "totals": [sum(counts) for counts in zip(*self.series.values())]
+            if self.series
+            else [0] * len(self.days),
+        }
+
+
+class BlacklistStatsRollup:
+    """
+    blacklist_stats 집계 테이블 관리
+    - 스키마/트리거/초기 적재는 마이그레이션에서 적용 (SCHEMA_SQL + BACKFILL_SQL)
+    - 수집/수동 등록/삭제 모두 트리거로 반영되므로 쓰기 경로는 별도 호출 불필요
+    - last_seen은 단조 증가 (삭제된 행의 최근 탐지 시각은 되돌리지 않음)
+    - source/category가 NULL인 행은 'unknown'으로 집계
+    """
+
+    SCHEMA_SQL = """
+        CREATE TABLE IF NOT EXISTS blacklist_stats (
+            source VARCHAR(100) NOT NULL,
+            category VARCHAR(50) NOT NULL,
+            is_active BOOLEAN NOT NULL,
+            ip_count BIGINT NOT NULL DEFAULT 0,
+            confidence_sum BIGINT NOT NULL DEFAULT 0,
+            confidence_count BIGINT NOT NULL DEFAULT 0,
+            last_seen TIMESTAMP,
+            PRIMARY KEY (source, category, is_active)
+        );
+
+        CREATE OR REPLACE FUNCTION blacklist_stats_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO blacklist_stats AS s
+                    (source, category, is_active,
+                     ip_count, confidence_sum, confidence_count)
+                SELECT COALESCE(source, 'unknown'), COALESCE(category, 'unknown'),
+                       COALESCE(is_active, false),
+                       -COUNT(*), -COALESCE(SUM(confidence_level), 0),
+                       -COUNT(confidence_level)
+                FROM old_rows
+                GROUP BY 1, 2, 3
+                ORDER BY 1, 2, 3
+                ON CONFLICT (source, category, is_active) DO UPDATE
+                SET ip_count = s.ip_count + EXCLUDED.ip_count,
+                    confidence_sum = s.confidence_sum + EXCLUDED.confidence_sum,
+                    confidence_count = s.confidence_count + EXCLUDED.confidence_count;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO blacklist_stats AS s
+                    (source, category, is_active,
+                     ip_count, confidence_sum, confidence_count, last_seen)
+                SELECT COALESCE(source, 'unknown'), COALESCE(category, 'unknown'),
+                       COALESCE(is_active, false),
+                       COUNT(*), COALESCE(SUM(confidence_level), 0),
+                       COUNT(confidence_level), MAX(last_seen)
+                FROM new_rows
+                GROUP BY 1, 2, 3
+                ORDER BY 1, 2, 3
+                ON CONFLICT (source, category, is_active) DO UPDATE
+                SET ip_count = s.ip_count + EXCLUDED.ip_count,
+                    confidence_sum = s.confidence_sum + EXCLUDED.confidence_sum,
+                    confidence_count = s.confidence_count + EXCLUDED.confidence_count,
+                    last_seen = GREATEST(s.last_seen, EXCLUDED.last_seen);
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION blacklist_stats_reset() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM blacklist_stats;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS blacklist_stats_insert ON blacklist_ips;
+        CREATE TRIGGER blacklist_stats_insert
+            AFTER INSERT ON blacklist_ips
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_apply();
+
+        DROP TRIGGER IF EXISTS blacklist_stats_update ON blacklist_ips;
+        CREATE TRIGGER blacklist_stats_update
+            AFTER UPDATE ON blacklist_ips
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_apply();
+
+        DROP TRIGGER IF EXISTS blacklist_stats_delete ON blacklist_ips;
+        CREATE TRIGGER blacklist_stats_delete
+            AFTER DELETE ON blacklist_ips
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_apply();
+
+        DROP TRIGGER IF EXISTS blacklist_stats_truncate ON blacklist_ips;
+        CREATE TRIGGER blacklist_stats_truncate
+            AFTER TRUNCATE ON blacklist_ips
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_reset();
+    """
+
+    # 트리거 생성과 같은 트랜잭션에서 실행 (잠금으로 그 사이 쓰기 누락 방지)
+    BACKFILL_SQL = """
+        LOCK TABLE blacklist_ips IN SHARE ROW EXCLUSIVE MODE;
+        DELETE FROM blacklist_stats;
+        INSERT INTO blacklist_stats
+            (source, category, is_active,
+             ip_count, confidence_sum, confidence_count, last_seen)
+        SELECT COALESCE(source, 'unknown'), COALESCE(category, 'unknown'),
+               COALESCE(is_active, false),
+               COUNT(*), COALESCE(SUM(confidence_level), 0),
+               COUNT(confidence_level), MAX(last_seen)
+        FROM blacklist_ips
+        GROUP BY 1, 2, 3;
+    """
+
+    READ_SQL = """
+        SELECT source, category, is_active,
+               ip_count, confidence_sum, confidence_count, last_seen
+        FROM blacklist_stats
+        WHERE ip_count <> 0
+    """
+
+    # 집계 테이블이 없을 때 (DB_AUTO_MIGRATE=false 등) 한 번의 GROUP BY로 대체
+    SCAN_SQL = """
+        SELECT COALESCE(source, 'unknown') AS source,
+               COALESCE(category, 'unknown') AS category,
+               COALESCE(is_active, false) AS is_active,
+               COUNT(*) AS ip_count,
+               COALESCE(SUM(confidence_level), 0) AS confidence_sum,
+               COUNT(confidence_level) AS confidence_count,
+               MAX(last_seen) AS last_seen
+        FROM blacklist_ips
+        GROUP BY 1, 2, 3
+    """
+
+    # 행의 last_seen 날짜가 바뀌면 이전 날짜에서 빼고 새 날짜에 더함
+    DAILY_SCHEMA_SQL = """
+        CREATE TABLE IF NOT EXISTS blacklist_daily_stats (
+            day DATE NOT NULL,
+            source VARCHAR(100) NOT NULL,
+            ip_count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, source)
+        );
+
+        CREATE OR REPLACE FUNCTION blacklist_daily_stats_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO blacklist_daily_stats AS d (day, source, ip_count)
+                SELECT DATE(last_seen), COALESCE(source, 'unknown'), COUNT(*)
+                FROM new_rows
+                WHERE last_seen IS NOT NULL
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+                ON CONFLICT (day, source) DO UPDATE
+                SET ip_count = d.ip_count + EXCLUDED.ip_count;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO blacklist_daily_stats AS d (day, source, ip_count)
+                SELECT DATE(last_seen), COALESCE(source, 'unknown'), -COUNT(*)
+                FROM old_rows
+                WHERE last_seen IS NOT NULL
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+                ON CONFLICT (day, source) DO UPDATE
+                SET ip_count = d.ip_count + EXCLUDED.ip_count;
+            ELSE
+                INSERT INTO blacklist_daily_stats AS d (day, source, ip_count)
+                SELECT day, source, SUM(delta)
+                FROM (
+                    SELECT DATE(last_seen) AS day,
+                           COALESCE(source, 'unknown') AS source, -1 AS delta
+                    FROM old_rows
+                    WHERE last_seen IS NOT NULL
+                    UNION ALL
+                    SELECT DATE(last_seen), COALESCE(source, 'unknown'), 1
+                    FROM new_rows
+                    WHERE last_seen IS NOT NULL
+                ) changes
+                GROUP BY day, source
+                HAVING SUM(delta) <> 0
+                ORDER BY day, source
+                ON CONFLICT (day, source) DO UPDATE
+                SET ip_count = d.ip_count + EXCLUDED.ip_count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION blacklist_daily_stats_reset() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM blacklist_daily_stats;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS blacklist_daily_stats_insert ON blacklist_ips;
+        CREATE TRIGGER blacklist_daily_stats_insert
+            AFTER INSERT ON blacklist_ips
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_daily_stats_apply();
+
+        DROP TRIGGER IF EXISTS blacklist_daily_stats_update ON blacklist_ips;
+        CREATE TRIGGER blacklist_daily_stats_update
+            AFTER UPDATE ON blacklist_ips
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_daily_stats_apply();
+
+        DROP TRIGGER IF EXISTS blacklist_daily_stats_delete ON blacklist_ips;
+        CREATE TRIGGER blacklist_daily_stats_delete
+            AFTER DELETE ON blacklist_ips
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_daily_stats_apply();
+
+        DROP TRIGGER IF EXISTS blacklist_daily_stats_truncate ON blacklist_ips;
+        CREATE TRIGGER blacklist_daily_stats_truncate
+            AFTER TRUNCATE ON blacklist_ips
+            FOR EACH STATEMENT EXECUTE FUNCTION blacklist_daily_stats_reset();
+    """
+
+    DAILY_BACKFILL_SQL = """
+        LOCK TABLE blacklist_ips IN SHARE ROW EXCLUSIVE MODE;
+        DELETE FROM blacklist_daily_stats;
+        INSERT INTO blacklist_daily_stats (day, source, ip_count)
+        SELECT DATE(last_seen), COALESCE(source, 'unknown'), COUNT(*)
+        FROM blacklist_ips
+        WHERE last_seen IS NOT NULL
+        GROUP BY 1, 2;
+    """
+
+    DAILY_READ_SQL = """
+        SELECT day, source, ip_count
+        FROM blacklist_daily_stats
+        WHERE day BETWEEN %s AND %s AND ip_count <> 0
+    """
+
+    # DATE(last_seen), source 표현식 인덱스 사용 (마이그레이션 4)
+    DAILY_SCAN_SQL = """
+        SELECT DATE(last_seen) AS day, COALESCE(source, 'unknown') AS source,
+               COUNT(*) AS ip_count
+        FROM blacklist_ips
+        WHERE DATE(last_seen) BETWEEN %s AND %s
+        GROUP BY 1, 2
+    """
+
+    def read(self, conn) -> BlacklistStats:
+        """집계 행 조회 (conn: 풀에서 대여한 연결, 커밋/반환은 호출자)"""
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            try:
+                cursor.execute(self.READ_SQL)
+                return BlacklistStats(rows=[dict(row) for row in cursor.fetchall()])
+            except errors.UndefinedTable:
+                conn.rollback()
+                logger.warning("blacklist_stats 집계 테이블 없음 - 전체 집계로 대체")
+                cursor.execute(self.SCAN_SQL)
+                return BlacklistStats(
+                    rows=[dict(row) for row in cursor.fetchall()], from_rollup=False
+                )
+        finally:
+            cursor.close()
+
+    async def read_async(self, db) -> BlacklistStats:
+        """집계 행 조회 (db: async_pool.AsyncDatabase)"""
+        try:
+            return BlacklistStats(rows=await db.fetchall(self.READ_SQL))
+        except db.UndefinedTable:
+            logger.warning("blacklist_stats 집계 테이블 없음 - 전체 집계로 대체")
+            return BlacklistStats(
+                rows=await db.fetchall(self.SCAN_SQL), from_rollup=False
+            )
+
+    def daily(self, conn, start: date, end: date) -> DailyStats:
+        """start~end (양 끝 포함) 일별 소스별 IP 수 - 한 번의 범위 조회"""
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        position = {day: i for i, day in enumerate(days)}
+        result = DailyStats(days=days)
+
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            try:
+                cursor.execute(self.DAILY_READ_SQL, (start, end))
+                rows = cursor.fetchall()
+            except errors.UndefinedTable:
+                conn.rollback()
+                logger.warning("blacklist_daily_stats 집계 테이블 없음 - 범위 집계로 대체")
+                cursor.execute(self.DAILY_SCAN_SQL, (start, end))
+                rows = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        for row in rows:
+            counts = result.series.setdefault(row["source"], [0] * len(days))
+            counts[position[row["day"]]] += row["ip_count"]
+        return result
+
+
+# 전역 통계 집계 인스턴스
+stats_rollup = BlacklistStatsRollup()
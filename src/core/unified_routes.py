@@ -2,22 +2,40 @@
 통합 API 라우트
 모든 블랙리스트 API를 하나로 통합한 라우트 시스템
 """
-from flask import Blueprint, request, jsonify, Response, render_template
+from flask import (
+    Blueprint,
+    request,
+    jsonify,
+    Response,
+    render_template,
+    stream_with_context,
+)
 from typing import Dict, Any
 import logging
-import asyncio
+import json
+import os
 from datetime import datetime
 
 # Import service and utilities
+from src.core.database.async_pool import run_async
 from src.core.services.blacklist_service import service
-from src.core.utils.validators import validate_ip, ValidationError
+from src.core.utils.validators import (
+    validate_ip,
+    ValidationError,
+    parse_cidr_aggregation,
+)
 from src.core.utils.error_handlers import handle_exception
+from src.core.services.feed_cache import aggregated_variant, feed_cache
+from src.core.utils.http_cache import feed_response
 
 logger = logging.getLogger(__name__)
 
 # 통합 라우트 블루프린트
 unified_bp = Blueprint("unified", __name__)
 
+# 배치 IP 검색 최대 개수
+MAX_BATCH_SEARCH_IPS = int(os.getenv("MAX_BATCH_SEARCH_IPS", "100000"))
+
 # === 웹 인터페이스 ===
 
 
@@ -293,38 +311,61 @@ def service_status():
 
 @unified_bp.route("/api/blacklist/active", methods=["GET"])
 def get_active_blacklist():
-    """활성 블랙리스트 조회 (플레인 텍스트)"""
+    """활성 블랙리스트 조회 (플레인 텍스트, ?aggregate=cidr 시 CIDR 집약)"""
     try:
-        result = asyncio.run(service.get_active_blacklist(format_type="text"))
+        aggregate, density = parse_cidr_aggregation(request.args)
 
-        if result["success"]:
-            response = Response(
-                "\n".join(result["data"]) + "\n",
-                mimetype="text/plain",
-                headers={
-                    "Cache-Control": "public, max-age=300",
-                    "Content-Disposition": 'inline; filename="blacklist.txt"',
-                },
+        def build(snapshot) -> bytes:
+            ips = (
+                snapshot.render_aggregated("text", density)
+                if aggregate
+                else snapshot.render("text")
             )
-            return response
-        else:
-            return jsonify({"error": result["error"]}), 500
+            return ("\n".join(ips) + "\n").encode("utf-8")
+
+        return feed_response(
+            feed_cache,
+            service.get_data_version(),
+            service.get_active_snapshot,
+            aggregated_variant("text", density) if aggregate else "text",
+            "text/plain",
+            build,
+            headers={"Content-Disposition": 'inline; filename="blacklist.txt"'},
+        )
 
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return handle_exception(e, "활성 블랙리스트 조회 실패")
 
 
 @unified_bp.route("/api/fortigate", methods=["GET"])
 def get_fortigate_format():
-    """FortiGate External Connector 형식"""
+    """FortiGate External Connector 형식 (?aggregate=cidr 시 CIDR 집약)"""
     try:
-        result = asyncio.run(service.get_active_blacklist(format_type="fortigate"))
-
-        if result["success"]:
-            return jsonify(result["data"])
-        else:
-            return jsonify({"error": result["error"]}), 500
+        aggregate, density = parse_cidr_aggregation(request.args)
+
+        def build(snapshot) -> bytes:
+            if aggregate:
+                return jsonify(
+                    snapshot.render_aggregated("fortigate", density)
+                ).get_data()
+            return jsonify(snapshot.render("fortigate")).get_data()
+
+        # unified_api와 본문이 다르므로 별도 변형으로 캐시
+        return feed_response(
+            feed_cache,
+            service.get_data_version(),
+            service.get_active_snapshot,
+            aggregated_variant("fortigate-legacy", density)
+            if aggregate
+            else "fortigate-legacy",
+            "application/json",
+            build,
+        )
 
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return handle_exception(e, "FortiGate 형식 조회 실패")
 
@@ -333,21 +374,26 @@ def get_fortigate_format():
 def get_blacklist_json():
     """블랙리스트 JSON 형식"""
     try:
-        result = asyncio.run(service.get_active_blacklist(format_type="json"))
 
-        if result["success"]:
+        def build(snapshot) -> bytes:
+            data = snapshot.render("json")
             return jsonify(
                 {
                     "success": True,
-                    "data": result["data"],
-                    "count": len(result["data"])
-                    if isinstance(result["data"], list)
-                    else 0,
-                    "timestamp": result["timestamp"],
+                    "data": data,
+                    "count": len(data),
+                    "timestamp": snapshot.updated_at.isoformat(),
                 }
-            )
-        else:
-            return jsonify({"error": result["error"]}), 500
+            ).get_data()
+
+        return feed_response(
+            feed_cache,
+            service.get_data_version(),
+            service.get_active_snapshot,
+            "json",
+            "application/json",
+            build,
+        )
 
     except Exception as e:
         return handle_exception(e, "JSON 블랙리스트 조회 실패")
@@ -364,7 +410,7 @@ def search_single_ip(ip: str):
         if not validate_ip(ip):
             raise ValidationError(f"유효하지 않은 IP 주소: {ip}")
 
-        result = asyncio.run(service.search_ip(ip))
+        result = run_async(service.search_ip(ip))
 
         if result["success"]:
             return jsonify(result)
@@ -379,32 +425,34 @@ def search_single_ip(ip: str):
 
 @unified_bp.route("/api/search", methods=["POST"])
 def search_batch_ips():
-    """배치 IP 검색"""
+    """배치 IP 검색 (?format=ndjson 또는 Accept: application/x-ndjson 시 스트리밍)"""
     try:
         data = request.get_json()
         if not data or "ips" not in data:
             raise ValidationError("IP 목록이 필요합니다")
 
         ips = data["ips"]
-        if not isinstance(ips, list) or len(ips) > 100:
-            raise ValidationError("IP 목록은 배열이며 100개 이하여야 합니다")
-
-        results = {}
-        for ip in ips:
-            if validate_ip(ip):
-                result = asyncio.run(service.search_ip(ip))
-                results[ip] = result
-            else:
-                results[ip] = {"success": False, "error": "Invalid IP address"}
+        if not isinstance(ips, list) or len(ips) > MAX_BATCH_SEARCH_IPS:
+            raise ValidationError(
+                f"IP 목록은 배열이며 {MAX_BATCH_SEARCH_IPS}개 이하여야 합니다"
+            )
+        if not all(isinstance(ip, str) for ip in ips):
+            raise ValidationError("IP 목록은 문자열 배열이어야 합니다")
+
+        if _wants_ndjson():
+            return Response(
+                stream_with_context(
+                    json.dumps(result, ensure_ascii=False) + "\n"
+                    for result in service.iter_lookup_ips(ips)
+                ),
+                mimetype="application/x-ndjson",
+            )
 
-        return jsonify(
-            {
-                "success": True,
-                "results": results,
-                "total_searched": len(ips),
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+        result = service.lookup_ips(ips)
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify({"error": result["error"]}), 500
 
     except ValidationError as e:
         return jsonify({"error": str(e)}), 400
@@ -412,6 +460,13 @@ def search_batch_ips():
         return handle_exception(e, "배치 IP 검색 실패")
 
 
+def _wants_ndjson() -> bool:
+    """NDJSON 스트리밍 응답 요청 여부"""
+    if request.args.get("format") == "ndjson":
+        return True
+    return request.accept_mimetypes.best == "application/x-ndjson"
+
+
 # === 통계 ===
 
 
@@ -419,7 +474,7 @@ def search_batch_ips():
 def get_statistics():
     """시스템 통계"""
     try:
-        result = asyncio.run(service.get_statistics())
+        result = run_async(service.get_statistics())
 
         if result["success"]:
             return jsonify(result["statistics"])
@@ -434,7 +489,7 @@ def get_statistics():
 def get_analytics_summary():
     """분석 요약"""
     try:
-        result = asyncio.run(service.get_statistics())
+        result = run_async(service.get_statistics())
 
         if result["success"]:
             stats = result["statistics"]
@@ -480,7 +535,7 @@ def get_collection_status():
 def enable_collection():
     """수집 시스템 활성화"""
     try:
-        result = asyncio.run(service.enable_collection())
+        result = run_async(service.enable_collection())
 
         if result["success"]:
             return jsonify(result)
@@ -495,7 +550,7 @@ def enable_collection():
 def disable_collection():
     """수집 시스템 비활성화"""
     try:
-        result = asyncio.run(service.disable_collection())
+        result = run_async(service.disable_collection())
 
         if result["success"]:
             return jsonify(result)
@@ -525,7 +580,7 @@ def trigger_collection():
             raise ValidationError(f"유효하지 않은 소스: {invalid_sources}")
 
         # 수집 실행
-        result = asyncio.run(service.collect_all_data(force=force))
+        result = run_async(service.collect_all_data(force=force))
 
         return jsonify(
             {
@@ -560,7 +615,7 @@ def trigger_regtech_collection():
         if "regtech" not in service._components:
             return jsonify({"error": "REGTECH 수집기가 비활성화되어 있습니다"}), 400
 
-        result = asyncio.run(service._collect_regtech_data(force))
+        result = run_async(service._collect_regtech_data(force))
 
         return jsonify(
             {
@@ -592,7 +647,7 @@ def trigger_secudium_collection():
         if "secudium" not in service._components:
             return jsonify({"error": "SECUDIUM 수집기가 비활성화되어 있습니다"}), 400
 
-        result = asyncio.run(service._collect_secudium_data(force))
+        result = run_async(service._collect_secudium_data(force))
 
         return jsonify(
             {
@@ -615,7 +670,7 @@ def trigger_secudium_collection():
 def get_enhanced_blacklist():
     """향상된 블랙리스트 (메타데이터 포함)"""
     try:
-        result = asyncio.run(service.get_active_blacklist(format_type="enhanced"))
+        result = run_async(service.get_active_blacklist(format_type="enhanced"))
 
         if result["success"]:
             return jsonify(
@@ -0,0 +1,104 @@
+"""
+수집 취소 토큰 유틸리티
+"""
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 취소 대기 중 토큰 확인 간격 (초)
+_POLL_INTERVAL = 0.2
+
+
+class CollectionCancelled(Exception):
+    """수집 취소 요청으로 중단"""
+
+    pass
+
+
+class CancelToken(threading.Event):
+    """
+    수집 취소 토큰 (threading.Event 호환 - validation_utils.should_cancel 대상)
+    - cancel(): 취소 요청, 등록된 콜백 실행 (세션 종료 / 쿼리 취소 등)
+    - on_cancel(): 취소 시 실행할 콜백 등록, 해제 함수 반환
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.reason: Optional[str] = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str = "사용자 취소 요청"):
+        with self._lock:
+            if self.is_set():
+                return
+            self.reason = reason
+            self.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run(callback)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        with self._lock:
+            if not self.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        # 이미 취소된 경우 즉시 실행
+        self._run(callback)
+        return lambda: None
+
+    def _unregister(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @staticmethod
+    def _run(callback: Callable[[], None]):
+        try:
+            callback()
+        except Exception as e:
+            logger.debug(f"취소 콜백 실행 실패: {e}")
+
+    def raise_if_cancelled(self):
+        if self.is_set():
+            raise CollectionCancelled(self.reason)
+
+
+def raise_if_cancelled(token: Optional[CancelToken]):
+    """토큰이 취소되었으면 CollectionCancelled (토큰 없으면 무시)"""
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+async def cancellable_async_sleep(token: Optional[CancelToken], seconds: float):
+    """취소 시 _POLL_INTERVAL 안에 깨어나는 asyncio.sleep (취소되면 CollectionCancelled)"""
+    if token is None:
+        await asyncio.sleep(seconds)
+        return
+    deadline = time.monotonic() + seconds
+    while True:
+        token.raise_if_cancelled()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, _POLL_INTERVAL))
+
+
+@contextmanager
+def cancel_on(
+    token: Optional[CancelToken], callback: Callable[[], None]
+) -> Iterator[None]:
+    """블록 실행 중 취소되면 callback 호출 (예: session.close, conn.cancel)"""
+    if token is None:
+        yield
+        return
+    unregister = token.on_cancel(callback)
+    try:
+        yield
+    finally:
+        unregister()
@@ -0,0 +1,81 @@
+"""
+HTTP 캐시 검증 유틸리티 (ETag / Last-Modified / 304)
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from flask import Response, request
+
+if TYPE_CHECKING:
+    from src.core.services.data_version import DataVersion
+
+
+def not_modified(etag: str, last_modified: datetime) -> Optional[Response]:
+    """요청의 If-None-Match / If-Modified-Since가 일치하면 304 응답 반환"""
+    if request.if_none_match:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif request.if_modified_since:
+        if last_modified.replace(microsecond=0) > request.if_modified_since.replace(
+            tzinfo=None
+        ):
+            return None
+    else:
+        return None
+
+    response = Response(status=304)
+    return set_validators(response, etag, last_modified)
+
+
+def set_validators(
+    response: Response,
+    etag: str,
+    last_modified: datetime,
+    cache_control: str = "public, max-age=300",
+) -> Response:
+    """응답에 강한 ETag, Last-Modified, Cache-Control 설정"""
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def feed_response(
+    cache,
+    current_version: "DataVersion",
+    load_snapshot: Callable[[], Any],
+    variant: str,
+    mimetype: str,
+    builder: Callable[[Any], bytes],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    데이터 버전별 사전 압축 피드 응답
+    - 현재 데이터 버전(공유 파일 stat)과 일치하는 조건부 요청은 스냅샷 조회 없이 304
+      (TTL 만료 / 다른 워커의 버전 증가 후에도 테이블을 읽지 않음)
+    - 본문 / 인코딩별 캐시 키 / ETag / Last-Modified 모두 같은 스냅샷에서 생성
+      (스냅샷 재생성 실패로 이전 스냅샷이 오면 이전 버전으로 응답)
+    - Accept-Encoding 협상 후 인코딩별 ETag로 304 판단
+    - 캐시된 바이트를 그대로 전송 (요청당 압축/직렬화 없음)
+    """
+    encoding = cache.negotiate(request.accept_encodings)
+    tag = variant if encoding == "identity" else f"{variant}.{encoding}"
+
+    cached = not_modified(current_version.etag(tag), current_version.updated_at)
+    if cached is None:
+        # 200 경로에서만 스냅샷 조회 / 재생성
+        snapshot = load_snapshot()
+        version = snapshot.data_version
+        if version.version != current_version.version:
+            # 이전 스냅샷으로 응답하는 경우 그 버전 기준으로 재검증
+            cached = not_modified(version.etag(tag), version.updated_at)
+    if cached is not None:
+        cached.vary.add("Accept-Encoding")
+        return cached
+
+    body = cache.get(snapshot, variant, encoding, builder)
+    response = Response(body, mimetype=mimetype, headers=headers)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return set_validators(response, version.etag(tag), version.updated_at)
@@ -0,0 +1,24 @@
+"""
+워커 프로세스 상태 유틸리티
+"""
+import os
+import tempfile
+from typing import Any
+
+
+def state_dir() -> str:
+    """워커 간 공유 상태 디렉토리 (tmpfs 우선, 없으면 임시 디렉토리)"""
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def pid_alive(pid: Any) -> bool:
+    """프로세스 생존 여부 (워커별 공유 파일 정리 판단용)"""
+    try:
+        os.kill(int(pid), 0)
+    except (TypeError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -3,7 +3,8 @@
 """
 import re
 import ipaddress
-from typing import Union
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple, Union
 
 
 def validate_ip(ip_str: str) -> bool:
@@ -19,3 +20,64 @@ class ValidationError(Exception):
     """검증 오류 예외"""
 
     pass
+
+
+# 허용 density 값 (값마다 스냅샷 메모이제이션 / 피드 캐시 변형이 생기므로 고정 목록)
+CIDR_DENSITIES = (0.25, 0.5, 0.75, 0.9)
+
+
+def parse_cidr_aggregation(args) -> Tuple[bool, Optional[float]]:
+    """?aggregate=cidr&density=<0.25|0.5|0.75|0.9|1> 쿼리 파라미터 검증"""
+    aggregate = args.get("aggregate")
+    if not aggregate:
+        return False, None
+    if aggregate != "cidr":
+        raise ValidationError(f"지원하지 않는 aggregate 값: {aggregate}")
+
+    density = args.get("density")
+    if not density:
+        return True, None
+    try:
+        value = float(density)
+    except ValueError:
+        raise ValidationError(f"density는 숫자여야 합니다: {density}")
+    # density=1은 무손실 집약과 같은 결과
+    if value == 1:
+        return True, None
+    if value not in CIDR_DENSITIES:
+        allowed = ", ".join(f"{d:g}" for d in CIDR_DENSITIES + (1,))
+        raise ValidationError(f"density는 다음 값 중 하나여야 합니다: {allowed}")
+    return True, value
+
+
+def parse_day_range(
+    args, default_days: int = 7, max_days: int = 366
+) -> Tuple[date, date]:
+    """?days=<N> 또는 ?start=YYYY-MM-DD&end=YYYY-MM-DD 일 범위 검증 (양 끝 포함)"""
+
+    def parse_date(name: str) -> Optional[date]:
+        value = args.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValidationError(f"{name}는 YYYY-MM-DD 형식이어야 합니다: {value}")
+
+    end = parse_date("end") or date.today()
+    start = parse_date("start")
+    if start is None:
+        days = args.get("days")
+        try:
+            days = int(days) if days else default_days
+        except ValueError:
+            raise ValidationError(f"days는 정수여야 합니다: {days}")
+        if days < 1:
+            raise ValidationError("days는 1 이상이어야 합니다")
+        start = end - timedelta(days=days - 1)
+
+    if start > end:
+        raise ValidationError("start는 end보다 늦을 수 없습니다")
+    if (end - start).days + 1 > max_days:
+        raise ValidationError(f"조회 범위는 최대 {max_days}일입니다")
+    return start, end
@@ -124,6 +124,11 @@ app = initialize_app()
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 2542))
 
+    # gunicorn 없이 단독 실행: 서비스 시작 전 스키마 마이그레이션 1회 (on_starting 대신)
+    from src.core.database.migrations import run_startup_migrations
+
+    run_startup_migrations()
+
     # App is already initialized above for gunicorn
     print(f"🎯 Starting {getattr(app, 'mode', 'unknown').title()} Mode on port {port}")
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -0,0 +1,107 @@
+"""
+공통 테스트 픽스처
+- 워커 간 공유 상태 파일은 테스트 전용 임시 디렉토리 사용 (/dev/shm 오염 방지)
+- DB 접근은 FakeConnection / FakeCursor로 대체 (PostgreSQL 불필요)
+- @pytest.mark.postgres 테스트만 실제 PostgreSQL 사용 (TEST_DATABASE_URL 미설정 시 건너뜀)
+"""
+import os
+import tempfile
+
+_STATE_DIR = tempfile.mkdtemp(prefix="blacklist-tests-")
+os.environ.setdefault(
+    "BLACKLIST_DATA_VERSION_FILE", os.path.join(_STATE_DIR, "data_version.json")
+)
+os.environ.setdefault("BLACKLIST_SNAPSHOT_DIR", _STATE_DIR)
+os.environ.setdefault("METRICS_DIR", os.path.join(_STATE_DIR, "metrics"))
+os.environ.setdefault("COLLECTION_JOB_DIR", os.path.join(_STATE_DIR, "jobs"))
+os.environ.setdefault("DB_QUERY_STATS_DIR", os.path.join(_STATE_DIR, "query_stats"))
+os.environ.setdefault(
+    "REGTECH_ENDPOINT_HISTORY", os.path.join(_STATE_DIR, "endpoint_history.json")
+)
+
+import pytest  # noqa: E402
+from flask import Flask  # noqa: E402
+
+
+class FakeCursor:
+    """execute 결과를 미리 지정하는 커서 (error 지정 시 execute에서 예외)"""
+
+    def __init__(self, rows=None, error=None, fetch_error=None):
+        self.rows = list(rows or [])
+        self.error = error
+        self.fetch_error = fetch_error
+        self.executed = []
+        self.itersize = None
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if self.error is not None:
+            raise self.error
+
+    def fetchmany(self, size):
+        if self.fetch_error is not None and not self.rows:
+            raise self.fetch_error
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def fetchall(self):
+        batch, self.rows = self.rows, []
+        return batch
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeConnection:
+    """풀 연결 대체 (cursor()마다 cursors의 다음 커서 반환)"""
+
+    def __init__(self, *cursors, cursor_error=None):
+        self.cursors = list(cursors)
+        self.cursor_error = cursor_error
+        self.closed = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.cancels = 0
+
+    def cursor(self, *args, **kwargs):
+        if self.cursor_error is not None:
+            raise self.cursor_error
+        return self.cursors.pop(0)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def cancel(self):
+        self.cancels += 1
+
+    def close(self):
+        self.closed += 1
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "postgres: 실제 PostgreSQL 필요 (TEST_DATABASE_URL)"
+    )
+
+
+@pytest.fixture
+def api_client():
+    """unified_api 블루프린트만 등록한 테스트 클라이언트"""
+    from src.core.routes.unified_api import unified_api_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(unified_api_bp)
+    return app.test_client()
@@ -0,0 +1,83 @@
+"""
+배치 IP 검색 테스트
+- 문자열이 아닌 항목은 500이 아닌 400으로 거부
+- 인덱스 / DB 대체 조회 모두 활성 항목의 가장 긴 prefix 결과
+"""
+import pytest
+from flask import Flask
+
+from src.core.services.blacklist_service import service
+from src.core.services.ip_index import IPLookupIndex
+
+from tests.conftest import FakeConnection, FakeCursor
+
+BAD_IPS = [["1.2.3.4", {"ip": "1.2.3.4"}], ["1.2.3.4", ["5.6.7.8"]], [1234]]
+
+
+@pytest.fixture
+def routes_client():
+    """unified_routes 블루프린트만 등록한 테스트 클라이언트"""
+    from src.core.unified_routes import unified_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(unified_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize("ips", BAD_IPS)
+@pytest.mark.parametrize("query", ["", "?format=ndjson"])
+def test_batch_search_rejects_non_string_entries(api_client, ips, query):
+    response = api_client.post(f"/api/search{query}", json={"ips": ips})
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+@pytest.mark.parametrize("ips", BAD_IPS)
+def test_legacy_batch_search_rejects_non_string_entries(routes_client, ips):
+    response = routes_client.post("/api/search", json={"ips": ips})
+
+    assert response.status_code == 400
+
+
+def test_iter_lookup_ips_treats_non_string_entries_as_invalid(monkeypatch):
+    index = IPLookupIndex([{"ip_address": "1.2.3.4"}])
+    snapshot = type("Snapshot", (), {"index": index})()
+    monkeypatch.setattr(service, "get_active_snapshot", lambda: snapshot)
+
+    results = list(service.iter_lookup_ips(["1.2.3.4", 1234]))
+
+    assert results[0]["found"] is True
+    assert results[1] == {"ip": 1234, "success": False, "error": "Invalid IP address"}
+
+
+def test_batch_db_fallback_matches_index(monkeypatch):
+    rows = [
+        {"ip_address": "10.0.0.0/8", "reason": "wide"},
+        {"ip_address": "10.1.2.0/24", "reason": "narrow"},
+    ]
+    index = IPLookupIndex(rows)
+    db_row = {
+        "query_ip": "10.1.2.3",
+        "ip_address": "10.1.2.0/24",
+        "reason": "narrow",
+        "source": "TEST",
+        "category": None,
+        "confidence_level": 5,
+        "is_active": True,
+        "last_seen": None,
+        "detection_count": 1,
+    }
+    cursor = FakeCursor([db_row])
+
+    def unavailable():
+        raise RuntimeError("snapshot unavailable")
+
+    monkeypatch.setattr(service, "get_active_snapshot", unavailable)
+    monkeypatch.setattr(service, "get_db_connection", lambda: FakeConnection(cursor))
+
+    (result,) = service.iter_lookup_ips(["10.1.2.3"])
+
+    assert result["data"]["reason"] == index.lookup("10.1.2.3")["reason"]
+    sql, _ = cursor.executed[0]
+    assert "b.is_active = true" in sql
@@ -0,0 +1,98 @@
+"""
+/api/blacklist/json?stream=true 서버 사이드 커서 스트리밍 테스트
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from src.core.services.blacklist_service import service
+from tests.conftest import FakeConnection, FakeCursor
+
+
+def _row(ip):
+    return {
+        "ip_address": ip,
+        "reason": "test",
+        "source": "REGTECH",
+        "category": "malware",
+        "confidence_level": 7,
+        "is_active": True,
+        "last_seen": datetime(2026, 1, 1),
+        "detection_count": 1,
+    }
+
+
+def test_stream_produces_complete_document(monkeypatch):
+    conn = FakeConnection(FakeCursor(rows=[_row("1.1.1.1"), _row("2.2.2.2")]))
+    monkeypatch.setattr(service, "get_db_connection", lambda: conn)
+
+    body = "".join(service.stream_active_blacklist_json(fetch_size=1))
+
+    document = json.loads(body)
+    assert document["success"] is True
+    assert document["count"] == 2
+    assert [item["ip_address"] for item in document["data"]] == [
+        "1.1.1.1",
+        "2.2.2.2",
+    ]
+    assert conn.closed
+
+
+def test_execute_failure_raises_before_streaming(monkeypatch):
+    conn = FakeConnection(FakeCursor(error=RuntimeError("relation does not exist")))
+    monkeypatch.setattr(service, "get_db_connection", lambda: conn)
+
+    with pytest.raises(RuntimeError):
+        service.stream_active_blacklist_json()
+    assert conn.closed
+
+
+def test_execute_failure_returns_500(api_client, monkeypatch):
+    conn = FakeConnection(FakeCursor(error=RuntimeError("relation does not exist")))
+    monkeypatch.setattr(service, "get_db_connection", lambda: conn)
+
+    response = api_client.get("/api/blacklist/json?stream=true")
+
+    assert response.status_code == 500
+    document = json.loads(response.get_data(as_text=True))
+    assert document["success"] is False
+    assert "relation does not exist" in document["error"]
+    assert conn.closed
+
+
+def test_pool_failure_returns_500(api_client, monkeypatch):
+    def getconn():
+        raise RuntimeError("connection pool exhausted")
+
+    monkeypatch.setattr(service, "get_db_connection", getconn)
+
+    response = api_client.get("/api/blacklist/json?stream=true")
+
+    assert response.status_code == 500
+    assert json.loads(response.get_data(as_text=True))["success"] is False
+
+
+def test_mid_stream_failure_closes_document(api_client, monkeypatch):
+    cursor = FakeCursor(rows=[_row("1.1.1.1")], fetch_error=RuntimeError("lost"))
+    conn = FakeConnection(cursor)
+    monkeypatch.setattr(service, "get_db_connection", lambda: conn)
+
+    response = api_client.get("/api/blacklist/json?stream=true")
+
+    assert response.status_code == 200
+    document = json.loads(response.get_data(as_text=True))
+    assert document["success"] is False
+    assert document["count"] == 1
+    assert document["error"] == "lost"
+    assert conn.closed
+
+
+def test_unconsumed_stream_returns_connection(monkeypatch):
+    conn = FakeConnection(FakeCursor(rows=[_row("1.1.1.1")]))
+    monkeypatch.setattr(service, "get_db_connection", lambda: conn)
+
+    stream = service.stream_active_blacklist_json()
+    stream.close()
+
+    assert conn.closed
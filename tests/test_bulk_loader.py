@@ -0,0 +1,61 @@
+"""
+대량 적재 병합 결과 집계 테스트
+- 병합이 돌려준 행만 신규/갱신으로 집계 → 변경 없는 적재는 changed == 0
+"""
+from src.core.database.bulk_loader import BlacklistBulkLoader
+from tests.conftest import FakeCursor
+
+
+class _LoadCursor(FakeCursor):
+    """COPY 입력을 읽고, 병합 문장에는 merged_rows를 돌려주는 커서"""
+
+    def __init__(self, merged_rows):
+        super().__init__()
+        self.merged_rows = merged_rows
+        self.copied = ""
+
+    def copy_expert(self, sql, file, size=8192):
+        self.executed.append((sql, None))
+        self.copied = file.read()
+
+    def execute(self, sql, params=None):
+        super().execute(sql, params)
+        if "RETURNING (xmax = 0)" in sql:
+            self.rows = list(self.merged_rows)
+
+
+RECORDS = [
+    {"ip_address": "1.1.1.1", "confidence_level": 7},
+    {"ip_address": "2.2.2.2", "confidence_level": 7},
+    {"ip_address": "not-an-ip"},
+]
+
+
+def test_unchanged_load_reports_no_changes():
+    loader = BlacklistBulkLoader()
+    cursor = _LoadCursor(merged_rows=[])
+
+    result = loader.load(cursor, RECORDS, "SECUDIUM")
+
+    assert result.staged == 2
+    assert result.rejected == 1
+    assert result.unchanged == 2
+    assert result.changed == 0
+    assert "1.1.1.1" in cursor.copied
+
+
+def test_load_counts_only_merged_rows():
+    loader = BlacklistBulkLoader()
+    cursor = _LoadCursor(merged_rows=[{"inserted": True}])
+
+    result = loader.load(cursor, RECORDS, "SECUDIUM")
+
+    assert (result.inserted, result.updated, result.unchanged) == (1, 0, 1)
+    assert result.changed == 1
+
+
+def test_merge_skips_rows_whose_content_is_unchanged():
+    # 조건 없는 DO UPDATE는 모든 충돌 행을 다시 쓰고 changed를 0이 될 수 없게 만든다
+    merge = BlacklistBulkLoader.MERGE_SQL
+    assert "WHERE NOT blacklist_ips.is_active" in merge
+    assert "IS DISTINCT FROM EXCLUDED.source" in merge
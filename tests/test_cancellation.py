@@ -0,0 +1,122 @@
+"""
+수집 취소 경로 테스트
+- cancel_on: 블록 실행 중에만 취소 콜백 등록 (끝난 뒤의 취소는 연결/세션을 건드리지 않음)
+- 적재 중 취소: 실행 중인 쿼리를 conn.cancel()로 중단하고 전체 롤백, 버전을 올리지 않음
+"""
+import os
+import threading
+import time
+
+import pytest
+
+from src.core.services import ingest
+from src.core.utils.cancellation import CancelToken, CollectionCancelled, cancel_on
+from tests.conftest import FakeConnection, FakeCursor
+
+
+def test_cancel_on_invokes_callback_only_inside_block():
+    token = CancelToken()
+    calls = []
+
+    with cancel_on(token, lambda: calls.append("inside")):
+        token.cancel("stop")
+    token.cancel("again")
+
+    assert calls == ["inside"]
+    assert token.reason == "stop"
+    with pytest.raises(CollectionCancelled, match="stop"):
+        token.raise_if_cancelled()
+
+
+def test_cancel_on_after_block_does_not_run_callback():
+    token = CancelToken()
+    calls = []
+
+    with cancel_on(token, lambda: calls.append("closed")):
+        pass
+    token.cancel()
+
+    assert calls == []
+
+
+def test_cancel_on_already_cancelled_token_runs_immediately():
+    token = CancelToken()
+    token.cancel()
+    calls = []
+
+    with cancel_on(token, lambda: calls.append("closed")):
+        assert calls == ["closed"]
+
+
+class CancellableConnection(FakeConnection):
+    """conn.cancel()이 호출될 때까지 적재 쿼리가 멈춰 있는 연결"""
+
+    def __init__(self):
+        super().__init__(FakeCursor())
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        super().cancel()
+        self.cancelled.set()
+
+
+class FakeProgress:
+    def __init__(self):
+        self.cancel_token = CancelToken()
+
+    def stage(self, name):
+        pass
+
+
+def test_cancel_interrupts_running_load(monkeypatch):
+    conn = CancellableConnection()
+    progress = FakeProgress()
+    loading = threading.Event()
+    published = []
+
+    def blocking_load(cursor, records, source):
+        loading.set()
+        if not conn.cancelled.wait(5):
+            raise AssertionError("쿼리가 취소되지 않음")
+        raise RuntimeError("canceling statement due to user request")
+
+    monkeypatch.setattr(ingest, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(ingest.bulk_loader, "load", blocking_load)
+    monkeypatch.setattr(ingest.data_version, "bump", lambda *a: published.append(a))
+    monkeypatch.setattr(ingest.service, "publish_ingest", published.append)
+
+    threading.Thread(
+        target=lambda: loading.wait(5) and progress.cancel_token.cancel("stop")
+    ).start()
+    with pytest.raises(CollectionCancelled, match="stop"):
+        ingest.load_collected_records(
+            [{"ip_address": "1.1.1.1"}], "REGTECH", progress=progress
+        )
+
+    assert conn.cancels == 1
+    assert conn.rollbacks == 1
+    assert conn.commits == 0
+    assert conn.closed == 1
+    assert published == []
+
+
+@pytest.mark.postgres
+def test_cancel_on_interrupts_postgres_query():
+    dsn = os.getenv("TEST_DATABASE_URL")
+    if not dsn:
+        pytest.skip("TEST_DATABASE_URL 미설정 (실제 PostgreSQL 필요)")
+    psycopg2 = pytest.importorskip("psycopg2")
+
+    conn = psycopg2.connect(dsn)
+    token = CancelToken()
+    timer = threading.Timer(0.2, token.cancel)
+    started = time.monotonic()
+    try:
+        timer.start()
+        with pytest.raises(psycopg2.errors.QueryCanceled):
+            with cancel_on(token, conn.cancel):
+                conn.cursor().execute("SELECT pg_sleep(30)")
+    finally:
+        timer.cancel()
+        conn.close()
+    assert time.monotonic() - started < 10
@@ -0,0 +1,73 @@
+"""
+버전별 변경 집합 델타 계산 테스트
+"""
+from src.core.services.change_log import (
+    CHANGE_ADDED,
+    CHANGE_DEACTIVATED,
+    BlacklistChangeLog,
+)
+
+
+class DeltaCursor:
+    """누락 버전 확인 → 변경 이력 조회 순서로 응답하는 커서"""
+
+    def __init__(self, changes, missing=0):
+        self.changes = changes
+        self.missing = missing
+        self.queries = []
+        self._result = []
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        if "missing" in sql:
+            self._result = [{"missing": self.missing}]
+        elif "blacklist_changes" in sql and "SELECT" in sql:
+            self._result = [{"ip": ip, "change": change} for ip, change in self.changes]
+        else:
+            self._result = []
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+def _change_log():
+    change_log = BlacklistChangeLog(retention=10)
+    change_log._schema_ready = True
+    return change_log
+
+
+def test_delta_keeps_cidr_prefix_in_snapshot_text_form():
+    cursor = DeltaCursor(
+        [
+            ("10.0.0.0/24", CHANGE_ADDED),
+            ("1.1.1.1", CHANGE_ADDED),
+            ("192.168.0.0/16", CHANGE_DEACTIVATED),
+        ]
+    )
+
+    delta = _change_log().get_delta(cursor, 3, 5)
+
+    assert delta == {
+        "added": ["10.0.0.0/24", "1.1.1.1"],
+        "removed": ["192.168.0.0/16"],
+    }
+    select = cursor.queries[-1]
+    assert "abbrev(ip_address)" in select
+    assert "host(" not in select
+
+
+def test_delta_nets_out_readded_entries():
+    cursor = DeltaCursor(
+        [("10.0.0.0/24", CHANGE_DEACTIVATED), ("10.0.0.0/24", CHANGE_ADDED)]
+    )
+
+    assert _change_log().get_delta(cursor, 1, 3) == {"added": [], "removed": []}
+
+
+def test_delta_unavailable_when_history_missing():
+    cursor = DeltaCursor([], missing=1)
+
+    assert _change_log().get_delta(cursor, 1, 3) is None
@@ -0,0 +1,61 @@
+"""
+CIDR 집약 density 검증 테스트
+- 허용 목록 외 density는 400 (스냅샷 메모 / 피드 캐시 변형이 무제한 증가하지 않음)
+"""
+from datetime import datetime
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from src.core.services.blacklist_snapshot import ActiveBlacklistSnapshot
+from src.core.utils.validators import (
+    CIDR_DENSITIES,
+    ValidationError,
+    parse_cidr_aggregation,
+)
+
+
+@pytest.mark.parametrize("density", ["0.5", "0.50", ".5", "0.9", "0.25"])
+def test_allowed_densities(density):
+    args = MultiDict({"aggregate": "cidr", "density": density})
+    aggregate, value = parse_cidr_aggregation(args)
+
+    assert aggregate is True
+    assert value in CIDR_DENSITIES
+
+
+@pytest.mark.parametrize("density", ["1", "1.0"])
+def test_density_one_is_lossless(density):
+    args = MultiDict({"aggregate": "cidr", "density": density})
+    assert parse_cidr_aggregation(args) == (True, None)
+
+
+@pytest.mark.parametrize(
+    "density", ["0.5000001", "0.123", "0", "1.5", "-0.5", "nan", "inf", "abc"]
+)
+def test_other_densities_are_rejected(density):
+    with pytest.raises(ValidationError):
+        parse_cidr_aggregation(MultiDict({"aggregate": "cidr", "density": density}))
+
+
+@pytest.mark.parametrize("path", ["/api/blacklist/active", "/api/fortigate"])
+def test_feed_routes_reject_unlisted_density(api_client, path):
+    response = api_client.get(f"{path}?aggregate=cidr&density=0.5000001")
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+def test_aggregate_memo_keys_are_bounded():
+    snapshot = ActiveBlacklistSnapshot(
+        1,
+        [{"ip_address": f"10.0.0.{i}"} for i in range(4)],
+        datetime(2024, 1, 1),
+    )
+
+    for density in (None,) + CIDR_DENSITIES:
+        snapshot.aggregate(density)
+        snapshot.aggregate(density)
+
+    keys = [key for key in snapshot._rendered if key.startswith("cidr")]
+    assert len(keys) == len(CIDR_DENSITIES) + 1
@@ -0,0 +1,158 @@
+"""
+수집 작업과 워커 수명 테스트
+- 작업이 있는 워커는 max_requests 재시작을 미룸
+- 종료되는 워커의 작업은 lost가 아닌 cancelled + 사유로 기록
+"""
+import os
+import runpy
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.services import collection_jobs as jobs_module
+from src.core.services.collection_jobs import (
+    JOB_CANCELLED,
+    JOB_SUCCEEDED,
+    CollectionJobRunner,
+    JobStore,
+)
+
+GUNICORN_CONF = os.path.join(os.path.dirname(__file__), "..", "gunicorn.conf.py")
+
+
+@pytest.fixture
+def runner(tmp_path):
+    return CollectionJobRunner(JobStore(str(tmp_path)))
+
+
+def _blocking_job(started):
+    def run(progress):
+        started.set()
+        progress.cancel_token.wait(5)
+        progress.cancel_token.raise_if_cancelled()
+        return {"success": True}
+
+    return run
+
+
+def test_shutdown_records_running_jobs_as_cancelled(runner):
+    started = threading.Event()
+    record, created = runner.submit("REGTECH", _blocking_job(started))
+    assert created
+    assert started.wait(5)
+    assert runner.local_jobs() == 1
+
+    cancelled = runner.shutdown(timeout=5)
+
+    assert cancelled == [record["id"]]
+    assert runner.local_jobs() == 0
+    stored = runner.get(record["id"])
+    assert stored["status"] == JOB_CANCELLED
+    assert "워커 프로세스 종료" in stored["error"]
+
+
+def test_shutdown_without_jobs_returns_immediately(runner):
+    assert runner.shutdown(timeout=5) == []
+
+
+def test_finished_jobs_are_not_local(runner):
+    record, _ = runner.submit("SECUDIUM", lambda progress: {"success": True})
+    runner._get_executor().shutdown(wait=True)
+
+    assert runner.local_jobs() == 0
+    assert runner.get(record["id"])["status"] == JOB_SUCCEEDED
+
+
+@pytest.fixture
+def gunicorn_hooks():
+    return runpy.run_path(GUNICORN_CONF)
+
+
+@pytest.mark.parametrize("local_jobs, expected", [(1, 1001), (0, 1000)])
+def test_pre_request_postpones_restart_while_jobs_run(
+    gunicorn_hooks, monkeypatch, local_jobs, expected
+):
+    monkeypatch.setattr(jobs_module.collection_jobs, "local_jobs", lambda: local_jobs)
+    worker = SimpleNamespace(nr=999, max_requests=1000)
+
+    gunicorn_hooks["pre_request"](worker, None)
+
+    assert worker.max_requests == expected
+
+
+def test_worker_exit_shuts_down_jobs(gunicorn_hooks, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        jobs_module.collection_jobs, "shutdown", lambda: calls.append(True) or ["a"]
+    )
+    logged = []
+    worker = SimpleNamespace(log=SimpleNamespace(info=lambda *a: logged.append(a)))
+
+    gunicorn_hooks["worker_exit"](None, worker)
+
+    assert calls == [True]
+    assert logged
+
+
+@pytest.fixture
+def stop_client(runner, monkeypatch):
+    from flask import Flask
+
+    from src.core.routes import collection_api
+
+    monkeypatch.setattr(collection_api, "collection_jobs", runner)
+    app = Flask(__name__)
+    app.register_blueprint(collection_api.collection_api_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize(
+    "body", [[1], "job", 5, {"job_id": 5}, {"job_id": ["a"]}, {"job_id": 0}]
+)
+def test_stop_rejects_malformed_body(stop_client, body):
+    response = stop_client.post("/api/collection/stop", json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+@pytest.mark.parametrize("job_id", [5, None, ["a"], "../x", ""])
+def test_job_store_rejects_non_alphanumeric_ids(runner, job_id):
+    assert runner.store.get(job_id) is None
+
+
+def test_stop_request_cancels_running_job(runner, stop_client):
+    started = threading.Event()
+    record, _ = runner.submit("REGTECH", _blocking_job(started))
+    assert started.wait(5)
+
+    response = stop_client.post("/api/collection/stop", json={"job_id": record["id"]})
+
+    assert response.status_code == 200
+    assert response.get_json()["cancelled"] == [record["id"]]
+    runner._get_executor().shutdown(wait=True)
+    stored = runner.get(record["id"])
+    assert stored["status"] == JOB_CANCELLED
+    assert stored["cancel_requested_at"] is not None
+
+
+def test_stop_request_from_another_worker_reaches_running_job(runner, tmp_path):
+    runner.cancel_poll = 0.05
+    started = threading.Event()
+    record, _ = runner.submit("REGTECH", _blocking_job(started))
+    assert started.wait(5)
+
+    # 다른 워커 프로세스의 실행기 - 로컬 작업이 없으므로 취소 표시 파일로 전달
+    other = CollectionJobRunner(JobStore(str(tmp_path)))
+    assert other.cancel(record["id"]) == [record["id"]]
+
+    runner._get_executor().shutdown(wait=True)
+    assert runner.get(record["id"])["status"] == JOB_CANCELLED
+    assert runner.store.cancel_requested(record["id"]) is None
+
+
+def test_stop_unknown_job_returns_404(stop_client):
+    response = stop_client.post("/api/collection/stop", json={"job_id": "abc123"})
+
+    assert response.status_code == 404
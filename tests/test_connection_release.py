@@ -0,0 +1,66 @@
+"""
+연결 반환 테스트 - 조회 중 예외가 나도 풀 연결을 반환
+"""
+import pytest
+from flask import Flask
+
+from src.core.routes import collection_api
+from src.core.services.stats_rollup import stats_rollup
+
+from tests.conftest import FakeConnection, FakeCursor
+
+
+@pytest.fixture
+def health_client(monkeypatch):
+    from src.core import app as app_module
+    from src.core.database import migrations
+
+    monkeypatch.setattr(
+        migrations.migration_runner, "run", lambda: {"success": True, "applied": []}
+    )
+    monkeypatch.setattr(app_module.db_pool, "close_all", lambda: None)
+    return app_module, app_module.create_app().test_client()
+
+
+def test_health_check_returns_connection_on_query_error(health_client, monkeypatch):
+    app_module, client = health_client
+    conn = FakeConnection(FakeCursor(error=RuntimeError("relation missing")))
+    monkeypatch.setattr(app_module.db_pool, "getconn", lambda: conn)
+
+    response = client.get("/health")
+
+    assert response.status_code == 500
+    assert response.get_json()["status"] == "unhealthy"
+    assert conn.closed == 1
+
+
+def test_health_check_returns_connection_on_rollup_error(health_client, monkeypatch):
+    app_module, client = health_client
+    conn = FakeConnection(FakeCursor([("blacklist_ips",)]))
+    monkeypatch.setattr(app_module.db_pool, "getconn", lambda: conn)
+
+    def fail(conn):
+        raise RuntimeError("rollup missing")
+
+    monkeypatch.setattr(stats_rollup, "read", fail)
+
+    assert client.get("/health").status_code == 500
+    assert conn.closed == 1
+
+
+def test_collection_status_returns_connection_on_error(monkeypatch):
+    conn = FakeConnection()
+    monkeypatch.setattr(collection_api, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(stats_rollup, "read", lambda conn: object())
+
+    def fail(conn, start, end):
+        raise RuntimeError("daily rollup missing")
+
+    monkeypatch.setattr(stats_rollup, "daily", fail)
+    app = Flask(__name__)
+    app.register_blueprint(collection_api.collection_api_bp)
+
+    response = app.test_client().get("/api/collection/status")
+
+    assert response.status_code == 500
+    assert conn.closed == 1
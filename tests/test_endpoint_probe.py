@@ -0,0 +1,105 @@
+"""
+REGTECH 쿠키 수집 엔드포인트 동시 탐색 테스트
+- 저장된 탐색 이력 순서대로 probe_concurrency 개씩 요청
+- 처음 도착한 고가치 응답(Excel / JSON)을 사용하고 나머지 요청은 취소
+- 탐색 이력은 재시작 후에도 유지되는 경로에 저장 (git 추적 제외)
+"""
+import asyncio
+import os
+import subprocess
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from src.core.collectors import regtech_collector_data
+from src.core.collectors.helpers.endpoint_history import EndpointHistory
+from src.core.collectors.regtech_collector_data import (
+    BLACKLIST_URLS,
+    RegtechCollectorData,
+)
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+class FakeResponse:
+    def __init__(self, ips):
+        self.status_code = 200
+        self.headers = {"content-type": "application/json"}
+        self.content = b"{}"
+        self.ips = ips
+
+
+@pytest.fixture
+def data_module(tmp_path):
+    module = RegtechCollectorData(
+        "https://example.invalid",
+        SimpleNamespace(
+            get_authenticated_session=requests.Session,
+            is_cookie_expired=lambda response: False,
+        ),
+        SimpleNamespace(is_valid_ip=lambda ip: True),
+    )
+    module.endpoint_history = EndpointHistory(str(tmp_path / "history.json"))
+
+    async def process_json_response(response):
+        return response.ips
+
+    module.data_processor.process_json_response = process_json_response
+    module.data_processor.validate_and_transform_data = lambda ips: ips
+    return module
+
+
+def test_first_high_value_response_wins_and_rest_are_cancelled(data_module):
+    history = data_module.endpoint_history
+    preferred = "/fcti/threat/ipBlacklist"
+    history.record(preferred, 200, "json", 50, 10.0)
+    order = history.order(BLACKLIST_URLS)
+    assert order[0] == preferred
+
+    data_module.probe_concurrency = 3
+    fast = order[1]
+    release = threading.Event()
+    started = []
+    lock = threading.Lock()
+
+    def probe(sessions, path):
+        with lock:
+            started.append(path)
+        if path == fast:
+            return FakeResponse([{"ip": "1.1.1.1"}]), 5.0
+        # 나머지는 수집이 끝날 때까지 응답하지 않음
+        release.wait(5)
+        return FakeResponse([{"ip": "9.9.9.9"}]), 5000.0
+
+    data_module._probe = probe
+    try:
+        ips = asyncio.run(data_module.collect_with_cookies())
+    finally:
+        release.set()
+
+    assert ips == [{"ip": "1.1.1.1"}]
+    # 저장된 이력 순서대로 동시 요청 수만큼 시작, 나머지는 실행되지 않음
+    # (빠른 응답을 끝낸 스레드가 취소 전에 다음 경로 하나를 집을 수는 있음)
+    assert sorted(started[:3]) == sorted(order[:3])
+    assert started[3:] in ([], [order[3]])
+    saved = EndpointHistory(history.path)
+    assert set(saved.order(BLACKLIST_URLS)[:2]) == {preferred, fast}
+    # 취소된 요청은 이력에 기록하지 않음
+    assert saved._entries[preferred]["attempts"] == 1
+    assert set(saved._entries) == {preferred, fast}
+
+
+def test_endpoint_history_defaults_to_persistent_ignored_path(monkeypatch):
+    monkeypatch.delenv("REGTECH_ENDPOINT_HISTORY", raising=False)
+
+    module = RegtechCollectorData("https://example.invalid", None, None)
+
+    path = module.endpoint_history.path
+    assert path == regtech_collector_data.DEFAULT_ENDPOINT_HISTORY
+    assert not path.startswith("/dev/shm")
+    ignored = subprocess.run(
+        ["git", "check-ignore", "-q", path], cwd=REPO_ROOT, check=False
+    )
+    assert ignored.returncode == 0
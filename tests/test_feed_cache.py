@@ -0,0 +1,67 @@
+"""
+사전 압축 피드 캐시 테스트 (인코딩별 바이트가 생성 스냅샷 버전에 귀속)
+"""
+import gzip
+from datetime import datetime
+
+from src.core.services.blacklist_service import service
+from src.core.services.blacklist_snapshot import ActiveBlacklistSnapshot
+from src.core.services.data_version import DataVersion
+from src.core.services.feed_cache import FeedCache, feed_cache
+
+
+def _snapshot(version, ips):
+    rows = [{"ip_address": ip} for ip in ips]
+    return ActiveBlacklistSnapshot(version, rows, datetime(2026, 1, version))
+
+
+def _text(snapshot):
+    return ("\n".join(snapshot.render("text")) + "\n").encode("utf-8")
+
+
+def test_encodings_are_built_from_the_keyed_snapshot():
+    cache = FeedCache()
+    built = []
+
+    def builder(snapshot):
+        built.append(snapshot.version)
+        return _text(snapshot)
+
+    snapshot = _snapshot(3, ["1.1.1.1"])
+    raw = cache.get(snapshot, "text", "identity", builder)
+    compressed = cache.get(snapshot, "text", "gzip", builder)
+
+    assert built == [3]
+    assert gzip.decompress(compressed) == raw == b"1.1.1.1\n"
+
+
+def test_stale_snapshot_does_not_evict_newer_version():
+    cache = FeedCache(max_versions=2)
+    cache.get(_snapshot(5, ["5.5.5.5"]), "text", "identity", _text)
+    cache.get(_snapshot(6, ["6.6.6.6"]), "text", "identity", _text)
+
+    cache.get(_snapshot(4, ["4.4.4.4"]), "text", "identity", _text)
+
+    def fail(snapshot):
+        raise AssertionError("v6 should still be cached")
+
+    assert cache.get(_snapshot(6, []), "text", "identity", fail) == b"6.6.6.6\n"
+
+
+def test_gzip_feed_carries_version_of_its_bytes(api_client, monkeypatch):
+    feed_cache.clear()
+    monkeypatch.setattr(
+        service, "get_data_version", lambda: DataVersion(6, datetime(2026, 1, 6))
+    )
+    monkeypatch.setattr(
+        service, "get_active_snapshot", lambda: _snapshot(5, ["1.1.1.1"])
+    )
+
+    response = api_client.get(
+        "/api/blacklist/active", headers={"Accept-Encoding": "gzip"}
+    )
+    feed_cache.clear()
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] == '"bl-5-text.gzip"'
+    assert gzip.decompress(response.get_data()) == b"1.1.1.1\n"
@@ -0,0 +1,111 @@
+"""
+피드 ETag / 캐시 키와 본문 스냅샷 일치 테스트
+- 현재 버전과 일치하는 조건부 요청은 스냅샷을 조회하지 않고 304
+"""
+from datetime import datetime
+
+import pytest
+
+from src.core.services.blacklist_service import service
+from src.core.services.blacklist_snapshot import (
+    ActiveBlacklistSnapshot,
+    BlacklistSnapshotCache,
+)
+from src.core.services.data_version import DataVersion
+from src.core.services.feed_cache import feed_cache
+
+
+def _snapshot(version, ips):
+    rows = [
+        {
+            "ip_address": ip,
+            "reason": "test",
+            "source": "REGTECH",
+            "category": "malware",
+            "confidence_level": 7,
+            "is_active": True,
+            "last_seen": None,
+            "detection_count": 1,
+        }
+        for ip in ips
+    ]
+    return ActiveBlacklistSnapshot(version, rows, datetime(2026, 1, version))
+
+
+@pytest.fixture
+def stale_snapshot(monkeypatch):
+    """데이터 버전은 v6으로 올라갔지만 스냅샷 재생성이 실패해 v5를 반환하는 상태"""
+    feed_cache.clear()
+    monkeypatch.setattr(
+        service, "get_data_version", lambda: DataVersion(6, datetime(2026, 1, 6))
+    )
+    monkeypatch.setattr(
+        service, "get_active_snapshot", lambda: _snapshot(5, ["1.1.1.1"])
+    )
+    yield
+    feed_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/blacklist/active", "/api/fortigate", "/api/blacklist/json"]
+)
+def test_etag_follows_served_snapshot(api_client, stale_snapshot, path):
+    response = api_client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"bl-5-')
+    assert response.last_modified.replace(tzinfo=None) == datetime(2026, 1, 5)
+
+
+def test_stale_bytes_are_not_cached_under_new_version(
+    api_client, stale_snapshot, monkeypatch
+):
+    api_client.get("/api/blacklist/active")
+
+    # 재생성 성공 후에는 새 버전 본문과 ETag
+    monkeypatch.setattr(
+        service, "get_active_snapshot", lambda: _snapshot(6, ["2.2.2.2"])
+    )
+    response = api_client.get("/api/blacklist/active")
+
+    assert response.headers["ETag"] == '"bl-6-text"'
+    assert response.get_data(as_text=True) == "2.2.2.2\n"
+
+
+def test_client_with_old_etag_is_revalidated_against_served_snapshot(
+    api_client, stale_snapshot
+):
+    first = api_client.get("/api/blacklist/active")
+
+    response = api_client.get(
+        "/api/blacklist/active", headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/blacklist/active", "/api/fortigate", "/api/blacklist/json"]
+)
+def test_304_does_not_load_snapshot_after_ttl_expiry(api_client, monkeypatch, path):
+    feed_cache.clear()
+    current = DataVersion(7, datetime(2026, 1, 7))
+    loads = []
+
+    def loader():
+        loads.append(True)
+        return _snapshot(7, ["7.7.7.7"]).rows
+
+    # TTL 0: 매 요청 만료 - 조건부 요청이 스냅샷을 조회하면 loader가 다시 호출됨
+    cache = BlacklistSnapshotCache(loader, ttl=0, version_provider=lambda: current)
+    monkeypatch.setattr(service, "_snapshot_cache", cache)
+    monkeypatch.setattr(service, "get_data_version", lambda: current)
+
+    first = api_client.get(path)
+    response = api_client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+    feed_cache.clear()
+
+    assert first.status_code == 200
+    assert response.status_code == 304
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert len(loads) == 1
@@ -0,0 +1,96 @@
+"""
+PostgreSQL 호스트 탐색 테스트
+- 더 빠른 대체 호스트가 있어도 응답하는 설정 호스트를 우선 사용
+- 설정 호스트가 실패하거나 대기 시간을 넘기면 대체 호스트 사용
+"""
+import threading
+import time
+
+from src.core.database.smart_connection_manager import HostDiscovery
+
+HOSTS = ["db.internal", "blacklist-postgres", "postgres", "localhost"]
+
+
+class ProbeConnection:
+    def __init__(self, host):
+        self.host = host
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+def _connector(delays, failing=()):
+    """호스트별 지연 후 연결 반환, failing 호스트와 목록에 없는 호스트는 실패"""
+    opened = {}
+    lock = threading.Lock()
+
+    def connect(host):
+        if host not in delays:
+            raise ConnectionError(f"{host} unreachable")
+        time.sleep(delays[host])
+        if host in failing:
+            raise ConnectionError(f"{host} refused")
+        conn = ProbeConnection(host)
+        with lock:
+            opened[host] = conn
+        return conn
+
+    return connect, opened
+
+
+def opened_eventually(opened, host, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while host not in opened and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return opened[host]
+
+
+def test_slow_configured_host_beats_fast_localhost():
+    discovery = HostDiscovery(stagger=0.01, prefer_wait=2)
+    connect, opened = _connector({"db.internal": 0.3, "localhost": 0.0})
+
+    conn, host = discovery.connect(HOSTS, connect)
+
+    assert host == "db.internal"
+    assert conn is opened["db.internal"]
+    assert opened["localhost"].closed.wait(1)
+    assert discovery.winner == "db.internal"
+
+
+def test_failed_configured_host_falls_back():
+    discovery = HostDiscovery(stagger=0.01, prefer_wait=2)
+    connect, opened = _connector(
+        {"db.internal": 0.2, "localhost": 0.0}, failing={"db.internal"}
+    )
+    errors = []
+
+    started = time.monotonic()
+    conn, host = discovery.connect(HOSTS, connect, lambda e, h: errors.append(h))
+
+    assert host == "localhost"
+    assert conn is opened["localhost"]
+    assert not conn.closed.is_set()
+    assert "db.internal" in errors
+    # 설정 호스트 실패 즉시 대체 (prefer_wait 전체를 기다리지 않음)
+    assert time.monotonic() - started < 1.5
+
+
+def test_unresponsive_configured_host_falls_back_after_prefer_wait():
+    discovery = HostDiscovery(stagger=0.01, prefer_wait=0.1)
+    connect, opened = _connector({"db.internal": 0.5, "localhost": 0.0})
+
+    conn, host = discovery.connect(HOSTS, connect)
+
+    assert host == "localhost"
+    # 늦게 연결된 설정 호스트 연결은 정리
+    assert opened_eventually(opened, "db.internal").closed.wait(1)
+
+
+def test_fallback_winner_does_not_skip_recovered_configured_host():
+    discovery = HostDiscovery(stagger=0.01, prefer_wait=0.1)
+    connect, _ = _connector({"db.internal": 0.5, "localhost": 0.0})
+    assert discovery.connect(HOSTS, connect)[1] == "localhost"
+
+    connect, _ = _connector({"db.internal": 0.0, "localhost": 0.0})
+    assert discovery.connect(HOSTS, connect)[1] == "db.internal"
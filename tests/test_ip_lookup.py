@@ -0,0 +1,119 @@
+"""
+IP 조회 일관성 테스트
+- 메모리 인덱스는 가장 긴 prefix의 CIDR 항목 반환 (DB ORDER BY masklen DESC와 동일)
+- DB 대체 조회는 인덱스와 같이 활성 항목만 조회
+"""
+import ipaddress
+import os
+import random
+from datetime import datetime
+
+from src.core.services.blacklist_service import service
+from src.core.services.data_version import DataVersion
+from src.core.services.ip_index import IPLookupIndex
+from src.core.services.shared_snapshot import (
+    MappedBlacklistSnapshot,
+    write_snapshot_file,
+)
+
+from tests.conftest import FakeConnection, FakeCursor
+
+ROWS = [
+    {"ip_address": "10.0.0.0/8", "reason": "wide"},
+    {"ip_address": "10.1.0.0/16", "reason": "narrow"},
+    {"ip_address": "10.1.2.0/24", "reason": "narrowest"},
+    {"ip_address": "2001:db8::/32", "reason": "wide6"},
+    {"ip_address": "2001:db8:1::/48", "reason": "narrow6"},
+    {"ip_address": "10.1.2.3", "reason": "host"},
+]
+
+
+def test_index_returns_longest_prefix_regardless_of_row_order():
+    for rows in (ROWS, list(reversed(ROWS))):
+        index = IPLookupIndex(rows)
+
+        assert index.lookup("10.1.2.3")["reason"] == "host"
+        assert index.lookup("10.1.2.4")["reason"] == "narrowest"
+        assert index.lookup("10.1.3.1")["reason"] == "narrow"
+        assert index.lookup("10.2.0.1")["reason"] == "wide"
+        assert index.lookup("2001:db8:1::5")["reason"] == "narrow6"
+        assert index.lookup("2001:db8:2::5")["reason"] == "wide6"
+        assert index.lookup("192.168.0.1") is None
+
+
+def _longest_prefix_reference(networks, ip):
+    """선형 탐색 기준 결과 (가장 긴 prefix, 같은 길이면 먼저 나온 행)"""
+    address = ipaddress.ip_address(ip)
+    best = None
+    for network, row in networks:
+        if address.version != network.version or address not in network:
+            continue
+        if best is None or network.prefixlen > best[0]:
+            best = (network.prefixlen, row)
+    return best[1] if best else None
+
+
+def test_index_with_many_cidrs_matches_linear_scan_on_misses():
+    rng = random.Random(7)
+    rows = []
+    for i in range(2000):
+        prefix = rng.choice([8, 12, 16, 20, 24, 28, 30])
+        address = ipaddress.IPv4Address(rng.getrandbits(32))
+        network = ipaddress.ip_network(f"{address}/{prefix}", strict=False)
+        rows.append({"ip_address": str(network), "reason": f"v4-{i}"})
+    for i in range(500):
+        prefix = rng.choice([32, 48, 56, 64, 72, 96, 120])
+        address = ipaddress.IPv6Address(rng.getrandbits(128))
+        network = ipaddress.ip_network(f"{address}/{prefix}", strict=False)
+        rows.append({"ip_address": str(network), "reason": f"v6-{i}"})
+    index = IPLookupIndex(rows)
+    networks = [(ipaddress.ip_network(row["ip_address"]), row) for row in rows]
+
+    probes = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(500)]
+    probes += [str(ipaddress.IPv6Address(rng.getrandbits(128))) for _ in range(200)]
+    # CIDR 내부 주소 (단일 호스트 항목이 없어 모두 CIDR 경로로 조회)
+    for network, _ in rng.sample(networks, 300):
+        offset = rng.randrange(network.num_addresses)
+        probes.append(str(network.network_address + offset))
+
+    assert index.get_stats()["networks"] == len(rows)
+    hits = 0
+    for ip in probes:
+        expected = _longest_prefix_reference(networks, ip)
+        assert index.lookup(ip) is expected
+        hits += expected is not None
+    assert 300 <= hits < len(probes)
+
+
+def test_mapped_snapshot_index_returns_longest_prefix(tmp_path):
+    path = os.path.join(tmp_path, "snapshot.bin")
+    rows = [dict(row, is_active=True) for row in ROWS]
+    write_snapshot_file(path, DataVersion(1, datetime(2024, 1, 1)), rows)
+
+    snapshot = MappedBlacklistSnapshot(path)
+    assert snapshot.index.lookup("10.1.2.4")["reason"] == "narrowest"
+    assert snapshot.index.lookup("2001:db8:1::5")["reason"] == "narrow6"
+
+
+def test_db_single_lookup_only_matches_active_rows(monkeypatch):
+    cursor = FakeCursor()
+    monkeypatch.setattr(service, "get_db_connection", lambda: FakeConnection(cursor))
+
+    assert service._search_ip_in_db("10.1.2.3") is None
+
+    sql, params = cursor.executed[0]
+    assert "is_active = true" in sql
+    assert "masklen(ip_address) DESC" in sql
+    assert params == ("10.1.2.3",)
+
+
+def test_db_batch_lookup_only_matches_active_rows(monkeypatch):
+    cursor = FakeCursor()
+    monkeypatch.setattr(service, "get_db_connection", lambda: FakeConnection(cursor))
+
+    assert service._search_ips_in_db(["10.1.2.3"]) == {}
+
+    sql, params = cursor.executed[0]
+    assert "b.is_active = true" in sql
+    assert "masklen(b.ip_address) DESC" in sql
+    assert params == (["10.1.2.3"],)
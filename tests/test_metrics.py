@@ -0,0 +1,188 @@
+"""
+Prometheus 메트릭 테스트
+- 히스토그램 버킷은 le 누적 값으로 출력
+- 종료된 워커 값은 아카이브로 합쳐 카운터가 줄어들지 않음, 살아 있는 워커 값은 합산
+- 요청 계측 훅 (after_request)은 /metrics 자체를 세지 않음
+- 공유 디렉토리를 쓸 수 없어도 /metrics는 이 워커 값으로 응답
+"""
+import json
+import os
+
+import pytest
+from flask import Flask
+
+from src.core.services.metrics import METRICS, MetricsRegistry
+
+DEAD_PID = 2**22 + 12345
+DURATION = "blacklist_http_request_duration_seconds"
+REQUESTS = "blacklist_http_requests_total"
+_LABELS = 'blueprint="api",method="GET",route="/x"'
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return MetricsRegistry(str(tmp_path), flush_interval=0)
+
+
+def _write_worker(directory, pid, counters=(), histograms=(), gauges=()):
+    path = os.path.join(directory, f"worker_{pid}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "pid": pid,
+                "counters": list(counters),
+                "histograms": list(histograms),
+                "gauges": list(gauges),
+            },
+            f,
+        )
+    return path
+
+
+def _counter(total, name, **labels):
+    key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+    return total["counters"].get((name, key))
+
+
+def test_histogram_buckets_render_cumulative(registry):
+    labels = {"blueprint": "api", "route": "/x", "method": "GET"}
+    for value in (0.003, 0.02, 0.02, 20):
+        registry.observe(DURATION, labels, value)
+
+    lines = [
+        line for line in registry.render().splitlines() if line.startswith(DURATION)
+    ]
+
+    buckets = {}
+    for line in lines:
+        if "_bucket{" in line:
+            le = line.split('le="')[1].split('"')[0]
+            buckets[le] = int(line.rsplit(" ", 1)[1])
+    bounds = [str(b) for b in METRICS[DURATION][2]]
+    assert list(buckets) == bounds + ["+Inf"]
+    assert buckets["0.005"] == 1
+    assert buckets["0.01"] == 1
+    assert buckets["0.025"] == 3
+    assert buckets["10"] == 3
+    assert buckets["+Inf"] == 4
+    counts = list(buckets.values())
+    assert counts == sorted(counts)
+    assert f"{DURATION}_count{{{_LABELS}}} 4" in lines
+    assert f"{DURATION}_sum{{{_LABELS}}} 20.043" in lines
+
+
+def test_dead_workers_are_archived_and_counters_stay_monotonic(registry, tmp_path):
+    labels = [["route", "/x"]]
+    registry.inc(REQUESTS, {"route": "/x"}, 1)
+    dead = _write_worker(
+        str(tmp_path),
+        DEAD_PID,
+        counters=[[REQUESTS, labels, 5]],
+        histograms=[[DURATION, labels, [1] + [0] * 11, 0.001, 1]],
+        gauges=[["blacklist_db_pool_connections", [["state", "idle"]], 4]],
+    )
+
+    first = registry.collect()
+
+    assert _counter(first, REQUESTS, route="/x") == 6
+    assert not os.path.exists(dead)
+    assert os.path.exists(os.path.join(tmp_path, "archive.json"))
+    # 종료된 워커의 게이지는 합산하지 않음
+    assert first["gauges"] == {}
+
+    # 아카이브된 값은 다음 집계에도 유지, 새로 종료된 워커 값은 더해짐
+    assert _counter(registry.collect(), REQUESTS, route="/x") == 6
+    _write_worker(str(tmp_path), DEAD_PID + 1, counters=[[REQUESTS, labels, 3]])
+    total = registry.collect()
+    assert _counter(total, REQUESTS, route="/x") == 9
+    assert total["histograms"][(DURATION, (("route", "/x"),))][2] == 1
+
+
+def test_live_workers_are_merged(registry, tmp_path):
+    labels = [["route", "/x"]]
+    registry.inc(REQUESTS, {"route": "/x"}, 2)
+    registry.observe(DURATION, {"route": "/x"}, 0.02)
+    registry.set_gauge("blacklist_db_pool_max_connections", None, 4)
+    registry.set_gauge("blacklist_db_pool_connections", {"state": "in_use"}, 1)
+    other = _write_worker(
+        str(tmp_path),
+        os.getppid(),
+        counters=[[REQUESTS, labels, 3]],
+        histograms=[[DURATION, labels, [1] + [0] * 11, 0.001, 1]],
+        gauges=[
+            ["blacklist_db_pool_max_connections", [], 4],
+            ["blacklist_db_pool_connections", [["state", "in_use"]], 3],
+        ],
+    )
+
+    total = registry.collect()
+
+    assert _counter(total, REQUESTS, route="/x") == 5
+    buckets, sum_, count = total["histograms"][(DURATION, (("route", "/x"),))]
+    assert count == 2
+    assert sum_ == pytest.approx(0.021)
+    assert buckets[0] == 1 and buckets[2] == 1
+    assert total["gauges"][("blacklist_db_pool_max_connections", ())] == 8
+    assert total["gauges"][("blacklist_db_pool_utilization", ())] == 0.5
+    assert os.path.exists(other)
+
+
+def test_after_request_hook_records_requests(registry):
+    app = Flask(__name__)
+
+    @app.route("/api/items/<item_id>")
+    def item(item_id):
+        return "body"
+
+    registry.init_app(app)
+    client = app.test_client()
+
+    assert client.get("/api/items/1").status_code == 200
+    assert client.get("/api/items/2").status_code == 200
+    assert client.get("/missing").status_code == 404
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    total = registry.collect()
+    labels = {"blueprint": "app", "route": "/api/items/<item_id>", "method": "GET"}
+    assert _counter(total, REQUESTS, status=200, **labels) == 2
+    assert (
+        _counter(
+            total,
+            REQUESTS,
+            blueprint="app",
+            route="<unmatched>",
+            method="GET",
+            status=404,
+        )
+        == 1
+    )
+    # /metrics 요청은 계측하지 않음
+    routes = {dict(key).get("route") for _, key in total["counters"]}
+    assert "/metrics" not in routes
+    key = tuple(sorted(labels.items()))
+    assert total["histograms"][(DURATION, key)][2] == 2
+    size = total["histograms"][("blacklist_http_response_size_bytes", key)]
+    assert size[1] == 2 * len(b"body")
+
+
+def test_metrics_endpoint_survives_unwritable_directory(tmp_path):
+    # 디렉토리 자리에 파일이 있으면 makedirs / open 모두 OSError
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    registry = MetricsRegistry(str(blocked), flush_interval=0)
+    app = Flask(__name__)
+
+    @app.route("/api/ping")
+    def ping():
+        return "pong"
+
+    registry.init_app(app)
+    client = app.test_client()
+
+    assert client.get("/api/ping").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert REQUESTS in response.get_data(as_text=True)
@@ -0,0 +1,267 @@
+"""
+스키마 마이그레이션 테스트
+- 인덱스 마이그레이션은 트랜잭션 밖에서 CREATE INDEX CONCURRENTLY 문장별 실행
+- 기존 인덱스는 대체 인덱스가 VALID로 확인된 뒤에만 삭제
+- 마이그레이션은 워커 부팅이 아닌 gunicorn 마스터(on_starting)에서 1회, 실패 시 시작 중단
+"""
+import pytest
+
+from src.core.database import migrations
+from src.core.database.migrations import MIGRATIONS, Migration, MigrationRunner
+
+
+class MigrationConnection:
+    """실행한 SQL과 실행 시점의 autocommit 상태를 기록하는 연결"""
+
+    def __init__(
+        self, applied=(), invalid=(), fail_on=None, missing=(), lock_busy=0
+    ):
+        self.applied = set(applied)
+        self.lock_busy = lock_busy
+        self.invalid = list(invalid)
+        self.missing = set(missing)
+        self.fail_on = fail_on
+        self.autocommit = False
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+
+    def cursor(self):
+        return MigrationCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed += 1
+
+
+class MigrationCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql.strip(), params, self.conn.autocommit))
+        if self.conn.fail_on and self.conn.fail_on in sql:
+            raise RuntimeError(f"failed: {self.conn.fail_on}")
+        if "pg_try_advisory_lock" in sql:
+            busy = self.conn.lock_busy > 0
+            self.conn.lock_busy -= 1
+            self.result = [(not busy,)]
+        elif sql.startswith("SELECT version FROM schema_migrations"):
+            self.result = [(v,) for v in self.conn.applied]
+        elif "FROM schema_migrations WHERE version" in sql:
+            self.result = [(1,)] if params[0] in self.conn.applied else []
+        elif "NOT i.indisvalid" in sql:
+            self.result = [(name,) for name in self.conn.invalid if name in params[0]]
+        elif "indisvalid" in sql:
+            self.result = [
+                (name,)
+                for name in params[0]
+                if name not in self.conn.invalid and name not in self.conn.missing
+            ]
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self.conn.applied.add(params[0])
+            self.result = []
+        else:
+            self.result = []
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return list(self.result)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    def install(conn):
+        monkeypatch.setattr(migrations.db_pool, "getconn", lambda: conn)
+        return conn
+
+    return install
+
+
+def _index_migrations():
+    return [m for m in MIGRATIONS if m.concurrent]
+
+
+def test_index_migrations_are_concurrent():
+    for migration in _index_migrations():
+        assert migration.concurrent
+        statements = [s for s in migration.sql.split(";") if s.strip()]
+        for statement in statements:
+            assert "CONCURRENTLY" in statement
+
+
+def test_concurrent_migration_runs_outside_transaction(connect):
+    conn = connect(MigrationConnection(applied={1, 2, 3, 6, 7}))
+
+    result = MigrationRunner(MIGRATIONS).run()
+
+    assert result["success"] is True
+    assert result["applied"] == [4, 5, 8]
+    index_sql = [
+        (sql, autocommit) for sql, _, autocommit in conn.executed if "INDEX" in sql
+    ]
+    assert len(index_sql) == 5
+    # 문장별 실행, 모두 autocommit (트랜잭션 블록 밖)
+    for sql, autocommit in index_sql:
+        assert autocommit is True
+        assert sql.count("INDEX") == 1
+    # 실행 전체에 세션 잠금 하나 (트랜잭션 잠금 없음)
+    locks = [sql for sql, _, _ in conn.executed if "pg_try_advisory_lock" in sql]
+    unlocks = [sql for sql, _, _ in conn.executed if "pg_advisory_unlock" in sql]
+    assert len(locks) == len(unlocks) == 1
+    assert not any("pg_advisory_xact_lock" in sql for sql, _, _ in conn.executed)
+    assert conn.autocommit is False
+    assert conn.closed == 1
+    # 기존 boolean 인덱스 삭제는 대체 인덱스 생성 이후
+    sqls = [sql for sql, _ in index_sql]
+    drop = next(i for i, sql in enumerate(sqls) if "DROP INDEX" in sql)
+    assert drop == len(sqls) - 1
+
+
+def test_invalid_index_from_failed_build_is_recreated(connect):
+    conn = connect(
+        MigrationConnection(
+            applied={1, 2, 3, 4, 6, 7, 8}, invalid=["idx_blacklist_ips_ip_gist"]
+        )
+    )
+
+    assert MigrationRunner(MIGRATIONS).run()["success"] is True
+
+    sqls = [sql for sql, _, _ in conn.executed]
+    drop = sqls.index('DROP INDEX CONCURRENTLY IF EXISTS "idx_blacklist_ips_ip_gist"')
+    create = next(i for i, sql in enumerate(sqls) if sql.startswith("-- CIDR"))
+    assert drop < create
+    assert "CREATE INDEX CONCURRENTLY" in sqls[create]
+
+
+def test_failed_concurrent_migration_stops_and_unlocks(connect):
+    conn = connect(
+        MigrationConnection(
+            applied={1, 2, 3, 6, 7, 8},
+            fail_on="idx_blacklist_ips_last_seen_date_source",
+        )
+    )
+
+    result = MigrationRunner(MIGRATIONS).run()
+
+    assert result["success"] is False
+    assert result["applied"] == []
+    assert 4 not in conn.applied and 5 not in conn.applied
+    assert "pg_advisory_unlock" in conn.executed[-1][0]
+    assert conn.autocommit is False
+
+
+def test_failed_transactional_migration_rolls_back(connect):
+    conn = connect(MigrationConnection(fail_on="ALTER TABLE blacklist_ips"))
+    runner = MigrationRunner(
+        [
+            Migration(1, "one", "SELECT 1"),
+            Migration(2, "two", "ALTER TABLE blacklist_ips"),
+        ]
+    )
+
+    result = runner.run()
+
+    assert result == {"success": False, "applied": [1], "error": result["error"]}
+    assert conn.rollbacks == 1
+    # 트랜잭션 마이그레이션만 트랜잭션 안에서 실행
+    statements = {sql: autocommit for sql, _, autocommit in conn.executed}
+    assert statements["SELECT 1"] is False
+    assert statements["ALTER TABLE blacklist_ips"] is False
+
+
+def test_lock_is_polled_without_open_transaction(connect):
+    conn = connect(MigrationConnection(applied={1, 2, 3, 4, 5, 6, 7, 8}, lock_busy=2))
+    runner = MigrationRunner(MIGRATIONS)
+    runner.lock_poll_interval = 0
+
+    assert runner.run()["success"] is True
+
+    polls = [
+        autocommit
+        for sql, _, autocommit in conn.executed
+        if "pg_try_advisory_lock" in sql
+    ]
+    # 대기 중에는 autocommit - 잠금 보유자의 CREATE INDEX CONCURRENTLY를 막지 않음
+    assert polls == [True, True, True]
+    assert conn.commits == 0
+
+
+def test_lock_wait_times_out(connect):
+    conn = connect(MigrationConnection(lock_busy=10**6))
+    runner = MigrationRunner(MIGRATIONS)
+    runner.lock_timeout = 0
+    runner.lock_poll_interval = 0
+
+    result = runner.run()
+
+    assert result["success"] is False
+    assert "잠금" in result["error"]
+    assert not any("pg_advisory_unlock" in sql for sql, _, _ in conn.executed)
+    assert conn.autocommit is False
+    assert conn.closed == 1
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        {"missing": {"idx_blacklist_ips_active_last_seen"}},
+        {"invalid": ["idx_blacklist_ips_active_source_category"]},
+    ],
+)
+def test_old_index_kept_until_replacement_is_valid(connect, state):
+    conn = connect(MigrationConnection(applied={1, 2, 3, 4, 5, 6, 7}, **state))
+
+    result = MigrationRunner(MIGRATIONS).run()
+
+    assert result["success"] is False
+    assert 8 not in conn.applied
+    assert not any("DROP INDEX" in sql for sql, _, _ in conn.executed)
+    assert "pg_advisory_unlock" in conn.executed[-1][0]
+
+
+def test_startup_migrations_raise_on_failure(monkeypatch):
+    monkeypatch.setattr(
+        migrations.migration_runner,
+        "run",
+        lambda: {"success": False, "applied": [], "error": "inet 변환 실패"},
+    )
+    monkeypatch.setattr(migrations.db_pool, "close_all", lambda: None)
+
+    with pytest.raises(RuntimeError, match="inet 변환 실패"):
+        migrations.run_startup_migrations()
+
+
+def test_gunicorn_master_runs_migrations_once_before_workers(monkeypatch):
+    import os
+    import runpy
+    from types import SimpleNamespace
+
+    from src.core import app as app_module
+
+    calls = []
+    monkeypatch.setattr(
+        migrations, "run_startup_migrations", lambda: calls.append(True) or None
+    )
+    hooks = runpy.run_path(
+        os.path.join(os.path.dirname(__file__), "..", "gunicorn.conf.py")
+    )
+    log = SimpleNamespace(info=lambda *a: None, warning=lambda *a: None)
+
+    hooks["on_starting"](SimpleNamespace(log=log))
+    app_module.create_app()
+
+    # create_app (워커 부팅 / preload)은 마이그레이션을 실행하지 않음
+    assert calls == [True]
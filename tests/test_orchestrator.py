@@ -0,0 +1,64 @@
+"""
+다중 소스 수집 오케스트레이터 테스트
+- 소스 종료 후 작업 토큰에 등록한 취소 전파 콜백 해제
+- 수집기 모듈이 없는 소스는 등록하지 않음
+"""
+from src.core.collectors.orchestrator import (
+    SOURCE_SUCCEEDED,
+    CollectionOrchestrator,
+)
+from src.core.utils.cancellation import CancelToken
+
+
+class FakeCollector:
+    def __init__(self, config):
+        self.config = config
+
+    def set_progress(self, progress):
+        pass
+
+    def set_cancel_token(self, token):
+        self.token = token
+
+    def collect_from_web(self):
+        return {"success": True, "data": [{"ip": "1.1.1.1"}]}
+
+
+class FakeProgress:
+    def __init__(self):
+        self.cancel_token = CancelToken()
+        self.stages = []
+
+    def stage(self, name):
+        self.stages.append(name)
+
+
+def test_child_cancel_callbacks_are_released():
+    orchestrator = CollectionOrchestrator()
+    orchestrator.register("A", f"{__name__}:FakeCollector")
+    orchestrator.register("B", f"{__name__}:FakeCollector")
+    progress = FakeProgress()
+    ingested = []
+
+    outcome = orchestrator.run(
+        progress=progress,
+        ingest=lambda source, data: ingested.append(source) or {"rows": len(data)},
+    )
+
+    assert outcome["success"] is True
+    assert {r["status"] for r in outcome["results"].values()} == {SOURCE_SUCCEEDED}
+    assert sorted(ingested) == ["A", "B"]
+    # 장기 실행 작업 토큰이 끝난 소스 토큰을 붙잡지 않음
+    assert progress.cancel_token._callbacks == []
+
+
+def test_missing_collector_module_is_not_registered():
+    orchestrator = CollectionOrchestrator()
+
+    assert not orchestrator.register_if_available(
+        "SECUDIUM", ".secudium_collector:SecudiumCollector"
+    )
+    assert orchestrator.register_if_available(
+        "REGTECH", ".regtech_collector_core:RegtechCollector"
+    )
+    assert orchestrator.sources() == ["REGTECH"]
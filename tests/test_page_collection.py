@@ -0,0 +1,142 @@
+"""
+REGTECH 페이지 수집 실패 경로 테스트
+- 페이지 요청 오류 / 429는 빈 페이지(마지막 페이지)가 아닌 오류로 AIMD에 반영
+- 연속 에러 한계로 중단되면 누락 페이지를 기록하고 수집 결과를 적재하지 않음
+- 페이지 스레드마다 별도 세션 사용
+"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from src.core.collectors.helpers.pagination import (
+    AIMDController,
+    PageCollectionIncomplete,
+    PagePipeline,
+)
+from src.core.collectors.helpers.request_utils import ThreadLocalSessions
+from src.core.collectors.regtech_collector_data import RegtechCollectorData
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def _run_pipeline(fetch, max_errors=3, concurrency=1):
+    controller = AIMDController(concurrency=concurrency, delay=0.0, delay_step=0.0)
+    pipeline = PagePipeline(fetch, controller, max_pages=10, max_errors=max_errors)
+
+    async def run():
+        queue: asyncio.Queue = asyncio.Queue()
+        stats = await pipeline.run(queue)
+        pages = []
+        while True:
+            item = queue.get_nowait()
+            if item is None:
+                return stats, pages
+            pages.append(item[0])
+
+    return asyncio.run(run()), controller
+
+
+def test_throttled_pages_reduce_concurrency():
+    calls = []
+
+    async def fetch(page):
+        calls.append(page)
+        if len(calls) == 1:
+            raise _http_error(429)
+        return [page] if page < 2 else []
+
+    (stats, pages), controller = _run_pipeline(fetch, concurrency=4)
+
+    assert stats["throttled"] == 1
+    assert stats["errors"] == 1
+    assert controller.decreases == 1
+    assert stats["failed_pages"] == []
+    assert sorted(pages) == [0, 1]
+
+
+def test_error_limit_records_failed_pages():
+    async def fetch(page):
+        if page == 1:
+            raise _http_error(500)
+        return [page] if page < 4 else []
+
+    (stats, pages), _ = _run_pipeline(fetch, max_errors=3, concurrency=4)
+
+    assert stats["failed_pages"] == [1]
+    assert 1 not in pages
+
+
+@pytest.fixture
+def data_module():
+    module = RegtechCollectorData(
+        "https://example.invalid",
+        SimpleNamespace(request_utils=SimpleNamespace()),
+        SimpleNamespace(is_valid_ip=lambda ip: True),
+    )
+    module.page_delay = 0.0
+    module.page_concurrency = 4
+    module.max_page_errors = 3
+    return module
+
+
+def test_robust_collect_rejects_gapped_results(data_module):
+    def collect_single_page(session, page, start_date, end_date):
+        if page == 1:
+            raise _http_error(502)
+        return [{"ip": f"10.0.0.{page}"}] if page < 4 else []
+
+    data_module.auth_module.request_utils.collect_single_page = collect_single_page
+
+    with pytest.raises(PageCollectionIncomplete) as excinfo:
+        asyncio.run(data_module.robust_collect_ips(requests.Session(), "", ""))
+    assert excinfo.value.failed_pages == [1]
+
+
+def test_robust_collect_uses_a_session_per_thread(data_module):
+    base = requests.Session()
+    base.cookies.set("JSESSIONID", "abc")
+    used = {}
+    lock = threading.Lock()
+
+    def collect_single_page(session, page, start_date, end_date):
+        assert session is not base
+        assert session.cookies.get("JSESSIONID") == "abc"
+        with lock:
+            owner = used.setdefault(id(session), threading.get_ident())
+        assert owner == threading.get_ident()
+        return [{"ip": f"10.0.0.{page}"}] if page < 20 else []
+
+    data_module.auth_module.request_utils.collect_single_page = collect_single_page
+
+    ips = asyncio.run(data_module.robust_collect_ips(base, "", ""))
+
+    assert len(ips) == 20
+    assert used
+
+
+def test_thread_local_sessions_copy_base_settings():
+    base = requests.Session()
+    base.headers["User-Agent"] = "test-agent"
+    base.cookies.set("JSESSIONID", "abc")
+    sessions = ThreadLocalSessions(base)
+
+    main = sessions.get()
+    assert sessions.get() is main
+    other = []
+    thread = threading.Thread(target=lambda: other.append(sessions.get()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not main
+    for session in (main, other[0]):
+        assert session.headers["User-Agent"] == "test-agent"
+        assert session.cookies.get("JSESSIONID") == "abc"
+        assert session.cookies is not base.cookies
+    sessions.close()
@@ -0,0 +1,117 @@
+"""
+커넥션 풀 크기 테스트
+- 풀 기본 크기는 워커당 요청 스레드 / 수집 작업 수에서 계산
+- 전체 워커의 풀 합계가 max_connections를 넘으면 gunicorn 시작 시 경고
+"""
+import os
+import runpy
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.database import async_pool
+from src.core.database.async_pool import AsyncDatabase
+from src.core.database.connection_pool import PooledConnectionManager, default_pool_max
+
+GUNICORN_CONF = os.path.join(os.path.dirname(__file__), "..", "gunicorn.conf.py")
+
+
+@pytest.fixture(autouse=True)
+def no_migrations(monkeypatch):
+    """on_starting 훅의 스키마 마이그레이션은 실행하지 않음"""
+    from src.core.database import migrations
+
+    monkeypatch.setattr(migrations, "run_startup_migrations", lambda: None)
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in (
+        "GUNICORN_WORKER_CLASS",
+        "GUNICORN_THREADS",
+        "DB_ASYNC_BACKEND",
+        "COLLECTION_JOB_WORKERS",
+        "DB_POOL_MAX",
+        "DB_ASYNC_POOL_MAX",
+        "DB_MAX_CONNECTIONS",
+        "DB_RESERVED_CONNECTIONS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_pool_sizes_follow_worker_threads(monkeypatch):
+    # 기본 sync 워커는 요청 스레드 1개
+    assert default_pool_max() == 1 + 1 + 1
+    assert PooledConnectionManager().maxconn == 3
+    assert AsyncDatabase().max_size == 1
+
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", "gthread")
+    assert default_pool_max() == 4 + 1 + 1
+    assert AsyncDatabase().max_size == 4
+
+    monkeypatch.setenv("GUNICORN_THREADS", "8")
+    monkeypatch.setenv("COLLECTION_JOB_WORKERS", "2")
+    assert PooledConnectionManager().maxconn == 8 + 2 + 1
+    assert AsyncDatabase().max_size == 8
+
+
+def test_explicit_pool_sizes_win(monkeypatch):
+    monkeypatch.setenv("DB_POOL_MAX", "3")
+    monkeypatch.setenv("DB_ASYNC_POOL_MAX", "2")
+
+    assert PooledConnectionManager().maxconn == 3
+    assert AsyncDatabase().max_size == 2
+
+
+@pytest.mark.parametrize("per_worker, warned", [(10, False), (25, True)])
+def test_gunicorn_warns_when_pools_exceed_max_connections(
+    monkeypatch, per_worker, warned
+):
+    hooks = runpy.run_path(GUNICORN_CONF)
+    monkeypatch.setattr(async_pool, "connections_per_worker", lambda: per_worker)
+    warnings = []
+    server = SimpleNamespace(log=SimpleNamespace(warning=lambda *a: warnings.append(a)))
+
+    hooks["on_starting"](server)
+
+    assert bool(warnings) is warned
+
+
+def test_default_pools_fit_default_max_connections(monkeypatch):
+    hooks = runpy.run_path(GUNICORN_CONF)
+    # psycopg3 유무와 관계없이 비동기 풀 포함 기준으로 확인
+    monkeypatch.setattr(async_pool.async_db, "backend", "psycopg")
+    monkeypatch.setattr(async_pool.async_db, "max_size", AsyncDatabase().max_size)
+    monkeypatch.setattr(
+        async_pool.db_pool, "maxconn", PooledConnectionManager().maxconn
+    )
+    warnings = []
+    server = SimpleNamespace(log=SimpleNamespace(warning=lambda *a: warnings.append(a)))
+
+    hooks["on_starting"](server)
+
+    assert warnings == []
+
+
+@pytest.mark.parametrize(
+    "worker_class, threads, expected",
+    [(None, "8", ("sync", 1)), ("gthread", "8", ("gthread", 8))],
+)
+def test_gunicorn_keeps_sync_workers_unless_gthread_requested(
+    monkeypatch, worker_class, threads, expected
+):
+    if worker_class:
+        monkeypatch.setenv("GUNICORN_WORKER_CLASS", worker_class)
+    monkeypatch.setenv("GUNICORN_THREADS", threads)
+
+    conf = runpy.run_path(GUNICORN_CONF)
+
+    assert (conf["worker_class"], conf["threads"]) == expected
+
+
+def test_async_backend_defaults_to_thread(monkeypatch):
+    pytest.importorskip("psycopg_pool")
+
+    assert AsyncDatabase().backend == "thread"
+    monkeypatch.setenv("DB_ASYNC_BACKEND", "psycopg")
+    assert AsyncDatabase().backend == "psycopg"
@@ -0,0 +1,93 @@
+"""
+요청 프로파일러 테스트
+- 프로파일 조회/다운로드는 PROFILE_TOKEN 없이는 항상 거부
+- 스트리밍 응답은 버퍼링하지 않고 그대로 전달
+"""
+import pytest
+from flask import Flask, Response
+
+from src.core.services.profiler import RequestProfiler
+
+TOKEN = "test-profile-token"
+
+
+def _app(profiler):
+    app = Flask(__name__)
+
+    @app.route("/api/buffered")
+    def buffered():
+        return "buffered-body"
+
+    @app.route("/api/stream")
+    def stream():
+        def generate():
+            produced.append("chunk-1")
+            yield "chunk-1"
+            produced.append("chunk-2")
+            yield "chunk-2"
+
+        return Response(generate(), mimetype="text/plain")
+
+    produced = []
+    app.produced = produced
+    profiler.init_app(app)
+    return app
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = RequestProfiler()
+    profiler.directory = tmp_path
+    return profiler
+
+
+@pytest.mark.parametrize("token", ["", "wrong"])
+def test_profile_routes_require_token_with_sampling_only(profiler, token):
+    profiler.token = ""
+    profiler.sample_rate = 0.5
+    client = _app(profiler).test_client()
+
+    for path in ("/api/internal/profiles", "/api/internal/profiles/x.prof"):
+        response = client.get(path, headers={"X-Profile-Token": token})
+        assert response.status_code == 403
+
+
+def test_profile_routes_with_token(profiler):
+    profiler.token = TOKEN
+    client = _app(profiler).test_client()
+
+    response = client.get(
+        "/api/internal/profiles", headers={"X-Profile-Token": TOKEN}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["success"] is True
+
+
+def test_buffered_response_is_profiled(profiler):
+    profiler.token = TOKEN
+    client = _app(profiler).test_client()
+
+    response = client.get("/api/buffered", headers={"X-Profile-Token": TOKEN})
+
+    assert response.data == b"buffered-body"
+    assert response.headers["Content-Length"] == str(len(b"buffered-body"))
+    assert response.headers["X-Profile-Id"].endswith(".prof")
+
+
+def test_streamed_response_is_not_buffered(profiler):
+    profiler.token = TOKEN
+    app = _app(profiler)
+    client = app.test_client()
+
+    response = client.get(
+        "/api/stream", headers={"X-Profile-Token": TOKEN}, buffered=False
+    )
+
+    # 본문을 읽기 전에는 제너레이터가 끝까지 실행되지 않아야 함
+    # (테스트 클라이언트는 첫 청크를 미리 읽음)
+    assert "chunk-2" not in app.produced
+    assert "X-Profile-Id" in response.headers
+    assert b"".join(response.response) == b"chunk-1chunk-2"
+    assert app.produced == ["chunk-1", "chunk-2"]
+    response.close()
@@ -0,0 +1,184 @@
+"""
+쿼리 통계 엔드포인트 / 워커 간 집계 테스트
+- 관리자 토큰 없이 조회/초기화 불가
+- 워커별 파일 합산, 종료된 워커 파일 정리, 전체 초기화 전파
+- 느린 쿼리 실행 계획은 읽기 전용 문장만, SAVEPOINT 안에서 EXPLAIN (ANALYZE 없음)
+"""
+import json
+import os
+
+import pytest
+from psycopg2 import extensions
+
+from src.core.database.query_stats import (
+    InstrumentedCursorMixin,
+    QueryStatsRecorder,
+    fingerprint,
+    query_stats,
+)
+from src.core.services.profiler import request_profiler
+from tests.conftest import FakeConnection, FakeCursor
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(request_profiler, "token", TOKEN)
+    return TOKEN
+
+
+def _write_worker(directory, pid, since, calls, total_ms):
+    stats = {
+        "SELECT ?": {
+            "calls": calls,
+            "errors": 0,
+            "rows": calls,
+            "total_ms": total_ms,
+            "max_ms": total_ms,
+            "slow": 0,
+            "buckets": [calls] + [0] * 11,
+            "last_error": None,
+            "last_plan": None,
+        }
+    }
+    path = os.path.join(directory, f"worker_{pid}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"pid": pid, "since": since, "stats": stats}, f)
+    return path
+
+
+@pytest.mark.parametrize("method", ["get", "delete"])
+def test_query_stats_requires_configured_token(api_client, monkeypatch, method):
+    monkeypatch.setattr(request_profiler, "token", "")
+
+    response = getattr(api_client, method)(
+        "/api/internal/query-stats", headers={"X-Profile-Token": ""}
+    )
+
+    assert response.status_code == 403
+
+
+def test_query_stats_rejects_wrong_token(api_client, admin_token, monkeypatch):
+    resets = []
+    monkeypatch.setattr(query_stats, "reset", lambda: resets.append(True))
+
+    for method in ("get", "delete"):
+        response = getattr(api_client, method)(
+            "/api/internal/query-stats", headers={"X-Profile-Token": "wrong"}
+        )
+        assert response.status_code == 403
+    assert resets == []
+
+
+def test_query_stats_with_token(api_client, admin_token):
+    response = api_client.get(
+        "/api/internal/query-stats", headers={"X-Profile-Token": admin_token}
+    )
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["success"] is True
+    assert os.getpid() in body["workers"]
+
+
+def test_collect_merges_live_workers_and_drops_dead(tmp_path):
+    recorder = QueryStatsRecorder(str(tmp_path))
+    recorder.record("SELECT 1", 2.0, rows=1)
+    recorder.record("SELECT 2", 4.0, rows=1)
+
+    other = _write_worker(str(tmp_path), os.getppid(), recorder._started, 3, 30.0)
+    dead = _write_worker(str(tmp_path), 2**22 + 12345, recorder._started, 5, 50.0)
+
+    result = recorder.collect()
+
+    assert result["workers"] == sorted([os.getpid(), os.getppid()])
+    (entry,) = result["queries"]
+    assert entry["fingerprint"] == "SELECT ?"
+    assert entry["calls"] == 5
+    assert entry["total_ms"] == 36.0
+    assert entry["max_ms"] == 30.0
+    assert [b["count"] for b in entry["histogram"][:2]] == [3, 2]
+    assert os.path.exists(other)
+    assert not os.path.exists(dead)
+
+
+def test_reset_applies_to_every_worker(tmp_path):
+    worker = QueryStatsRecorder(str(tmp_path))
+    worker.record("SELECT 1", 2.0)
+    stale = _write_worker(str(tmp_path), os.getppid(), worker._started, 3, 30.0)
+
+    QueryStatsRecorder(str(tmp_path)).reset()
+
+    # 다른 워커는 다음 파일 기록 때 초기화, 아직 기록하지 않은 파일은 합산 제외
+    worker.flush()
+    assert worker.snapshot()["queries"] == []
+    assert os.path.exists(stale)
+    assert worker.collect()["queries"] == []
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("SELECT ip_address FROM blacklist_ips WHERE is_active = true", True),
+        ("WITH a AS (SELECT 1 FROM blacklist_ips) SELECT * FROM a", True),
+        ("SELECT pg_advisory_lock(%s)", False),
+        ("SELECT nextval('seq') FROM blacklist_ips", False),
+        ("WITH d AS (DELETE FROM blacklist_ips RETURNING 1) SELECT * FROM d", False),
+        ("UPDATE blacklist_ips SET is_active = false", False),
+    ],
+)
+def test_should_explain_only_read_only_statements(tmp_path, query, expected):
+    recorder = QueryStatsRecorder(str(tmp_path))
+    recorder.explain = True
+
+    assert recorder.should_explain(fingerprint(query), query) is expected
+
+
+class _PlanCursor(FakeCursor):
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if sql.startswith("EXPLAIN") and self.error is not None:
+            raise self.error
+
+
+class _ExplainConnection(FakeConnection):
+    autocommit = False
+
+    def get_transaction_status(self):
+        return extensions.TRANSACTION_STATUS_INTRANS
+
+
+class _Cursor(InstrumentedCursorMixin):
+    def __init__(self, connection):
+        self.connection = connection
+
+    def mogrify(self, query, vars=None):
+        return query.encode()
+
+
+def test_explain_runs_plain_explain_inside_savepoint():
+    plan_cursor = _PlanCursor(rows=[("Seq Scan on blacklist_ips",)])
+    cursor = _Cursor(_ExplainConnection(plan_cursor))
+
+    plan = cursor._explain("SELECT * FROM blacklist_ips", None)
+
+    assert plan == "Seq Scan on blacklist_ips"
+    assert [sql for sql, _ in plan_cursor.executed] == [
+        "SAVEPOINT query_stats_explain",
+        "EXPLAIN SELECT * FROM blacklist_ips",
+        "RELEASE SAVEPOINT query_stats_explain",
+    ]
+
+
+def test_explain_failure_rolls_back_to_savepoint():
+    plan_cursor = _PlanCursor(error=RuntimeError("explain failed"))
+    cursor = _Cursor(_ExplainConnection(plan_cursor))
+
+    assert cursor._explain("SELECT * FROM blacklist_ips", None) is None
+    assert [sql for sql, _ in plan_cursor.executed] == [
+        "SAVEPOINT query_stats_explain",
+        "EXPLAIN SELECT * FROM blacklist_ips",
+        "ROLLBACK TO SAVEPOINT query_stats_explain",
+        "RELEASE SAVEPOINT query_stats_explain",
+    ]
@@ -0,0 +1,134 @@
+"""
+REGTECH 수집 작업 적재 경로 테스트 (단일 매핑 / 단일 동기화 쓰기)
+"""
+import pytest
+
+from src.core.collectors.regtech_collector_core import RegtechCollector
+from src.core.database.bulk_loader import BulkLoadResult
+from src.core.routes import collection_api
+from src.core.services import ingest
+from src.core.utils.cancellation import CancelToken
+from tests.conftest import FakeConnection, FakeCursor
+
+COLLECTED = [
+    {
+        "ip": "1.1.1.1",
+        "threat_level": "high",
+        "attack_type": "malware",
+        "detection_date": "2026-01-01",
+    },
+    {
+        "ip": "2.2.2.2",
+        "threat_level": "HIGH",
+        "attack_type": "malware",
+        "detection_date": "20260102",
+    },
+    {
+        "ip": "3.3.3.3",
+        "threat_level": "low",
+        "country": "KR",
+        "detection_date": "2026-01-03",
+    },
+]
+
+
+class FakeProgress:
+    def __init__(self):
+        self.cancel_token = CancelToken()
+        self.stages = []
+
+    def stage(self, name):
+        self.stages.append(name)
+
+
+@pytest.fixture
+def ingest_calls(monkeypatch):
+    """수집기 / DB 적재 / 버전 게시 호출 기록"""
+    calls = {"load": [], "reconcile": [], "bump": [], "publish": [], "changed": 3}
+
+    def fake_init(self, config=None):
+        self.username = self.password = None
+
+    monkeypatch.setattr(RegtechCollector, "__init__", fake_init)
+    monkeypatch.setattr(RegtechCollector, "set_progress", lambda self, p: None)
+    monkeypatch.setattr(RegtechCollector, "set_cancel_token", lambda self, t: None)
+    monkeypatch.setattr(
+        RegtechCollector,
+        "collect_from_web",
+        lambda self: {"success": True, "data": COLLECTED},
+    )
+
+    def loader(mode):
+        def run(cursor, records, source):
+            calls[mode].append((list(records), source))
+            result = BulkLoadResult(source=source, staged=len(records))
+            result.updated = calls["changed"]
+            return result
+
+        return run
+
+    monkeypatch.setattr(ingest.bulk_loader, "load", loader("load"))
+    monkeypatch.setattr(ingest.bulk_loader, "reconcile", loader("reconcile"))
+    monkeypatch.setattr(
+        ingest,
+        "get_db_connection",
+        lambda: FakeConnection(FakeCursor()),
+    )
+    monkeypatch.setattr(
+        ingest.data_version,
+        "bump",
+        lambda cursor, source, rows: calls["bump"].append(rows) or 42,
+    )
+    monkeypatch.setattr(ingest.change_log, "record", lambda *a, **k: None)
+    monkeypatch.setattr(
+        ingest.service, "publish_ingest", calls["publish"].append
+    )
+    return calls
+
+
+def test_to_records_maps_threat_level_case_insensitively():
+    records = RegtechCollector.to_records(COLLECTED)
+
+    assert [r["confidence_level"] for r in records] == [9, 9, 5]
+    assert records[0]["category"] == "malware"
+    assert records[2]["reason"] == "REGTECH blacklist (KR)"
+
+
+def test_regtech_job_reconciles_once_with_collector_mapping(ingest_calls):
+    result = collection_api._run_regtech_collection(FakeProgress(), "user", "pw")
+
+    assert result["success"] is True
+    assert ingest_calls["load"] == []
+    assert len(ingest_calls["reconcile"]) == 1
+    records, source = ingest_calls["reconcile"][0]
+    assert source == "REGTECH"
+    assert records == RegtechCollector.to_records(COLLECTED)
+    assert ingest_calls["bump"] == [3]
+    assert ingest_calls["publish"] == [42]
+
+
+def test_unchanged_reconcile_keeps_data_version(ingest_calls):
+    ingest_calls["changed"] = 0
+
+    result = collection_api._run_regtech_collection(FakeProgress(), "user", "pw")
+
+    assert result["success"] is True
+    assert ingest_calls["bump"] == []
+    assert ingest_calls["publish"] == []
+
+
+def test_save_to_database_uses_the_job_load_path(ingest_calls):
+    saved = RegtechCollector().save_to_database(COLLECTED)
+
+    assert saved == len(COLLECTED)
+    assert ingest_calls["load"] == []
+    ((records, source),) = ingest_calls["reconcile"]
+    assert source == "REGTECH"
+    assert records == RegtechCollector.to_records(COLLECTED)
+    assert ingest_calls["bump"] == [3]
+    assert ingest_calls["publish"] == [42]
+
+
+def test_save_to_database_skips_empty_results(ingest_calls):
+    assert RegtechCollector().save_to_database([]) == 0
+    assert ingest_calls["reconcile"] == []
@@ -0,0 +1,233 @@
+"""
+공유 메모리 스냅샷 파일 테스트
+- 기록한 파일을 mmap한 스냅샷은 메모리 스냅샷과 같은 행 / 조회 / 피드 결과
+- NULL 값은 센티널로 저장했다가 None으로 복원, 섹션은 8바이트 정렬
+- 버전이 바뀌면 새 파일로 전환, 최근 keep개 버전 파일만 유지
+"""
+import os
+from datetime import datetime
+
+import pytest
+
+from src.core.services.blacklist_snapshot import ActiveBlacklistSnapshot
+from src.core.services.data_version import DataVersion
+from src.core.services.shared_snapshot import (
+    HEADER,
+    MappedBlacklistSnapshot,
+    SharedSnapshotStore,
+    _align,
+    _layout,
+    write_snapshot_file,
+)
+
+UPDATED_AT = datetime(2026, 1, 2, 3, 4, 5)
+
+ROWS = [
+    {
+        "ip_address": "203.0.113.7",
+        "reason": "악성 스캐너",
+        "source": "REGTECH",
+        "category": "scanning",
+        "confidence_level": 9,
+        "is_active": True,
+        "last_seen": "2026-01-02T03:04:05.123456",
+        "detection_count": 3,
+    },
+    {
+        "ip_address": "2001:db8::7",
+        "reason": "phishing host",
+        "source": "SECUDIUM",
+        "category": "phishing",
+        "confidence_level": 7,
+        "is_active": True,
+        "last_seen": "2026-01-01T00:00:00",
+        "detection_count": 1,
+    },
+    {
+        "ip_address": "198.51.100.0/24",
+        "reason": "악성 스캐너",
+        "source": "REGTECH",
+        "category": "scanning",
+        "confidence_level": 0,
+        "is_active": True,
+        "last_seen": "2025-12-31T23:59:59",
+        "detection_count": 12,
+    },
+    {
+        "ip_address": "2001:db8:1::/48",
+        "reason": "wide6",
+        "source": "manual",
+        "category": "unknown",
+        "confidence_level": 5,
+        "is_active": False,
+        "last_seen": "2025-12-01T12:00:00",
+        "detection_count": 2,
+    },
+    {
+        "ip_address": "10.0.0.1",
+        "reason": None,
+        "source": None,
+        "category": None,
+        "confidence_level": None,
+        "is_active": True,
+        "last_seen": None,
+        "detection_count": 0,
+    },
+]
+
+PROBES = [
+    "203.0.113.7",
+    "203.0.113.8",
+    "2001:db8::7",
+    "2001:db8::8",
+    "198.51.100.42",
+    "2001:db8:1::5",
+    "2001:db8:2::5",
+    "10.0.0.1",
+    "192.0.2.1",
+]
+
+
+def _write(tmp_path, rows, version=7):
+    path = os.path.join(tmp_path, f"snapshot.v{version}.bin")
+    write_snapshot_file(path, DataVersion(version, UPDATED_AT), rows)
+    return path
+
+
+def test_mapped_snapshot_matches_in_memory_snapshot(tmp_path):
+    mapped = MappedBlacklistSnapshot(_write(tmp_path, ROWS))
+    memory = ActiveBlacklistSnapshot(7, ROWS, UPDATED_AT)
+
+    assert len(mapped) == len(memory)
+    assert mapped.data_version == memory.data_version
+    assert [mapped.row(i) for i in range(len(ROWS))] == ROWS
+    assert mapped.rows[-1] == ROWS[-1]
+    assert mapped.rows[1:3] == ROWS[1:3]
+    with pytest.raises(IndexError):
+        mapped.rows[len(ROWS)]
+
+    for ip in PROBES:
+        assert mapped.index.lookup(ip) == memory.index.lookup(ip), ip
+    assert mapped.index.get_stats() == memory.index.get_stats()
+
+    for format_type in ("text", "fortigate", "json", "enhanced"):
+        assert mapped.render(format_type) == memory.render(format_type)
+
+
+def test_null_values_round_trip_as_none(tmp_path):
+    rows = [
+        {"ip_address": "10.0.0.1"},
+        {
+            "ip_address": "10.0.0.2",
+            "reason": "",
+            "confidence_level": 0,
+            "detection_count": None,
+            "last_seen": datetime(1970, 1, 1),
+        },
+    ]
+    mapped = MappedBlacklistSnapshot(_write(tmp_path, rows))
+
+    assert mapped.row(0) == {
+        "ip_address": "10.0.0.1",
+        "reason": None,
+        "source": None,
+        "category": None,
+        "confidence_level": None,
+        "is_active": True,
+        "last_seen": None,
+        "detection_count": 0,
+    }
+    # 빈 문자열 / 0 / epoch는 NULL 센티널과 구분
+    second = mapped.row(1)
+    assert second["reason"] == ""
+    assert second["confidence_level"] == 0
+    assert second["last_seen"] == "1970-01-01T00:00:00"
+    assert second["detection_count"] == 0
+
+
+@pytest.mark.parametrize("count", [1, 3, 5])
+def test_sections_are_eight_byte_aligned(tmp_path, count):
+    rows = [dict(ROWS[i % len(ROWS)], ip_address=f"10.0.{i}.1") for i in range(count)]
+    path = _write(tmp_path, rows)
+    mapped = MappedBlacklistSnapshot(path)
+    with open(path, "rb") as f:
+        data = f.read()
+
+    header = HEADER.unpack_from(data)
+    assert HEADER.size % 8 == 0
+    offset = HEADER.size
+    for name, _, _ in _layout(*header[3:8]):
+        start = _align(offset)
+        assert start % 8 == 0
+        # 패딩은 0으로 채움
+        assert data[offset:start] == b"\0" * (start - offset)
+        column = mapped._columns[name].tobytes()
+        assert data[start : start + len(column)] == column
+        offset = start + len(column)
+    assert len(data) == offset + len(mapped._blob)
+    assert mapped.render("text") == [row["ip_address"] for row in rows]
+
+
+def test_acquire_switches_file_on_version_change(tmp_path):
+    store = SharedSnapshotStore(str(tmp_path), keep=2)
+    loads = []
+
+    def loader(rows):
+        def load():
+            loads.append(len(rows))
+            return rows
+
+        return load
+
+    first = store.acquire(DataVersion(1, UPDATED_AT), loader(ROWS[:2]), max_age=60)
+    again = store.acquire(DataVersion(1, UPDATED_AT), loader(ROWS), max_age=60)
+    # 같은 버전은 기록된 파일을 다시 mmap (DB 조회 없음)
+    assert loads == [2]
+    assert again.path == first.path
+    assert len(again) == 2
+
+    second = store.acquire(DataVersion(2, UPDATED_AT), loader(ROWS), max_age=60)
+    assert loads == [2, 5]
+    assert second.version == 2
+    assert second.path == store.path_for(2) != first.path
+    assert second.render("text") == [row["ip_address"] for row in ROWS]
+    # 이전 버전을 mmap한 워커는 그대로 읽을 수 있음
+    assert first.render("text") == [row["ip_address"] for row in ROWS[:2]]
+
+    # 만료 / force 시 재생성
+    store.acquire(DataVersion(2, UPDATED_AT), loader(ROWS), max_age=0)
+    store.acquire(DataVersion(2, UPDATED_AT), loader(ROWS), max_age=60, force=True)
+    assert loads == [2, 5, 5, 5]
+
+
+def test_acquire_rebuilds_corrupt_file(tmp_path):
+    store = SharedSnapshotStore(str(tmp_path))
+    with open(store.path_for(3), "wb") as f:
+        f.write(b"not a snapshot")
+
+    snapshot = store.acquire(DataVersion(3, UPDATED_AT), lambda: ROWS, max_age=60)
+
+    assert snapshot.version == 3
+    assert len(snapshot) == len(ROWS)
+
+
+def test_cleanup_keeps_latest_versions(tmp_path):
+    store = SharedSnapshotStore(str(tmp_path), keep=2)
+    stray = os.path.join(tmp_path, f"{store.prefix}.vX.bin")
+    open(stray, "wb").close()
+
+    oldest = store.acquire(DataVersion(1, UPDATED_AT), lambda: ROWS, max_age=60)
+    for version in (2, 10, 3):
+        store.acquire(DataVersion(version, UPDATED_AT), lambda: ROWS, max_age=60)
+
+    remaining = sorted(
+        name for name in os.listdir(tmp_path) if name.startswith(store.prefix)
+    )
+    # 숫자 순서로 최근 keep개 (v10, v3), 형식이 다른 파일은 건드리지 않음
+    assert remaining == [
+        f"{store.prefix}.v10.bin",
+        f"{store.prefix}.v3.bin",
+        f"{store.prefix}.vX.bin",
+    ]
+    # 삭제된 파일을 이미 mmap한 스냅샷은 계속 사용 가능
+    assert oldest.index.lookup("203.0.113.7")["reason"] == "악성 스캐너"